@@ -11,14 +11,18 @@ urlpatterns = [
     # Customer endpoints
     path('customers/', views.customer_list, name='customer-list'),
     path('customers/active/', views.customer_active_list, name='customer-active-list'),
+    path('customers/statement/', payment_views.customer_statement_list, name='customer-statement-list'),
     path('customers/<int:pk>/', views.customer_detail, name='customer-detail'),
     path('customers/<int:pk>/toggle-active/', views.customer_toggle_active, name='customer-toggle-active'),
     path('customers/<int:bp_pk>/payment-summary/', payment_views.business_partner_payment_summary, name='customer-payment-summary'),
+    path('customers/<int:bp_pk>/statement/', payment_views.customer_statement, name='customer-statement'),
     
     # Supplier endpoints
     path('suppliers/', views.supplier_list, name='supplier-list'),
     path('suppliers/active/', views.supplier_active_list, name='supplier-active-list'),
+    path('suppliers/statement/', payment_views.supplier_statement_list, name='supplier-statement-list'),
     path('suppliers/<int:pk>/', views.supplier_detail, name='supplier-detail'),
     path('suppliers/<int:pk>/toggle-active/', views.supplier_toggle_active, name='supplier-toggle-active'),
     path('suppliers/<int:bp_pk>/payment-summary/', payment_views.business_partner_payment_summary, name='supplier-payment-summary'),
+    path('suppliers/<int:bp_pk>/statement/', payment_views.supplier_statement, name='supplier-statement'),
 ]
@@ -0,0 +1,106 @@
+"""
+Django management command to reconcile stored journal entry totals.
+
+JournalEntry keeps total_debit, total_credit and line_count up to date on
+every line write. This command finds entries whose stored figures drifted
+from their lines (e.g. after raw SQL or data fixes) and repairs them.
+
+This command will:
+1. Compare stored totals with totals aggregated from the lines (one query)
+2. Report every entry that drifted
+3. Recompute the drifted entries with one set-based UPDATE
+
+With --segment-usage it also reconciles the journal_line_count usage
+counters of segment combinations, segments and segment types
+(XX_Segment_combination.refresh_usage()).
+
+Usage:
+    python manage.py reconcile_journal_totals
+    python manage.py reconcile_journal_totals --dry-run
+    python manage.py reconcile_journal_totals --entry-id 42
+    python manage.py reconcile_journal_totals --segment-usage
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from Finance.GL.models import JournalEntry, XX_Segment_combination
+
+
+class Command(BaseCommand):
+    help = 'Find and repair journal entries whose stored totals differ from their lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted entries without updating the database',
+        )
+        parser.add_argument(
+            '--entry-id',
+            type=int,
+            help='Process only a specific journal entry by ID',
+        )
+        parser.add_argument(
+            '--segment-usage',
+            action='store_true',
+            help='Also reconcile the usage counters of segment combinations, segments and segment types',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        entry_id = options.get('entry_id')
+        
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be saved'))
+        
+        entries = JournalEntry.objects.all()
+        if entry_id:
+            entries = entries.filter(id=entry_id)
+            if not entries.exists():
+                raise CommandError(f'Journal Entry with ID {entry_id} does not exist')
+        
+        with transaction.atomic():
+            drifted = list(JournalEntry.with_drifted_totals(entries).order_by('id'))
+            
+            for entry in drifted:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'Journal Entry {entry.id}: '
+                        f'debit {entry.total_debit} -> {entry.actual_debit}, '
+                        f'credit {entry.total_credit} -> {entry.actual_credit}, '
+                        f'lines {entry.line_count} -> {entry.actual_line_count}'
+                    )
+                )
+            
+            if drifted and not dry_run:
+                JournalEntry.refresh_totals(entry.id for entry in drifted)
+            
+            drifted_usage = 0
+            if options['segment_usage']:
+                for model, rows in XX_Segment_combination.with_drifted_usage():
+                    for row in rows:
+                        drifted_usage += 1
+                        self.stdout.write(
+                            self.style.WARNING(
+                                f'{model._meta.verbose_name} {row.pk}: '
+                                f'usage {row.journal_line_count} -> {row.actual_line_count}'
+                            )
+                        )
+                if drifted_usage and not dry_run:
+                    XX_Segment_combination.refresh_usage()
+        
+        # Summary
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(f'Drifted entries: {len(drifted)}')
+        fixes = f'{len(drifted)} entry(ies)'
+        if options['segment_usage']:
+            self.stdout.write(f'Drifted usage counters: {drifted_usage}')
+            fixes += f' and {drifted_usage} usage counter(s)'
+        
+        if not drifted and not drifted_usage:
+            self.stdout.write(self.style.SUCCESS('\n✓ All journal entry totals match their lines'))
+        elif dry_run:
+            self.stdout.write(self.style.WARNING(f'\nRun without --dry-run to fix {fixes}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully fixed {fixes}'))
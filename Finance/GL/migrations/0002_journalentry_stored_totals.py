@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:22
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_journal_totals(apps, schema_editor):
+    """
+    Compute stored totals for existing journal entries from their lines.
+    """
+    JournalEntry = apps.get_model('finance_gl', 'JournalEntry')
+    JournalLine = apps.get_model('finance_gl', 'JournalLine')
+    
+    lines = JournalLine.objects.filter(entry=OuterRef('pk')).order_by().values('entry')
+    zero = Value(Decimal('0'), output_field=models.DecimalField(max_digits=18, decimal_places=5))
+    
+    def line_sum(line_type):
+        return Coalesce(
+            Subquery(lines.filter(type=line_type).annotate(total=Sum('amount')).values('total')),
+            zero
+        )
+    
+    JournalEntry.objects.update(
+        total_debit=line_sum('DEBIT'),
+        total_credit=line_sum('CREDIT'),
+        line_count=Coalesce(Subquery(lines.annotate(total=Count('pk')).values('total')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance_gl', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='line_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='total_credit',
+            field=models.DecimalField(decimal_places=5, default=0, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='total_debit',
+            field=models.DecimalField(decimal_places=5, default=0, max_digits=18),
+        ),
+        migrations.RunPython(backfill_journal_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_segment_usage(apps, schema_editor):
+    """
+    Count existing journal lines per combination, segment and segment type.
+    """
+    XX_SegmentType = apps.get_model('finance_gl', 'XX_SegmentType')
+    XX_Segment = apps.get_model('finance_gl', 'XX_Segment')
+    XX_Segment_combination = apps.get_model('finance_gl', 'XX_Segment_combination')
+    JournalLine = apps.get_model('finance_gl', 'JournalLine')
+
+    lines = JournalLine.objects.order_by()
+
+    def line_count(lookup):
+        return Coalesce(
+            Subquery(
+                lines.filter(**{lookup: OuterRef('pk')}).values(lookup)
+                .annotate(total=Count('pk')).values('total')
+            ),
+            0
+        )
+
+    XX_Segment_combination.objects.update(journal_line_count=line_count('segment_combination'))
+    XX_Segment.objects.update(journal_line_count=line_count('segment_combination__details__segment'))
+    XX_SegmentType.objects.update(journal_line_count=line_count('segment_combination__details__segment_type'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance_gl', '0002_journalentry_stored_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='xx_segment',
+            name='journal_line_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='xx_segment_combination',
+            name='journal_line_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='xx_segmenttype',
+            name='journal_line_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_segment_usage, migrations.RunPython.noop),
+    ]
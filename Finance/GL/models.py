@@ -1,4 +1,8 @@
-from django.db import models
+from collections import Counter
+from decimal import Decimal
+from django.db import models, transaction
+from django.db.models import F, Q, Sum, Count, Value, OuterRef, Subquery, Exists, Case, When
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from Finance.core.models import Currency, ProtectedDeleteMixin
 
@@ -38,6 +42,9 @@ class XX_SegmentType(ProtectedDeleteMixin, models.Model):
         default=True,
         help_text="Whether this segment is currently active"
     )
+    # Journal lines whose combination uses a value of this type, maintained
+    # on every line write (see XX_Segment_combination.adjust_usage())
+    journal_line_count = models.PositiveIntegerField(default=0)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -54,34 +61,15 @@ class XX_SegmentType(ProtectedDeleteMixin, models.Model):
     def is_used_in_transactions(self):
         """
         Check if this segment type is used in any transactions.
+        Reads the maintained journal_line_count (no query).
         Returns tuple: (is_used: bool, usage_details: list)
         """
         usage = []
-        
-        try:
-            # Check if any segment values of this type are used in combinations
-            segment_values = self.values.all()
-            if segment_values.exists():
-                # Get all combinations using any segment of this type
-                combinations_using_type = segment_combination_detials.objects.filter(
-                    segment_type=self
-                ).values_list('segment_combination_id', flat=True).distinct()
-                
-                if combinations_using_type:
-                    # Check if these combinations are used in journal lines
-                    journal_line_count = JournalLine.objects.filter(
-                        segment_combination_id__in=combinations_using_type
-                    ).count()
-                    
-                    if journal_line_count > 0:
-                        usage.append(
-                            f"Segment type used in {len(combinations_using_type)} combination(s) "
-                            f"referenced by {journal_line_count} journal line(s)"
-                        )
-        except Exception:
-            # Tables might not exist yet during migrations
-            pass
-        
+        if self.journal_line_count > 0:
+            usage.append(
+                f"Segment type used in segment combination(s) "
+                f"referenced by {self.journal_line_count} journal line(s)"
+            )
         return (len(usage) > 0, usage)
     
     @property
@@ -106,6 +94,8 @@ class XX_SegmentType(ProtectedDeleteMixin, models.Model):
         Prevent deletion if segment type is used in transactions.
         Suggest marking as inactive instead.
         """
+        if self.pk is not None:
+            self.refresh_from_db(fields=['journal_line_count'])
         is_used, usage_details = self.is_used_in_transactions()
         
         if is_used:
@@ -127,6 +117,23 @@ class XX_SegmentType(ProtectedDeleteMixin, models.Model):
         
         super().delete(*args, **kwargs)
 
+class XX_SegmentQuerySet(models.QuerySet):
+    """QuerySet for XX_Segment"""
+    
+    def with_usage(self):
+        """
+        Annotate has_children_flag, so can_delete needs no query per segment.
+        
+        Together with the maintained journal_line_count this answers
+        "is used" / "can delete" for a whole list of segments in one query.
+        """
+        return self.annotate(
+            has_children_flag=Exists(
+                XX_Segment.objects.filter(segment_type=OuterRef('segment_type'), parent_code=OuterRef('code'))
+            )
+        )
+
+
 class XX_Segment(ProtectedDeleteMixin, models.Model):
     """
     Generic segment value model that replaces XX_Entity, XX_Account, XX_Project.
@@ -169,10 +176,15 @@ class XX_Segment(ProtectedDeleteMixin, models.Model):
         default=True,
         help_text="Whether this segment value is active"
     )
+    # Journal lines whose combination uses this value, maintained on every
+    # line write (see XX_Segment_combination.adjust_usage())
+    journal_line_count = models.PositiveIntegerField(default=0)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = XX_SegmentQuerySet.as_manager()
+    
     class Meta:
         db_table = "XX_SEGMENT_XX"
         verbose_name = "Segment Value"
@@ -255,33 +267,26 @@ class XX_Segment(ProtectedDeleteMixin, models.Model):
     def is_used_in_transactions(self):
         """
         Check if this segment is used in any transactions.
+        Reads the maintained journal_line_count (no query).
         Returns tuple: (is_used: bool, usage_details: list)
         """
         usage = []
-        
-        try:
-            # Check if this segment is used in any segment combinations
-            combinations_using_segment = segment_combination_detials.objects.filter(
-                segment=self
-            ).values_list('segment_combination_id', flat=True)
-            
-            if combinations_using_segment:
-                # Check if these combinations are used in journal lines
-                journal_line_count = JournalLine.objects.filter(
-                    segment_combination_id__in=combinations_using_segment
-                ).count()
-                
-                if journal_line_count > 0:
-                    usage.append(
-                        f"Used in {len(combinations_using_segment)} segment combination(s) "
-                        f"referenced by {journal_line_count} journal line(s)"
-                    )
-        except Exception:
-            # Tables might not exist yet during migrations
-            pass
-        
+        if self.journal_line_count > 0:
+            usage.append(
+                f"Used in segment combination(s) "
+                f"referenced by {self.journal_line_count} journal line(s)"
+            )
         return (len(usage) > 0, usage)
     
+    def has_children(self):
+        """Whether child segments reference this segment (from with_usage() when annotated)"""
+        if hasattr(self, 'has_children_flag'):
+            return self.has_children_flag
+        return XX_Segment.objects.filter(
+            segment_type_id=self.segment_type_id,
+            parent_code=self.code
+        ).exists()
+    
     @property
     def can_delete(self):
         """
@@ -294,20 +299,15 @@ class XX_Segment(ProtectedDeleteMixin, models.Model):
             return False
         
         # Check if has children
-        has_children = XX_Segment.objects.filter(
-            segment_type=self.segment_type,
-            parent_code=self.code
-        ).exists()
-        if has_children:
-            return False
-        
-        return True
+        return not self.has_children()
     
     def delete(self, *args, **kwargs):
         """
         Prevent deletion if segment is used in any transactions.
         Suggest marking as inactive instead.
         """
+        if self.pk is not None:
+            self.refresh_from_db(fields=['journal_line_count'])
         is_used, usage_details = self.is_used_in_transactions()
         
         if is_used:
@@ -371,6 +371,10 @@ class XX_Segment_combination(models.Model):
         default=True,
         help_text="Whether this envelope is currently active"
     )
+    # Journal lines using this combination, maintained on every line write.
+    # Only changed through queryset updates (see adjust_usage()), which
+    # bypass the immutability check in save().
+    journal_line_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
    
@@ -419,6 +423,96 @@ class XX_Segment_combination(models.Model):
             "Consider marking it as inactive (is_active=False) instead."
         )
     
+    @classmethod
+    def adjust_usage(cls, deltas):
+        """
+        Add journal lines to (positive delta) or remove them from (negative
+        delta) the usage counters of combinations, their segments and their
+        segment types.
+        
+        One query for the combinations' details plus one F-expression UPDATE
+        per level, so concurrent line writes cannot lose each other's changes.
+        
+        Args:
+            deltas: {combination_id: change in journal line count}
+        """
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        
+        segment_deltas = Counter()
+        segment_type_deltas = Counter()
+        details = segment_combination_detials.objects.filter(
+            segment_combination_id__in=deltas
+        ).values_list('segment_combination_id', 'segment_id', 'segment_type_id')
+        for combination_id, segment_id, segment_type_id in details:
+            segment_deltas[segment_id] += deltas[combination_id]
+            segment_type_deltas[segment_type_id] += deltas[combination_id]
+        
+        for model, model_deltas in (
+            (cls, deltas), (XX_Segment, segment_deltas), (XX_SegmentType, segment_type_deltas)
+        ):
+            model_deltas = {pk: delta for pk, delta in model_deltas.items() if delta}
+            if not model_deltas:
+                continue
+            change = Case(
+                *[When(pk=pk, then=Value(delta)) for pk, delta in model_deltas.items()],
+                default=Value(0)
+            )
+            model.objects.filter(pk__in=model_deltas).update(
+                journal_line_count=F('journal_line_count') + change
+            )
+    
+    @classmethod
+    def _usage_count_expressions(cls):
+        """(model, correlated subquery counting its journal lines) per usage level."""
+        lines = JournalLine.objects.order_by()
+        
+        def line_count(lookup):
+            return Coalesce(
+                Subquery(
+                    lines.filter(**{lookup: OuterRef('pk')}).values(lookup)
+                    .annotate(total=Count('pk')).values('total')
+                ),
+                0
+            )
+        
+        return [
+            (cls, line_count('segment_combination')),
+            (XX_Segment, line_count('segment_combination__details__segment')),
+            (XX_SegmentType, line_count('segment_combination__details__segment_type')),
+        ]
+    
+    @classmethod
+    def with_drifted_usage(cls):
+        """
+        Combinations, segments and segment types whose usage counter does
+        not match their journal lines.
+        
+        Returns:
+            list: (model, queryset) per level; each row is annotated with
+            actual_line_count as counted from the lines
+        """
+        return [
+            (model, model.objects.annotate(actual_line_count=line_count)
+             .exclude(journal_line_count=F('actual_line_count')).order_by('pk'))
+            for model, line_count in cls._usage_count_expressions()
+        ]
+    
+    @classmethod
+    def refresh_usage(cls):
+        """
+        Recompute every usage counter from the journal lines (one set-based
+        UPDATE per level). Use after writes that bypassed the JournalLine hooks.
+        
+        Returns:
+            int: Number of counters changed
+        """
+        return sum(
+            model.objects.exclude(journal_line_count=line_count).update(journal_line_count=line_count)
+            for model, line_count in cls._usage_count_expressions()
+        )
+    
     def get_combination_dict(self):
         """
         Returns a dictionary representation of the combination using segment codes.
@@ -686,6 +780,14 @@ class JournalEntry(models.Model):
     currency = models.ForeignKey(Currency, on_delete=models.PROTECT)
     memo = models.CharField(max_length=255, blank=True)
     posted = models.BooleanField(default=False)
+    # Running totals of the entry's lines, maintained on every line write so
+    # list/detail endpoints never aggregate lines at read time.
+    # See refresh_totals() and the reconcile_journal_totals command.
+    total_debit = models.DecimalField(max_digits=18, decimal_places=5, default=0)
+    total_credit = models.DecimalField(max_digits=18, decimal_places=5, default=0)
+    line_count = models.PositiveIntegerField(default=0)
+    
+    TOTAL_FIELDS = ('total_debit', 'total_credit', 'line_count')
 
     def __str__(self):
         return f"JE#{self.id} - {self.date} - {self.memo or 'No memo'}"
@@ -711,6 +813,14 @@ class JournalEntry(models.Model):
                 # New record, allow save
                 pass
         
+        # Stored totals are maintained by the lines; never overwrite them
+        # with this instance's possibly stale values
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.TOTAL_FIELDS
+            ]
+        
         super().save(*args, **kwargs)
     
     def delete(self, *args, **kwargs):
@@ -724,7 +834,13 @@ class JournalEntry(models.Model):
                 "Consider creating a reversing entry instead."
             )
         
-        super().delete(*args, **kwargs)
+        # Lines are cascade-deleted without JournalLine.delete(): release
+        # their segment usage here
+        usage = Counter(self.lines.values_list('segment_combination_id', flat=True))
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            XX_Segment_combination.adjust_usage({pk: -count for pk, count in usage.items()})
+        return result
     
     @classmethod
     def filter_by_segment(cls, segment_type_id, segment_code):
@@ -829,6 +945,73 @@ class JournalEntry(models.Model):
         
         return cls.objects.filter(q_objects).distinct()
     
+    @classmethod
+    def adjust_totals(cls, entry_id, line_type, amount, count):
+        """
+        Add (count=1) or remove (count=-1) one line's amount to the stored totals.
+        
+        Uses a single F-expression UPDATE so concurrent line writes on the
+        same entry cannot lose each other's changes.
+        """
+        field = 'total_debit' if line_type == 'DEBIT' else 'total_credit'
+        cls.objects.filter(pk=entry_id).update(**{
+            field: F(field) + Decimal(str(amount)) * count,
+            'line_count': F('line_count') + count,
+        })
+    
+    @staticmethod
+    def _line_total_expressions():
+        """Correlated subqueries computing each stored total from the lines."""
+        lines = JournalLine.objects.filter(entry=OuterRef('pk')).order_by().values('entry')
+        zero = Value(Decimal('0'), output_field=models.DecimalField(max_digits=18, decimal_places=5))
+        
+        def line_sum(line_type):
+            return Coalesce(
+                Subquery(lines.filter(type=line_type).annotate(total=Sum('amount')).values('total')),
+                zero
+            )
+        
+        return {
+            'total_debit': line_sum('DEBIT'),
+            'total_credit': line_sum('CREDIT'),
+            'line_count': Coalesce(Subquery(lines.annotate(total=Count('pk')).values('total')), 0),
+        }
+    
+    @classmethod
+    def with_drifted_totals(cls, queryset=None):
+        """
+        Entries whose stored totals do not match their lines.
+        
+        Each entry is annotated with actual_debit, actual_credit and
+        actual_line_count as aggregated from its lines.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        expressions = cls._line_total_expressions()
+        return queryset.annotate(
+            actual_debit=expressions['total_debit'],
+            actual_credit=expressions['total_credit'],
+            actual_line_count=expressions['line_count'],
+        ).filter(
+            ~Q(total_debit=F('actual_debit'))
+            | ~Q(total_credit=F('actual_credit'))
+            | ~Q(line_count=F('actual_line_count'))
+        )
+    
+    @classmethod
+    def refresh_totals(cls, entry_ids=None):
+        """
+        Recompute stored totals from the lines with one set-based UPDATE.
+        
+        Args:
+            entry_ids: Iterable of entry IDs, or None for every entry
+        
+        Returns:
+            int: Number of entries updated
+        """
+        queryset = cls.objects.all() if entry_ids is None else cls.objects.filter(pk__in=list(entry_ids))
+        return queryset.update(**cls._line_total_expressions())
+    
     def get_total_debit(self):
         """
         Calculate the total debit amount for this journal entry.
@@ -972,6 +1155,51 @@ class JournalEntry(models.Model):
         
         return gl_entry
 
+class JournalLineQuerySet(models.QuerySet):
+    """
+    Keeps JournalEntry stored totals and segment usage counters current for
+    queryset-level writes, which bypass JournalLine.save()/delete().
+    """
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic():
+            objs = super().bulk_create(objs, *args, **kwargs)
+            JournalEntry.refresh_totals({line.entry_id for line in objs})
+            XX_Segment_combination.adjust_usage(Counter(line.segment_combination_id for line in objs))
+        return objs
+    
+    def update(self, **kwargs):
+        changes_totals = bool({'amount', 'type', 'entry', 'entry_id'} & set(kwargs))
+        changes_usage = bool({'segment_combination', 'segment_combination_id'} & set(kwargs))
+        if not changes_totals and not changes_usage:
+            return super().update(**kwargs)
+        rows = list(self.values_list('pk', 'entry_id', 'segment_combination_id'))
+        with transaction.atomic():
+            updated = super().update(**kwargs)
+            if changes_totals:
+                entry_ids = {entry_id for _, entry_id, _ in rows}
+                entry_ids.update(self.values_list('entry_id', flat=True))
+                JournalEntry.refresh_totals(entry_ids)
+            if changes_usage:
+                usage = Counter()
+                for _, _, combination_id in rows:
+                    usage[combination_id] -= 1
+                usage.update(JournalLine.objects.filter(
+                    pk__in=[pk for pk, _, _ in rows]
+                ).values_list('segment_combination_id', flat=True))
+                XX_Segment_combination.adjust_usage(usage)
+        return updated
+    
+    def delete(self):
+        rows = list(self.values_list('entry_id', 'segment_combination_id'))
+        with transaction.atomic():
+            result = super().delete()
+            JournalEntry.refresh_totals({entry_id for entry_id, _ in rows})
+            usage = Counter(combination_id for _, combination_id in rows)
+            XX_Segment_combination.adjust_usage({pk: -count for pk, count in usage.items()})
+        return result
+
+
 class JournalLine(models.Model):
     entry = models.ForeignKey(JournalEntry, related_name="lines", on_delete=models.CASCADE)
     amount = models.DecimalField(max_digits=14, decimal_places=5)
@@ -981,6 +1209,8 @@ class JournalLine(models.Model):
     ])
     segment_combination = models.ForeignKey('XX_Segment_combination', on_delete=models.PROTECT)
     
+    objects = JournalLineQuerySet.as_manager()
+    
     def __str__(self):
         return f"JL#{self.id} - JE#{self.entry.id} - {self.type} {self.amount}"
     
@@ -996,6 +1226,7 @@ class JournalLine(models.Model):
             )
         
         # If updating an existing line, check if it was previously attached to a posted entry
+        original = None
         if self.pk is not None:
             try:
                 original = JournalLine.objects.get(pk=self.pk)
@@ -1007,7 +1238,20 @@ class JournalLine(models.Model):
             except JournalLine.DoesNotExist:
                 pass
         
-        super().save(*args, **kwargs)
+        # Keep the entry's stored totals and the segment usage counters in
+        # step with the line
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if original is not None:
+                JournalEntry.adjust_totals(original.entry_id, original.type, original.amount, -1)
+            JournalEntry.adjust_totals(self.entry_id, self.type, self.amount, 1)
+            if original is None:
+                XX_Segment_combination.adjust_usage({self.segment_combination_id: 1})
+            elif original.segment_combination_id != self.segment_combination_id:
+                XX_Segment_combination.adjust_usage({
+                    original.segment_combination_id: -1,
+                    self.segment_combination_id: 1,
+                })
     
     def delete(self, *args, **kwargs):
         """
@@ -1019,7 +1263,10 @@ class JournalLine(models.Model):
                 "Posted entries and their lines cannot be deleted for accounting integrity."
             )
         
-        super().delete(*args, **kwargs)
+        with transaction.atomic():
+            super().delete(*args, **kwargs)
+            JournalEntry.adjust_totals(self.entry_id, self.type, self.amount, -1)
+            XX_Segment_combination.adjust_usage({self.segment_combination_id: -1})
 
 class GeneralLedger(models.Model):
     submitted_date = models.DateField()
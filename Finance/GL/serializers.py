@@ -24,11 +24,12 @@ class SegmentTypeSerializer(serializers.ModelSerializer):
             'display_order',
             'description',
             'is_active',
+            'journal_line_count',
             'created_at',
             'updated_at',
             'can_delete',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'can_delete']
+        read_only_fields = ['id', 'journal_line_count', 'created_at', 'updated_at', 'can_delete']
 
 
 class SegmentTypeListSerializer(serializers.ModelSerializer):
@@ -77,13 +78,17 @@ class SegmentSerializer(serializers.ModelSerializer):
             'alias',
             'node_type',
             'is_active',
+            'journal_line_count',
             'created_at',
             'updated_at',
             'parent_segment',
             'full_path',
             'can_delete',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'name', 'parent_segment', 'full_path', 'can_delete']
+        read_only_fields = [
+            'id', 'journal_line_count', 'created_at', 'updated_at', 'name', 'parent_segment', 'full_path',
+            'can_delete'
+        ]
     
     def get_parent_segment(self, obj):
         """Get parent segment information if exists"""
@@ -116,6 +121,31 @@ class SegmentListSerializer(serializers.ModelSerializer):
         ]
 
 
+class SegmentUsageSerializer(serializers.ModelSerializer):
+    """
+    Usage of one segment value, for XX_Segment.objects.with_usage() querysets.
+    """
+    is_used = serializers.SerializerMethodField()
+    has_children = serializers.BooleanField(source='has_children_flag', read_only=True)
+    can_delete = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = XX_Segment
+        fields = [
+            'id',
+            'code',
+            'alias',
+            'is_active',
+            'journal_line_count',
+            'is_used',
+            'has_children',
+            'can_delete',
+        ]
+    
+    def get_is_used(self, obj):
+        return obj.journal_line_count > 0
+
+
 class UsageDetailsSerializer(serializers.Serializer):
     """
     Serializer for usage details response.
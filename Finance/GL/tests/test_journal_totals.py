@@ -0,0 +1,225 @@
+"""
+Tests for stored journal entry totals.
+
+Covers:
+- total_debit / total_credit / line_count kept current on line create, edit, delete
+- Queryset-level bulk_create / update / delete of lines
+- JournalEntry.refresh_totals() and the reconcile_journal_totals command
+- Journal entry list/detail endpoints reading the stored figures
+
+Run:
+    python manage.py test Finance.GL.tests.test_journal_totals
+"""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.base.test_utils import create_test_currency
+from Finance.GL.models import (
+    XX_SegmentType,
+    XX_Segment,
+    XX_Segment_combination,
+    JournalEntry,
+    JournalLine,
+)
+
+
+class JournalTotalsTestCase(TestCase):
+    """Base test case with a segment combination, a journal entry and line helpers"""
+
+    def setUp(self):
+        self.currency = create_test_currency()
+        entity_type = XX_SegmentType.objects.create(segment_name="Entity")
+        account_type = XX_SegmentType.objects.create(segment_name="Account")
+        XX_Segment.objects.create(segment_type=entity_type, code="100", alias="Entity 100", node_type="child")
+        XX_Segment.objects.create(segment_type=account_type, code="5000", alias="Account 5000", node_type="child")
+        self.combo = XX_Segment_combination.create_combination([
+            (entity_type.id, "100"),
+            (account_type.id, "5000"),
+        ])
+        self.entry = self.create_entry()
+
+    def create_entry(self, memo="Totals"):
+        return JournalEntry.objects.create(date=date(2026, 1, 15), currency=self.currency, memo=memo)
+
+    def add_line(self, entry, amount, line_type):
+        return JournalLine.objects.create(
+            entry=entry, amount=Decimal(amount), type=line_type, segment_combination=self.combo
+        )
+
+    def assertTotals(self, entry, debit, credit, line_count):
+        entry.refresh_from_db()
+        self.assertEqual(entry.total_debit, Decimal(debit))
+        self.assertEqual(entry.total_credit, Decimal(credit))
+        self.assertEqual(entry.line_count, line_count)
+
+
+class JournalTotalsMaintenanceTest(JournalTotalsTestCase):
+    """Stored totals follow every kind of line write"""
+
+    def test_line_create_updates_totals(self):
+        self.add_line(self.entry, '100.50', 'DEBIT')
+        self.add_line(self.entry, '100.50', 'CREDIT')
+
+        self.assertTotals(self.entry, '100.50', '100.50', 2)
+
+    def test_line_edit_moves_amount(self):
+        line = self.add_line(self.entry, '100', 'DEBIT')
+
+        line.amount = Decimal('80')
+        line.type = 'CREDIT'
+        line.save()
+
+        self.assertTotals(self.entry, '0', '80', 1)
+
+    def test_line_moved_to_other_entry(self):
+        other = self.create_entry("Other")
+        line = self.add_line(self.entry, '40', 'DEBIT')
+
+        line.entry = other
+        line.save()
+
+        self.assertTotals(self.entry, '0', '0', 0)
+        self.assertTotals(other, '40', '0', 1)
+
+    def test_line_delete_updates_totals(self):
+        line = self.add_line(self.entry, '100', 'DEBIT')
+        self.add_line(self.entry, '30', 'DEBIT')
+
+        line.delete()
+
+        self.assertTotals(self.entry, '30', '0', 1)
+
+    def test_queryset_bulk_create_update_delete(self):
+        JournalLine.objects.bulk_create([
+            JournalLine(entry=self.entry, amount=Decimal('10'), type='DEBIT', segment_combination=self.combo),
+            JournalLine(entry=self.entry, amount=Decimal('10'), type='CREDIT', segment_combination=self.combo),
+        ])
+        self.assertTotals(self.entry, '10', '10', 2)
+
+        self.entry.lines.filter(type='DEBIT').update(amount=Decimal('25'))
+        self.assertTotals(self.entry, '25', '10', 2)
+
+        JournalLine.objects.filter(entry=self.entry).delete()
+        self.assertTotals(self.entry, '0', '0', 0)
+
+    def test_entry_save_does_not_overwrite_totals(self):
+        stale = JournalEntry.objects.get(pk=self.entry.pk)
+        self.add_line(self.entry, '75', 'DEBIT')
+
+        stale.memo = "Renamed"
+        stale.save()
+
+        self.assertTotals(self.entry, '75', '0', 1)
+        self.assertEqual(self.entry.memo, "Renamed")
+
+
+class JournalTotalsReconcileTest(JournalTotalsTestCase):
+    """Drift detection and repair"""
+
+    def setUp(self):
+        super().setUp()
+        self.add_line(self.entry, '100', 'DEBIT')
+        self.add_line(self.entry, '100', 'CREDIT')
+        self.clean_entry = self.create_entry("Clean")
+        self.add_line(self.clean_entry, '5', 'DEBIT')
+        # Simulate drift from a write that bypassed the ORM hooks
+        JournalEntry.objects.filter(pk=self.entry.pk).update(total_debit=Decimal('1'), line_count=7)
+
+    def test_with_drifted_totals(self):
+        drifted = list(JournalEntry.with_drifted_totals())
+
+        self.assertEqual([entry.pk for entry in drifted], [self.entry.pk])
+        self.assertEqual(drifted[0].actual_debit, Decimal('100'))
+        self.assertEqual(drifted[0].actual_line_count, 2)
+
+    def test_refresh_totals(self):
+        JournalEntry.refresh_totals([self.entry.pk])
+
+        self.assertTotals(self.entry, '100', '100', 2)
+        self.assertFalse(JournalEntry.with_drifted_totals().exists())
+
+    def test_command_dry_run_reports_without_fixing(self):
+        out = StringIO()
+        call_command('reconcile_journal_totals', '--dry-run', stdout=out)
+
+        self.assertIn(f'Journal Entry {self.entry.pk}', out.getvalue())
+        self.assertIn('Drifted entries: 1', out.getvalue())
+        self.assertTotals(self.entry, '1', '100', 7)
+
+    def test_command_fixes_drift(self):
+        out = StringIO()
+        call_command('reconcile_journal_totals', stdout=out)
+
+        self.assertIn('Successfully fixed 1', out.getvalue())
+        self.assertTotals(self.entry, '100', '100', 2)
+
+
+class JournalTotalsEndpointTest(JournalTotalsTestCase):
+    """List and detail endpoints read the stored totals"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.list_url = reverse('finance:GL:journal_entry_list')
+
+    def test_list_returns_stored_totals(self):
+        self.add_line(self.entry, '60', 'DEBIT')
+        self.add_line(self.entry, '50', 'CREDIT')
+
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        row = response.data['results'][0]
+        self.assertEqual(row['total_debit'], '60.00000')
+        self.assertEqual(row['total_credit'], '50.00000')
+        self.assertEqual(row['line_count'], 2)
+        self.assertFalse(row['is_balanced'])
+
+    def test_list_filters_by_balance(self):
+        self.add_line(self.entry, '60', 'DEBIT')
+        balanced = self.create_entry("Balanced")
+        self.add_line(balanced, '10', 'DEBIT')
+        self.add_line(balanced, '10', 'CREDIT')
+
+        response = self.client.get(self.list_url, {'is_balanced': 'true'})
+
+        self.assertEqual([row['id'] for row in response.data['results']], [balanced.pk])
+
+    def test_list_query_count_does_not_grow_with_entries(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(self.list_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(ctx.captured_queries)
+
+        self.add_line(self.entry, '10', 'DEBIT')
+        small = count_queries()
+        for index in range(10):
+            entry = self.create_entry(f"Entry {index}")
+            self.add_line(entry, '10', 'DEBIT')
+            self.add_line(entry, '10', 'CREDIT')
+
+        self.assertEqual(count_queries(), small)
+
+    def test_detail_returns_stored_totals(self):
+        self.add_line(self.entry, '20', 'DEBIT')
+        self.add_line(self.entry, '20', 'CREDIT')
+
+        response = self.client.get(reverse('finance:GL:journal_entry_detail', args=[self.entry.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_balanced'])
+        self.assertEqual(response.data['balance_difference'], '0.00000')
+        self.assertEqual(response.data['line_count'], 2)
+        self.assertEqual(len(response.data['lines']), 2)
+        self.assertEqual(response.data['lines'][0]['segments'], {'Entity': '100', 'Account': '5000'})
@@ -0,0 +1,238 @@
+"""
+Tests for maintained segment usage counters.
+
+Covers:
+- journal_line_count of combinations, segments and segment types kept current
+  on line create, edit, delete and journal entry delete
+- Queryset-level bulk_create / update / delete of lines
+- is_used_in_transactions / can_delete / delete reading the counters
+- XX_Segment_combination.with_drifted_usage() / refresh_usage()
+- reconcile_journal_totals --segment-usage
+- /segment-types/{id}/values/usage/ bulk endpoint
+
+Run:
+    python manage.py test Finance.GL.tests.test_segment_usage
+"""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.base.test_utils import create_test_currency
+from Finance.GL.models import (
+    XX_SegmentType,
+    XX_Segment,
+    XX_Segment_combination,
+    JournalEntry,
+    JournalLine,
+)
+
+
+class SegmentUsageTestCase(TestCase):
+    """Base test case with segments, two combinations, a journal entry and line helpers"""
+
+    def setUp(self):
+        self.currency = create_test_currency()
+        self.entity_type = XX_SegmentType.objects.create(segment_name="Entity")
+        self.account_type = XX_SegmentType.objects.create(segment_name="Account")
+        self.entity = XX_Segment.objects.create(
+            segment_type=self.entity_type, code="100", alias="Entity 100", node_type="child"
+        )
+        self.cash = XX_Segment.objects.create(
+            segment_type=self.account_type, code="1000", alias="Cash", node_type="child"
+        )
+        self.expense = XX_Segment.objects.create(
+            segment_type=self.account_type, code="5000", alias="Expense", node_type="child"
+        )
+        self.cash_combo = XX_Segment_combination.create_combination([
+            (self.entity_type.id, "100"), (self.account_type.id, "1000"),
+        ])
+        self.expense_combo = XX_Segment_combination.create_combination([
+            (self.entity_type.id, "100"), (self.account_type.id, "5000"),
+        ])
+        self.entry = JournalEntry.objects.create(date=date(2026, 1, 15), currency=self.currency, memo="Usage")
+
+    def add_line(self, combo, amount='10', line_type='DEBIT'):
+        return JournalLine.objects.create(
+            entry=self.entry, amount=Decimal(amount), type=line_type, segment_combination=combo
+        )
+
+    def assertUsage(self, obj, count):
+        obj.refresh_from_db(fields=['journal_line_count'])
+        self.assertEqual(obj.journal_line_count, count)
+
+
+class SegmentUsageMaintenanceTest(SegmentUsageTestCase):
+    """Counters follow every kind of line write"""
+
+    def test_line_create_and_delete(self):
+        line = self.add_line(self.cash_combo)
+        self.add_line(self.expense_combo)
+
+        self.assertUsage(self.cash_combo, 1)
+        self.assertUsage(self.entity, 2)
+        self.assertUsage(self.cash, 1)
+        self.assertUsage(self.entity_type, 2)
+        self.assertUsage(self.account_type, 2)
+
+        line.delete()
+
+        self.assertUsage(self.cash_combo, 0)
+        self.assertUsage(self.cash, 0)
+        self.assertUsage(self.entity, 1)
+        self.assertUsage(self.account_type, 1)
+
+    def test_line_moved_to_other_combination(self):
+        line = self.add_line(self.cash_combo)
+
+        line.segment_combination = self.expense_combo
+        line.save()
+        line.amount = Decimal('20')
+        line.save()
+
+        self.assertUsage(self.cash, 0)
+        self.assertUsage(self.expense, 1)
+        self.assertUsage(self.entity, 1)
+        self.assertUsage(self.account_type, 1)
+
+    def test_queryset_bulk_create_update_delete(self):
+        JournalLine.objects.bulk_create([
+            JournalLine(entry=self.entry, amount=Decimal('10'), type='DEBIT', segment_combination=self.cash_combo),
+            JournalLine(entry=self.entry, amount=Decimal('10'), type='CREDIT', segment_combination=self.cash_combo),
+            JournalLine(entry=self.entry, amount=Decimal('5'), type='DEBIT', segment_combination=self.expense_combo),
+        ])
+        self.assertUsage(self.cash, 2)
+        self.assertUsage(self.entity, 3)
+
+        self.entry.lines.filter(type='DEBIT').update(segment_combination=self.expense_combo)
+        self.assertUsage(self.cash, 1)
+        self.assertUsage(self.expense, 2)
+        self.assertUsage(self.entity, 3)
+
+        JournalLine.objects.filter(entry=self.entry).delete()
+        for obj in (self.cash, self.expense, self.entity, self.entity_type, self.expense_combo):
+            self.assertUsage(obj, 0)
+
+    def test_entry_delete_releases_usage(self):
+        self.add_line(self.cash_combo)
+        self.add_line(self.expense_combo)
+
+        self.entry.delete()
+
+        self.assertUsage(self.entity, 0)
+        self.assertUsage(self.account_type, 0)
+
+    def test_refresh_usage_repairs_drift(self):
+        self.add_line(self.cash_combo)
+        XX_Segment.objects.filter(pk=self.entity.pk).update(journal_line_count=9)
+        XX_SegmentType.objects.filter(pk=self.account_type.pk).update(journal_line_count=0)
+
+        drifted = {model: list(rows) for model, rows in XX_Segment_combination.with_drifted_usage()}
+        self.assertEqual([row.pk for row in drifted[XX_Segment]], [self.entity.pk])
+        self.assertEqual(drifted[XX_SegmentType][0].actual_line_count, 1)
+        self.assertEqual(drifted[XX_Segment_combination], [])
+
+        self.assertEqual(XX_Segment_combination.refresh_usage(), 2)
+
+        self.assertUsage(self.entity, 1)
+        self.assertUsage(self.account_type, 1)
+        self.assertUsage(self.expense_combo, 0)
+        self.assertTrue(all(not rows.exists() for _, rows in XX_Segment_combination.with_drifted_usage()))
+
+    def test_command_reconciles_usage(self):
+        self.add_line(self.cash_combo)
+        XX_Segment.objects.filter(pk=self.cash.pk).update(journal_line_count=5)
+
+        out = StringIO()
+        call_command('reconcile_journal_totals', '--segment-usage', '--dry-run', stdout=out)
+        self.assertIn(f'Segment Value {self.cash.pk}: usage 5 -> 1', out.getvalue())
+        self.assertIn('Drifted usage counters: 1', out.getvalue())
+        self.assertUsage(self.cash, 5)
+
+        out = StringIO()
+        call_command('reconcile_journal_totals', '--segment-usage', stdout=out)
+        self.assertIn('Successfully fixed 0 entry(ies) and 1 usage counter(s)', out.getvalue())
+        self.assertUsage(self.cash, 1)
+
+
+class SegmentUsageChecksTest(SegmentUsageTestCase):
+    """is_used / can_delete / delete read the counters"""
+
+    def test_checks_need_no_queries(self):
+        self.add_line(self.cash_combo)
+        cash = XX_Segment.objects.with_usage().get(pk=self.cash.pk)
+        expense = XX_Segment.objects.with_usage().get(pk=self.expense.pk)
+        account_type = XX_SegmentType.objects.get(pk=self.account_type.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cash.is_used_in_transactions(), (
+                True, ["Used in segment combination(s) referenced by 1 journal line(s)"]
+            ))
+            self.assertFalse(cash.can_delete)
+            self.assertFalse(expense.is_used_in_transactions()[0])
+            self.assertTrue(expense.can_delete)
+            self.assertTrue(account_type.is_used_in_transactions()[0])
+
+    def test_delete_checks_current_usage(self):
+        stale_expense = XX_Segment.objects.get(pk=self.expense.pk)
+        self.add_line(self.expense_combo)
+
+        with self.assertRaises(ValidationError) as ctx:
+            stale_expense.delete()
+        self.assertIn("referenced by 1 journal line(s)", str(ctx.exception))
+
+        with self.assertRaises(ValidationError):
+            self.account_type.delete()
+
+
+class SegmentTypeValuesUsageEndpointTest(SegmentUsageTestCase):
+    """Bulk usage of a segment type's values"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.url = reverse('finance:GL:segment_type_values_usage', args=[self.account_type.pk])
+        XX_Segment.objects.create(
+            segment_type=self.account_type, code="5100", parent_code="5000", alias="Travel", node_type="child"
+        )
+
+    def test_values_usage(self):
+        self.add_line(self.cash_combo)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['journal_line_count'], 1)
+        self.assertFalse(response.data['can_delete'])
+        values = {value['code']: value for value in response.data['values']}
+        self.assertEqual(values['1000']['journal_line_count'], 1)
+        self.assertTrue(values['1000']['is_used'])
+        self.assertFalse(values['1000']['can_delete'])
+        self.assertTrue(values['5000']['has_children'])
+        self.assertFalse(values['5000']['can_delete'])
+        self.assertTrue(values['5100']['can_delete'])
+
+        response = self.client.get(self.url, {'is_used': 'false'})
+        self.assertEqual([value['code'] for value in response.data['values']], ['5000', '5100'])
+
+    def test_query_count_does_not_grow_with_values(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        for index in range(10):
+            XX_Segment.objects.create(
+                segment_type=self.account_type, code=f"6{index:03d}", alias="More", node_type="child"
+            )
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data['values']), 13)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
@@ -35,6 +35,10 @@ urlpatterns = [
          segments_views.segment_type_values, 
          name='segment_type_values'),
     
+    path('segment-types/<int:pk>/values/usage/', 
+         segments_views.segment_type_values_usage, 
+         name='segment_type_values_usage'),
+    
     # ========================================================================
     # Segment Endpoints
     # ========================================================================
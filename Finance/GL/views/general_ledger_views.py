@@ -181,10 +181,10 @@ def general_ledger_list(request):
                 'memo': gl.JournalEntry.memo,
                 'posted': gl.JournalEntry.posted,
                 'posted_date': gl.submitted_date,
-                'is_balanced': gl.JournalEntry.is_balanced(),
-                'total_debit': str(gl.JournalEntry.get_total_debit()),
-                'total_credit': str(gl.JournalEntry.get_total_credit()),
-                'line_count': gl.JournalEntry.lines.count()
+                'is_balanced': gl.JournalEntry.total_debit == gl.JournalEntry.total_credit,
+                'total_debit': str(gl.JournalEntry.total_debit),
+                'total_credit': str(gl.JournalEntry.total_credit),
+                'line_count': gl.JournalEntry.line_count
             }
             for gl in queryset
         ]
@@ -239,10 +239,10 @@ def general_ledger_detail(request, pk):
                 'currency_name': entry.currency.name,
                 'memo': entry.memo,
                 'posted': entry.posted,
-                'is_balanced': entry.is_balanced(),
-                'total_debit': str(entry.get_total_debit()),
-                'total_credit': str(entry.get_total_credit()),
-                'balance_difference': str(entry.get_balance_difference()),
+                'is_balanced': entry.total_debit == entry.total_credit,
+                'total_debit': str(entry.total_debit),
+                'total_credit': str(entry.total_credit),
+                'balance_difference': str(entry.total_debit - entry.total_credit),
             },
             
             # Journal Lines
@@ -8,6 +8,7 @@ from rest_framework import status
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
+from django.db.models import F
 from decimal import Decimal
 from erp_project.pagination import auto_paginate
 
@@ -19,6 +20,20 @@ from Finance.GL.models import (
 )
 
 
+def journal_entry_totals(entry):
+    """
+    Totals for a journal entry response, read from the stored figures
+    so no lines are aggregated at read time.
+    """
+    return {
+        'is_balanced': entry.total_debit == entry.total_credit,
+        'total_debit': str(entry.total_debit),
+        'total_credit': str(entry.total_credit),
+        'balance_difference': str(entry.total_debit - entry.total_credit),
+        'line_count': entry.line_count,
+    }
+
+
 @api_view(['POST', 'PUT'])
 def journal_entry_create_update(request):
     """
@@ -221,10 +236,7 @@ def journal_entry_create_update(request):
                     'currency_code': entry.currency.code,
                     'memo': entry.memo,
                     'posted': entry.posted,
-                    'is_balanced': entry.is_balanced(),
-                    'total_debit': str(entry.get_total_debit()),
-                    'total_credit': str(entry.get_total_credit()),
-                    'balance_difference': str(entry.get_balance_difference()),
+                    **journal_entry_totals(entry),
                     'lines': [
                         {
                             'id': line.id,
@@ -313,7 +325,13 @@ def journal_entry_detail(request, pk):
         200: Journal entry with all details
         404: Entry not found
     """
-    entry = get_object_or_404(JournalEntry, pk=pk)
+    entry = get_object_or_404(
+        JournalEntry.objects.select_related('currency').prefetch_related(
+            'lines__segment_combination__details__segment_type',
+            'lines__segment_combination__details__segment',
+        ),
+        pk=pk
+    )
     
     try:
         
@@ -325,17 +343,17 @@ def journal_entry_detail(request, pk):
             'currency_name': entry.currency.name,
             'memo': entry.memo,
             'posted': entry.posted,
-            'is_balanced': entry.is_balanced(),
-            'total_debit': str(entry.get_total_debit()),
-            'total_credit': str(entry.get_total_credit()),
-            'balance_difference': str(entry.get_balance_difference()),
+            **journal_entry_totals(entry),
             'lines': [
                 {
                     'id': line.id,
                     'amount': str(line.amount),
                     'type': line.type,
                     'segment_combination_id': line.segment_combination.id,
-                    'segments': line.segment_combination.get_combination_display(),
+                    'segments': {
+                        detail.segment_type.segment_name: detail.segment.code
+                        for detail in line.segment_combination.details.all()
+                    },
                     'segment_details': [
                         {
                             'segment_type_id': detail.segment_type.id,
@@ -373,6 +391,7 @@ def journal_entry_list(request):
     - currency_id: Filter by currency
     - date_from: Filter entries from this date (YYYY-MM-DD)
     - date_to: Filter entries to this date (YYYY-MM-DD)
+    - is_balanced: Filter by stored debit/credit totals matching (true/false)
     
     Segment Filters (3 modes):
     
@@ -511,8 +530,14 @@ def journal_entry_list(request):
         # Order and Return Results
         # ====================================================================
         
+        if 'is_balanced' in request.query_params:
+            if request.query_params['is_balanced'].lower() == 'true':
+                queryset = queryset.filter(total_debit=F('total_credit'))
+            else:
+                queryset = queryset.exclude(total_debit=F('total_credit'))
+        
         # Order by date descending
-        queryset = queryset.order_by('-date', '-id')
+        queryset = queryset.select_related('currency').order_by('-date', '-id')
         
         entries = [
             {
@@ -521,10 +546,7 @@ def journal_entry_list(request):
                 'currency_code': entry.currency.code,
                 'memo': entry.memo,
                 'posted': entry.posted,
-                'is_balanced': entry.is_balanced(),
-                'total_debit': str(entry.get_total_debit()),
-                'total_credit': str(entry.get_total_credit()),
-                'line_count': entry.lines.count()
+                **journal_entry_totals(entry)
             }
             for entry in queryset
         ]
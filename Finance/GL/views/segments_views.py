@@ -16,6 +16,7 @@ from Finance.GL.serializers import (
     SegmentTypeListSerializer,
     SegmentSerializer,
     SegmentListSerializer,
+    SegmentUsageSerializer,
     UsageDetailsSerializer,
     SegmentChildrenSerializer,
     FullPathSerializer,
@@ -154,7 +155,7 @@ def segment_type_can_delete(request, pk):
         is_used, usage_details = segment_type.is_used_in_transactions()
         if is_used:
             reason = "Segment type is used in transactions: " + "; ".join(usage_details)
-        elif segment_type.values.exists():
+        else:
             reason = f"Segment type has {segment_type.values.count()} segment value(s)"
     
     return Response({
@@ -216,6 +217,48 @@ def segment_type_values(request, pk):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+def segment_type_values_usage(request, pk):
+    """
+    Usage and deletability of every value of a segment type in one response.
+    
+    GET /segment-types/{id}/values/usage/
+    
+    Query params:
+        - is_used: Only used (true) or unused (false) values
+    
+    Returns:
+        {
+            "id": 1,
+            "segment_name": "Entity",
+            "journal_line_count": 12,
+            "can_delete": false,
+            "values": [{"id", "code", "journal_line_count", "is_used", "has_children", "can_delete", ...}]
+        }
+    
+    Reads the maintained usage counters: a constant number of queries however
+    many values the type has.
+    """
+    segment_type = get_object_or_404(XX_SegmentType, pk=pk)
+    segments = segment_type.values.with_usage().order_by('code')
+    
+    is_used = request.query_params.get('is_used')
+    if is_used is not None:
+        if is_used.lower() == 'true':
+            segments = segments.filter(journal_line_count__gt=0)
+        else:
+            segments = segments.filter(journal_line_count=0)
+    
+    values = SegmentUsageSerializer(segments, many=True).data
+    return Response({
+        'id': segment_type.id,
+        'segment_name': segment_type.segment_name,
+        'journal_line_count': segment_type.journal_line_count,
+        'can_delete': segment_type.can_delete,
+        'values': values,
+    }, status=status.HTTP_200_OK)
+
+
 # ============================================================================
 # XX_Segment API Views
 # ============================================================================
@@ -398,7 +441,7 @@ def segment_can_delete(request, pk):
             "reason": "explanation if cannot delete"
         }
     """
-    segment = get_object_or_404(XX_Segment, pk=pk)
+    segment = get_object_or_404(XX_Segment.objects.with_usage(), pk=pk)
     can_delete = segment.can_delete
     
     reason = None
@@ -411,8 +454,7 @@ def segment_can_delete(request, pk):
                 segment_type=segment.segment_type,
                 parent_code=segment.code
             ).count()
-            if children_count > 0:
-                reason = f"Segment has {children_count} child segment(s)"
+            reason = f"Segment has {children_count} child segment(s)"
     
     return Response({
         'can_delete': can_delete,
@@ -5,3 +5,6 @@ class InvoiceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Finance.Invoice'
     label = 'finance_invoice'  # Unique label for this app
+
+    def ready(self):
+        import Finance.Invoice.signals  # noqa: F401
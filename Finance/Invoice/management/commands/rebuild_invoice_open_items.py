@@ -0,0 +1,51 @@
+"""
+Django management command to rebuild the invoice open-items snapshot.
+
+InvoiceOpenItem (the AR/AP aging snapshot) is kept current on every invoice
+save and payment allocation. Run this command once after migrating, and
+after raw SQL or data fixes that bypass the ORM.
+
+This command will:
+1. Delete the snapshot rows (all, or those of the given invoices)
+2. Re-create them from approved invoices and their payment allocations
+
+Usage:
+    python manage.py rebuild_invoice_open_items
+    python manage.py rebuild_invoice_open_items --invoice-id 42 --invoice-id 43
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Finance.Invoice.models import InvoiceOpenItem
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the invoice open-items snapshot used by the AR/AP aging report'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--invoice-id',
+            type=int,
+            action='append',
+            help='Rebuild only these invoices (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        invoice_ids = options.get('invoice_id')
+
+        with transaction.atomic():
+            if invoice_ids:
+                written = InvoiceOpenItem.objects.sync(invoice_ids)
+            else:
+                written = InvoiceOpenItem.objects.rebuild()
+
+        open_count = InvoiceOpenItem.objects.filter(closed_date__isnull=True).count()
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write('OPEN ITEMS REBUILD SUMMARY')
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'Snapshot rows written: {written}')
+        self.stdout.write(f'Open items:            {open_count}')
+        self.stdout.write('=' * 60)
+        self.stdout.write(self.style.SUCCESS('✓ Open-items snapshot rebuilt'))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance_businesspartner', '0001_initial'),
+        ('finance_core', '0004_alter_country_code'),
+        ('finance_invoice', '0008_alter_invoice_invoice_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceOpenItem',
+            fields=[
+                ('invoice', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='open_item', serialize=False, to='finance_invoice.invoice')),
+                ('invoice_type', models.CharField(choices=[('AR', 'Accounts Receivable'), ('AP', 'Accounts Payable')], max_length=2)),
+                ('invoice_date', models.DateField()),
+                ('due_date', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('open_amount', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('closed_date', models.DateField(blank=True, help_text='Date of the payment that settled the invoice (NULL while open)', null=True)),
+                ('business_partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='open_items', to='finance_businesspartner.businesspartner')),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='open_items', to='finance_core.currency')),
+            ],
+            options={
+                'verbose_name': 'Invoice Open Item',
+                'verbose_name_plural': 'Invoice Open Items',
+                'db_table': 'invoice_open_item',
+                'indexes': [models.Index(condition=models.Q(('closed_date__isnull', True)), fields=['invoice_type', 'business_partner', 'currency', 'due_date', 'open_amount'], name='open_item_open_idx'), models.Index(fields=['invoice_type', 'business_partner', 'currency', 'invoice_date', 'closed_date', 'due_date', 'total'], name='open_item_history_idx')],
+            },
+        ),
+    ]
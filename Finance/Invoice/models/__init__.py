@@ -7,6 +7,7 @@ This package contains all Invoice-related models organized into separate modules
 - ap_model.py: AP_Invoice (Accounts Payable)
 - ar_model.py: AR_Invoice (Accounts Receivable)
 - one_time_model.py: OneTimeSupplier (ad-hoc suppliers)
+- open_item_model.py: InvoiceOpenItem (open-items snapshot for aging)
 
 All models are re-exported here for backward compatibility and convenience.
 """
@@ -39,6 +40,11 @@ from .one_time_model import (
     OneTimeSupplierManager,
 )
 
+from .open_item_model import (
+    InvoiceOpenItem,
+    InvoiceOpenItemManager,
+)
+
 # Explicit exports for clarity
 __all__ = [
     # Mixins
@@ -60,4 +66,8 @@ __all__ = [
     # One-time supplier models
     'OneTimeSupplier',
     'OneTimeSupplierManager',
+    
+    # Aging snapshot
+    'InvoiceOpenItem',
+    'InvoiceOpenItemManager',
 ]
@@ -28,6 +28,15 @@ class InvoiceChildManagerMixin(ChildModelManagerMixin):
                 kwargs['business_partner'] = source_obj.business_partner
         return super().create(**kwargs)
 
+    def bulk_create_with_parents(self, rows, batch_size=None):
+        """Auto-set business_partner_id from the source field on every row"""
+        if self.bp_source_field:
+            for row in rows:
+                if self.bp_source_field in row and 'business_partner' not in row \
+                        and 'business_partner_id' not in row:
+                    row['business_partner_id'] = row[self.bp_source_field].business_partner_id
+        return super().bulk_create_with_parents(rows, batch_size=batch_size)
+
 
 class InvoiceChildModelMixin(ChildModelMixin):
     """
@@ -0,0 +1,184 @@
+"""
+Invoice Open Item Model
+
+Snapshot of every approved invoice's open balance, used by the AR/AP aging
+report. Aging from Invoice + PaymentAllocation on every request would scan
+the full invoice history; the snapshot keeps one narrow, indexed row per
+approved invoice instead.
+
+The snapshot is kept current by:
+- Finance.Invoice.signals: invoice (or child invoice) saved / deleted
+- apply_invoice_paid_changes(): set-based payment allocation writes
+
+Any other queryset-level write to Invoice must call
+InvoiceOpenItem.objects.sync(invoice_ids) itself.
+"""
+
+from django.db import models
+from django.db.models import Exists, Max, OuterRef
+
+from Finance.core.models import Currency
+from Finance.BusinessPartner.models import BusinessPartner
+from .parent_model import Invoice
+from .ar_model import AR_Invoice
+
+
+class InvoiceOpenItemManager(models.Manager):
+    """Keeps the open-items snapshot in step with Invoice"""
+
+    BATCH_SIZE = 2000
+
+    def sync(self, invoice_ids):
+        """
+        Rebuild the snapshot rows of the given invoices (set-based).
+
+        Approved invoices with a total are upserted; all other invoices are
+        removed from the snapshot.
+
+        Args:
+            invoice_ids: Iterable of Invoice ids
+
+        Returns:
+            int: Number of snapshot rows written
+        """
+        invoice_ids = sorted(set(invoice_ids))
+        written = 0
+        for start in range(0, len(invoice_ids), self.BATCH_SIZE):
+            batch = invoice_ids[start:start + self.BATCH_SIZE]
+            items = list(self._build_items(Invoice.objects.filter(pk__in=batch)))
+            self.filter(invoice_id__in=batch).exclude(
+                invoice_id__in=[item.invoice_id for item in items]
+            ).delete()
+            written += self._upsert(items)
+        return written
+
+    def rebuild(self):
+        """
+        Rebuild the whole snapshot from Invoice.
+
+        Returns:
+            int: Number of snapshot rows written
+        """
+        self.all().delete()
+        written = 0
+        pending = []
+        for item in self._build_items(Invoice.objects.all(), iterator=True):
+            pending.append(item)
+            if len(pending) >= self.BATCH_SIZE:
+                written += self._upsert(pending)
+                pending = []
+        return written + self._upsert(pending)
+
+    def _build_items(self, invoices, iterator=False):
+        rows = invoices.filter(
+            approval_status=Invoice.APPROVED,
+            total__isnull=False,
+        ).annotate(
+            is_receivable=Exists(AR_Invoice.objects.filter(invoice_id=OuterRef('pk'))),
+            last_payment_date=Max('payment_allocations__payment__date'),
+        ).order_by().values_list(
+            'pk', 'is_receivable', 'business_partner_id', 'currency_id', 'date',
+            'total', 'paid_amount', 'last_payment_date'
+        )
+        if iterator:
+            rows = rows.iterator(chunk_size=self.BATCH_SIZE)
+
+        for pk, is_receivable, business_partner_id, currency_id, invoice_date, total, paid_amount, \
+                last_payment_date in rows:
+            yield self.model(
+                invoice_id=pk,
+                invoice_type=InvoiceOpenItem.AR if is_receivable else InvoiceOpenItem.AP,
+                business_partner_id=business_partner_id,
+                currency_id=currency_id,
+                invoice_date=invoice_date,
+                # Invoices carry no payment terms: they fall due on their date
+                due_date=invoice_date,
+                total=total,
+                paid_amount=paid_amount,
+                open_amount=total - paid_amount,
+                closed_date=(last_payment_date or invoice_date) if paid_amount >= total else None,
+            )
+
+    def _upsert(self, items):
+        if not items:
+            return 0
+        self.bulk_create(
+            items,
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['invoice'],
+            update_fields=[
+                'invoice_type', 'business_partner', 'currency', 'invoice_date', 'due_date',
+                'total', 'paid_amount', 'open_amount', 'closed_date',
+            ],
+        )
+        return len(items)
+
+
+class InvoiceOpenItem(models.Model):
+    """
+    Open balance of one approved invoice.
+
+    closed_date is the date of the payment that settled the invoice, so the
+    rows that were open on any earlier date can still be found for
+    point-in-time ("as of") aging.
+    """
+    AR = 'AR'
+    AP = 'AP'
+    INVOICE_TYPES = [
+        (AR, 'Accounts Receivable'),
+        (AP, 'Accounts Payable'),
+    ]
+
+    invoice = models.OneToOneField(
+        Invoice,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='open_item'
+    )
+    invoice_type = models.CharField(max_length=2, choices=INVOICE_TYPES)
+    business_partner = models.ForeignKey(
+        BusinessPartner,
+        on_delete=models.CASCADE,
+        related_name='open_items'
+    )
+    currency = models.ForeignKey(
+        Currency,
+        on_delete=models.PROTECT,
+        related_name='open_items'
+    )
+    invoice_date = models.DateField()
+    due_date = models.DateField()
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    open_amount = models.DecimalField(max_digits=14, decimal_places=2)
+    closed_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Date of the payment that settled the invoice (NULL while open)"
+    )
+
+    objects = InvoiceOpenItemManager()
+
+    class Meta:
+        db_table = 'invoice_open_item'
+        verbose_name = 'Invoice Open Item'
+        verbose_name_plural = 'Invoice Open Items'
+        # Both indexes cover their aging query and are ordered by its GROUP BY
+        indexes = [
+            # Current aging: open rows only
+            models.Index(
+                fields=['invoice_type', 'business_partner', 'currency', 'due_date', 'open_amount'],
+                condition=models.Q(closed_date__isnull=True),
+                name='open_item_open_idx',
+            ),
+            # Point-in-time aging: rows open on a past date
+            models.Index(
+                fields=['invoice_type', 'business_partner', 'currency', 'invoice_date', 'closed_date',
+                        'due_date', 'total'],
+                name='open_item_history_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.invoice_type} invoice {self.invoice_id}: {self.open_amount} open"
@@ -29,6 +29,36 @@ from Finance.Invoice.services import (
 from Finance.GL.models import JournalEntry, JournalLine
 
 
+# ==================== HELPERS ====================
+
+
+def check_period_open(serializer, validator, value):
+    """
+    Run a PeriodValidator check for a date, raising a serializer error if closed.
+
+    When the serializer context holds a 'period_checks' dict (bulk requests share
+    one context across all invoices), each (validator, date) result is cached
+    there so a batch runs one period query per distinct date.
+    """
+    from django.core.exceptions import ValidationError as DjangoValidationError
+
+    cache = serializer.context.get("period_checks")
+    key = (validator.__name__, value)
+    if cache is not None and key in cache:
+        error = cache[key]
+    else:
+        try:
+            validator(value)
+            error = None
+        except DjangoValidationError as e:
+            error = str(e)
+        if cache is not None:
+            cache[key] = error
+
+    if error:
+        raise serializers.ValidationError(error)
+
+
 # ==================== NESTED SERIALIZERS ====================
 
 
@@ -252,17 +282,17 @@ class APInvoiceCreateSerializer(serializers.Serializer):
     def validate_date(self, value):
         """Validate that AP period is open for this invoice date."""
         from Finance.period.validators import PeriodValidator
-        from django.core.exceptions import ValidationError as DjangoValidationError
-        
-        try:
-            PeriodValidator.validate_ap_period_open(value)
-        except DjangoValidationError as e:
-            raise serializers.ValidationError(str(e))
-        
+
+        check_period_open(self, PeriodValidator.validate_ap_period_open, value)
         return value
 
     def create(self, validated_data):
         """Create AP Invoice using service layer"""
+        return InvoiceService.create_ap_invoice(self.to_dto())
+
+    def to_dto(self) -> APInvoiceDTO:
+        """Convert validated data to DTO (also used by the bulk endpoint)"""
+        validated_data = self.validated_data
         # Convert nested items to DTOs
         items = [InvoiceItemDTO(**item) for item in validated_data["items"]]
 
@@ -284,7 +314,7 @@ class APInvoiceCreateSerializer(serializers.Serializer):
         )
 
         # Convert to DTO
-        dto = APInvoiceDTO(
+        return APInvoiceDTO(
             invoice_number=validated_data["invoice_number"],
             date=validated_data["date"],
             currency_id=validated_data["currency_id"],
@@ -299,9 +329,6 @@ class APInvoiceCreateSerializer(serializers.Serializer):
             journal_entry=journal_entry,
         )
 
-        # Call service
-        return InvoiceService.create_ap_invoice(dto)
-
 
 class APInvoiceListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing AP invoices"""
@@ -723,17 +750,17 @@ class ARInvoiceCreateSerializer(serializers.Serializer):
     def validate_date(self, value):
         """Validate that AR period is open for this invoice date."""
         from Finance.period.validators import PeriodValidator
-        from django.core.exceptions import ValidationError as DjangoValidationError
-        
-        try:
-            PeriodValidator.validate_ar_period_open(value)
-        except DjangoValidationError as e:
-            raise serializers.ValidationError(str(e))
-        
+
+        check_period_open(self, PeriodValidator.validate_ar_period_open, value)
         return value
 
     def create(self, validated_data):
         """Create AR Invoice using service layer"""
+        return InvoiceService.create_ar_invoice(self.to_dto())
+
+    def to_dto(self) -> ARInvoiceDTO:
+        """Convert validated data to DTO (also used by the bulk endpoint)"""
+        validated_data = self.validated_data
         # Convert nested items to DTOs
         items = [InvoiceItemDTO(**item) for item in validated_data["items"]]
 
@@ -755,7 +782,7 @@ class ARInvoiceCreateSerializer(serializers.Serializer):
         )
 
         # Convert to DTO
-        dto = ARInvoiceDTO(
+        return ARInvoiceDTO(
             invoice_number=validated_data["invoice_number"],
             date=validated_data["date"],
             currency_id=validated_data["currency_id"],
@@ -770,8 +797,6 @@ class ARInvoiceCreateSerializer(serializers.Serializer):
             journal_entry=journal_entry,
         )
 
-        return InvoiceService.create_ar_invoice(dto)
-
 
 class ARInvoiceListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing AR invoices"""
@@ -981,6 +1006,11 @@ class OneTimeSupplierCreateSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         """Create one-time supplier invoice using service layer"""
+        return InvoiceService.create_one_time_supplier_invoice(self.to_dto())
+
+    def to_dto(self) -> OneTimeSupplierDTO:
+        """Convert validated data to DTO (also used by the bulk endpoint)"""
+        validated_data = self.validated_data
         # Convert nested items to DTOs
         items = [InvoiceItemDTO(**item) for item in validated_data["items"]]
 
@@ -1002,7 +1032,7 @@ class OneTimeSupplierCreateSerializer(serializers.Serializer):
         )
 
         # Convert to DTO
-        dto = OneTimeSupplierDTO(
+        return OneTimeSupplierDTO(
             invoice_number=validated_data["invoice_number"],
             date=validated_data["date"],
             currency_id=validated_data["currency_id"],
@@ -1021,8 +1051,6 @@ class OneTimeSupplierCreateSerializer(serializers.Serializer):
             journal_entry=journal_entry,
         )
 
-        return InvoiceService.create_one_time_supplier_invoice(dto)
-
 
 class OneTimeSupplierListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing one-time supplier invoices"""
@@ -7,6 +7,8 @@ This service layer handles the complexity of creating invoices with:
 3. Segment Combinations
 4. Automatic GL posting
 
+and serves the AR/AP aging report from the open-items snapshot.
+
 WHY USE A SERVICE LAYER?
 ========================
 1. **Separation of Concerns**: Business logic separate from API layer
@@ -22,20 +24,27 @@ Architecture:
 """
 
 from django.db import transaction
+from django.db.models import (
+    F, Q, Case, When, Value, Sum, Count, DecimalField, Exists, ExpressionWrapper, OuterRef, Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_date
 from decimal import Decimal
 from dataclasses import dataclass, field
 from typing import List, Optional
-from datetime import date
+from datetime import date, timedelta
 
-from Finance.Invoice.models import Invoice, InvoiceItem, AP_Invoice, AR_Invoice, OneTimeSupplier
+from Finance.Invoice.models import (
+    Invoice, InvoiceItem, AP_Invoice, AR_Invoice, OneTimeSupplier, InvoiceOpenItem,
+)
 from Finance.GL.models import (
     JournalEntry, JournalLine, 
     XX_Segment_combination, segment_combination_detials,
     XX_SegmentType, XX_Segment
 )
 from Finance.core.models import Currency, Country
-from Finance.BusinessPartner.models import Supplier, Customer
+from Finance.BusinessPartner.models import BusinessPartner, Supplier, Customer
 
 
 # ==================== DTOs (Data Transfer Objects) ====================
@@ -121,6 +130,17 @@ class OneTimeSupplierDTO(InvoiceBaseDTO):
     supplier_tax_id: Optional[str] = ""
 
 
+@dataclass
+class BulkInvoiceResult:
+    """Outcome of a bulk create - both dicts are keyed by position in the input list"""
+    created: dict = field(default_factory=dict)  # {index: AP_Invoice / AR_Invoice / OneTimeSupplier}
+    errors: dict = field(default_factory=dict)   # {index: error message}
+
+
+# Rows per INSERT statement for bulk creates
+BULK_BATCH_SIZE = 500
+
+
 # ==================== SERVICE LAYER ====================
 
 class InvoiceService:
@@ -388,6 +408,124 @@ class InvoiceService:
         
         return ap_invoice
     
+    # ==================== BULK OPERATIONS ====================
+    
+    @staticmethod
+    @transaction.atomic
+    def create_invoices_bulk(dtos: List[InvoiceBaseDTO], batch_size: int = BULK_BATCH_SIZE) -> BulkInvoiceResult:
+        """
+        Create many invoices (AP, AR and/or one-time supplier) in one pass.
+        
+        The single-invoice methods run a query per lookup and an INSERT per row.
+        The batch instead:
+        1. Loads currencies, countries, partners, segments and already used
+           invoice numbers with one query per table
+        2. Validates every invoice in memory (totals, journal balance, segments).
+           Invalid invoices are reported per index, the rest are still created
+        3. Resolves all segment combinations at once, creating missing ones in bulk
+        4. Bulk inserts journal entries, journal lines, invoices, child rows and
+           items in batches of batch_size
+        5. Adds the approved invoices to the open-items snapshot (bulk_create
+           sends no signals)
+        
+        Note: new one-time suppliers (OneTimeSupplierDTO without
+        one_time_supplier_id) are still created one at a time.
+        
+        Args:
+            dtos: List of APInvoiceDTO / ARInvoiceDTO / OneTimeSupplierDTO
+            batch_size: Rows per INSERT statement
+            
+        Returns:
+            BulkInvoiceResult with created invoices and per-invoice errors
+            
+        Example:
+            result = InvoiceService.create_invoices_bulk([ap_dto_1, ap_dto_2, ar_dto])
+            for index, message in result.errors.items():
+                print(f"Invoice #{index} rejected: {message}")
+        """
+        result = BulkInvoiceResult()
+        if not dtos:
+            return result
+        
+        # 1. Load everything the batch references
+        lookups = InvoiceService._load_bulk_lookups(dtos)
+        
+        # 2. Validate in memory
+        prepared = []
+        seen_numbers = set()
+        for index, dto in enumerate(dtos):
+            try:
+                row = InvoiceService._prepare_bulk_invoice(dto, lookups, seen_numbers)
+            except ValidationError as e:
+                result.errors[index] = '; '.join(e.messages)
+                continue
+            row['index'] = index
+            prepared.append(row)
+        
+        if not prepared:
+            return result
+        
+        # 3. Segment combinations
+        combination_ids = InvoiceService._resolve_segment_combinations_bulk(
+            {key for row in prepared for key in row['combination_keys']},
+            batch_size
+        )
+        
+        # 4. Journal entries and lines
+        journal_entries = JournalEntry.objects.bulk_create([
+            JournalEntry(
+                date=row['dto'].journal_entry.date,
+                currency=row['currency'],
+                memo=row['dto'].journal_entry.memo,
+                posted=False
+            )
+            for row in prepared
+        ], batch_size=batch_size)
+        
+        JournalLine.objects.bulk_create([
+            JournalLine(
+                entry=journal_entry,
+                amount=line_dto.amount,
+                type=line_dto.type,
+                segment_combination_id=combination_ids[key]
+            )
+            for row, journal_entry in zip(prepared, journal_entries)
+            for line_dto, key in zip(row['dto'].journal_entry.lines, row['combination_keys'])
+        ], batch_size=batch_size)
+        
+        # 5. Invoices - each child manager bulk creates its Invoice parents
+        rows_by_model = {}
+        for row, journal_entry in zip(prepared, journal_entries):
+            row['journal_entry'] = journal_entry
+            rows_by_model.setdefault(row['child_model'], []).append(row)
+        
+        for child_model, rows in rows_by_model.items():
+            children = child_model.objects.bulk_create_with_parents(
+                [InvoiceService._bulk_invoice_fields(row) for row in rows],
+                batch_size=batch_size
+            )
+            for row, child in zip(rows, children):
+                row['invoice_id'] = child.invoice_id
+                result.created[row['index']] = child
+        
+        # 6. Invoice items
+        InvoiceItem.objects.bulk_create([
+            InvoiceItem(
+                invoice_id=row['invoice_id'],
+                name=item_dto.name,
+                description=item_dto.description,
+                quantity=item_dto.quantity,
+                unit_price=item_dto.unit_price
+            )
+            for row in prepared
+            for item_dto in row['dto'].items
+        ], batch_size=batch_size)
+        
+        # 7. Open-items snapshot (aging, statements) for approved invoices
+        InvoiceOpenItem.objects.sync(row['invoice_id'] for row in prepared)
+        
+        return result
+    
     # ==================== HELPER METHODS ====================
     
     @staticmethod
@@ -523,8 +661,19 @@ class InvoiceService:
         Validate that journal entry debits = credits.
         Also validates that journal total matches invoice total.
         """
-        lines = journal_entry.lines.all()
+        InvoiceService._validate_line_balance(journal_entry.lines.all())
         
+        # Check against invoice total (optional - depends on your business rules)
+        # For AP invoices, credits should typically equal invoice total
+        # For AR invoices, debits should typically equal invoice total
+        # This can be customized based on your specific requirements
+    
+    @staticmethod
+    def _validate_line_balance(lines):
+        """
+        Validate that debits = credits for journal lines.
+        Works on JournalLine instances and JournalLineDTOs alike.
+        """
         total_debits = sum(
             line.amount for line in lines if line.type == 'DEBIT'
         )
@@ -532,16 +681,221 @@ class InvoiceService:
             line.amount for line in lines if line.type == 'CREDIT'
         )
         
-        # Check balance
         if abs(total_debits - total_credits) > Decimal('0.01'):
             raise ValidationError(
                 f"Journal entry is not balanced. Debits: {total_debits}, Credits: {total_credits}"
             )
+    
+    @staticmethod
+    def _load_bulk_lookups(dtos: List[InvoiceBaseDTO]) -> dict:
+        """Load every master record a batch references - one query per table"""
+        from Finance.BusinessPartner.models import OneTime
         
-        # Check against invoice total (optional - depends on your business rules)
-        # For AP invoices, credits should typically equal invoice total
-        # For AR invoices, debits should typically equal invoice total
-        # This can be customized based on your specific requirements
+        def referenced_ids(attr):
+            return {getattr(dto, attr, None) for dto in dtos} - {None}
+        
+        segment_pairs = {
+            (seg.segment_type_id, str(seg.segment_code))
+            for dto in dtos if dto.journal_entry
+            for line in dto.journal_entry.lines
+            for seg in line.segments
+        }
+        segments = {}
+        if segment_pairs:
+            candidates = XX_Segment.objects.filter(
+                segment_type_id__in={type_id for type_id, _ in segment_pairs},
+                code__in={code for _, code in segment_pairs}
+            ).values_list('segment_type_id', 'code', 'id')
+            segments = {
+                (type_id, code): segment_id
+                for type_id, code, segment_id in candidates
+                if (type_id, code) in segment_pairs
+            }
+        
+        return {
+            'currencies': Currency.objects.in_bulk(referenced_ids('currency_id')),
+            'countries': Country.objects.in_bulk(referenced_ids('country_id')),
+            'partners': {
+                'supplier': Supplier.objects.in_bulk(referenced_ids('supplier_id')),
+                'customer': Customer.objects.in_bulk(referenced_ids('customer_id')),
+                'one_time_supplier': OneTime.objects.in_bulk(referenced_ids('one_time_supplier_id')),
+            },
+            'segments': segments,
+            'used_numbers': set(
+                Invoice.objects.filter(
+                    invoice_number__in={dto.invoice_number for dto in dtos}
+                ).values_list('invoice_number', flat=True)
+            ),
+        }
+    
+    @staticmethod
+    def _prepare_bulk_invoice(dto: InvoiceBaseDTO, lookups: dict, seen_numbers: set) -> dict:
+        """
+        Validate one invoice of a batch against pre-loaded lookups.
+        
+        Returns:
+            dict: Resolved objects and totals used by the bulk inserts
+            
+        Raises:
+            ValidationError: If the invoice is invalid
+        """
+        if type(dto) not in BULK_INVOICE_TYPES:
+            raise ValidationError(f"Unsupported invoice type {type(dto).__name__}")
+        child_model, partner_field, partner_label = BULK_INVOICE_TYPES[type(dto)]
+        
+        if dto.invoice_number in lookups['used_numbers']:
+            raise ValidationError(f"Invoice number '{dto.invoice_number}' already exists")
+        if dto.invoice_number in seen_numbers:
+            raise ValidationError(f"Invoice number '{dto.invoice_number}' is duplicated in this batch")
+        
+        currency = lookups['currencies'].get(dto.currency_id)
+        if currency is None:
+            raise ValidationError(f"Currency with ID {dto.currency_id} not found")
+        
+        country = None
+        if dto.country_id:
+            country = lookups['countries'].get(dto.country_id)
+            if country is None:
+                raise ValidationError(f"Country with ID {dto.country_id} not found")
+        
+        subtotal, total = InvoiceService._calculate_totals(
+            dto.items, dto.subtotal, dto.tax_amount, dto.total
+        )
+        
+        if not dto.journal_entry:
+            raise ValidationError("Journal entry is required")
+        InvoiceService._validate_line_balance(dto.journal_entry.lines)
+        
+        combination_keys = [
+            InvoiceService._segment_combination_key(line_dto.segments, lookups['segments'])
+            for line_dto in dto.journal_entry.lines
+        ]
+        
+        # Partner last - a new one-time supplier is only created for valid invoices
+        if partner_field == 'one_time_supplier' and not dto.one_time_supplier_id:
+            from Finance.BusinessPartner.models import OneTime
+            if not dto.supplier_name:
+                raise ValidationError("supplier_name is required when creating a new one-time supplier")
+            partner = OneTime.objects.create(
+                name=dto.supplier_name,
+                email=dto.supplier_email or "",
+                phone=dto.supplier_phone or "",
+                tax_id=dto.supplier_tax_id or ""
+            )
+        else:
+            partner_id = getattr(dto, f'{partner_field}_id')
+            partner = lookups['partners'][partner_field].get(partner_id)
+            if partner is None:
+                raise ValidationError(f"{partner_label} with ID {partner_id} not found")
+        
+        seen_numbers.add(dto.invoice_number)
+        
+        return {
+            'dto': dto,
+            'child_model': child_model,
+            'partner_field': partner_field,
+            'partner': partner,
+            'currency': currency,
+            'country': country,
+            'subtotal': subtotal,
+            'total': total,
+            'combination_keys': combination_keys,
+        }
+    
+    @staticmethod
+    def _segment_combination_key(segments: List[SegmentDTO], segment_ids: dict) -> tuple:
+        """
+        Build the lookup key of a segment combination:
+        sorted ((segment_type_id, segment_id), ...) tuple.
+        """
+        pairs = []
+        used_types = set()
+        for seg_dto in segments:
+            segment_id = segment_ids.get((seg_dto.segment_type_id, str(seg_dto.segment_code)))
+            if segment_id is None:
+                raise ValidationError(
+                    f"Segment '{seg_dto.segment_code}' not found for segment type ID {seg_dto.segment_type_id}"
+                )
+            if seg_dto.segment_type_id in used_types:
+                raise ValidationError(
+                    f"Duplicate segment type ID {seg_dto.segment_type_id} in combination. "
+                    "Each segment type must appear only once."
+                )
+            used_types.add(seg_dto.segment_type_id)
+            pairs.append((seg_dto.segment_type_id, segment_id))
+        return tuple(sorted(pairs))
+    
+    @staticmethod
+    def _resolve_segment_combinations_bulk(keys: set, batch_size: int = BULK_BATCH_SIZE) -> dict:
+        """
+        Map combination keys (see _segment_combination_key) to combination IDs.
+        
+        Existing combinations are matched with one query; missing ones are
+        bulk created together with their details.
+        
+        Returns:
+            dict: {combination key: XX_Segment_combination id}
+        """
+        if not keys:
+            return {}
+        
+        segment_ids = {segment_id for key in keys for _, segment_id in key}
+        candidate_ids = segment_combination_detials.objects.filter(
+            segment_id__in=segment_ids
+        ).values('segment_combination_id')
+        
+        details_by_combination = {}
+        details = segment_combination_detials.objects.filter(
+            segment_combination_id__in=candidate_ids
+        ).order_by('segment_combination_id').values_list(
+            'segment_combination_id', 'segment_type_id', 'segment_id'
+        )
+        for combination_id, segment_type_id, segment_id in details:
+            details_by_combination.setdefault(combination_id, []).append((segment_type_id, segment_id))
+        
+        combination_ids = {}
+        for combination_id, pairs in details_by_combination.items():
+            key = tuple(sorted(pairs))
+            if key in keys and key not in combination_ids:
+                combination_ids[key] = combination_id
+        
+        missing = [key for key in keys if key not in combination_ids]
+        if missing:
+            combinations = XX_Segment_combination.objects.bulk_create(
+                [XX_Segment_combination() for _ in missing],
+                batch_size=batch_size
+            )
+            segment_combination_detials.objects.bulk_create([
+                segment_combination_detials(
+                    segment_combination=combination,
+                    segment_type_id=segment_type_id,
+                    segment_id=segment_id
+                )
+                for combination, key in zip(combinations, missing)
+                for segment_type_id, segment_id in key
+            ], batch_size=batch_size)
+            for combination, key in zip(combinations, missing):
+                combination_ids[key] = combination.id
+        
+        return combination_ids
+    
+    @staticmethod
+    def _bulk_invoice_fields(row: dict) -> dict:
+        """Build the child manager kwargs (parent + child fields) for a prepared row"""
+        dto = row['dto']
+        return {
+            'invoice_number': dto.invoice_number,
+            'date': dto.date,
+            'currency': row['currency'],
+            'country': row['country'],
+            'approval_status': dto.approval_status,
+            'payment_status': dto.payment_status,
+            'subtotal': row['subtotal'],
+            'tax_amount': dto.tax_amount or Decimal('0.00'),
+            'total': row['total'],
+            'gl_distributions': row['journal_entry'],
+            row['partner_field']: row['partner'],
+        }
     
     @staticmethod
     def _create_invoice_items(invoice: Invoice, items: List[InvoiceItemDTO]):
@@ -556,6 +910,452 @@ class InvoiceService:
             )
 
 
+# DTO type -> (child model, partner field, partner label) for bulk creates
+BULK_INVOICE_TYPES = {
+    APInvoiceDTO: (AP_Invoice, 'supplier', 'Supplier'),
+    ARInvoiceDTO: (AR_Invoice, 'customer', 'Customer'),
+    OneTimeSupplierDTO: (OneTimeSupplier, 'one_time_supplier', 'One-time supplier'),
+}
+
+
+# ==================== AGING REPORT ====================
+
+# Default aging buckets in days past due: current, 1-30, 31-60, 61-90, over 90
+DEFAULT_AGING_BUCKETS = (30, 60, 90)
+
+
+class AgingReportService:
+    """
+    AR / AP aging by business partner and currency.
+
+    Served from the open-items snapshot (InvoiceOpenItem), never from the
+    invoice history: one grouped query with one conditional SUM per bucket,
+    read from covering indexes and paginated in the database.
+
+    - Current aging (as_of today or later) sums open_amount of the open rows.
+    - Point-in-time aging (as_of in the past) sums the totals of the rows
+      open on that date (closed_date after as_of), then format_rows()
+      subtracts the allocations of payments dated on or before as_of for
+      the page's partners with one more grouped query.
+    """
+
+    @staticmethod
+    def bucket_labels(buckets):
+        """['current', '1-30', '31-60', ..., 'over_90'] for the given bucket limits"""
+        labels = ['current']
+        lower = 1
+        for upper in buckets:
+            labels.append(f'{lower}-{upper}')
+            lower = upper + 1
+        labels.append(f'over_{buckets[-1]}')
+        return labels
+
+    @staticmethod
+    def parse_buckets(value):
+        """
+        Parse '30,60,90' into (30, 60, 90).
+
+        Raises:
+            ValidationError: If the limits are not increasing positive integers
+        """
+        if not value:
+            return DEFAULT_AGING_BUCKETS
+        try:
+            buckets = tuple(int(part) for part in str(value).split(',') if part.strip())
+        except ValueError:
+            raise ValidationError("buckets must be a comma-separated list of days, e.g. '30,60,90'")
+        if not buckets or buckets[0] <= 0 or list(buckets) != sorted(set(buckets)):
+            raise ValidationError("buckets must be increasing positive day counts, e.g. '30,60,90'")
+        return buckets
+
+    @staticmethod
+    def is_point_in_time(as_of):
+        return as_of is not None and as_of < date.today()
+
+    @staticmethod
+    def _bucket_conditions(as_of, buckets, prefix=''):
+        """One due-date condition per bucket (days past due = as_of - due_date)"""
+        due_date = f'{prefix}due_date'
+        conditions = [Q(**{f'{due_date}__gte': as_of})]
+        newest = as_of - timedelta(days=1)
+        for upper in buckets:
+            oldest = as_of - timedelta(days=upper)
+            conditions.append(Q(**{f'{due_date}__gte': oldest, f'{due_date}__lte': newest}))
+            newest = oldest - timedelta(days=1)
+        conditions.append(Q(**{f'{due_date}__lte': newest}))
+        return conditions
+
+    @staticmethod
+    def _bucket_sums(conditions, amount):
+        amount_field = DecimalField(max_digits=16, decimal_places=2)
+        return {
+            f'bucket_{index}': Coalesce(
+                Sum(Case(When(condition, then=amount), default=Value(Decimal('0')), output_field=amount_field)),
+                Value(Decimal('0')), output_field=amount_field
+            )
+            for index, condition in enumerate(conditions)
+        }
+
+    @staticmethod
+    def aging_queryset(invoice_type, as_of=None, buckets=DEFAULT_AGING_BUCKETS,
+                       business_partner_id=None, currency_id=None):
+        """
+        Aging rows grouped by business partner and currency.
+
+        Args:
+            invoice_type: InvoiceOpenItem.AR or InvoiceOpenItem.AP
+            as_of: Aging date (default today)
+            buckets: Increasing day limits of the past-due buckets
+            business_partner_id: Optional partner filter
+            currency_id: Optional currency filter
+
+        Returns:
+            QuerySet of dicts with business_partner_id, business_partner_name,
+            currency_id, currency_code, item_count, total_open and one
+            bucket_<n> amount per bucket label (see bucket_labels()), ordered
+            by partner and currency id. For a past as_of the amounts are
+            before allocations - pass the rows through format_rows().
+        """
+        as_of = as_of or date.today()
+        items = InvoiceOpenItem.objects.filter(invoice_type=invoice_type, invoice_date__lte=as_of)
+        if business_partner_id:
+            items = items.filter(business_partner_id=business_partner_id)
+        if currency_id:
+            items = items.filter(currency_id=currency_id)
+
+        if AgingReportService.is_point_in_time(as_of):
+            items = items.filter(Q(closed_date__isnull=True) | Q(closed_date__gt=as_of))
+            amount = F('total')
+        else:
+            items = items.filter(closed_date__isnull=True)
+            amount = F('open_amount')
+
+        amount_field = DecimalField(max_digits=16, decimal_places=2)
+        return items.values(
+            'business_partner_id', 'currency_id',
+        ).annotate(
+            item_count=Count('invoice_id'),
+            total_open=Coalesce(Sum(amount, output_field=amount_field), Value(Decimal('0')),
+                                output_field=amount_field),
+            **AgingReportService._bucket_sums(AgingReportService._bucket_conditions(as_of, buckets), amount)
+        ).annotate(
+            # Per group, after aggregation
+            business_partner_name=Subquery(
+                BusinessPartner.objects.filter(pk=OuterRef('business_partner_id')).values('name')[:1]
+            ),
+            currency_code=Subquery(Currency.objects.filter(pk=OuterRef('currency_id')).values('code')[:1]),
+        ).order_by('business_partner_id', 'currency_id')
+
+    @staticmethod
+    def _allocated_by_as_of(rows, invoice_type, as_of, buckets):
+        """
+        {(business_partner_id, currency_id): {bucket_<n>: amount}} allocated on
+        or before as_of to the items of the given rows that were open on as_of.
+        """
+        from Finance.payments.models import Payment, PaymentAllocation
+
+        partner_ids = {row['business_partner_id'] for row in rows}
+        if not partner_ids:
+            return {}
+        allocations = PaymentAllocation.objects.exclude(
+            payment__approval_status=Payment.REJECTED
+        ).filter(
+            payment__date__lte=as_of,
+            invoice__open_item__invoice_type=invoice_type,
+            invoice__open_item__business_partner_id__in=partner_ids,
+            invoice__open_item__invoice_date__lte=as_of,
+        ).filter(
+            Q(invoice__open_item__closed_date__isnull=True) | Q(invoice__open_item__closed_date__gt=as_of)
+        ).values(
+            'invoice__open_item__business_partner_id', 'invoice__open_item__currency_id',
+        ).annotate(
+            **AgingReportService._bucket_sums(
+                AgingReportService._bucket_conditions(as_of, buckets, prefix='invoice__open_item__'),
+                F('amount_allocated')
+            )
+        ).order_by()
+        return {
+            (row.pop('invoice__open_item__business_partner_id'), row.pop('invoice__open_item__currency_id')): row
+            for row in allocations
+        }
+
+    @staticmethod
+    def _money(value):
+        # SQLite returns sums without their decimal places
+        return str(Decimal(value).quantize(Decimal('0.01')))
+
+    @staticmethod
+    def format_rows(rows, invoice_type, as_of=None, buckets=DEFAULT_AGING_BUCKETS):
+        """Turn a page of aging_queryset() rows into response dicts with labelled buckets"""
+        labels = AgingReportService.bucket_labels(buckets)
+        rows = list(rows)
+        allocated = {}
+        if AgingReportService.is_point_in_time(as_of):
+            allocated = AgingReportService._allocated_by_as_of(rows, invoice_type, as_of, buckets)
+
+        result = []
+        for row in rows:
+            paid = allocated.get((row['business_partner_id'], row['currency_id']), {})
+            amounts = [
+                row[f'bucket_{index}'] - paid.get(f'bucket_{index}', Decimal('0'))
+                for index in range(len(labels))
+            ]
+            result.append({
+                'business_partner_id': row['business_partner_id'],
+                'business_partner_name': row['business_partner_name'],
+                'currency_id': row['currency_id'],
+                'currency_code': row['currency_code'],
+                'item_count': row['item_count'],
+                'total_open': AgingReportService._money(sum(amounts, Decimal('0'))),
+                'buckets': {
+                    label: AgingReportService._money(amount) for label, amount in zip(labels, amounts)
+                },
+            })
+        return result
+
+
+
+# ==================== STATEMENT OF ACCOUNT ====================
+
+# Columns of a statement row, in order
+STATEMENT_FIELDS = (
+    'business_partner_id', 'business_partner_name', 'currency_id', 'currency_code', 'opening_balance',
+    'invoice_count', 'invoiced', 'allocated', 'unapplied', 'closing_balance',
+)
+
+class StatementOfAccountService:
+    """
+    Statement of account by business partner and currency over a period.
+
+    For each partner and currency:
+        closing_balance = opening_balance + invoiced - allocated - unapplied
+
+    - Invoices come from the open-items snapshot (approved invoices), on
+      their invoice date.
+    - Payments of the matching type (receipts for AR, payments for AP),
+      except rejected ones, count on their payment date: allocated is what
+      they applied to invoices, unapplied is the rest of their GL entry
+      total. Payments without a GL entry count for their allocations only.
+    - opening_balance is the same balance for everything dated before
+      date_from.
+
+    statement_queryset() computes all figures in one query: the invoice
+    figures are conditional SUMs over the open items grouped by partner and
+    currency, the payment figures correlated subqueries per group served by
+    the payment partner index. Partners with payments but no invoices get
+    their rows from the distinct partner and currency pairs of those
+    payments, joined with UNION ALL.
+    A page and a full download therefore cost one query each.
+    """
+
+    @staticmethod
+    def parse_period(date_from=None, date_to=None):
+        """
+        Parse the period bounds (YYYY-MM-DD strings).
+
+        date_to defaults to today and date_from to the first day of the
+        month of date_to.
+
+        Raises:
+            ValidationError: If a bound is not a date or date_from > date_to
+        """
+        bounds = {}
+        for name, value in (('date_from', date_from), ('date_to', date_to)):
+            bounds[name] = parse_date(value) if value else None
+            if value and bounds[name] is None:
+                raise ValidationError(f"{name} must be a date (YYYY-MM-DD)")
+        date_to = bounds['date_to'] or date.today()
+        date_from = bounds['date_from'] or date_to.replace(day=1)
+        if date_from > date_to:
+            raise ValidationError("date_from must be on or before date_to")
+        return date_from, date_to
+
+    @staticmethod
+    def _conditional_sum(condition, amount):
+        amount_field = DecimalField(max_digits=16, decimal_places=2)
+        return Coalesce(
+            Sum(Case(When(condition, then=amount), default=Value(Decimal('0')), output_field=amount_field)),
+            Value(Decimal('0')), output_field=amount_field
+        )
+
+    @staticmethod
+    def _payment_type(invoice_type):
+        from Finance.payments.models import Payment
+
+        return Payment.RECEIPT if invoice_type == InvoiceOpenItem.AR else Payment.PAYMENT
+
+    @staticmethod
+    def _payment_sums(invoice_type, date_from, date_to):
+        """
+        Correlated subqueries of the allocated and unapplied payment amounts
+        of the outer partner and currency: opening_* (before date_from) and
+        the period figures.
+        """
+        from Finance.payments.models import Payment, PaymentAllocation
+
+        amount_field = DecimalField(max_digits=16, decimal_places=2)
+        payment_type = StatementOfAccountService._payment_type(invoice_type)
+
+        def payment_filter(prefix, dates):
+            return Q(**{
+                f'{prefix}business_partner_id': OuterRef('business_partner_id'),
+                f'{prefix}currency_id': OuterRef('currency_id'),
+                f'{prefix}payment_type': payment_type,
+                **{f'{prefix}{lookup}': value for lookup, value in dates.items()},
+            }) & ~Q(**{f'{prefix}approval_status': Payment.REJECTED})
+
+        def subquery_sum(queryset, group, amount):
+            return Coalesce(
+                Subquery(queryset.order_by().values(group).annotate(amount=Sum(amount)).values('amount')[:1]),
+                Value(Decimal('0')), output_field=amount_field
+            )
+
+        sums = {}
+        for prefix, dates in (
+            ('opening_', {'date__lt': date_from}),
+            ('', {'date__gte': date_from, 'date__lte': date_to}),
+        ):
+            allocations = PaymentAllocation.objects.filter(payment_filter('payment__', dates))
+            sums[f'{prefix}allocated'] = subquery_sum(allocations, 'payment__business_partner_id', 'amount_allocated')
+            sums[f'{prefix}unapplied'] = ExpressionWrapper(
+                subquery_sum(
+                    Payment.objects.filter(payment_filter('', dates), gl_entry__isnull=False),
+                    'business_partner_id', 'gl_entry__total_credit'
+                ) - subquery_sum(
+                    allocations.filter(payment__gl_entry__isnull=False),
+                    'payment__business_partner_id', 'amount_allocated'
+                ),
+                output_field=amount_field
+            )
+        return sums
+
+    @staticmethod
+    def _filter_partners(queryset, business_partner_id=None, currency_id=None, search=None, is_active=None):
+        if business_partner_id:
+            queryset = queryset.filter(business_partner_id=business_partner_id)
+        if currency_id:
+            queryset = queryset.filter(currency_id=currency_id)
+        if search:
+            queryset = queryset.filter(business_partner__name__icontains=search)
+        if is_active is not None:
+            queryset = queryset.filter(business_partner__is_active=is_active)
+        return queryset
+
+    @staticmethod
+    def _with_balances(rows, has_balance):
+        """Add the balances and names to grouped rows, in STATEMENT_FIELDS order"""
+        amount_field = DecimalField(max_digits=16, decimal_places=2)
+        rows = rows.annotate(
+            opening_balance=ExpressionWrapper(
+                F('opening_invoiced') - F('opening_allocated') - F('opening_unapplied'), output_field=amount_field
+            ),
+        ).annotate(
+            closing_balance=ExpressionWrapper(
+                F('opening_balance') + F('invoiced') - F('allocated') - F('unapplied'), output_field=amount_field
+            ),
+            # Per group, after aggregation
+            business_partner_name=Subquery(
+                BusinessPartner.objects.filter(pk=OuterRef('business_partner_id')).values('name')[:1]
+            ),
+            currency_code=Subquery(Currency.objects.filter(pk=OuterRef('currency_id')).values('code')[:1]),
+        )
+        if has_balance:
+            rows = rows.exclude(closing_balance=0)
+        return rows.order_by().values(*STATEMENT_FIELDS)
+
+    @staticmethod
+    def statement_queryset(invoice_type, date_from, date_to, business_partner_id=None, currency_id=None,
+                           search=None, is_active=None, has_balance=False):
+        """
+        Statement rows by business partner and currency.
+
+        The rows are the union of two disjoint groupings: the partners and
+        currencies with approved invoices dated on or before date_to (open
+        items), and those with only payments up to date_to (prepayments,
+        credit balances), whose invoice figures are zero.
+
+        Args:
+            invoice_type: InvoiceOpenItem.AR or InvoiceOpenItem.AP
+            date_from: First day of the period
+            date_to: Last day of the period
+            business_partner_id: Optional partner filter
+            currency_id: Optional currency filter
+            search: Optional partner name filter (contains, case-insensitive)
+            is_active: Optional partner active status filter
+            has_balance: Only rows with a non-zero closing balance
+
+        Returns:
+            QuerySet of dicts with the STATEMENT_FIELDS keys, ordered by
+            partner and currency id.
+        """
+        from Finance.payments.models import Payment
+
+        partner_filters = dict(
+            business_partner_id=business_partner_id, currency_id=currency_id, search=search, is_active=is_active
+        )
+        payment_sums = StatementOfAccountService._payment_sums(invoice_type, date_from, date_to)
+        items = StatementOfAccountService._filter_partners(
+            InvoiceOpenItem.objects.filter(invoice_type=invoice_type, invoice_date__lte=date_to), **partner_filters
+        )
+
+        in_period = Q(invoice_date__gte=date_from)
+        invoiced_rows = items.values(
+            'business_partner_id', 'currency_id',
+        ).annotate(
+            opening_invoiced=StatementOfAccountService._conditional_sum(~in_period, F('total')),
+            invoiced=StatementOfAccountService._conditional_sum(in_period, F('total')),
+            invoice_count=Count('invoice_id', filter=in_period),
+            **payment_sums
+        )
+
+        # Partners and currencies with payments but no invoice up to date_to
+        zero = Value(Decimal('0'), output_field=DecimalField(max_digits=16, decimal_places=2))
+        payments = StatementOfAccountService._filter_partners(
+            Payment.objects.filter(
+                payment_type=StatementOfAccountService._payment_type(invoice_type), date__lte=date_to
+            ).exclude(approval_status=Payment.REJECTED),
+            **partner_filters
+        ).exclude(Exists(InvoiceOpenItem.objects.filter(
+            invoice_type=invoice_type,
+            business_partner_id=OuterRef('business_partner_id'),
+            currency_id=OuterRef('currency_id'),
+            invoice_date__lte=date_to,
+        )))
+        payment_only_rows = payments.values(
+            'business_partner_id', 'currency_id',
+        ).annotate(
+            opening_invoiced=zero,
+            invoiced=zero,
+            invoice_count=Value(0),
+            **payment_sums
+        )
+
+        return StatementOfAccountService._with_balances(invoiced_rows, has_balance).union(
+            # Every column depends on the partner and currency only: one row per pair
+            StatementOfAccountService._with_balances(payment_only_rows, has_balance).distinct(), all=True
+        ).order_by('business_partner_id', 'currency_id')
+
+    @staticmethod
+    def format_rows(rows):
+        """Turn statement_queryset() rows into response dicts"""
+        money = AgingReportService._money
+        return [
+            {
+                'business_partner_id': row['business_partner_id'],
+                'business_partner_name': row['business_partner_name'],
+                'currency_id': row['currency_id'],
+                'currency_code': row['currency_code'],
+                'opening_balance': money(row['opening_balance']),
+                'invoice_count': row['invoice_count'],
+                'invoiced': money(row['invoiced']),
+                'allocated': money(row['allocated']),
+                'unapplied': money(row['unapplied']),
+                'closing_balance': money(row['closing_balance']),
+            }
+            for row in rows
+        ]
+
+
 # ==================== USAGE EXAMPLES ====================
 
 """
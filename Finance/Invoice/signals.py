@@ -0,0 +1,30 @@
+"""
+Invoice Signals
+
+Keep the open-items snapshot (InvoiceOpenItem) current as invoices are
+approved, paid, refunded or changed. Child invoices are synced too: when an
+invoice is created through AR_Invoice / AP_Invoice / OneTimeSupplier the
+child row (which decides AR vs AP) is written after the Invoice row.
+"""
+from django.db.models.signals import post_save
+
+from Finance.Invoice.models import Invoice, AP_Invoice, AR_Invoice, OneTimeSupplier, InvoiceOpenItem
+
+
+def sync_invoice_open_item(sender, instance, created, **kwargs):
+    if instance.approval_status == Invoice.APPROVED:
+        InvoiceOpenItem.objects.sync([instance.pk])
+    elif not created:
+        InvoiceOpenItem.objects.filter(invoice_id=instance.pk).delete()
+
+
+def sync_child_invoice_open_item(sender, instance, created, **kwargs):
+    if created and instance.invoice.approval_status == Invoice.APPROVED:
+        InvoiceOpenItem.objects.sync([instance.invoice_id])
+
+
+post_save.connect(sync_invoice_open_item, sender=Invoice, dispatch_uid='open_item_invoice_saved')
+for model in (AP_Invoice, AR_Invoice, OneTimeSupplier):
+    post_save.connect(
+        sync_child_invoice_open_item, sender=model, dispatch_uid=f'open_item_{model.__name__}_saved'
+    )
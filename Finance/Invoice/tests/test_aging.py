@@ -0,0 +1,215 @@
+"""
+Tests for the AR/AP aging report.
+
+Covers:
+- InvoiceOpenItem snapshot kept current on approval, allocation and removal
+- Aging buckets, custom buckets and filters
+- Point-in-time ("as of") aging
+- GET /finance/invoice/ar/aging/ and ap/aging/ (query count independent of rows)
+- rebuild_invoice_open_items command
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.base.test_utils import create_test_currency, create_test_invoice, create_test_payment
+from Finance.BusinessPartner.models import Customer, Supplier
+from Finance.Invoice.models import Invoice, InvoiceOpenItem
+from Finance.Invoice.services import AgingReportService
+from Finance.payments.models import Payment
+
+
+class AgingTestCase(TestCase):
+    """Base test case with a customer, a supplier and invoice / payment builders"""
+
+    def setUp(self):
+        self.today = date.today()
+        self.currency = create_test_currency()
+        self.customer = Customer.objects.create(name='Aging Customer')
+        self.supplier = Supplier.objects.create(name='Aging Supplier')
+
+    def create_ar_invoice(self, total, days_old=0, approval_status=Invoice.APPROVED, customer=None):
+        return create_test_invoice(
+            customer or self.customer, total, self.today - timedelta(days=days_old), self.currency,
+            approval_status=approval_status
+        )
+
+    def create_ap_invoice(self, total, days_old=0):
+        return create_test_invoice(
+            self.supplier, total, self.today - timedelta(days=days_old), self.currency,
+            approval_status=Invoice.APPROVED
+        )
+
+    def create_payment(self, days_old=0):
+        return create_test_payment(self.customer, self.today - timedelta(days=days_old), self.currency)
+
+
+class OpenItemSnapshotTests(AgingTestCase):
+    """Test InvoiceOpenItem stays in step with invoices and allocations"""
+
+    def test_only_approved_invoices_are_open_items(self):
+        draft = self.create_ar_invoice('100.00', approval_status=Invoice.DRAFT)
+        self.assertFalse(InvoiceOpenItem.objects.filter(invoice=draft).exists())
+
+        draft.approval_status = Invoice.APPROVED
+        draft._allow_direct_save = True
+        draft.save()
+
+        item = InvoiceOpenItem.objects.get(invoice=draft)
+        self.assertEqual(item.invoice_type, InvoiceOpenItem.AR)
+        self.assertEqual(item.open_amount, Decimal('100.00'))
+        self.assertIsNone(item.closed_date)
+
+    def test_ap_invoices_are_ap_items(self):
+        invoice = self.create_ap_invoice('50.00')
+        self.assertEqual(InvoiceOpenItem.objects.get(invoice=invoice).invoice_type, InvoiceOpenItem.AP)
+
+    def test_allocations_update_open_amount(self):
+        invoice = self.create_ar_invoice('300.00')
+        payment = self.create_payment(days_old=2)
+
+        payment.allocate_to_invoice(invoice, Decimal('100.00'))
+        self.assertEqual(InvoiceOpenItem.objects.get(invoice=invoice).open_amount, Decimal('200.00'))
+
+        payment.allocate_bulk({invoice.pk: Decimal('200.00')})
+        item = InvoiceOpenItem.objects.get(invoice=invoice)
+        self.assertEqual(item.open_amount, Decimal('0.00'))
+        self.assertEqual(item.closed_date, payment.date)
+
+        payment.remove_allocations_bulk()
+        item.refresh_from_db()
+        self.assertEqual(item.open_amount, Decimal('300.00'))
+        self.assertIsNone(item.closed_date)
+
+    def test_rebuild_command(self):
+        invoice = self.create_ar_invoice('100.00')
+        self.create_ap_invoice('40.00')
+        InvoiceOpenItem.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_invoice_open_items', stdout=out)
+
+        self.assertEqual(InvoiceOpenItem.objects.count(), 2)
+        self.assertEqual(InvoiceOpenItem.objects.get(invoice=invoice).open_amount, Decimal('100.00'))
+        self.assertIn('Snapshot rows written: 2', out.getvalue())
+
+
+class AgingReportTests(AgingTestCase):
+    """Test AgingReportService"""
+
+    def aging(self, invoice_type=InvoiceOpenItem.AR, **kwargs):
+        buckets = kwargs.setdefault('buckets', (30, 60, 90))
+        return AgingReportService.format_rows(
+            AgingReportService.aging_queryset(invoice_type, **kwargs), invoice_type, kwargs.get('as_of'), buckets
+        )
+
+    def test_buckets(self):
+        for total, days_old in [('100.00', 0), ('200.00', 1), ('300.00', 30), ('400.00', 31), ('500.00', 91)]:
+            self.create_ar_invoice(total, days_old=days_old)
+        self.create_ap_invoice('999.00', days_old=10)
+
+        [row] = self.aging()
+
+        self.assertEqual(row['business_partner_name'], 'Aging Customer')
+        self.assertEqual(row['currency_code'], 'USD')
+        self.assertEqual(row['item_count'], 5)
+        self.assertEqual(row['total_open'], '1500.00')
+        self.assertEqual(row['buckets'], {
+            'current': '100.00', '1-30': '500.00', '31-60': '400.00', '61-90': '0.00', 'over_90': '500.00',
+        })
+
+    def test_custom_buckets(self):
+        self.create_ar_invoice('100.00', days_old=10)
+        self.create_ar_invoice('200.00', days_old=20)
+
+        [row] = self.aging(buckets=(15,))
+
+        self.assertEqual(row['buckets'], {'current': '0.00', '1-15': '100.00', 'over_15': '200.00'})
+
+    def test_paid_invoices_are_excluded(self):
+        invoice = self.create_ar_invoice('100.00', days_old=5)
+        self.create_payment().allocate_to_invoice(invoice, Decimal('100.00'))
+
+        self.assertEqual(self.aging(), [])
+
+    def test_as_of_date(self):
+        invoice = self.create_ar_invoice('100.00', days_old=40)
+        self.create_ar_invoice('70.00', days_old=5)
+        self.create_payment(days_old=10).allocate_to_invoice(invoice, Decimal('60.00'))
+        self.create_payment(days_old=3).allocate_to_invoice(invoice, Decimal('40.00'))
+
+        # Before either payment: 100 open, aged 20 days on that date
+        [row] = self.aging(as_of=self.today - timedelta(days=20))
+        self.assertEqual(row['total_open'], '100.00')
+        self.assertEqual(row['buckets']['1-30'], '100.00')
+
+        # Between the payments, the later invoice already exists
+        [row] = self.aging(as_of=self.today - timedelta(days=4))
+        self.assertEqual(row['total_open'], '110.00')
+        self.assertEqual(row['buckets']['31-60'], '40.00')
+        self.assertEqual(row['buckets']['1-30'], '70.00')
+
+        # Today: the first invoice is settled
+        [row] = self.aging()
+        self.assertEqual(row['total_open'], '70.00')
+
+    def test_as_of_date_ignores_rejected_payments(self):
+        invoice = self.create_ar_invoice('100.00', days_old=40)
+        payment = self.create_payment(days_old=10)
+        payment.allocate_to_invoice(invoice, Decimal('60.00'))
+        Payment.objects.filter(pk=payment.pk).update(approval_status=Payment.REJECTED)
+
+        [row] = self.aging(as_of=self.today - timedelta(days=5))
+
+        self.assertEqual(row['total_open'], '100.00')
+
+    def test_partner_filter(self):
+        other = Customer.objects.create(name='Other Customer')
+        self.create_ar_invoice('100.00')
+        self.create_ar_invoice('50.00', customer=other)
+
+        self.assertEqual(len(self.aging()), 2)
+        [row] = self.aging(business_partner_id=other.business_partner_id)
+        self.assertEqual(row['total_open'], '50.00')
+
+
+class AgingEndpointTests(AgingTestCase):
+    """Test the aging endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+
+    def test_ap_aging(self):
+        self.create_ap_invoice('250.00', days_old=45)
+
+        response = self.client.get('/finance/invoice/ap/aging/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [row] = response.data['data']['results']
+        self.assertEqual(row['business_partner_name'], 'Aging Supplier')
+        self.assertEqual(row['buckets']['31-60'], '250.00')
+
+    def test_invalid_parameters(self):
+        response = self.client.get('/finance/invoice/ar/aging/', {'buckets': '60,30'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/finance/invoice/ar/aging/', {'as_of': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_grow_with_invoices(self):
+        def count_queries(invoices):
+            for days_old in range(invoices):
+                self.create_ar_invoice('10.00', days_old=days_old)
+            with self.assertNumQueries(3):  # count + page + allocations before as_of
+                response = self.client.get('/finance/invoice/ar/aging/', {'as_of': str(self.today - timedelta(days=1))})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        count_queries(2)
+        count_queries(20)
@@ -0,0 +1,301 @@
+"""
+Tests for bulk invoice creation.
+
+Covers:
+- InvoiceService.create_invoices_bulk() (AP, AR, one-time supplier)
+- Per-invoice validation errors that do not block the rest of the batch
+- Segment combination reuse / bulk creation
+- Approved invoices added to the open-items snapshot
+- POST /finance/invoice/ap/bulk-create/ and ar/bulk-create/ endpoints
+- Query count independent of batch size
+"""
+
+from decimal import Decimal
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from Finance.Invoice.models import AP_Invoice, AR_Invoice, OneTimeSupplier, Invoice, InvoiceItem, InvoiceOpenItem
+from Finance.Invoice.services import (
+    InvoiceService,
+    APInvoiceDTO,
+    ARInvoiceDTO,
+    OneTimeSupplierDTO,
+    InvoiceItemDTO,
+    JournalEntryDTO,
+    JournalLineDTO,
+    SegmentDTO,
+)
+from Finance.GL.models import JournalEntry, JournalLine, XX_Segment_combination
+from Finance.period.models import Period
+from Finance.Invoice.tests.fixtures import setup_test_data
+
+
+INVOICE_DATE = date(2026, 1, 15)
+
+
+class BulkInvoiceTestCase(TestCase):
+    """Base test case with an open period and DTO / payload builders"""
+
+    def setUp(self):
+        self.data = setup_test_data()
+        self.currency = self.data['currency']
+        self.supplier = self.data['supplier']
+        self.customer = self.data['customer']
+        self.company = self.data['segment_types']['company']
+        self.account = self.data['segment_types']['account']
+
+        period = Period.objects.create(
+            name='January 2026',
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 1, 31),
+            fiscal_year=2026,
+            period_number=1
+        )
+        period.ap_period.state = 'open'
+        period.ap_period.save()
+        period.ar_period.state = 'open'
+        period.ar_period.save()
+
+    def _segments(self, account_code):
+        return [
+            SegmentDTO(segment_type_id=self.company.id, segment_code='100'),
+            SegmentDTO(segment_type_id=self.account.id, segment_code=account_code),
+        ]
+
+    def _dto_fields(self, invoice_number, amount=Decimal('100.00'), credit_amount=None, credit_account='2100'):
+        return dict(
+            invoice_number=invoice_number,
+            date=INVOICE_DATE,
+            currency_id=self.currency.id,
+            country_id=None,
+            subtotal=None,
+            tax_amount=Decimal('0.00'),
+            total=None,
+            approval_status='DRAFT',
+            payment_status='UNPAID',
+            items=[InvoiceItemDTO(name='Paper', description='A4', quantity=Decimal('1'), unit_price=amount)],
+            journal_entry=JournalEntryDTO(
+                date=INVOICE_DATE,
+                currency_id=self.currency.id,
+                memo=f'JE {invoice_number}',
+                lines=[
+                    JournalLineDTO(amount=amount, type='DEBIT', segments=self._segments('6100')),
+                    JournalLineDTO(
+                        amount=credit_amount if credit_amount is not None else amount,
+                        type='CREDIT',
+                        segments=self._segments(credit_account)
+                    ),
+                ]
+            ),
+        )
+
+    def _payload(self, invoice_number, partner_key, partner_id, amount='100.00'):
+        segments = lambda account_code: [
+            {'segment_type_id': self.company.id, 'segment_code': '100'},
+            {'segment_type_id': self.account.id, 'segment_code': account_code},
+        ]
+        return {
+            'invoice_number': invoice_number,
+            'date': str(INVOICE_DATE),
+            'currency_id': self.currency.id,
+            partner_key: partner_id,
+            'items': [{'name': 'Paper', 'description': 'A4', 'quantity': '1', 'unit_price': amount}],
+            'journal_entry': {
+                'date': str(INVOICE_DATE),
+                'currency_id': self.currency.id,
+                'lines': [
+                    {'amount': amount, 'type': 'DEBIT', 'segments': segments('6100')},
+                    {'amount': amount, 'type': 'CREDIT', 'segments': segments('2100')},
+                ]
+            }
+        }
+
+
+class InvoiceServiceBulkCreateTests(BulkInvoiceTestCase):
+    """Test InvoiceService.create_invoices_bulk()"""
+
+    def test_creates_invoices_items_and_journals(self):
+        dtos = [
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields(f'AP-{i}', Decimal('100.00') * (i + 1)))
+            for i in range(3)
+        ]
+
+        result = InvoiceService.create_invoices_bulk(dtos)
+
+        self.assertEqual(result.errors, {})
+        self.assertEqual(sorted(result.created), [0, 1, 2])
+        self.assertEqual(AP_Invoice.objects.count(), 3)
+
+        ap_invoice = AP_Invoice.objects.get(invoice__invoice_number='AP-1')
+        self.assertEqual(ap_invoice.invoice.business_partner_id, self.supplier.business_partner_id)
+        self.assertEqual(ap_invoice.invoice.prefix_code, 'Inv-AP')
+        self.assertEqual(ap_invoice.invoice.total, Decimal('200.00'))
+        self.assertEqual(ap_invoice.invoice.items.count(), 1)
+        self.assertEqual(ap_invoice.invoice.gl_distributions.memo, 'JE AP-1')
+        self.assertEqual(ap_invoice.invoice.gl_distributions.lines.count(), 2)
+        self.assertFalse(ap_invoice.invoice.gl_distributions.posted)
+
+    def test_approved_invoices_join_open_items(self):
+        approved = dict(self._dto_fields('AR-APPROVED'), approval_status='APPROVED')
+        dtos = [
+            ARInvoiceDTO(customer_id=self.customer.id, **approved),
+            ARInvoiceDTO(customer_id=self.customer.id, **self._dto_fields('AR-DRAFT')),
+        ]
+
+        result = InvoiceService.create_invoices_bulk(dtos)
+
+        item = InvoiceOpenItem.objects.get()
+        self.assertEqual(item.invoice_id, result.created[0].invoice_id)
+        self.assertEqual(item.invoice_type, InvoiceOpenItem.AR)
+        self.assertEqual(item.open_amount, Decimal('100.00'))
+
+    def test_segment_combinations_are_reused(self):
+        existing = XX_Segment_combination.create_combination([(self.company.id, '100'), (self.account.id, '6100')])
+        dtos = [
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields(f'AP-{i}'))
+            for i in range(4)
+        ]
+
+        InvoiceService.create_invoices_bulk(dtos)
+
+        # Only the credit-side combination (100/2100) is new
+        self.assertEqual(XX_Segment_combination.objects.count(), 2)
+        debit_lines = JournalLine.objects.filter(type='DEBIT')
+        self.assertEqual(debit_lines.count(), 4)
+        self.assertTrue(all(line.segment_combination_id == existing.id for line in debit_lines))
+        credit_combo = XX_Segment_combination.objects.exclude(pk=existing.pk).get()
+        self.assertEqual(credit_combo.get_combination_dict(), {self.company.id: '100', self.account.id: '2100'})
+
+    def test_invalid_invoices_are_reported_and_others_created(self):
+        dtos = [
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields('AP-OK')),
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields('AP-OK')),
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields('AP-UNBALANCED', credit_amount=Decimal('90'))),
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields('AP-BAD-SEGMENT', credit_account='9999')),
+            APInvoiceDTO(supplier_id=999999, **self._dto_fields('AP-BAD-SUPPLIER')),
+        ]
+
+        result = InvoiceService.create_invoices_bulk(dtos)
+
+        self.assertEqual(list(result.created), [0])
+        self.assertIn('duplicated in this batch', result.errors[1])
+        self.assertIn('not balanced', result.errors[2])
+        self.assertIn("Segment '9999' not found", result.errors[3])
+        self.assertIn('Supplier with ID 999999 not found', result.errors[4])
+        self.assertEqual(Invoice.objects.count(), 1)
+        self.assertEqual(JournalEntry.objects.count(), 1)
+
+    def test_existing_invoice_number_rejected(self):
+        InvoiceService.create_invoices_bulk([
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields('AP-1'))
+        ])
+
+        result = InvoiceService.create_invoices_bulk([
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields('AP-1'))
+        ])
+
+        self.assertEqual(result.created, {})
+        self.assertIn('already exists', result.errors[0])
+
+    def test_mixed_invoice_types(self):
+        dtos = [
+            APInvoiceDTO(supplier_id=self.supplier.id, **self._dto_fields('AP-1')),
+            ARInvoiceDTO(customer_id=self.customer.id, **self._dto_fields('AR-1')),
+            OneTimeSupplierDTO(supplier_name='Walk-in Vendor', **self._dto_fields('OT-1')),
+        ]
+
+        result = InvoiceService.create_invoices_bulk(dtos)
+
+        self.assertEqual(result.errors, {})
+        self.assertIsInstance(result.created[0], AP_Invoice)
+        self.assertIsInstance(result.created[1], AR_Invoice)
+        self.assertIsInstance(result.created[2], OneTimeSupplier)
+        ar_invoice = AR_Invoice.objects.get()
+        self.assertEqual(ar_invoice.invoice.business_partner_id, self.customer.business_partner_id)
+        one_time = OneTimeSupplier.objects.get()
+        self.assertEqual(one_time.one_time_supplier.name, 'Walk-in Vendor')
+        self.assertEqual(one_time.invoice.business_partner_id, one_time.one_time_supplier.business_partner_id)
+        self.assertEqual(InvoiceItem.objects.count(), 3)
+
+
+class InvoiceBulkCreateEndpointTests(BulkInvoiceTestCase):
+    """Test POST /finance/invoice/{ap,ar}/bulk-create/"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.ap_url = reverse('finance:invoice:ap-invoice-bulk-create')
+
+    def test_ap_bulk_create_success(self):
+        payload = {'invoices': [
+            self._payload(f'AP-{i}', 'supplier_id', self.supplier.id) for i in range(3)
+        ]}
+
+        response = self.client.post(self.ap_url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created_count'], 3)
+        self.assertEqual(response.data['error_count'], 0)
+        self.assertEqual([row['index'] for row in response.data['created']], [0, 1, 2])
+        self.assertEqual(AP_Invoice.objects.count(), 3)
+
+    def test_ap_bulk_create_reports_errors_by_index(self):
+        bad_serializer = self._payload('AP-1', 'supplier_id', self.supplier.id)
+        del bad_serializer['items']
+        payload = {'invoices': [
+            self._payload('AP-0', 'supplier_id', self.supplier.id),
+            bad_serializer,
+            self._payload('AP-2', 'supplier_id', 999999),
+        ]}
+
+        response = self.client.post(self.ap_url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created_count'], 1)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('items', response.data['errors'][0]['errors'])
+        self.assertIn('Supplier with ID 999999 not found', response.data['errors'][1]['errors']['non_field_errors'][0])
+
+    def test_all_invalid_returns_400(self):
+        payload = {'invoices': [self._payload('AP-0', 'supplier_id', 999999)]}
+
+        response = self.client.post(self.ap_url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['created_count'], 0)
+        self.assertFalse(Invoice.objects.exists())
+
+    def test_empty_list_returns_400(self):
+        response = self.client.post(self.ap_url, {'invoices': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ar_bulk_create(self):
+        payload = {'invoices': [self._payload('AR-0', 'customer_id', self.customer.id)]}
+
+        response = self.client.post(reverse('finance:invoice:ar-invoice-bulk-create'), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(AR_Invoice.objects.count(), 1)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def count_queries(prefix, size):
+            payload = {'invoices': [
+                self._payload(f'{prefix}-{i}', 'supplier_id', self.supplier.id) for i in range(size)
+            ]}
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.ap_url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(ctx.captured_queries)
+
+        # Warm-up run creates the segment combinations
+        count_queries('WARM', 1)
+        small = count_queries('SMALL', 2)
+        large = count_queries('LARGE', 25)
+
+        self.assertEqual(small, large)
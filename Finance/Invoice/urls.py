@@ -18,6 +18,8 @@ urlpatterns = [
     path('ap/', views.ap_invoice_list, name='ap-invoice-list'),
     path('ap/variance-preview/', views.ap_invoice_variance_preview, name='ap-invoice-variance-preview'),
     path('ap/create-from-receipt/', views.ap_invoice_create_from_receipt, name='ap-invoice-create-from-receipt'),
+    path('ap/bulk-create/', views.ap_invoice_bulk_create, name='ap-invoice-bulk-create'),
+    path('ap/aging/', views.ap_aging, name='ap-aging'),
     path('ap/<int:pk>/', views.ap_invoice_detail, name='ap-invoice-detail'),
     path('ap/<int:pk>/post-to-gl/', views.ap_invoice_post_to_gl, name='ap-invoice-post-to-gl'),
     
@@ -33,6 +35,8 @@ urlpatterns = [
     # AR Invoice URLs
     # ============================================================================
     path('ar/', views.ar_invoice_list, name='ar-invoice-list'),
+    path('ar/bulk-create/', views.ar_invoice_bulk_create, name='ar-invoice-bulk-create'),
+    path('ar/aging/', views.ar_aging, name='ar-aging'),
     path('ar/<int:pk>/', views.ar_invoice_detail, name='ar-invoice-detail'),
     path('ar/<int:pk>/post-to-gl/', views.ar_invoice_post_to_gl, name='ar-invoice-post-to-gl'),
     
@@ -48,6 +52,7 @@ urlpatterns = [
     # One-Time Supplier Invoice URLs
     # ============================================================================
     path('one-time-supplier/', views.one_time_supplier_invoice_list, name='one-time-supplier-list'),
+    path('one-time-supplier/bulk-create/', views.one_time_supplier_invoice_bulk_create, name='one-time-supplier-bulk-create'),
     path('one-time-supplier/<int:pk>/', views.one_time_supplier_invoice_detail, name='one-time-supplier-detail'),
     path('one-time-supplier/<int:pk>/post-to-gl/', views.one_time_supplier_invoice_post_to_gl, name='one-time-supplier-post-to-gl'),
     
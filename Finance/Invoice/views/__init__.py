@@ -5,6 +5,8 @@ This package organizes invoice views by type:
 - ap_views: Accounts Payable invoice views
 - ar_views: Accounts Receivable invoice views  
 - one_time_views: One-Time Supplier invoice views
+- bulk_views: Bulk create endpoints for all invoice types
+- aging_views: AR/AP aging reports
 
 All views are exported here for convenient importing.
 """
@@ -38,6 +40,17 @@ from Finance.Invoice.views.one_time_views import (
     one_time_supplier_invoice_approval_action
 )
 
+from Finance.Invoice.views.bulk_views import (
+    ap_invoice_bulk_create,
+    ar_invoice_bulk_create,
+    one_time_supplier_invoice_bulk_create
+)
+
+from Finance.Invoice.views.aging_views import (
+    ar_aging,
+    ap_aging
+)
+
 __all__ = [
     # AP Invoice views
     'ap_invoice_list',
@@ -64,4 +77,13 @@ __all__ = [
     'one_time_supplier_invoice_submit_for_approval',
     'one_time_supplier_invoice_pending_approvals',
     'one_time_supplier_invoice_approval_action',
+    
+    # Bulk create views
+    'ap_invoice_bulk_create',
+    'ar_invoice_bulk_create',
+    'one_time_supplier_invoice_bulk_create',
+    
+    # Aging views
+    'ar_aging',
+    'ap_aging',
 ]
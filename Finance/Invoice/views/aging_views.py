@@ -0,0 +1,74 @@
+"""
+Aging Views - API Endpoints
+
+AR and AP aging by business partner and currency, served from the
+open-items snapshot by AgingReportService. Rows are grouped and
+paginated in the database.
+"""
+
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_date
+
+from erp_project.pagination import paginate_queryset_response
+from Finance.Invoice.models import InvoiceOpenItem
+from Finance.Invoice.services import AgingReportService
+
+
+def _aging_response(request, invoice_type):
+    """
+    Build the paginated aging report for one invoice type.
+
+    Query params:
+        - as_of: Aging date YYYY-MM-DD (default today)
+        - buckets: Comma-separated past-due limits in days (default 30,60,90)
+        - business_partner_id: Filter by business partner
+        - currency_id: Filter by currency
+    """
+    as_of = request.query_params.get('as_of')
+    if as_of:
+        as_of = parse_date(as_of)
+        if as_of is None:
+            return Response({'error': 'as_of must be a date (YYYY-MM-DD)'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        buckets = AgingReportService.parse_buckets(request.query_params.get('buckets'))
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = AgingReportService.aging_queryset(
+        invoice_type,
+        as_of=as_of,
+        buckets=buckets,
+        business_partner_id=request.query_params.get('business_partner_id'),
+        currency_id=request.query_params.get('currency_id'),
+    )
+    return paginate_queryset_response(
+        request, rows, lambda page: AgingReportService.format_rows(page, invoice_type, as_of, buckets)
+    )
+
+
+@api_view(['GET'])
+def ar_aging(request):
+    """
+    AR aging by customer and currency.
+    
+    GET /invoice/ar/aging/?as_of=2026-06-30&buckets=30,60,90
+    - Returns one row per customer and currency with the open amount in
+      each bucket: current, 1-30, 31-60, 61-90, over_90
+    """
+    return _aging_response(request, InvoiceOpenItem.AR)
+
+
+@api_view(['GET'])
+def ap_aging(request):
+    """
+    AP aging by supplier and currency.
+    
+    GET /invoice/ap/aging/?as_of=2026-06-30&buckets=30,60,90
+    - Returns one row per supplier and currency with the open amount in
+      each bucket: current, 1-30, 31-60, 61-90, over_90
+    """
+    return _aging_response(request, InvoiceOpenItem.AP)
@@ -19,6 +19,7 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 
 from erp_project.pagination import auto_paginate
+from core.security import get_scoped_queryset, apply_field_security
 
 from Finance.Invoice.models import AP_Invoice
 from Finance.Invoice.serializers import (
@@ -59,6 +60,7 @@ def ap_invoice_list(request):
             'supplier',
             'supplier__business_partner'
         ).all()
+        invoices = get_scoped_queryset(request.user, AP_Invoice, queryset=invoices)
         
         # Apply filters
         supplier_id = request.query_params.get('supplier_id')
@@ -85,7 +87,8 @@ def ap_invoice_list(request):
         if date_to:
             invoices = invoices.filter(invoice__date__lte=date_to)
         
-        serializer = APInvoiceListSerializer(invoices, many=True)
+        serializer_class = apply_field_security(request.user, APInvoiceListSerializer)
+        serializer = serializer_class(invoices, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     elif request.method == 'POST':
@@ -19,6 +19,7 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 
 from erp_project.pagination import auto_paginate
+from core.security import get_scoped_queryset, apply_field_security
 
 from Finance.Invoice.models import AR_Invoice
 from Finance.Invoice.serializers import (
@@ -57,6 +58,7 @@ def ar_invoice_list(request):
             'customer',
             'customer__business_partner'
         ).all()
+        invoices = get_scoped_queryset(request.user, AR_Invoice, queryset=invoices)
         
         # Apply filters
         customer_id = request.query_params.get('customer_id')
@@ -83,7 +85,8 @@ def ar_invoice_list(request):
         if date_to:
             invoices = invoices.filter(invoice__date__lte=date_to)
         
-        serializer = ARInvoiceListSerializer(invoices, many=True)
+        serializer_class = apply_field_security(request.user, ARInvoiceListSerializer)
+        serializer = serializer_class(invoices, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     elif request.method == 'POST':
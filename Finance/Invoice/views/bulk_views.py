@@ -0,0 +1,143 @@
+"""
+Bulk Invoice Views - API Endpoints
+
+Create many invoices of one type in a single request.
+
+Each invoice is validated with the same serializer as the single-create
+endpoint, then all valid invoices are created together by
+InvoiceService.create_invoices_bulk(). Invalid invoices do not block the
+rest of the batch - they are reported per index in the response.
+"""
+
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from Finance.Invoice.services import InvoiceService
+from Finance.Invoice.serializers import (
+    APInvoiceCreateSerializer,
+    ARInvoiceCreateSerializer,
+    OneTimeSupplierCreateSerializer,
+)
+
+
+# Maximum invoices accepted per bulk request
+MAX_BULK_INVOICES = 1000
+
+
+def _bulk_create_invoices(request, create_serializer_class):
+    """
+    Validate and bulk create the invoices in request.data['invoices'].
+
+    Returns:
+        Response: 201 if at least one invoice was created, 400 otherwise
+    """
+    invoices_data = request.data.get('invoices') if isinstance(request.data, dict) else None
+    if not isinstance(invoices_data, list) or not invoices_data:
+        return Response(
+            {'error': "'invoices' must be a non-empty list"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(invoices_data) > MAX_BULK_INVOICES:
+        return Response(
+            {'error': f'A bulk request can contain at most {MAX_BULK_INVOICES} invoices'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # One shared context so period checks are cached per distinct date
+    context = {'period_checks': {}}
+    dtos = []
+    positions = []
+    errors = []
+    for index, invoice_data in enumerate(invoices_data):
+        serializer = create_serializer_class(data=invoice_data, context=context)
+        if serializer.is_valid():
+            dtos.append(serializer.to_dto())
+            positions.append(index)
+        else:
+            errors.append({
+                'index': index,
+                'invoice_number': invoice_data.get('invoice_number') if isinstance(invoice_data, dict) else None,
+                'errors': serializer.errors,
+            })
+
+    result = InvoiceService.create_invoices_bulk(dtos)
+
+    for dto_index, message in result.errors.items():
+        errors.append({
+            'index': positions[dto_index],
+            'invoice_number': dtos[dto_index].invoice_number,
+            'errors': {'non_field_errors': [message]},
+        })
+    errors.sort(key=lambda error: error['index'])
+
+    created = [
+        {
+            'index': positions[dto_index],
+            'invoice_id': child.invoice_id,
+            'invoice_number': dtos[dto_index].invoice_number,
+        }
+        for dto_index, child in sorted(result.created.items())
+    ]
+
+    return Response(
+        {
+            'created_count': len(created),
+            'error_count': len(errors),
+            'created': created,
+            'errors': errors,
+        },
+        status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+    )
+
+
+@api_view(['POST'])
+def ap_invoice_bulk_create(request):
+    """
+    Create many AP invoices in one request.
+
+    POST /invoices/ap/bulk-create/
+
+    Request body:
+    {
+        "invoices": [
+            { ...same fields as POST /invoices/ap/... },
+            ...
+        ]
+    }
+
+    Response (201 if any invoice was created, else 400):
+    {
+        "created_count": 2,
+        "error_count": 1,
+        "created": [{"index": 0, "invoice_id": 10, "invoice_number": "INV-1"}, ...],
+        "errors": [{"index": 2, "invoice_number": "INV-3", "errors": {...}}]
+    }
+    """
+    return _bulk_create_invoices(request, APInvoiceCreateSerializer)
+
+
+@api_view(['POST'])
+def ar_invoice_bulk_create(request):
+    """
+    Create many AR invoices in one request.
+
+    POST /invoices/ar/bulk-create/
+
+    Same request/response format as POST /invoices/ap/bulk-create/,
+    with POST /invoices/ar/ fields per invoice.
+    """
+    return _bulk_create_invoices(request, ARInvoiceCreateSerializer)
+
+
+@api_view(['POST'])
+def one_time_supplier_invoice_bulk_create(request):
+    """
+    Create many one-time supplier invoices in one request.
+
+    POST /invoices/one-time-supplier/bulk-create/
+
+    Same request/response format as POST /invoices/ap/bulk-create/,
+    with POST /invoices/one-time-supplier/ fields per invoice.
+    """
+    return _bulk_create_invoices(request, OneTimeSupplierCreateSerializer)
@@ -1,30 +1,30 @@
 """
 Excel Import/Export Utilities for Budget Control
 """
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from django.http import HttpResponse
+from openpyxl import load_workbook
 from decimal import Decimal, InvalidOperation
-from io import BytesIO
 
+from erp_project.exports import ExportSheet, export_response, build_xlsx_response, iterate_queryset
 
-def export_budget_to_excel(budget):
+
+AMOUNT_FORMAT = '#,##0.00'
+
+
+def export_budget_to_excel(budget, file_format='xlsx'):
     """
-    Export a budget header with all amounts to Excel file
+    Export a budget header with all amounts to Excel (or CSV) file
+    
+    Amount rows are read with queryset.iterator() and written through the
+    streaming export engine, so memory stays flat for very large budgets.
     
     Args:
         budget: BudgetHeader instance
+        file_format: 'xlsx' (default) or 'csv' (amounts only)
     
     Returns:
-        HttpResponse with Excel file
+        StreamingHttpResponse with the export file
     """
-    wb = Workbook()
-    
-    # Remove default sheet
-    wb.remove(wb.active)
-    
-    # Create Budget Header sheet
-    ws_header = wb.create_sheet('Budget Header')
+    from Finance.budget_control.models import BudgetAmount
     
     # Budget Header - Row 1 has headers, Row 2 has values
     header_labels = ['Budget Code', 'Budget Name', 'Description', 'Status', 'Start Date', 'End Date', 'Currency', 'Default Control Level', 'Is Active']
@@ -39,23 +39,12 @@ def export_budget_to_excel(budget):
         budget.default_control_level,
         'Yes' if budget.is_active else 'No'
     ]
-    
-    # Row 1: Labels
-    for col_idx, label in enumerate(header_labels, start=1):
-        cell = ws_header.cell(row=1, column=col_idx, value=label)
-        cell.font = Font(bold=True)
-    
-    # Row 2: Values
-    for col_idx, value in enumerate(header_values, start=1):
-        ws_header.cell(row=2, column=col_idx, value=value)
-    
-    # Auto-fit columns
-    for col_idx in range(1, len(header_labels) + 1):
-        col_letter = chr(64 + col_idx)
-        ws_header.column_dimensions[col_letter].width = 20
-    
-    # Create Budget Amounts sheet
-    ws_amounts = wb.create_sheet('Budget Amounts')
+    header_sheet = ExportSheet(
+        title='Budget Header',
+        headers=header_labels,
+        rows=[header_values],
+        default_width=20
+    )
     
     # Headers - Simplified based on test expectations
     headers = [
@@ -69,50 +58,34 @@ def export_budget_to_excel(budget):
         'Available'
     ]
     
-    # Add headers
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws_amounts.cell(row=1, column=col_idx, value=header)
-        cell.font = Font(bold=True)
-    
-    # Data rows
-    amounts = budget.budget_amounts.select_related(
-        'budget_segment_value__segment_value__segment_type'
-    ).all()
-    
-    for row_idx, amount in enumerate(amounts, start=2):
-        segment = amount.budget_segment_value.segment_value
-        
-        data_row = [
-            segment.code,
-            segment.alias,
-            amount.get_effective_control_level(),
-            float(amount.original_budget),
-            float(amount.committed_amount),
-            float(amount.encumbered_amount),
-            float(amount.actual_amount),
-            float(amount.get_available()),
-        ]
-        
-        for col_idx, value in enumerate(data_row, start=1):
-            ws_amounts.cell(row=row_idx, column=col_idx, value=value)
-    
-    # Auto-fit columns
-    for col in range(1, len(headers) + 1):
-        col_letter = chr(64 + col)
-        ws_amounts.column_dimensions[col_letter].width = 15
-    
-    # Prepare response
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    response = HttpResponse(
-        output.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    amounts = BudgetAmount.objects.filter(
+        budget_header=budget
+    ).with_utilization().select_related(
+        'budget_segment_value__segment_value'
+    ).order_by('id')
+    
+    def amount_rows():
+        for amount in iterate_queryset(amounts):
+            segment = amount.budget_segment_value.segment_value
+            yield [
+                segment.code,
+                segment.alias,
+                amount.effective_control_level,
+                float(amount.original_budget),
+                float(amount.committed_amount),
+                float(amount.encumbered_amount),
+                float(amount.actual_amount),
+                float(amount.available_amt),
+            ]
+    
+    amounts_sheet = ExportSheet(
+        title='Budget Amounts',
+        headers=headers,
+        rows=amount_rows(),
+        number_formats={col: AMOUNT_FORMAT for col in range(3, 8)}
     )
-    response['Content-Disposition'] = f'attachment; filename="Budget_{budget.budget_code}.xlsx"'
     
-    return response
+    return export_response(f"Budget_{budget.budget_code}", [header_sheet, amounts_sheet], file_format)
 
 
 def create_budget_template(budget):
@@ -123,12 +96,8 @@ def create_budget_template(budget):
         budget: BudgetHeader instance
     
     Returns:
-        HttpResponse with Excel template file
+        StreamingHttpResponse with Excel template file
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = 'Budget Import Template'
-    
     # Headers - Simplified based on test expectations
     headers = [
         'Segment Code',
@@ -137,30 +106,17 @@ def create_budget_template(budget):
         'Notes'
     ]
     
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = Font(bold=True)
-        col_letter = chr(64 + col_idx)
-        ws.column_dimensions[col_letter].width = 20
-    
     # Add instruction/example row
-    ws.cell(row=2, column=1, value='5000')
-    ws.cell(row=2, column=2, value=50000.00)
-    ws.cell(row=2, column=3, value=0.00)
-    ws.cell(row=2, column=4, value='Example budget entry')
-    
-    # Prepare response
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
+    example_rows = [['5000', 50000.00, 0.00, 'Example budget entry']]
     
-    response = HttpResponse(
-        output.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    template_sheet = ExportSheet(
+        title='Budget Import Template',
+        headers=headers,
+        rows=example_rows,
+        default_width=20
     )
-    response['Content-Disposition'] = f'attachment; filename="Budget_Import_Template_{budget.budget_code}.xlsx"'
     
-    return response
+    return build_xlsx_response(f"Budget_Import_Template_{budget.budget_code}", [template_sheet])
 
 
 def import_budget_from_excel(budget, excel_file):
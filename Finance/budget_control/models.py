@@ -17,9 +17,11 @@ Key Features:
 
 from django.db import models
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, F, Value, Case, When, ExpressionWrapper
+from django.db.models.functions import Coalesce, Round
 from decimal import Decimal
 
+from core.base.functions import DecimalDivide
 from Finance.GL.models import XX_Segment, XX_SegmentType
 from Finance.core.models import Currency
 
@@ -603,6 +605,81 @@ class BudgetSegmentValue(models.Model):
         return self.segment_value_id in transaction_segment_ids
 
 
+AMOUNT_OUTPUT = models.DecimalField(max_digits=18, decimal_places=2)
+
+
+class BudgetAmountQuerySet(models.QuerySet):
+    """
+    QuerySet for BudgetAmount with database-side consumption figures.
+
+    Methods:
+        - with_utilization(): Annotate total/consumed/available/utilization
+        - over_threshold(pct): Amounts whose utilization is >= pct
+    """
+
+    def with_utilization(self):
+        """
+        Annotate the calculated budget figures so filtering, ordering and
+        grouping run in SQL instead of per-row Python.
+
+        Annotations (mirror the instance methods of the same meaning):
+            - total_budget_amt: original_budget + adjustment_amount
+            - consumed_amt: committed + encumbered + actual
+            - available_amt: total_budget_amt - consumed_amt
+            - utilization_pct: consumed / total × 100, rounded to 2 places (0 when no budget)
+            - effective_control_level: segment override or header default
+        """
+        total = ExpressionWrapper(
+            F('original_budget') + F('adjustment_amount'),
+            output_field=AMOUNT_OUTPUT
+        )
+        consumed = ExpressionWrapper(
+            F('committed_amount') + F('encumbered_amount') + F('actual_amount'),
+            output_field=AMOUNT_OUTPUT
+        )
+        return self.annotate(
+            total_budget_amt=total,
+            consumed_amt=consumed,
+        ).annotate(
+            available_amt=ExpressionWrapper(
+                F('total_budget_amt') - F('consumed_amt'),
+                output_field=AMOUNT_OUTPUT
+            ),
+            utilization_pct=Case(
+                When(total_budget_amt=0, then=Value(Decimal('0.00'))),
+                default=Round(
+                    DecimalDivide(F('consumed_amt') * Value(Decimal('100')), F('total_budget_amt')),
+                    precision=2
+                ),
+                output_field=AMOUNT_OUTPUT
+            ),
+            effective_control_level=Coalesce(
+                'budget_segment_value__control_level',
+                'budget_header__default_control_level'
+            ),
+        )
+
+    def over_threshold(self, threshold):
+        """
+        Return amounts utilized at or above threshold percent.
+
+        Args:
+            threshold: Utilization percentage (e.g. 80)
+        """
+        return self.with_utilization().filter(utilization_pct__gte=threshold)
+
+
+class BudgetAmountManager(models.Manager.from_queryset(BudgetAmountQuerySet)):
+    """
+    Manager for BudgetAmount.
+
+    Usage:
+        BudgetAmount.objects.with_utilization().order_by('-utilization_pct')
+        BudgetAmount.objects.over_threshold(80)
+    """
+    pass
+
+
 class BudgetAmount(models.Model):
     """
     Budget Amount - Budget allocated to individual segment value
@@ -709,6 +786,8 @@ class BudgetAmount(models.Model):
         help_text="Last time budget was adjusted"
     )
     
+    objects = BudgetAmountManager()
+    
     class Meta:
         db_table = 'budget_amount'
         ordering = ['budget_header']
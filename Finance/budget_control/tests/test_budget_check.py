@@ -387,6 +387,90 @@ class BudgetViolationsReportTestCase(APITestCase):
         self.assertIn('segment_value', violation)
         self.assertIn('available', violation)
     
+    def test_violations_report_threshold_and_ordering_in_sql(self):
+        """Test threshold filtering and most-utilized-first ordering"""
+        segment_5100 = XX_Segment.objects.create(segment_type=self.account_type, code='5100', alias='Supplies', node_type='child', is_active=True)
+        segment_5200 = XX_Segment.objects.create(segment_type=self.account_type, code='5200', alias='Training', node_type='child', is_active=True)
+        
+        # 85% utilized - uses header default control level
+        seg_85 = BudgetSegmentValue.objects.create(budget_header=self.budget, segment_value=segment_5100)
+        BudgetAmount.objects.create(
+            budget_segment_value=seg_85,
+            budget_header=self.budget,
+            original_budget=Decimal('1000.00'),
+            actual_amount=Decimal('850.00')
+        )
+        # 10% utilized - below threshold
+        seg_10 = BudgetSegmentValue.objects.create(budget_header=self.budget, segment_value=segment_5200)
+        BudgetAmount.objects.create(
+            budget_segment_value=seg_10,
+            budget_header=self.budget,
+            original_budget=Decimal('1000.00'),
+            actual_amount=Decimal('100.00')
+        )
+        
+        url = reverse('budget_control:budget-violations-report')
+        response = self.client.get(url, {'threshold': 80})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['count'], 2)
+        utilizations = [row['utilization_percentage'] for row in data['results']]
+        self.assertEqual(utilizations, ['110.00', '85.00'])
+        self.assertEqual(data['results'][1]['control_level'], self.budget.default_control_level)
+        self.assertEqual(data['results'][0]['available'], '-1000.00')
+    
+    def test_violations_report_fractional_utilization(self):
+        """Test utilization is not truncated to a whole percentage (805 / 1000 = 80.50%)"""
+        for code, actual in (('5100', '805.00'), ('5200', '802.00')):
+            segment = XX_Segment.objects.create(segment_type=self.account_type, code=code, alias=code, node_type='child', is_active=True)
+            seg_val = BudgetSegmentValue.objects.create(budget_header=self.budget, segment_value=segment)
+            BudgetAmount.objects.create(
+                budget_segment_value=seg_val,
+                budget_header=self.budget,
+                original_budget=Decimal('1000.00'),
+                actual_amount=Decimal(actual)
+            )
+        
+        self.assertEqual(
+            sorted(BudgetAmount.objects.over_threshold(Decimal('80.5')).values_list('utilization_pct', flat=True)),
+            [Decimal('80.50'), Decimal('110.00')]
+        )
+        url = reverse('budget_control:budget-violations-report')
+        response = self.client.get(url, {'threshold': 80})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        utilizations = [row['utilization_percentage'] for row in response.data['data']['results']]
+        self.assertEqual(utilizations, ['110.00', '80.50', '80.20'])
+    
+    def test_violations_report_control_level_filter(self):
+        """Test filtering violations by effective control level"""
+        url = reverse('budget_control:budget-violations-report')
+        
+        response = self.client.get(url, {'control_level': 'ADVISORY'})
+        self.assertEqual(response.data['data']['count'], 0)
+        
+        response = self.client.get(url, {'control_level': 'ABSOLUTE'})
+        self.assertEqual(response.data['data']['count'], 1)
+    
+    def test_violations_report_query_count_independent_of_rows(self):
+        """Test the report does not issue per-row queries"""
+        for i in range(5):
+            segment = XX_Segment.objects.create(segment_type=self.account_type, code=f'60{i}0', alias=f'Extra {i}', node_type='child', is_active=True)
+            seg_val = BudgetSegmentValue.objects.create(budget_header=self.budget, segment_value=segment)
+            BudgetAmount.objects.create(
+                budget_segment_value=seg_val,
+                budget_header=self.budget,
+                original_budget=Decimal('100.00'),
+                actual_amount=Decimal('95.00')
+            )
+        
+        url = reverse('budget_control:budget-violations-report')
+        # One COUNT for the paginator plus one page query
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data['data']['count'], 6)
+    
     def test_violations_report_with_filters(self):
         """Test violations report with budget filter"""
         url = reverse('budget_control:budget-violations-report')
@@ -128,7 +128,7 @@ class BudgetExcelExportTestCase(APITestCase):
             
             # Verify file content if openpyxl available
             if OPENPYXL_AVAILABLE:
-                wb = openpyxl.load_workbook(io.BytesIO(response.content))
+                wb = openpyxl.load_workbook(io.BytesIO(response.getvalue()))
                 
                 # Should have sheets
                 self.assertIn('Budget Header', wb.sheetnames)
@@ -161,13 +161,42 @@ class BudgetExcelExportTestCase(APITestCase):
             )
             print("INFO: Excel export endpoint not yet implemented")
     
+    def test_export_is_streamed(self):
+        """Test export is returned as a streaming response"""
+        url = reverse('budget_control:budget-export', kwargs={'pk': self.budget.id})
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+    
+    def test_export_budget_to_csv(self):
+        """Test GET /budget-headers/<pk>/export/?file_format=csv streams the amounts as CSV"""
+        url = reverse('budget_control:budget-export', kwargs={'pk': self.budget.id})
+        response = self.client.get(url, {'file_format': 'csv'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('Budget_EXPORT2026.csv', response['Content-Disposition'])
+        
+        lines = response.getvalue().decode('utf-8').splitlines()
+        self.assertEqual(lines[0].split(',')[0], 'Segment Code')
+        self.assertEqual(len(lines), 3)  # Header + 2 amounts
+        self.assertTrue(lines[1].startswith('5000,'))
+    
+    def test_export_invalid_format(self):
+        """Test export with unsupported file_format returns 400"""
+        url = reverse('budget_control:budget-export', kwargs={'pk': self.budget.id})
+        response = self.client.get(url, {'file_format': 'pdf'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
     def test_export_includes_all_budget_data(self):
         """Test export includes complete budget information"""
         url = reverse('budget_control:budget-export', kwargs={'pk': self.budget.id})
         response = self.client.get(url)
         
         if response.status_code == status.HTTP_200_OK and OPENPYXL_AVAILABLE:
-            wb = openpyxl.load_workbook(io.BytesIO(response.content))
+            wb = openpyxl.load_workbook(io.BytesIO(response.getvalue()))
             amounts_sheet = wb['Budget Amounts']
             
             # Should have 2 data rows (plus header)
@@ -198,7 +227,7 @@ class BudgetExcelExportTestCase(APITestCase):
         response = self.client.get(url)
         
         if response.status_code == status.HTTP_200_OK and OPENPYXL_AVAILABLE:
-            wb = openpyxl.load_workbook(io.BytesIO(response.content))
+            wb = openpyxl.load_workbook(io.BytesIO(response.getvalue()))
             amounts_sheet = wb['Budget Amounts']
             
             # Should have header row only
@@ -219,7 +248,7 @@ class BudgetExcelExportTestCase(APITestCase):
         response = self.client.get(url)
         
         if response.status_code == status.HTTP_200_OK and OPENPYXL_AVAILABLE:
-            wb = openpyxl.load_workbook(io.BytesIO(response.content))
+            wb = openpyxl.load_workbook(io.BytesIO(response.getvalue()))
             amounts_sheet = wb['Budget Amounts']
             
             # Check number formatting for currency columns
@@ -604,7 +633,7 @@ class BudgetExcelTemplateTestCase(APITestCase):
             )
             
             if OPENPYXL_AVAILABLE:
-                wb = openpyxl.load_workbook(io.BytesIO(response.content))
+                wb = openpyxl.load_workbook(io.BytesIO(response.getvalue()))
                 ws = wb.active
                 
                 # Should have headers and instructions
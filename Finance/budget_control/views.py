@@ -8,12 +8,12 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
-from django.db.models import Q, Sum, F
+from django.db.models import Q, Sum, F, Count
 from django.db import transaction
 from decimal import Decimal
 from datetime import date
 
-from erp_project.pagination import auto_paginate
+from erp_project.pagination import auto_paginate, paginate_queryset_response
 from erp_project.response_formatter import success_response, error_response
 
 from .models import BudgetHeader, BudgetSegmentValue, BudgetAmount
@@ -34,6 +34,11 @@ from .serializers import (
 from Finance.GL.models import XX_Segment
 
 
+def _money(value):
+    """Format a (possibly unquantized SQL-computed) amount as a 2-place string."""
+    return str(Decimal(value or 0).quantize(Decimal('0.01')))
+
+
 # ============================================================================
 # BUDGET HEADER API VIEWS
 # ============================================================================
@@ -565,7 +570,9 @@ def budget_amount_list(request, budget_id):
         amounts = BudgetAmount.objects.filter(
             budget_header=budget
         ).select_related(
+            'budget_header',
             'budget_segment_value',
+            'budget_segment_value__budget_header',
             'budget_segment_value__segment_value',
             'budget_segment_value__segment_value__segment_type'
         )
@@ -574,10 +581,10 @@ def budget_amount_list(request, budget_id):
         if segment_value_id:
             amounts = amounts.filter(budget_segment_value__segment_value_id=segment_value_id)
         
-        # Filter by low availability (< 20%)
+        # Filter by low availability (< 20%) - computed in SQL
         low_availability = request.query_params.get('low_availability')
         if low_availability and low_availability.lower() == 'true':
-            amounts = [amt for amt in amounts if amt.get_utilization_percentage() > 80]
+            amounts = amounts.with_utilization().filter(utilization_pct__gt=80)
         
         serializer = BudgetAmountListSerializer(amounts, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -768,11 +775,9 @@ def budget_summary(request, pk):
         - Overall utilization percentage
         - Breakdown by segment type
     """
-    budget = get_object_or_404(BudgetHeader, pk=pk)
+    budget = get_object_or_404(BudgetHeader.objects.select_related('currency'), pk=pk)
     
-    amounts = budget.budget_amounts.select_related(
-        'budget_segment_value__segment_value__segment_type'
-    )
+    amounts = budget.budget_amounts.order_by()
     
     # Calculate totals
     totals = amounts.aggregate(
@@ -796,43 +801,34 @@ def budget_summary(request, pk):
     if total_budget > 0:
         utilization = (total_consumed / total_budget * 100).quantize(Decimal('0.01'))
     
-    # Breakdown by segment type
-    segment_breakdown = {}
-    for amount in amounts:
-        segment_type = amount.budget_segment_value.segment_value.segment_type.segment_name
-        if segment_type not in segment_breakdown:
-            segment_breakdown[segment_type] = {
-                'total_budget': Decimal('0'),
-                'committed': Decimal('0'),
-                'encumbered': Decimal('0'),
-                'actual': Decimal('0'),
-                'available': Decimal('0'),
-                'count': 0
-            }
-        
-        breakdown = segment_breakdown[segment_type]
-        breakdown['total_budget'] += amount.get_total_budget()
-        breakdown['committed'] += amount.committed_amount
-        breakdown['encumbered'] += amount.encumbered_amount
-        breakdown['actual'] += amount.actual_amount
-        breakdown['available'] += amount.get_available()
-        breakdown['count'] += 1
+    # Breakdown by segment type - one GROUP BY query
+    segment_breakdown = amounts.with_utilization().values(
+        segment_type=F('budget_segment_value__segment_value__segment_type__segment_name')
+    ).annotate(
+        type_total_budget=Sum('total_budget_amt'),
+        type_committed=Sum('committed_amount'),
+        type_encumbered=Sum('encumbered_amount'),
+        type_actual=Sum('actual_amount'),
+        type_available=Sum('available_amt'),
+        count=Count('id')
+    ).order_by('budget_segment_value__segment_value__segment_type__display_order', 'segment_type')
     
     # Convert to list and add utilization
     segment_list = []
-    for seg_type, data in segment_breakdown.items():
+    for data in segment_breakdown:
+        type_total = Decimal(data['type_total_budget'] or 0)
         util = Decimal('0')
-        if data['total_budget'] > 0:
-            consumed = data['committed'] + data['encumbered'] + data['actual']
-            util = (consumed / data['total_budget'] * 100).quantize(Decimal('0.01'))
+        if type_total > 0:
+            consumed = data['type_committed'] + data['type_encumbered'] + data['type_actual']
+            util = (consumed / type_total * 100).quantize(Decimal('0.01'))
         
         segment_list.append({
-            'segment_type': seg_type,
-            'total_budget': str(data['total_budget']),
-            'committed': str(data['committed']),
-            'encumbered': str(data['encumbered']),
-            'actual': str(data['actual']),
-            'available': str(data['available']),
+            'segment_type': data['segment_type'],
+            'total_budget': _money(type_total),
+            'committed': str(data['type_committed']),
+            'encumbered': str(data['type_encumbered']),
+            'actual': str(data['type_actual']),
+            'available': _money(data['type_available']),
             'utilization_percentage': str(util),
             'count': data['count']
         })
@@ -860,19 +856,27 @@ def budget_summary(request, pk):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@auto_paginate
 def budget_violations_report(request):
     """
     Get report of all budget violations (amounts with low availability).
     
     GET /budget-violations/
-    - Returns budget amounts that are over 80% utilized
+    - Returns budget amounts that are over 80% utilized, most utilized first
+    - Utilization, filtering, ordering and pagination all run in the database
     - Query params:
         - threshold: Utilization threshold percentage (default: 80)
         - status: Filter by budget status
-        - control_level: Filter by control level
+        - budget_id: Filter by budget header
+        - control_level: Filter by effective control level
+        - page / page_size: Pagination
     """
-    threshold = int(request.query_params.get('threshold', 80))
+    try:
+        threshold = Decimal(request.query_params.get('threshold', 80))
+    except (ArithmeticError, ValueError):
+        return Response(
+            {'error': 'threshold must be a number'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     amounts = BudgetAmount.objects.filter(
         budget_header__status='ACTIVE',
@@ -886,26 +890,37 @@ def budget_violations_report(request):
     if status_filter:
         amounts = amounts.filter(budget_header__status=status_filter.upper())
     
-    # Filter by utilization (need to do in Python since it's calculated)
-    violations = []
-    for amount in amounts:
-        utilization = amount.get_utilization_percentage()
-        if utilization >= threshold:
-            violations.append({
+    budget_id = request.query_params.get('budget_id')
+    if budget_id:
+        amounts = amounts.filter(budget_header_id=budget_id)
+    
+    amounts = amounts.over_threshold(threshold)
+    
+    control_level = request.query_params.get('control_level')
+    if control_level:
+        amounts = amounts.filter(effective_control_level=control_level.upper())
+    
+    amounts = amounts.order_by('-utilization_pct', 'id')
+    
+    def serialize(page):
+        return [
+            {
                 'budget_code': amount.budget_header.budget_code,
                 'budget_name': amount.budget_header.budget_name,
                 'segment_value': str(amount.budget_segment_value.segment_value),
                 'segment_type': amount.budget_segment_value.segment_value.segment_type.segment_name,
-                'control_level': amount.get_effective_control_level(),
-                'total_budget': str(amount.get_total_budget()),
+                'control_level': amount.effective_control_level,
+                'total_budget': _money(amount.total_budget_amt),
                 'committed': str(amount.committed_amount),
                 'encumbered': str(amount.encumbered_amount),
                 'actual': str(amount.actual_amount),
-                'available': str(amount.get_available()),
-                'utilization_percentage': str(utilization)
-            })
+                'available': _money(amount.available_amt),
+                'utilization_percentage': _money(amount.utilization_pct)
+            }
+            for amount in page
+        ]
     
-    return Response(violations, status=status.HTTP_200_OK)
+    return paginate_queryset_response(request, amounts, serialize)
 
 
 # Excel Import/Export Views
@@ -916,16 +931,24 @@ from .excel_utils import export_budget_to_excel, create_budget_template, import_
 @permission_classes([IsAuthenticated])
 def budget_export_excel(request, pk):
     """
-    Export budget to Excel file.
+    Export budget to Excel file (streamed).
+    
+    Query params:
+        - file_format: 'xlsx' (default) or 'csv' (amounts only, fastest for large budgets)
     """
     try:
         budget = BudgetHeader.objects.select_related('currency').get(id=pk)
-        return export_budget_to_excel(budget)
+        return export_budget_to_excel(budget, request.query_params.get('file_format'))
     except BudgetHeader.DoesNotExist:
         return Response(
             {'error': 'Budget not found'},
             status=status.HTTP_404_NOT_FOUND
         )
+    except ValueError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
 
 @api_view(['POST'])
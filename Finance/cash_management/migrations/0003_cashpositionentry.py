@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cash_management', '0002_bankaccount_transction_type_bankstatement_and_more'),
+        ('finance_core', '0004_alter_country_code'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CashPositionEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position_date', models.DateField(help_text='Date of the cash movement')),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Signed movement (positive = inflow, negative = outflow)', max_digits=14)),
+                ('balance_after', models.DecimalField(decimal_places=2, help_text='Account balance right after this movement', max_digits=14)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('bank', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cash_position_entries', to='cash_management.bank')),
+                ('bank_account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cash_position_entries', to='cash_management.bankaccount')),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cash_position_entries', to='cash_management.bankbranch')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='cash_position_entries_created', to=settings.AUTH_USER_MODEL)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cash_position_entries', to='finance_core.currency')),
+            ],
+            options={
+                'verbose_name': 'Cash Position Entry',
+                'verbose_name_plural': 'Cash Position Entries',
+                'ordering': ['position_date', 'id'],
+                'indexes': [models.Index(fields=['bank_account', 'position_date'], name='cash_manage_bank_ac_af510a_idx'), models.Index(fields=['bank', 'position_date'], name='cash_manage_bank_id_7b4a6a_idx'), models.Index(fields=['branch', 'position_date'], name='cash_manage_branch__20389b_idx'), models.Index(fields=['currency', 'position_date'], name='cash_manage_currenc_d9f00e_idx'), models.Index(fields=['position_date'], name='cash_manage_positio_b561c7_idx')],
+            },
+        ),
+    ]
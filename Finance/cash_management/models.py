@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Sum, Count, Case, When, Value, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -455,8 +457,9 @@ class BankBranch(ProtectedDeleteMixin, models.Model):
         if currency:
             accounts = accounts.filter(currency=currency)
         
-        total = sum(account.current_balance for account in accounts)
-        return Decimal(str(total))
+        return accounts.aggregate(
+            total=Coalesce(Sum('current_balance'), Value(Decimal('0.00')))
+        )['total']
     
     def get_accounts_count(self, active_only=False):
         """
@@ -718,14 +721,20 @@ class BankAccount(ProtectedDeleteMixin, models.Model):
             'currency': self.currency.code,
         }
     
-    def update_balance(self, amount, user=None, increase=True):
+    def update_balance(self, amount, user=None, increase=True, description='', position_date=None):
         """
         Update the account balance.
         
+        The change is applied in the database with a single F-expression
+        UPDATE, so concurrent payments and statement imports cannot lose each
+        other's updates, and is recorded in the cash-position ledger.
+        
         Args:
             amount (Decimal): Amount to add or subtract
             user: User performing the action (for audit)
             increase (bool): True to increase balance, False to decrease
+            description (str): Optional description for the ledger entry
+            position_date (date): Date of the cash movement (defaults to today)
             
         Returns:
             Decimal: New balance
@@ -734,24 +743,42 @@ class BankAccount(ProtectedDeleteMixin, models.Model):
             ValidationError: If amount would result in negative balance
         """
         amount = Decimal(str(amount))
+        delta = amount if increase else -amount
         
-        if increase:
-            new_balance = self.current_balance + amount
-        else:
-            new_balance = self.current_balance - amount
+        with transaction.atomic():
+            accounts = BankAccount.objects.filter(pk=self.pk)
+            # Allow negative balance for overdraft accounts
+            if self.account_type != self.OVERDRAFT:
+                accounts = accounts.filter(current_balance__gte=-delta)
             
-        # Allow negative balance for overdraft accounts
-        if new_balance < 0 and self.account_type != self.OVERDRAFT:
-            raise ValidationError(
-                f"Insufficient balance. Current: {self.current_balance}, "
-                f"Attempted: {amount}, Would result in: {new_balance}"
+            changes = {'current_balance': F('current_balance') + delta, 'updated_at': timezone.now()}
+            if user:
+                changes['updated_by'] = user
+            updated = accounts.update(**changes)
+            
+            # The row is locked by the UPDATE until commit, so this read is consistent
+            current_balance = BankAccount.objects.values_list('current_balance', flat=True).get(pk=self.pk)
+            if not updated:
+                raise ValidationError(
+                    f"Insufficient balance. Current: {current_balance}, "
+                    f"Attempted: {amount}, Would result in: {current_balance + delta}"
+                )
+            
+            CashPositionEntry.objects.create(
+                bank_account=self,
+                bank_id=self.branch.bank_id,
+                branch_id=self.branch_id,
+                currency_id=self.currency_id,
+                position_date=position_date or timezone.now().date(),
+                amount=delta,
+                balance_after=current_balance,
+                description=description or '',
+                created_by=user
             )
         
-        self.current_balance = new_balance
+        self.current_balance = current_balance
         if user:
             self.updated_by = user
-        self.save(update_fields=['current_balance', 'updated_by', 'updated_at'])
-        
         return self.current_balance
     
     def check_sufficient_balance(self, amount):
@@ -916,6 +943,229 @@ class BankAccount(ProtectedDeleteMixin, models.Model):
         return accounts
 
 
+class CashPositionEntry(models.Model):
+    """
+    Append-only daily cash-position ledger.
+    One row per balance movement of a bank account, written by
+    BankAccount.update_balance(). Bank, branch and currency are copied from
+    the account so cash position can be filtered and grouped on indexed
+    columns without joins.
+    """
+    
+    # Grouping dimensions for get_cash_position()
+    GROUP_BY_FIELDS = {
+        'bank': 'bank_id',
+        'branch': 'branch_id',
+        'account': 'bank_account_id',
+        'currency': 'currency_id',
+    }
+    
+    # The same grouping dimensions reached from BankAccount, for get_cash_balances()
+    ACCOUNT_GROUP_FIELDS = {
+        'bank_id': 'branch__bank_id',
+        'branch_id': 'branch_id',
+        'bank_account_id': 'pk',
+        'currency_id': 'currency_id',
+    }
+    
+    bank_account = models.ForeignKey(
+        BankAccount,
+        on_delete=models.PROTECT,
+        related_name='cash_position_entries'
+    )
+    bank = models.ForeignKey(
+        Bank,
+        on_delete=models.PROTECT,
+        related_name='cash_position_entries'
+    )
+    branch = models.ForeignKey(
+        BankBranch,
+        on_delete=models.PROTECT,
+        related_name='cash_position_entries'
+    )
+    currency = models.ForeignKey(
+        Currency,
+        on_delete=models.PROTECT,
+        related_name='cash_position_entries'
+    )
+    
+    position_date = models.DateField(
+        help_text="Date of the cash movement"
+    )
+    amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        help_text="Signed movement (positive = inflow, negative = outflow)"
+    )
+    balance_after = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        help_text="Account balance right after this movement"
+    )
+    description = models.CharField(
+        max_length=255,
+        blank=True
+    )
+    
+    # Audit Fields
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='cash_position_entries_created'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Cash Position Entry'
+        verbose_name_plural = 'Cash Position Entries'
+        ordering = ['position_date', 'id']
+        indexes = [
+            models.Index(fields=['bank_account', 'position_date']),
+            models.Index(fields=['bank', 'position_date']),
+            models.Index(fields=['branch', 'position_date']),
+            models.Index(fields=['currency', 'position_date']),
+            models.Index(fields=['position_date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.position_date} - {self.bank_account_id}: {self.amount}"
+    
+    def save(self, *args, **kwargs):
+        """Ledger entries are append-only."""
+        if not self._state.adding:
+            raise ValidationError(
+                f"Cannot modify Cash Position Entry #{self.pk}. "
+                "The cash-position ledger is append-only."
+            )
+        super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        """Ledger entries are append-only."""
+        raise ValidationError(
+            f"Cannot delete Cash Position Entry #{self.pk}. "
+            "The cash-position ledger is append-only."
+        )
+    
+    @classmethod
+    def get_cash_position(cls, date_from=None, date_to=None, bank=None, branch=None,
+                          currency=None, account=None, group_by='bank'):
+        """
+        Daily cash movements grouped by bank, branch or account, in one query.
+        
+        Rows are always split by currency since amounts in different
+        currencies cannot be summed. Opening and closing balances come
+        from get_cash_balances().
+        
+        Args:
+            date_from, date_to: Optional inclusive date range
+            bank, branch, currency, account: Optional filters (object or ID)
+            group_by (str): 'bank', 'branch', 'account' or 'currency'
+            
+        Returns:
+            QuerySet: dicts with the group ID, currency_id, position_date,
+            inflow, outflow, net_movement and movement_count
+            
+        Raises:
+            ValidationError: If group_by is not supported
+        """
+        if group_by not in cls.GROUP_BY_FIELDS:
+            raise ValidationError(
+                f"Invalid group_by '{group_by}'. "
+                f"Choose from: {', '.join(cls.GROUP_BY_FIELDS)}"
+            )
+        
+        entries = cls.objects.all()
+        if date_from:
+            entries = entries.filter(position_date__gte=date_from)
+        if date_to:
+            entries = entries.filter(position_date__lte=date_to)
+        if bank:
+            entries = entries.filter(bank=bank)
+        if branch:
+            entries = entries.filter(branch=branch)
+        if currency:
+            entries = entries.filter(currency=currency)
+        if account:
+            entries = entries.filter(bank_account=account)
+        
+        group_fields = list(dict.fromkeys([cls.GROUP_BY_FIELDS[group_by], 'currency_id']))
+        zero = Value(Decimal('0.00'))
+        return entries.values(*group_fields, 'position_date').annotate(
+            inflow=Coalesce(Sum(Case(When(amount__gt=0, then='amount'))), zero),
+            outflow=Coalesce(Sum(Case(When(amount__lt=0, then=-F('amount')))), zero),
+            net_movement=Sum('amount'),
+            movement_count=Count('id'),
+        ).order_by('position_date', *group_fields)
+    
+    @classmethod
+    def get_cash_balances(cls, date_from=None, date_to=None, bank=None, branch=None,
+                          currency=None, account=None, group_by='bank'):
+        """
+        Opening and closing balances for a date range, grouped like
+        get_cash_position(), in one query.
+        
+        Entries may be back-dated, so balance_after follows insertion order
+        rather than position_date. Balances are therefore derived from each
+        account's current balance minus the movements dated after the range
+        boundary. Accounts without movements are included.
+        
+        Args:
+            date_from, date_to: Optional inclusive date range; without
+                date_from the opening balance is the balance before the
+                first ledger entry, without date_to the closing balance is
+                the current balance
+            bank, branch, currency, account: Optional filters (object or ID)
+            group_by (str): 'bank', 'branch', 'account' or 'currency'
+            
+        Returns:
+            QuerySet: dicts with the group ID, currency_id, opening_balance
+            and closing_balance
+            
+        Raises:
+            ValidationError: If group_by is not supported
+        """
+        if group_by not in cls.GROUP_BY_FIELDS:
+            raise ValidationError(
+                f"Invalid group_by '{group_by}'. "
+                f"Choose from: {', '.join(cls.GROUP_BY_FIELDS)}"
+            )
+        
+        accounts = BankAccount.objects.all()
+        if bank:
+            accounts = accounts.filter(branch__bank=bank)
+        if branch:
+            accounts = accounts.filter(branch=branch)
+        if currency:
+            accounts = accounts.filter(currency=currency)
+        if account:
+            accounts = accounts.filter(pk=account)
+        
+        balance_field = models.DecimalField(max_digits=14, decimal_places=2)
+        zero = Value(Decimal('0.00'))
+        
+        def movements(**date_filter):
+            """Sum of the account's movements matching date_filter"""
+            totals = cls.objects.filter(bank_account=OuterRef('pk'), **date_filter).order_by()
+            totals = totals.values('bank_account').annotate(total=Sum('amount')).values('total')
+            return Coalesce(Subquery(totals, output_field=balance_field), zero)
+        
+        opening = F('current_balance') - (movements(position_date__gte=date_from) if date_from else movements())
+        closing = F('current_balance') - movements(position_date__gt=date_to) if date_to else F('current_balance')
+        
+        group_fields = list(dict.fromkeys([cls.GROUP_BY_FIELDS[group_by], 'currency_id']))
+        aliased = {
+            field: F(cls.ACCOUNT_GROUP_FIELDS[field]) for field in group_fields
+            if cls.ACCOUNT_GROUP_FIELDS[field] != field
+        }
+        plain = [field for field in group_fields if field not in aliased]
+        return accounts.values(*plain, **aliased).annotate(
+            opening_balance=Sum(opening, output_field=balance_field),
+            closing_balance=Sum(closing, output_field=balance_field),
+        ).order_by(*group_fields)
+
+
 # ==================== BANK STATEMENT MODELS ====================
 
 class BankStatement(ProtectedDeleteMixin, models.Model):
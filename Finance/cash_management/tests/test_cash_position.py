@@ -0,0 +1,221 @@
+"""
+Cash Position Ledger Tests
+Tests for atomic BankAccount.update_balance(), the append-only
+CashPositionEntry ledger and the cash position endpoint.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.base.test_utils import create_test_currency, create_test_user
+from Finance.cash_management.models import Bank, BankBranch, BankAccount, CashPositionEntry
+from Finance.core.models import Country
+from Finance.GL.models import XX_Segment_combination
+
+
+class CashPositionTestCase(APITestCase):
+    """Base test case with a bank hierarchy and bank account builders"""
+
+    def setUp(self):
+        self.user = create_test_user()
+        self.country = Country.objects.create(code='US', name='United States')
+        self.usd = create_test_currency()
+        self.eur = create_test_currency('EUR', 'Euro', '€', is_base_currency=False)
+        self.gl_combination = XX_Segment_combination.objects.create()
+
+        self.bank = Bank.objects.create(
+            bank_name='Test Bank', bank_code='TB001', country=self.country, created_by=self.user
+        )
+        self.other_bank = Bank.objects.create(
+            bank_name='Other Bank', bank_code='OB001', country=self.country, created_by=self.user
+        )
+        self.branch = self.create_branch(self.bank, 'MAIN')
+        self.other_branch = self.create_branch(self.other_bank, 'OTHER')
+
+        self.account = self.create_account(self.branch, 'ACC-1', self.usd)
+
+    def create_branch(self, bank, code):
+        return BankBranch.objects.create(
+            bank=bank, branch_name=f'{code} Branch', branch_code=code,
+            address='123 Main St', country=self.country, created_by=self.user
+        )
+
+    def create_account(self, branch, number, currency, balance='1000.00', account_type=BankAccount.CURRENT):
+        return BankAccount.objects.create(
+            branch=branch,
+            account_number=number,
+            account_name=f'Account {number}',
+            account_type=account_type,
+            currency=currency,
+            opening_balance=Decimal(balance),
+            current_balance=Decimal(balance),
+            cash_GL_combination=self.gl_combination,
+            cash_clearing_GL_combination=self.gl_combination,
+            created_by=self.user
+        )
+
+
+class AtomicBalanceUpdateTests(CashPositionTestCase):
+    """Test BankAccount.update_balance() and the ledger it writes"""
+
+    def test_stale_instances_do_not_lose_updates(self):
+        first = BankAccount.objects.get(pk=self.account.pk)
+        second = BankAccount.objects.get(pk=self.account.pk)
+
+        first.update_balance(Decimal('100.00'), user=self.user)
+        second.update_balance(Decimal('50.00'), user=self.user, increase=False)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_balance, Decimal('1050.00'))
+        self.assertEqual(second.current_balance, Decimal('1050.00'))
+
+    def test_movements_are_recorded(self):
+        self.account.update_balance(Decimal('200.00'), user=self.user, description='Deposit',
+                                    position_date=date(2026, 1, 5))
+        self.account.update_balance(Decimal('300.00'), user=self.user, increase=False,
+                                    position_date=date(2026, 1, 6))
+
+        entries = list(self.account.cash_position_entries.all())
+        self.assertEqual([e.amount for e in entries], [Decimal('200.00'), Decimal('-300.00')])
+        self.assertEqual([e.balance_after for e in entries], [Decimal('1200.00'), Decimal('900.00')])
+        self.assertEqual(entries[0].bank_id, self.bank.id)
+        self.assertEqual(entries[0].branch_id, self.branch.id)
+        self.assertEqual(entries[0].currency_id, self.usd.id)
+        self.assertEqual(entries[0].description, 'Deposit')
+
+    def test_insufficient_balance_checked_in_database(self):
+        stale = BankAccount.objects.get(pk=self.account.pk)
+        self.account.update_balance(Decimal('900.00'), user=self.user, increase=False)
+
+        # The stale instance still thinks 1000.00 is available
+        with self.assertRaises(ValidationError):
+            stale.update_balance(Decimal('500.00'), user=self.user, increase=False)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_balance, Decimal('100.00'))
+        self.assertEqual(CashPositionEntry.objects.count(), 1)
+
+    def test_overdraft_may_go_negative(self):
+        overdraft = self.create_account(self.branch, 'OD-1', self.usd, balance='0.00',
+                                        account_type=BankAccount.OVERDRAFT)
+
+        self.assertEqual(overdraft.update_balance(Decimal('250.00'), increase=False), Decimal('-250.00'))
+
+    def test_ledger_is_append_only(self):
+        self.account.update_balance(Decimal('10.00'))
+        entry = CashPositionEntry.objects.get()
+
+        entry.description = 'Changed'
+        with self.assertRaises(ValidationError):
+            entry.save()
+        with self.assertRaises(ValidationError):
+            entry.delete()
+
+    def test_branch_total_balance(self):
+        self.create_account(self.branch, 'ACC-2', self.usd, balance='250.50')
+        self.create_account(self.branch, 'ACC-3', self.eur, balance='99.00')
+
+        self.assertEqual(self.branch.get_total_balance(), Decimal('1349.50'))
+        self.assertEqual(self.branch.get_total_balance(currency=self.eur), Decimal('99.00'))
+        self.assertEqual(self.other_branch.get_total_balance(), Decimal('0.00'))
+
+
+class CashPositionTests(CashPositionTestCase):
+    """Test CashPositionEntry.get_cash_position() and GET /accounts/cash_position/"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+        self.usd_account_2 = self.create_account(self.branch, 'ACC-2', self.usd)
+        self.eur_account = self.create_account(self.branch, 'ACC-3', self.eur)
+        self.other_account = self.create_account(self.other_branch, 'ACC-4', self.usd)
+
+        jan_5, jan_6 = date(2026, 1, 5), date(2026, 1, 6)
+        self.account.update_balance(Decimal('100.00'), position_date=jan_5)
+        self.account.update_balance(Decimal('40.00'), increase=False, position_date=jan_5)
+        self.usd_account_2.update_balance(Decimal('10.00'), position_date=jan_5)
+        self.eur_account.update_balance(Decimal('70.00'), position_date=jan_5)
+        self.other_account.update_balance(Decimal('5.00'), position_date=jan_6)
+
+    def test_group_by_bank_splits_currencies(self):
+        rows = list(CashPositionEntry.get_cash_position(group_by='bank'))
+
+        self.assertEqual(rows, [
+            {'bank_id': self.bank.id, 'currency_id': self.usd.id, 'position_date': date(2026, 1, 5),
+             'inflow': Decimal('110.00'), 'outflow': Decimal('40.00'),
+             'net_movement': Decimal('70.00'), 'movement_count': 3},
+            {'bank_id': self.bank.id, 'currency_id': self.eur.id, 'position_date': date(2026, 1, 5),
+             'inflow': Decimal('70.00'), 'outflow': Decimal('0.00'),
+             'net_movement': Decimal('70.00'), 'movement_count': 1},
+            {'bank_id': self.other_bank.id, 'currency_id': self.usd.id, 'position_date': date(2026, 1, 6),
+             'inflow': Decimal('5.00'), 'outflow': Decimal('0.00'),
+             'net_movement': Decimal('5.00'), 'movement_count': 1},
+        ])
+
+    def test_filters_and_single_query(self):
+        with self.assertNumQueries(1):
+            rows = list(CashPositionEntry.get_cash_position(
+                date_from=date(2026, 1, 6), currency=self.usd, group_by='branch'
+            ))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['branch_id'], self.other_branch.id)
+
+    def test_cash_balances(self):
+        """Opening and closing balances per group, back-dated entries included"""
+        self.other_account.update_balance(Decimal('20.00'), increase=False, position_date=date(2026, 1, 4))
+
+        with self.assertNumQueries(1):
+            rows = list(CashPositionEntry.get_cash_balances(
+                date_from=date(2026, 1, 5), date_to=date(2026, 1, 5), group_by='bank'
+            ))
+
+        self.assertEqual(rows, [
+            {'bank_id': self.bank.id, 'currency_id': self.usd.id,
+             'opening_balance': Decimal('2000.00'), 'closing_balance': Decimal('2070.00')},
+            {'bank_id': self.bank.id, 'currency_id': self.eur.id,
+             'opening_balance': Decimal('1000.00'), 'closing_balance': Decimal('1070.00')},
+            {'bank_id': self.other_bank.id, 'currency_id': self.usd.id,
+             'opening_balance': Decimal('980.00'), 'closing_balance': Decimal('980.00')},
+        ])
+        rows = CashPositionEntry.get_cash_balances(account=self.other_account.id, group_by='account')
+        self.assertEqual(list(rows), [
+            {'bank_account_id': self.other_account.id, 'currency_id': self.usd.id,
+             'opening_balance': Decimal('1000.00'), 'closing_balance': Decimal('985.00')},
+        ])
+
+    def test_invalid_group_by(self):
+        with self.assertRaises(ValidationError):
+            CashPositionEntry.get_cash_position(group_by='region')
+
+    def test_cash_position_endpoint(self):
+        response = self.client.get('/finance/cash/accounts/cash_position/', {
+            'group_by': 'account', 'bank': self.bank.id, 'currency': self.usd.id
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        first = response.data['results'][0]
+        self.assertEqual(first['bank_account_id'], self.account.id)
+        self.assertEqual(first['net_movement'], 60.0)
+        self.assertEqual(first['movement_count'], 2)
+        self.assertEqual(response.data['balances'], [
+            {'bank_account_id': self.account.id, 'currency_id': self.usd.id,
+             'opening_balance': 1000.0, 'closing_balance': 1060.0},
+            {'bank_account_id': self.usd_account_2.id, 'currency_id': self.usd.id,
+             'opening_balance': 1000.0, 'closing_balance': 1010.0},
+        ])
+
+    def test_cash_position_endpoint_rejects_bad_params(self):
+        response = self.client.get('/finance/cash/accounts/cash_position/', {'group_by': 'region'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/finance/cash/accounts/cash_position/', {'date_from': 'not-a-date'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for name in ('bank', 'branch', 'currency', 'account'):
+            response = self.client.get('/finance/cash/accounts/cash_position/', {name: 'abc'})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -17,7 +17,7 @@ import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import date
 
-from .models import PaymentType, Bank, BankBranch, BankAccount, BankStatement, BankStatementLine, BankStatementLineMatch
+from .models import PaymentType, Bank, BankBranch, BankAccount, CashPositionEntry, BankStatement, BankStatementLine, BankStatementLineMatch
 from .serializers import (
     PaymentTypeListSerializer,
     PaymentTypeDetailSerializer,
@@ -409,6 +409,7 @@ class BankAccountViewSet(viewsets.ModelViewSet):
     - GET /accounts/{id}/balance/ - Get balance summary
     - GET /accounts/{id}/check_balance/ - Check if sufficient balance
     - GET /accounts/{id}/hierarchy/ - Get full bank hierarchy
+    - GET /accounts/cash_position/ - Daily cash position by bank/branch/account/currency
     """
     queryset = BankAccount.objects.select_related(
         'branch__bank',
@@ -500,7 +501,8 @@ class BankAccountViewSet(viewsets.ModelViewSet):
                 new_balance = account.update_balance(
                     amount=amount,
                     user=request.user,
-                    increase=increase
+                    increase=increase,
+                    description=serializer.validated_data.get('description', '')
                 )
                 
                 return Response({
@@ -603,6 +605,77 @@ class BankAccountViewSet(viewsets.ModelViewSet):
         account = self.get_object()
         hierarchy = account.get_full_hierarchy()
         return Response(hierarchy, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def cash_position(self, request):
+        """
+        Daily cash position from the cash-position ledger.
+        
+        GET /accounts/cash_position/?group_by=bank&date_from=2026-01-01&date_to=2026-01-31
+        
+        Query Parameters:
+        - group_by: bank (default), branch, account or currency
+        - date_from / date_to: Inclusive date range (YYYY-MM-DD)
+        - bank, branch, currency, account: Optional ID filters
+        
+        Rows are always split by currency. `results` holds the daily
+        movements, `balances` the opening and closing balance per group.
+        """
+        params = request.query_params
+        group_by = params.get('group_by', 'bank')
+        
+        filters = {}
+        for name in ('bank', 'branch', 'currency', 'account'):
+            value = params.get(name)
+            if value and not value.isdigit():
+                return Response(
+                    {'error': f"Invalid {name} ID '{value}'"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            filters[name] = value
+        
+        try:
+            rows = CashPositionEntry.get_cash_position(
+                date_from=params.get('date_from'),
+                date_to=params.get('date_to'),
+                group_by=group_by,
+                **filters
+            )
+            results = [
+                {
+                    **{key: value for key, value in row.items()
+                       if key not in ('inflow', 'outflow', 'net_movement')},
+                    'inflow': float(row['inflow']),
+                    'outflow': float(row['outflow']),
+                    'net_movement': float(row['net_movement']),
+                }
+                for row in rows
+            ]
+            balances = [
+                {
+                    **row,
+                    'opening_balance': float(row['opening_balance']),
+                    'closing_balance': float(row['closing_balance']),
+                }
+                for row in CashPositionEntry.get_cash_balances(
+                    date_from=params.get('date_from'),
+                    date_to=params.get('date_to'),
+                    group_by=group_by,
+                    **filters
+                )
+            ]
+        except ValidationError as e:
+            return Response(
+                {'error': e.messages[0]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            'group_by': group_by,
+            'count': len(results),
+            'results': results,
+            'balances': balances,
+        }, status=status.HTTP_200_OK)
 
 
 # ==================== BANK STATEMENT VIEWSET ====================
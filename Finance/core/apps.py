@@ -5,3 +5,6 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Finance.core'
     label = 'finance_core'  # Unique label for this app
+
+    def ready(self):
+        import Finance.core.signals  # noqa: F401
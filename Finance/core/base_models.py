@@ -208,19 +208,8 @@ class ChildModelManagerMixin:
                 f"{self.__class__.__name__} must set 'parent_model' class attribute"
             )
         
-        # Get all parent field names dynamically
-        parent_field_names = self.parent_model.get_field_names()
-        
-        # Extract parent fields from kwargs
-        parent_fields = {}
-        for field_name in parent_field_names:
-            if field_name in kwargs:
-                parent_fields[field_name] = kwargs.pop(field_name)
-        
-        # Apply defaults
-        for key, value in self.parent_defaults.items():
-            if key not in parent_fields:
-                parent_fields[key] = value
+        # Extract parent fields from kwargs (defaults applied)
+        parent_fields = self._extract_parent_fields(kwargs)
         
         # Create parent (with permission)
         parent = self.parent_model(**parent_fields)
@@ -236,6 +225,72 @@ class ChildModelManagerMixin:
         
         return child
     
+    def bulk_create_with_parents(self, rows, batch_size=None):
+        """
+        Create many child instances along with their parents.
+        
+        Set-based counterpart of create(): each row is the same kwargs dict
+        create() accepts. Parents are inserted with one bulk INSERT per batch,
+        then children with another, instead of two INSERTs per row.
+        
+        Note: like QuerySet.bulk_create(), model save() overrides are NOT
+        called - callers are responsible for validating rows up front.
+        Parent foreign keys may be given as objects or as '<field>_id' values.
+        
+        Args:
+            rows: List of kwargs dicts (parent + child fields)
+            batch_size: Rows per INSERT statement (None = all at once)
+        
+        Returns:
+            list: Created child instances, in the order of rows
+        """
+        if self.parent_model is None:
+            raise NotImplementedError(
+                f"{self.__class__.__name__} must set 'parent_model' class attribute"
+            )
+        
+        parent_field_name = self._get_parent_field_name()
+        
+        parents = []
+        children_kwargs = []
+        for row in rows:
+            child_fields = dict(row)
+            parents.append(self.parent_model(**self._extract_parent_fields(child_fields)))
+            children_kwargs.append(child_fields)
+        
+        # Parent managers block bulk_create() - the base manager is the sanctioned path
+        self.parent_model._base_manager.bulk_create(parents, batch_size=batch_size)
+        
+        children = []
+        for parent, child_fields in zip(parents, children_kwargs):
+            child_fields[parent_field_name] = parent
+            children.append(self.model(**child_fields))
+        
+        return super().bulk_create(children, batch_size=batch_size)
+    
+    def _extract_parent_fields(self, kwargs):
+        """
+        Pop parent fields (by name or '<field>_id' attname) out of kwargs.
+        
+        Returns:
+            dict: Parent field values with parent_defaults applied
+        """
+        parent_fields = {}
+        for field_name in self.parent_model.get_field_names():
+            if field_name in kwargs:
+                parent_fields[field_name] = kwargs.pop(field_name)
+                continue
+            attname = getattr(self.parent_model._meta.get_field(field_name), 'attname', None)
+            if attname and attname != field_name and attname in kwargs:
+                parent_fields[attname] = kwargs.pop(attname)
+        
+        # Apply defaults
+        for key, value in self.parent_defaults.items():
+            if key not in parent_fields:
+                parent_fields[key] = value
+        
+        return parent_fields
+    
     def active(self):
         """
         Default active() method - filters by is_active field if it exists.
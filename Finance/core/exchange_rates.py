@@ -0,0 +1,185 @@
+"""
+Exchange Rate Tables
+
+Historical exchange rates (ExchangeRate) are looked up as of a transaction
+date. Converting thousands of invoice or journal lines one query per line is
+too slow, so every rate of one rate type into the base currency is loaded
+once into a process-wide RateTable and looked up in memory:
+
+    table = get_rate_table(ExchangeRate.CLOSING)
+    for line in lines:
+        base_amount = table.convert(line.amount, line.currency_id, line.date)
+
+Tables are valid for one exchange rate version, kept in the default cache,
+which is shared by every worker process (required outside DEBUG by
+core.user_accounts.principal.require_shared_cache(); with a per-process
+cache, other workers would keep their tables indefinitely). The version is
+bumped (Finance.core.signals) when a currency or exchange rate is saved or
+deleted, and by ExchangeRate.objects.load_rates() after a bulk load. Other
+queryset-level writes must call bump_exchange_rate_version() themselves.
+"""
+import csv
+import json
+import uuid
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+
+EXCHANGE_RATE_VERSION_CACHE_KEY = 'finance_core:exchange_rate_version'
+
+# Process-wide tables: {rate_type: RateTable}
+_rate_tables = {}
+
+
+class RateTable:
+    """
+    Rates of one rate type into the base currency.
+
+    Each currency's history is kept as parallel, date-sorted lists so an
+    as-of lookup is a binary search. Currencies without a rate on or before
+    the requested date fall back to Currency.exchange_rate_to_base_currency.
+    """
+
+    def __init__(self, rate_type, version, base_currency_id, live_rates, history):
+        self.rate_type = rate_type
+        self.version = version
+        self.base_currency_id = base_currency_id
+        self.live_rates = live_rates
+        self.history = history
+
+    def rate(self, currency_id, on_date=None):
+        """
+        Rate of one unit of a currency in the base currency.
+
+        Args:
+            currency_id: Currency primary key
+            on_date (date): Transaction date (default: the currency's live rate)
+
+        Raises:
+            ValidationError: If the currency does not exist
+        """
+        if currency_id == self.base_currency_id:
+            return Decimal('1')
+        if on_date is not None and currency_id in self.history:
+            dates, rates = self.history[currency_id]
+            index = bisect_right(dates, on_date)
+            if index:
+                return rates[index - 1]
+        try:
+            return self.live_rates[currency_id]
+        except KeyError:
+            raise ValidationError(f"Currency {currency_id} does not exist")
+
+    def convert(self, amount, currency_id, on_date=None):
+        """Amount in a currency converted to the base currency as of a date"""
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        return amount * self.rate(currency_id, on_date)
+
+
+def get_exchange_rate_version():
+    """Current exchange rate version (created on first use)"""
+    version = cache.get(EXCHANGE_RATE_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(EXCHANGE_RATE_VERSION_CACHE_KEY, version, None)
+        version = cache.get(EXCHANGE_RATE_VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_exchange_rate_version():
+    """Invalidate every process' rate tables"""
+    cache.set(EXCHANGE_RATE_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+def _build_rate_table(rate_type, version):
+    from Finance.core.models import Currency, ExchangeRate
+
+    base_currency_id = None
+    live_rates = {}
+    for pk, is_base, rate in Currency.objects.values_list('pk', 'is_base_currency', 'exchange_rate_to_base_currency'):
+        live_rates[pk] = rate
+        if is_base:
+            base_currency_id = pk
+
+    history = {}
+    rows = ExchangeRate.objects.filter(
+        rate_type=rate_type, to_currency_id=base_currency_id
+    ).order_by('from_currency_id', 'effective_date').values_list('from_currency_id', 'effective_date', 'rate')
+    for currency_id, effective_date, rate in rows:
+        dates, rates = history.setdefault(currency_id, ([], []))
+        dates.append(effective_date)
+        rates.append(rate)
+
+    return RateTable(rate_type, version, base_currency_id, live_rates, history)
+
+
+def get_rate_table(rate_type='SPOT'):
+    """
+    Process-wide rate table of one rate type (built on first use per version).
+
+    Costs one cache lookup when the table is current, two queries otherwise.
+    """
+    version = get_exchange_rate_version()
+    table = _rate_tables.get(rate_type)
+    if table is None or table.version != version:
+        table = _build_rate_table(rate_type, version)
+        _rate_tables[rate_type] = table
+    return table
+
+
+def parse_rate_file(path, file_format=None):
+    """
+    Read exchange rate rows from a CSV or JSON file.
+
+    CSV files need a header row; JSON files hold a list of objects (or
+    {"rates": [...]}). Both use the keys accepted by
+    ExchangeRate.objects.load_rates(): from_currency, to_currency (optional),
+    rate_type (optional), effective_date and rate.
+
+    Args:
+        path: File path
+        file_format: 'csv' or 'json' (default: from the file extension)
+
+    Returns:
+        list of dicts
+    """
+    file_format = (file_format or path.rsplit('.', 1)[-1]).lower()
+    with open(path, newline='', encoding='utf-8') as rate_file:
+        if file_format == 'csv':
+            return list(csv.DictReader(rate_file))
+        if file_format == 'json':
+            data = json.load(rate_file)
+            return data.get('rates', []) if isinstance(data, dict) else data
+    raise ValueError(f"Unsupported exchange rate file format '{file_format}' (expected csv or json)")
+
+
+def clean_rate_row(row, line):
+    """
+    Normalise one exchange rate row.
+
+    Returns:
+        tuple: (from_code, to_code or None, rate_type or None, effective_date, rate)
+
+    Raises:
+        ValidationError: If a value is missing or invalid
+    """
+    try:
+        from_code = str(row['from_currency']).strip().upper()
+        to_code = str(row.get('to_currency') or '').strip().upper() or None
+        rate_type = str(row.get('rate_type') or '').strip().upper() or None
+        effective_date = row['effective_date']
+        if not isinstance(effective_date, date):
+            effective_date = date.fromisoformat(str(effective_date).strip())
+        rate = Decimal(str(row['rate']).strip())
+    except KeyError as e:
+        raise ValidationError(f"Row {line}: missing {e.args[0]}")
+    except (ValueError, InvalidOperation):
+        raise ValidationError(f"Row {line}: invalid effective_date or rate")
+    if not rate.is_finite() or rate <= 0:
+        raise ValidationError(f"Row {line}: rate must be greater than zero")
+    return from_code, to_code, rate_type, effective_date, rate
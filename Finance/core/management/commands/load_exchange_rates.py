@@ -0,0 +1,61 @@
+"""
+Django management command to bulk load exchange rates from a file.
+
+Reads a CSV (with header row) or JSON file of rates and upserts them with
+ExchangeRate.objects.load_rates(): rates already stored for the same
+currencies, rate type and date are replaced. Nothing is written if any row is
+invalid.
+
+File columns / keys:
+    from_currency, to_currency (optional: base currency),
+    rate_type (optional), effective_date (YYYY-MM-DD), rate
+
+Usage:
+    python manage.py load_exchange_rates rates.csv
+    python manage.py load_exchange_rates closing.json --rate-type CLOSING
+    python manage.py load_exchange_rates rates.txt --format csv
+"""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from Finance.core.exchange_rates import parse_rate_file
+from Finance.core.models import ExchangeRate
+
+
+class Command(BaseCommand):
+    help = 'Bulk load effective-dated exchange rates from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file of exchange rates')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='File format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--rate-type',
+            choices=[choice for choice, _ in ExchangeRate.RATE_TYPES],
+            help='Rate type for rows without one (default: SPOT)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            rows = parse_rate_file(options['path'], options.get('format'))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        self.stdout.write('=' * 60)
+        self.stdout.write('EXCHANGE RATE LOAD')
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'Rows read: {len(rows)}')
+
+        try:
+            loaded = ExchangeRate.objects.load_rates(rows, rate_type=options.get('rate_type'))
+        except ValidationError as e:
+            for message in e.messages:
+                self.stdout.write(self.style.ERROR(message))
+            raise CommandError('No exchange rates were loaded')
+
+        self.stdout.write(f'Rates written: {loaded}')
+        self.stdout.write('=' * 60)
+        self.stdout.write(self.style.SUCCESS(f'✓ Loaded {loaded} exchange rate(s)'))
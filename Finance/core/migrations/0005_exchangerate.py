@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance_core', '0004_alter_country_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rate_type', models.CharField(choices=[('SPOT', 'Spot'), ('AVERAGE', 'Average'), ('CLOSING', 'Closing')], default='SPOT', max_length=10)),
+                ('effective_date', models.DateField()),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('from_currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exchange_rates', to='finance_core.currency')),
+                ('to_currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inverse_exchange_rates', to='finance_core.currency')),
+            ],
+            options={
+                'verbose_name': 'Exchange Rate',
+                'verbose_name_plural': 'Exchange Rates',
+                'ordering': ['from_currency', 'to_currency', 'rate_type', '-effective_date'],
+                'unique_together': {('from_currency', 'to_currency', 'rate_type', 'effective_date')},
+            },
+        ),
+    ]
@@ -2,10 +2,21 @@
 Finance Core Models
 Shared models used across all Finance sub-apps
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, When, Value, Exists, OuterRef, Q
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+from .exchange_rates import bump_exchange_rate_version, clean_rate_row, get_rate_table
+
+
+# Ids per reference-check query in ProtectedDeleteMixin bulk lookups
+REFERENCE_CHECK_BATCH_SIZE = 500
+
+# Compiled reference checks per model: {model class: [(label, queryset), ...]}
+_reference_checks = {}
+
 
 class ProtectedDeleteMixin:
     """
@@ -14,6 +25,12 @@ class ProtectedDeleteMixin:
     This mixin dynamically discovers all foreign key references using Django's _meta API,
     so you never need to manually update the code when new models reference this one.
     
+    The reverse relations are compiled once per model into EXISTS subqueries,
+    so checking a record costs one query however many models reference it:
+    - is_referenced(): EXISTS(...) OR EXISTS(...), stops at the first reference
+    - get_references(): which models reference the record
+    - get_deletable_ids() / get_references_for_ids(): the same for many ids at once
+    
     Usage:
         class MyModel(ProtectedDeleteMixin, models.Model):
             # your fields here
@@ -39,37 +56,106 @@ class ProtectedDeleteMixin:
                     return str(value)
         return str(self)
     
+    @classmethod
+    def _get_reference_checks(cls):
+        """
+        (label, queryset) per reverse relation, each queryset filtered on an
+        OuterRef to this model's referenced field.
+        
+        One-to-one relations (parent/child records) and hidden relations
+        are not references.
+        """
+        checks = _reference_checks.get(cls)
+        if checks is None:
+            checks = []
+            for related_object in cls._meta.related_objects:
+                if related_object.one_to_one or related_object.hidden:
+                    continue
+                related_model = related_object.related_model
+                model_name = related_model._meta.verbose_name_plural or related_model.__name__
+                
+                if related_object.many_to_many:
+                    field = related_object.field
+                    through = related_object.through
+                    queryset = through._base_manager.filter(**{field.m2m_reverse_field_name(): OuterRef('pk')})
+                else:
+                    field = related_object.field
+                    queryset = related_model._base_manager.filter(
+                        **{field.name: OuterRef(field.target_field.attname)}
+                    )
+                checks.append((str(model_name).title(), queryset.order_by()))
+            _reference_checks[cls] = checks
+        return checks
+    
+    def is_referenced(self):
+        """
+        Check whether any other record references this one.
+        
+        Returns:
+            bool: True if at least one reference exists (one query)
+        """
+        checks = self._get_reference_checks()
+        if not checks or self.pk is None:
+            return False
+        condition = Q()
+        for _, queryset in checks:
+            condition |= Exists(queryset)
+        return type(self)._base_manager.filter(condition, pk=self.pk).exists()
+    
+    def get_references(self):
+        """
+        Names of the models that reference this record.
+        
+        Returns:
+            list: Model names, e.g. ['Journal Entries', 'Invoices'] (one query)
+        """
+        if self.pk is None:
+            return []
+        return self.get_references_for_ids([self.pk]).get(self.pk, [])
+    
+    @classmethod
+    def get_references_for_ids(cls, ids):
+        """
+        Names of the models referencing each of many records.
+        
+        Args:
+            ids: Iterable of primary keys
+        
+        Returns:
+            dict: {pk: [model names]} for every existing pk (one query per
+            REFERENCE_CHECK_BATCH_SIZE ids); unknown pks are left out
+        """
+        checks = cls._get_reference_checks()
+        labels = {f'_ref_{index}': label for index, (label, _) in enumerate(checks)}
+        flags = {f'_ref_{index}': Exists(queryset) for index, (_, queryset) in enumerate(checks)}
+        
+        ids = list(dict.fromkeys(ids))
+        references = {}
+        for start in range(0, len(ids), REFERENCE_CHECK_BATCH_SIZE):
+            batch = ids[start:start + REFERENCE_CHECK_BATCH_SIZE]
+            rows = cls._base_manager.filter(pk__in=batch).annotate(**flags).values_list('pk', *flags)
+            for pk, *referenced in rows:
+                references[pk] = [label for label, is_set in zip(labels.values(), referenced) if is_set]
+        return references
+    
+    @classmethod
+    def get_deletable_ids(cls, ids):
+        """
+        Ids of the given records that no other record references.
+        
+        Returns:
+            set: Existing, unreferenced primary keys
+        """
+        return {pk for pk, references in cls.get_references_for_ids(ids).items() if not references}
+    
     def delete(self, *args, **kwargs):
         """
         Override delete to prevent deletion if this instance is referenced by other models.
         Uses Django's meta API to dynamically discover all related objects.
         """
-        # Get all related objects dynamically
-        references = []
-        
-        # Get all reverse foreign key relations
-        for related_object in self._meta.related_objects:
-            # Get the related model and accessor name
-            related_model = related_object.related_model
-            accessor_name = related_object.get_accessor_name()
-            
-            try:
-                # Get the related manager (e.g., self.journal_entries)
-                related_manager = getattr(self, accessor_name)
-                
-                # Count related objects
-                count = related_manager.count()
-                
-                if count > 0:
-                    # Get a human-readable name for the related model
-                    model_name = related_model._meta.verbose_name_plural or related_model.__name__
-                    references.append(f"{model_name.title()} ({count} record(s))")
-            except Exception:
-                # Skip if there's any issue accessing the related objects
-                pass
-        
-        # If there are any references, prevent deletion
-        if references:
+        # One EXISTS query; the referencing models are only listed when needed
+        if self.is_referenced():
+            references = self.get_references()
             identifier = self.get_deletion_identifier()
             model_name = self._meta.verbose_name or self.__class__.__name__
             
@@ -82,7 +168,6 @@ class ProtectedDeleteMixin:
         super().delete(*args, **kwargs)
 
 
-
 class Currency(ProtectedDeleteMixin, models.Model):
     """Currency master data"""
     code = models.CharField(max_length=3, unique=True)  # USD, EUR, etc.
@@ -174,26 +259,41 @@ class Currency(ProtectedDeleteMixin, models.Model):
         """
         Update exchange rates for all currencies when base currency changes.
         
+        Each currency takes its latest stored spot rate into the new base
+        currency; only currencies without one are fetched from the API.
+        All currencies are then written with a single UPDATE.
+        
         Args:
             old_base_currency_code: The code of the previous base currency (if any)
         """
         # Get all currencies except this one (the new base)
-        all_currencies = Currency.objects.exclude(pk=self.pk)
+        currency_ids = dict(Currency.objects.exclude(pk=self.pk).values_list('pk', 'code'))
+        if not currency_ids:
+            bump_exchange_rate_version()
+            return
         
-        for currency in all_currencies:
-            # Fetch the exchange rate from API
-            exchange_rate = self._fetch_exchange_rate_from_api(
-                from_currency=currency.code,
-                to_currency=self.code
-            )
-            
-            # Update the currency's exchange rate
-            currency.exchange_rate_to_base_currency = exchange_rate
-            # Use update to avoid triggering save() recursion
-            Currency.objects.filter(pk=currency.pk).update(
-                exchange_rate_to_base_currency=exchange_rate,
-                is_base_currency=False  # Ensure old base is no longer base
-            )
+        # Latest stored rate per currency: rows are ordered so the last one wins
+        stored_rates = dict(ExchangeRate.objects.filter(
+            from_currency_id__in=currency_ids,
+            to_currency=self,
+            rate_type=ExchangeRate.SPOT,
+            effective_date__lte=timezone.now().date(),
+        ).order_by('from_currency_id', 'effective_date').values_list('from_currency_id', 'rate'))
+        
+        exchange_rates = {
+            pk: stored_rates.get(pk) or self._fetch_exchange_rate_from_api(from_currency=code, to_currency=self.code)
+            for pk, code in currency_ids.items()
+        }
+        
+        # Use update to avoid triggering save() recursion
+        Currency.objects.filter(pk__in=exchange_rates).update(
+            exchange_rate_to_base_currency=Case(
+                *[When(pk=pk, then=Value(rate)) for pk, rate in exchange_rates.items()],
+                output_field=models.DecimalField(max_digits=10, decimal_places=4)
+            ),
+            is_base_currency=False  # Ensure old base is no longer base
+        )
+        bump_exchange_rate_version()
     
     @staticmethod
     def _fetch_exchange_rate_from_api(from_currency, to_currency):
@@ -235,12 +335,34 @@ class Currency(ProtectedDeleteMixin, models.Model):
         # Return 1.0 as placeholder
         return Decimal('1.0000')
     
-    def convert_to_base_currency(self, amount):
+    def get_rate_to_base(self, on_date=None, rate_type='SPOT'):
+        """
+        Rate of one unit of this currency in the base currency.
+        
+        Args:
+            on_date (date): Transaction date; the latest ExchangeRate effective
+                on or before it is used (default: exchange_rate_to_base_currency)
+            rate_type (str): ExchangeRate rate type (default: SPOT)
+        
+        Returns:
+            Decimal: Exchange rate
+        """
+        if self.is_base_currency:
+            from decimal import Decimal
+            return Decimal('1')
+        if on_date is None:
+            return self.exchange_rate_to_base_currency
+        return get_rate_table(rate_type).rate(self.pk, on_date)
+    
+    def convert_to_base_currency(self, amount, on_date=None, rate_type='SPOT'):
         """
         Convert an amount in this currency to the base currency.
         
         Args:
             amount: The amount in this currency (Decimal or float)
+            on_date (date): Convert at the rate effective on this date
+                (default: exchange_rate_to_base_currency)
+            rate_type (str): ExchangeRate rate type (default: SPOT)
         
         Returns:
             Decimal: The equivalent amount in the base currency
@@ -253,11 +375,16 @@ class Currency(ProtectedDeleteMixin, models.Model):
             amount_in_usd = eur_currency.convert_to_base_currency(amount_in_eur)
             # Returns: Decimal('110.00')
             
+            # At the closing rate of a past date:
+            eur_currency.convert_to_base_currency(amount_in_eur, date(2025, 12, 31), 'CLOSING')
+            
             # If USD is base currency:
             usd_currency = Currency.objects.get(code='USD')
             amount_in_usd = Decimal('100.00')
             same_amount = usd_currency.convert_to_base_currency(amount_in_usd)
             # Returns: Decimal('100.00') (no conversion needed)
+        
+        To convert many lines use get_rate_table(rate_type).convert() directly.
         """
         from decimal import Decimal
         
@@ -270,11 +397,127 @@ class Currency(ProtectedDeleteMixin, models.Model):
             return amount
         
         # Convert to base currency using the exchange rate
-        # exchange_rate_to_base_currency represents: 1 unit of this currency = X units of base currency
-        base_amount = amount * self.exchange_rate_to_base_currency
+        # The rate represents: 1 unit of this currency = X units of base currency
+        base_amount = amount * self.get_rate_to_base(on_date, rate_type)
         
         return base_amount
+
+
+class ExchangeRateManager(models.Manager):
+    """Bulk loading of exchange rates"""
     
+    BATCH_SIZE = 1000
+    
+    @transaction.atomic
+    def load_rates(self, rows, rate_type=None):
+        """
+        Insert or update many exchange rates (one upsert per BATCH_SIZE rows).
+        
+        Args:
+            rows: Iterable of dicts with from_currency and optional to_currency
+                (currency codes; to_currency defaults to the base currency),
+                optional rate_type, effective_date (date or YYYY-MM-DD) and rate
+            rate_type (str): Rate type for rows without one (default: SPOT)
+        
+        Returns:
+            int: Number of rates written
+        
+        Raises:
+            ValidationError: If any row is invalid; nothing is written
+        """
+        rate_type = rate_type or ExchangeRate.SPOT
+        valid_types = {choice for choice, _ in ExchangeRate.RATE_TYPES}
+        cleaned = [clean_rate_row(row, line) for line, row in enumerate(rows, start=1)]
+        
+        # All currency codes resolved in one query
+        codes = {from_code for from_code, *_ in cleaned} | {to_code for _, to_code, *_ in cleaned if to_code}
+        currencies = dict(Currency.objects.filter(code__in=codes).values_list('code', 'pk'))
+        base_currency_id = Currency.objects.filter(is_base_currency=True).values_list('pk', flat=True).first()
+        
+        rates = {}
+        errors = []
+        for line, (from_code, to_code, row_type, effective_date, rate) in enumerate(cleaned, start=1):
+            row_type = row_type or rate_type
+            from_id = currencies.get(from_code)
+            to_id = currencies.get(to_code) if to_code else base_currency_id
+            if from_id is None or (to_code and to_id is None):
+                errors.append(f"Row {line}: unknown currency {from_code if from_id is None else to_code}")
+            elif to_id is None:
+                errors.append(f"Row {line}: no base currency configured")
+            elif from_id == to_id:
+                errors.append(f"Row {line}: from_currency and to_currency must differ")
+            elif row_type not in valid_types:
+                errors.append(f"Row {line}: invalid rate_type '{row_type}'")
+            else:
+                # A later row for the same key replaces an earlier one
+                rates[(from_id, to_id, row_type, effective_date)] = rate
+        if errors:
+            raise ValidationError(errors)
+        
+        self.bulk_create(
+            [
+                self.model(
+                    from_currency_id=from_id, to_currency_id=to_id, rate_type=row_type,
+                    effective_date=effective_date, rate=rate
+                )
+                for (from_id, to_id, row_type, effective_date), rate in rates.items()
+            ],
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['from_currency', 'to_currency', 'rate_type', 'effective_date'],
+            update_fields=['rate'],
+        )
+        # bulk_create sends no signals
+        bump_exchange_rate_version()
+        return len(rates)
+
+
+class ExchangeRate(models.Model):
+    """
+    Exchange rate effective from a date, per rate type.
+    
+    1 unit of from_currency = rate units of to_currency, from effective_date
+    until the next rate of the same currencies and type. Conversions use the
+    rates into the base currency (see Finance.core.exchange_rates).
+    
+    Rate types:
+        - SPOT: Daily rate for transactions
+        - AVERAGE: Period average rate for reporting
+        - CLOSING: Period-end rate for revaluation
+    """
+    SPOT = 'SPOT'
+    AVERAGE = 'AVERAGE'
+    CLOSING = 'CLOSING'
+    RATE_TYPES = [
+        (SPOT, 'Spot'),
+        (AVERAGE, 'Average'),
+        (CLOSING, 'Closing'),
+    ]
+    
+    from_currency = models.ForeignKey(Currency, on_delete=models.CASCADE, related_name='exchange_rates')
+    to_currency = models.ForeignKey(Currency, on_delete=models.CASCADE, related_name='inverse_exchange_rates')
+    rate_type = models.CharField(max_length=10, choices=RATE_TYPES, default=SPOT)
+    effective_date = models.DateField()
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+    
+    objects = ExchangeRateManager()
+    
+    class Meta:
+        verbose_name = 'Exchange Rate'
+        verbose_name_plural = 'Exchange Rates'
+        ordering = ['from_currency', 'to_currency', 'rate_type', '-effective_date']
+        unique_together = (('from_currency', 'to_currency', 'rate_type', 'effective_date'),)
+    
+    def __str__(self):
+        return f"{self.from_currency_id}->{self.to_currency_id} {self.rate_type} {self.effective_date}: {self.rate}"
+    
+    def clean(self):
+        if self.from_currency_id == self.to_currency_id:
+            raise ValidationError("from_currency and to_currency must differ")
+        if self.rate is not None and self.rate <= 0:
+            raise ValidationError({'rate': "Rate must be greater than zero"})
+
+
 class Country(ProtectedDeleteMixin, models.Model):
     code = models.CharField(max_length=3, unique=True)  # AE, SA, etc.
     name = models.CharField(max_length=100)
@@ -1,9 +1,9 @@
 """
 Serializers for Finance Core models.
-Handles serialization/deserialization of Currency, Country, and TaxRate models for API endpoints.
+Handles serialization/deserialization of Currency, ExchangeRate, Country, and TaxRate models for API endpoints.
 """
 from rest_framework import serializers
-from .models import Currency, Country, TaxRate
+from .models import Currency, Country, TaxRate, ExchangeRate
 
 
 class CurrencySerializer(serializers.ModelSerializer):
@@ -45,6 +45,27 @@ class CurrencyListSerializer(serializers.ModelSerializer):
         ]
 
 
+class ExchangeRateSerializer(serializers.ModelSerializer):
+    """
+    Serializer for listing exchange rates.
+    """
+    from_currency_code = serializers.CharField(source='from_currency.code', read_only=True)
+    to_currency_code = serializers.CharField(source='to_currency.code', read_only=True)
+    
+    class Meta:
+        model = ExchangeRate
+        fields = [
+            'id',
+            'from_currency',
+            'from_currency_code',
+            'to_currency',
+            'to_currency_code',
+            'rate_type',
+            'effective_date',
+            'rate',
+        ]
+
+
 class CountrySerializer(serializers.ModelSerializer):
     """
     Serializer for Country model.
@@ -0,0 +1,19 @@
+"""
+Finance Core Signals
+
+Invalidate the process-wide exchange rate tables (Finance.core.exchange_rates)
+whenever a currency or an exchange rate changes.
+"""
+from django.db.models.signals import post_delete, post_save
+
+from Finance.core.exchange_rates import bump_exchange_rate_version
+from Finance.core.models import Currency, ExchangeRate
+
+
+def exchange_rates_changed(sender, **kwargs):
+    bump_exchange_rate_version()
+
+
+for model in (Currency, ExchangeRate):
+    post_save.connect(exchange_rates_changed, sender=model, dispatch_uid=f'exchange_rates_{model.__name__}_saved')
+    post_delete.connect(exchange_rates_changed, sender=model, dispatch_uid=f'exchange_rates_{model.__name__}_deleted')
@@ -0,0 +1,236 @@
+"""
+Exchange Rate Tests
+
+Covers:
+- ExchangeRate.objects.load_rates(): upsert, validation, defaults
+- RateTable / get_rate_table(): as-of lookups, cache invalidation, no per-line queries
+- Currency.convert_to_base_currency() with a date and rate type
+- Base currency switch using stored rates
+- /finance/core/exchange-rates/ and convert-to-base with a date
+- load_exchange_rates management command (CSV and JSON)
+"""
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.base.test_utils import create_test_currency
+from Finance.core.exchange_rates import get_rate_table
+from Finance.core.models import Currency, ExchangeRate
+
+
+class ExchangeRateTestCase(APITestCase):
+    """Base test case with USD as base currency and EUR rates loaded"""
+
+    def setUp(self):
+        self.usd = create_test_currency()
+        self.eur = create_test_currency(
+            'EUR', 'Euro', '€', is_base_currency=False, exchange_rate_to_base_currency=Decimal('1.1000')
+        )
+        self.gbp = create_test_currency(
+            'GBP', 'British Pound', '£', is_base_currency=False, exchange_rate_to_base_currency=Decimal('1.2500')
+        )
+        ExchangeRate.objects.load_rates([
+            {'from_currency': 'EUR', 'effective_date': '2026-01-01', 'rate': '1.0500'},
+            {'from_currency': 'EUR', 'effective_date': '2026-02-01', 'rate': '1.0800'},
+            {'from_currency': 'EUR', 'effective_date': '2026-01-31', 'rate': '1.0700', 'rate_type': 'CLOSING'},
+        ])
+
+
+class ExchangeRateModelTests(ExchangeRateTestCase):
+
+    def test_load_rates_upserts(self):
+        loaded = ExchangeRate.objects.load_rates([
+            {'from_currency': 'eur', 'to_currency': 'USD', 'effective_date': date(2026, 2, 1), 'rate': '1.0900'},
+            {'from_currency': 'GBP', 'effective_date': '2026-02-01', 'rate': 1.27},
+        ])
+
+        self.assertEqual(loaded, 2)
+        self.assertEqual(ExchangeRate.objects.count(), 4)
+        self.assertEqual(
+            ExchangeRate.objects.get(from_currency=self.eur, rate_type='SPOT', effective_date=date(2026, 2, 1)).rate,
+            Decimal('1.09')
+        )
+
+    def test_load_rates_query_count_is_constant(self):
+        rows = [
+            {'from_currency': 'GBP', 'effective_date': date(2025, 1, 1).replace(day=day), 'rate': '1.2'}
+            for day in range(1, 29)
+        ]
+        # Savepoint, currencies, base currency, upsert, release
+        with self.assertNumQueries(5):
+            ExchangeRate.objects.load_rates(rows)
+
+    def test_load_rates_rejects_invalid_rows(self):
+        bad_rows = [
+            {'from_currency': 'XXX', 'effective_date': '2026-01-01', 'rate': '1'},
+            {'from_currency': 'USD', 'effective_date': '2026-01-01', 'rate': '1'},
+            {'from_currency': 'EUR', 'effective_date': '2026-01-01', 'rate': '1', 'rate_type': 'WEEKLY'},
+        ]
+        with self.assertRaises(ValidationError) as ctx:
+            ExchangeRate.objects.load_rates(bad_rows)
+        self.assertEqual(len(ctx.exception.messages), 3)
+
+        for row in ({'from_currency': 'EUR', 'effective_date': '2026-13-01', 'rate': '1'},
+                    {'from_currency': 'EUR', 'effective_date': '2026-01-01', 'rate': '-1'},
+                    {'from_currency': 'EUR', 'rate': '1'}):
+            with self.assertRaises(ValidationError):
+                ExchangeRate.objects.load_rates([row])
+        self.assertEqual(ExchangeRate.objects.count(), 3)
+
+    def test_rate_as_of_date(self):
+        table = get_rate_table()
+
+        self.assertEqual(table.rate(self.eur.pk, date(2026, 1, 15)), Decimal('1.05'))
+        self.assertEqual(table.rate(self.eur.pk, date(2026, 2, 1)), Decimal('1.08'))
+        # Before the first stored rate, and without a date: the live rate
+        self.assertEqual(table.rate(self.eur.pk, date(2025, 12, 31)), Decimal('1.1'))
+        self.assertEqual(table.rate(self.eur.pk), Decimal('1.1'))
+        # No history at all
+        self.assertEqual(table.rate(self.gbp.pk, date(2026, 1, 15)), Decimal('1.25'))
+        self.assertEqual(table.rate(self.usd.pk, date(2026, 1, 15)), Decimal('1'))
+        self.assertEqual(get_rate_table('CLOSING').rate(self.eur.pk, date(2026, 2, 15)), Decimal('1.07'))
+
+    def test_convert_to_base_currency_with_date(self):
+        self.assertEqual(self.eur.convert_to_base_currency(Decimal('100')), Decimal('110'))
+        self.assertEqual(self.eur.convert_to_base_currency(Decimal('100'), date(2026, 1, 20)), Decimal('105'))
+        self.assertEqual(
+            self.eur.convert_to_base_currency(Decimal('100'), date(2026, 3, 1), ExchangeRate.CLOSING),
+            Decimal('107')
+        )
+        self.assertEqual(self.usd.convert_to_base_currency(Decimal('100'), date(2026, 1, 20)), Decimal('100'))
+
+    def test_conversions_cost_no_queries_per_line(self):
+        lines = [(Decimal('10.00'), self.eur.pk, date(2026, 1, day)) for day in range(1, 29)] * 50
+        get_rate_table()
+
+        with self.assertNumQueries(0):
+            table = get_rate_table()
+            total = sum(table.convert(amount, currency_id, on_date) for amount, currency_id, on_date in lines)
+
+        self.assertEqual(total, Decimal('10.50') * len(lines))
+
+    def test_changes_invalidate_the_table(self):
+        self.assertEqual(get_rate_table().rate(self.eur.pk, date(2026, 3, 1)), Decimal('1.08'))
+
+        ExchangeRate.objects.create(
+            from_currency=self.eur, to_currency=self.usd, effective_date=date(2026, 3, 1), rate=Decimal('1.1200')
+        )
+        self.assertEqual(get_rate_table().rate(self.eur.pk, date(2026, 3, 1)), Decimal('1.12'))
+
+        self.gbp.exchange_rate_to_base_currency = Decimal('1.3000')
+        self.gbp.save()
+        self.assertEqual(get_rate_table().rate(self.gbp.pk), Decimal('1.3'))
+
+    def test_base_currency_switch_uses_stored_rates(self):
+        ExchangeRate.objects.load_rates([
+            {'from_currency': 'USD', 'to_currency': 'GBP', 'effective_date': '2026-01-01', 'rate': '0.8000'},
+        ])
+        self.usd.is_base_currency = False
+        Currency.objects.filter(pk=self.usd.pk).update(is_base_currency=False)
+
+        self.gbp.is_base_currency = True
+        self.gbp.save()
+
+        rates = dict(Currency.objects.values_list('code', 'exchange_rate_to_base_currency'))
+        self.assertEqual(rates['USD'], Decimal('0.8'))
+        # No stored EUR->GBP rate: falls back to the rate API
+        self.assertEqual(rates['EUR'], Decimal('1'))
+        self.assertEqual(rates['GBP'], Decimal('1'))
+        self.assertEqual(get_rate_table().base_currency_id, self.gbp.pk)
+
+
+class ExchangeRateAPITests(ExchangeRateTestCase):
+
+    url = '/finance/core/exchange-rates/'
+
+    def test_list_exchange_rates(self):
+        response = self.client.get(self.url, {'from_currency': 'eur', 'rate_type': 'spot', 'date_from': '2026-01-15'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['data']['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['from_currency_code'], 'EUR')
+        self.assertEqual(results[0]['to_currency_code'], 'USD')
+        self.assertEqual(results[0]['effective_date'], '2026-02-01')
+
+    def test_bulk_load_exchange_rates(self):
+        response = self.client.post(self.url, {
+            'rate_type': 'AVERAGE',
+            'rates': [
+                {'from_currency': 'EUR', 'effective_date': '2026-01-31', 'rate': '1.0650'},
+                {'from_currency': 'GBP', 'effective_date': '2026-01-31', 'rate': '1.2600'},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['loaded'], 2)
+        self.assertEqual(ExchangeRate.objects.filter(rate_type='AVERAGE').count(), 2)
+
+        response = self.client.post(self.url, {'rates': [{'from_currency': 'XXX'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_convert_to_base_as_of_date(self):
+        response = self.client.post(
+            f'/finance/core/currencies/{self.eur.id}/convert-to-base/',
+            {'amount': 100, 'date': '2026-01-31', 'rate_type': 'CLOSING'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(response.data['base_amount']), Decimal('107'))
+        self.assertEqual(Decimal(response.data['exchange_rate']), Decimal('1.07'))
+
+        response = self.client.post(
+            f'/finance/core/currencies/{self.eur.id}/convert-to-base/',
+            {'amount': 100, 'date': 'yesterday'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LoadExchangeRatesCommandTests(ExchangeRateTestCase):
+
+    def write_file(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as rate_file:
+            rate_file.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_load_csv(self):
+        path = self.write_file('.csv', (
+            'from_currency,to_currency,effective_date,rate\n'
+            'GBP,USD,2026-01-01,1.2700\n'
+            'GBP,,2026-02-01,1.2800\n'
+        ))
+        out = StringIO()
+
+        call_command('load_exchange_rates', path, '--rate-type', 'CLOSING', stdout=out)
+
+        self.assertIn('Rates written: 2', out.getvalue())
+        self.assertEqual(ExchangeRate.objects.filter(from_currency=self.gbp, rate_type='CLOSING').count(), 2)
+
+    def test_load_json(self):
+        path = self.write_file('.json', json.dumps({'rates': [
+            {'from_currency': 'GBP', 'effective_date': '2026-01-01', 'rate': '1.2700'},
+        ]}))
+
+        call_command('load_exchange_rates', path, stdout=StringIO())
+
+        self.assertEqual(get_rate_table().rate(self.gbp.pk, date(2026, 1, 2)), Decimal('1.27'))
+
+    def test_invalid_file_loads_nothing(self):
+        path = self.write_file('.csv', 'from_currency,effective_date,rate\nGBP,2026-01-01,1.27\nXXX,2026-01-01,1\n')
+
+        with self.assertRaises(CommandError):
+            call_command('load_exchange_rates', path, stdout=StringIO())
+        self.assertFalse(ExchangeRate.objects.filter(from_currency=self.gbp).exists())
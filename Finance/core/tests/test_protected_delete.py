@@ -0,0 +1,100 @@
+"""
+Protected Delete Tests
+
+Covers:
+- ProtectedDeleteMixin reference checks compiled into single queries
+- delete() of referenced and unreferenced records
+- Bulk deletion check endpoint /finance/core/deletable/
+"""
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.base.test_utils import create_test_currency
+from Finance.core.models import Country, Currency, ExchangeRate, TaxRate
+
+
+class ProtectedDeleteTestCase(APITestCase):
+    """Base test case with currencies, countries and records referencing some of them"""
+
+    def setUp(self):
+        self.usd = create_test_currency()
+        self.eur = create_test_currency('EUR', 'Euro', '€', is_base_currency=False)
+        self.gbp = create_test_currency('GBP', 'British Pound', '£', is_base_currency=False)
+        ExchangeRate.objects.create(
+            from_currency=self.eur, to_currency=self.usd, effective_date='2026-01-01', rate=Decimal('1.08')
+        )
+        self.ae = Country.objects.create(code='AE', name='United Arab Emirates')
+        self.us = Country.objects.create(code='US', name='United States')
+        TaxRate.objects.create(name='VAT', rate=Decimal('5.00'), country=self.ae)
+
+
+class ProtectedDeleteMixinTests(ProtectedDeleteTestCase):
+
+    def test_is_referenced_is_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.eur.is_referenced())
+        with self.assertNumQueries(1):
+            self.assertTrue(self.usd.is_referenced())
+        with self.assertNumQueries(1):
+            self.assertFalse(self.gbp.is_referenced())
+
+    def test_get_references(self):
+        self.assertEqual(self.eur.get_references(), ['Exchange Rates'])
+        self.assertEqual(self.usd.get_references(), ['Exchange Rates'])
+        self.assertEqual(self.ae.get_references(), ['Tax Rates'])
+        self.assertEqual(self.gbp.get_references(), [])
+
+    def test_bulk_references_are_one_query(self):
+        ids = [self.usd.pk, self.eur.pk, self.gbp.pk, 99999]
+
+        with self.assertNumQueries(1):
+            references = Currency.get_references_for_ids(ids)
+
+        self.assertEqual(set(references), {self.usd.pk, self.eur.pk, self.gbp.pk})
+        self.assertEqual(Currency.get_deletable_ids(ids), {self.gbp.pk})
+
+    def test_delete_referenced_record_fails(self):
+        with self.assertRaises(ValidationError) as ctx:
+            self.ae.delete()
+
+        self.assertIn("Cannot delete country 'AE' because it is referenced by: Tax Rates", str(ctx.exception))
+        self.assertTrue(Country.objects.filter(pk=self.ae.pk).exists())
+
+    def test_delete_unreferenced_record(self):
+        self.us.delete()
+        self.gbp.delete()
+
+        self.assertFalse(Country.objects.filter(code='US').exists())
+        self.assertFalse(Currency.objects.filter(code='GBP').exists())
+
+
+class DeletableRecordsAPITests(ProtectedDeleteTestCase):
+
+    url = '/finance/core/deletable/'
+
+    def test_deletable_records(self):
+        response = self.client.post(self.url, {
+            'model': 'finance_core.Currency',
+            'ids': [self.gbp.pk, self.eur.pk, 99999, self.gbp.pk],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deletable_ids'], [self.gbp.pk])
+        self.assertEqual(response.data['not_found_ids'], [99999])
+        self.assertEqual(response.data['results'], [
+            {'id': self.gbp.pk, 'deletable': True, 'referenced_by': []},
+            {'id': self.eur.pk, 'deletable': False, 'referenced_by': ['Exchange Rates']},
+        ])
+
+    def test_invalid_requests(self):
+        for body in (
+            {'model': 'nope.Model', 'ids': [1]},
+            {'model': 'finance_core.ExchangeRate', 'ids': [1]},
+            {'model': 'finance_core.Country', 'ids': []},
+            {'model': 'finance_core.Country', 'ids': ['abc']},
+        ):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, body)
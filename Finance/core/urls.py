@@ -14,6 +14,9 @@ urlpatterns = [
     path('currencies/<int:pk>/convert-to-base/', views.currency_convert_to_base, name='currency-convert-to-base'),
     path('currencies/base/', views.currency_get_base, name='currency-get-base'),
     
+    # Exchange rate endpoints
+    path('exchange-rates/', views.exchange_rate_list, name='exchange-rate-list'),
+    
     # Country endpoints
     path('countries/', views.country_list, name='country-list'),
     path('countries/<int:pk>/', views.country_detail, name='country-detail'),
@@ -23,4 +26,7 @@ urlpatterns = [
     path('tax-rates/', views.tax_rate_list, name='tax-rate-list'),
     path('tax-rates/<int:pk>/', views.tax_rate_detail, name='tax-rate-detail'),
     path('tax-rates/<int:pk>/toggle-active/', views.tax_rate_toggle_active, name='tax-rate-toggle-active'),
+    
+    # Deletion checks (any ProtectedDeleteMixin model)
+    path('deletable/', views.deletable_records, name='deletable-records'),
 ]
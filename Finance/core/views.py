@@ -1,19 +1,21 @@
 """
 API Views for Finance Core models.
-Provides REST API endpoints for Currency, Country, and TaxRate.
+Provides REST API endpoints for Currency, ExchangeRate, Country, and TaxRate.
 """
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from django.apps import apps
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 
 from erp_project.pagination import auto_paginate
 
-from .models import Currency, Country, TaxRate
+from .models import Currency, Country, TaxRate, ExchangeRate, ProtectedDeleteMixin
 from .serializers import (
     CurrencySerializer,
     CurrencyListSerializer,
+    ExchangeRateSerializer,
     CountrySerializer,
     CountryListSerializer,
     TaxRateSerializer,
@@ -168,7 +170,9 @@ def currency_convert_to_base(request, pk):
     
     Request body:
         {
-            "amount": 100.00
+            "amount": 100.00,
+            "date": "2025-12-31",      (optional: convert at the rate effective on this date)
+            "rate_type": "CLOSING"     (optional: SPOT, AVERAGE or CLOSING; default SPOT)
         }
     
     Returns:
@@ -189,10 +193,21 @@ def currency_convert_to_base(request, pk):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    on_date = request.data.get('date')
+    rate_type = request.data.get('rate_type', ExchangeRate.SPOT)
+    if rate_type not in dict(ExchangeRate.RATE_TYPES):
+        return Response(
+            {'error': f"Invalid rate_type '{rate_type}'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
     try:
+        from datetime import date
         from decimal import Decimal
         amount = Decimal(str(amount))
-        base_amount = currency.convert_to_base_currency(amount)
+        on_date = date.fromisoformat(on_date) if on_date else None
+        exchange_rate = currency.get_rate_to_base(on_date, rate_type)
+        base_amount = currency.convert_to_base_currency(amount, on_date, rate_type)
         
         # Get base currency
         base_currency = Currency.objects.filter(is_base_currency=True).first()
@@ -202,11 +217,11 @@ def currency_convert_to_base(request, pk):
             'original_currency': currency.code,
             'base_amount': str(base_amount),
             'base_currency': base_currency.code if base_currency else None,
-            'exchange_rate': str(currency.exchange_rate_to_base_currency)
+            'exchange_rate': str(exchange_rate)
         }, status=status.HTTP_200_OK)
     except (ValueError, TypeError) as e:
         return Response(
-            {'error': f'Invalid amount: {str(e)}'},
+            {'error': f'Invalid amount or date: {str(e)}'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
@@ -238,6 +253,77 @@ def currency_get_base(request):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+# ============================================================================
+# Exchange Rate API Views
+# ============================================================================
+
+@api_view(['GET', 'POST'])
+@auto_paginate
+def exchange_rate_list(request):
+    """
+    List exchange rates or bulk load them.
+    
+    GET /exchange-rates/
+    - Returns exchange rates, newest first per currency pair and rate type
+    - Query params:
+        - from_currency: Filter by source currency code
+        - to_currency: Filter by target currency code
+        - rate_type: Filter by rate type (SPOT, AVERAGE, CLOSING)
+        - date_from / date_to: Effective date window (YYYY-MM-DD)
+    
+    POST /exchange-rates/
+    - Insert or update many rates in one request
+    - Request body:
+        {
+            "rate_type": "SPOT",    (optional default for rows without one)
+            "rates": [
+                {"from_currency": "EUR", "effective_date": "2026-01-01", "rate": "1.0850"},
+                {"from_currency": "GBP", "to_currency": "USD", "rate_type": "CLOSING",
+                 "effective_date": "2025-12-31", "rate": "1.2710"}
+            ]
+        }
+      to_currency defaults to the base currency.
+    """
+    if request.method == 'GET':
+        rates = ExchangeRate.objects.select_related('from_currency', 'to_currency')
+        
+        from_currency = request.query_params.get('from_currency')
+        if from_currency:
+            rates = rates.filter(from_currency__code__iexact=from_currency)
+        
+        to_currency = request.query_params.get('to_currency')
+        if to_currency:
+            rates = rates.filter(to_currency__code__iexact=to_currency)
+        
+        rate_type = request.query_params.get('rate_type')
+        if rate_type:
+            rates = rates.filter(rate_type=rate_type.upper())
+        
+        date_from = request.query_params.get('date_from')
+        if date_from:
+            rates = rates.filter(effective_date__gte=date_from)
+        
+        date_to = request.query_params.get('date_to')
+        if date_to:
+            rates = rates.filter(effective_date__lte=date_to)
+        
+        serializer = ExchangeRateSerializer(rates, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    
+    elif request.method == 'POST':
+        rows = request.data.get('rates')
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {'error': 'rates must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            loaded = ExchangeRate.objects.load_rates(rows, rate_type=request.data.get('rate_type'))
+        except ValidationError as e:
+            return Response({'error': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'loaded': loaded}, status=status.HTTP_201_CREATED)
+
+
 # ============================================================================
 # Country API Views
 # ============================================================================
@@ -496,3 +582,74 @@ def tax_rate_toggle_active(request, pk):
         'category': tax_rate.category,
         'is_active': tax_rate.is_active
     }, status=status.HTTP_200_OK)
+
+
+# ============================================================================
+# Deletion Check API Views
+# ============================================================================
+
+@api_view(['POST'])
+def deletable_records(request):
+    """
+    Report which of many records can be deleted.
+    
+    POST /deletable/
+    - Works for every model using ProtectedDeleteMixin
+    - Request body:
+        {
+            "model": "finance_core.Currency",
+            "ids": [1, 2, 3]
+        }
+    
+    Returns:
+        {
+            "model": "finance_core.Currency",
+            "deletable_ids": [3],
+            "not_found_ids": [],
+            "results": [
+                {"id": 1, "deletable": false, "referenced_by": ["Invoices", "Journal Entries"]},
+                {"id": 3, "deletable": true, "referenced_by": []}
+            ]
+        }
+    """
+    model_path = request.data.get('model')
+    ids = request.data.get('ids')
+    
+    try:
+        model_class = apps.get_model(model_path)
+    except (LookupError, ValueError, TypeError):
+        return Response(
+            {'error': f"'{model_path}' is not an installed model (expected 'app_label.ModelName')"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not issubclass(model_class, ProtectedDeleteMixin):
+        return Response(
+            {'error': f"{model_path} does not support deletion checks"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not isinstance(ids, list) or not ids:
+        return Response(
+            {'error': 'ids must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        ids = [model_class._meta.pk.to_python(pk) for pk in ids]
+    except ValidationError:
+        return Response(
+            {'error': 'ids contains an invalid id'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    ids = list(dict.fromkeys(ids))
+    references = model_class.get_references_for_ids(ids)
+    results = [
+        {'id': pk, 'deletable': not references[pk], 'referenced_by': references[pk]}
+        for pk in ids if pk in references
+    ]
+    return Response({
+        'model': model_class._meta.label,
+        'deletable_ids': [result['id'] for result in results if result['deletable']],
+        'not_found_ids': [pk for pk in ids if pk not in references],
+        'results': results,
+    }, status=status.HTTP_200_OK)
@@ -1,7 +1,7 @@
 from django.apps import AppConfig
 
 
-# class FixedAssetsConfig(AppConfig):
-#     default_auto_field = 'django.db.models.BigAutoField'
-#     name = 'Finance.fixed_assets'
-#     verbose_name = 'Fixed Assets'
+class FixedAssetsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'Finance.fixed_assets'
+    verbose_name = 'Fixed Assets'
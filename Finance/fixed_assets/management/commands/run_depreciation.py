@@ -0,0 +1,65 @@
+"""
+Django management command to run period-end depreciation.
+
+Usage:
+    python manage.py run_depreciation --period 2026-01-31
+    python manage.py run_depreciation --period 2026-01-31 --book FIN
+"""
+
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from Finance.fixed_assets.models import DepreciationBook
+from Finance.fixed_assets.services import DepreciationService
+
+
+class Command(BaseCommand):
+    help = 'Run period-end depreciation for one or all active depreciation books'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            required=True,
+            help='Any date in the period to depreciate (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--book',
+            help='Depreciation book code (default: all active books)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DepreciationService.BATCH_SIZE,
+            help='Rows per bulk insert',
+        )
+
+    def handle(self, *args, **options):
+        period_date = parse_date(options['period'])
+        if period_date is None:
+            raise CommandError(f"Invalid period date '{options['period']}'")
+        
+        books = DepreciationBook.objects.filter(is_active=True)
+        if options.get('book'):
+            books = books.filter(code=options['book'])
+            if not books.exists():
+                raise CommandError(f"Active depreciation book '{options['book']}' does not exist")
+        
+        for book in books:
+            started = time.monotonic()
+            try:
+                run = DepreciationService.run_depreciation(
+                    book, period_date, batch_size=options['batch_size']
+                )
+            except ValidationError as e:
+                self.stdout.write(self.style.ERROR(f'{book.code}: {e.messages[0]}'))
+                continue
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'✓ {book.code} {run.period_date}: {run.assets_processed} asset(s), '
+                    f'total {run.total_depreciation} in {time.monotonic() - started:.1f}s'
+                )
+            )
@@ -0,0 +1,197 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:49
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('finance_core', '0004_alter_country_code'),
+        ('finance_gl', '0002_journalentry_stored_totals'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location_code', models.CharField(max_length=100, unique=True)),
+                ('location_name', models.CharField(max_length=500)),
+                ('location_segments', models.JSONField(blank=True, default=dict)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['location_code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=50, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('default_useful_life_months', models.IntegerField(default=60, validators=[django.core.validators.MinValueValidator(1)])),
+                ('default_salvage_value_percent', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('accumulated_depreciation_account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='accumulated_depreciation_categories', to='finance_gl.xx_segment_combination')),
+                ('asset_account', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='asset_categories', to='finance_gl.xx_segment_combination')),
+                ('depreciation_expense_account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='depreciation_expense_categories', to='finance_gl.xx_segment_combination')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='fixed_assets.assetcategory')),
+            ],
+            options={
+                'verbose_name_plural': 'Asset Categories',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Asset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_number', models.CharField(db_index=True, max_length=50, unique=True)),
+                ('description', models.CharField(max_length=500)),
+                ('serial_number', models.CharField(blank=True, max_length=200)),
+                ('manufacturer', models.CharField(blank=True, max_length=200)),
+                ('model', models.CharField(blank=True, max_length=200)),
+                ('acquisition_date', models.DateField()),
+                ('in_service_date', models.DateField()),
+                ('original_cost', models.DecimalField(decimal_places=2, max_digits=15, validators=[django.core.validators.MinValueValidator(0)])),
+                ('quantity', models.DecimalField(decimal_places=2, default=1, max_digits=10, validators=[django.core.validators.MinValueValidator(0)])),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('ACTIVE', 'Active'), ('RETIRED', 'Retired')], default='DRAFT', max_length=20)),
+                ('cost_center', models.CharField(blank=True, max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='created_assets', to=settings.AUTH_USER_MODEL)),
+                ('custodian', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custodian_assets', to=settings.AUTH_USER_MODEL)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='assets', to='fixed_assets.assetcategory')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='assets', to='fixed_assets.location')),
+            ],
+            options={
+                'ordering': ['asset_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DepreciationBook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=50, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('book_type', models.CharField(choices=[('FINANCIAL', 'Financial'), ('TAX', 'Tax'), ('IFRS', 'IFRS'), ('MANAGEMENT', 'Management')], max_length=20)),
+                ('is_primary', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='depreciation_books', to='finance_core.currency')),
+            ],
+            options={
+                'ordering': ['code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetBook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cost', models.DecimalField(decimal_places=2, max_digits=15, validators=[django.core.validators.MinValueValidator(0)])),
+                ('salvage_value', models.DecimalField(decimal_places=2, default=0, max_digits=15, validators=[django.core.validators.MinValueValidator(0)])),
+                ('accumulated_depreciation', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('net_book_value', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('useful_life_months', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('remaining_life_months', models.IntegerField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('depreciation_start_date', models.DateField()),
+                ('last_depreciation_date', models.DateField(blank=True, null=True)),
+                ('next_depreciation_date', models.DateField(blank=True, null=True)),
+                ('is_fully_depreciated', models.BooleanField(default=False)),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='books', to='fixed_assets.asset')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='asset_books', to='fixed_assets.depreciationbook')),
+            ],
+            options={
+                'ordering': ['asset', 'book'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DepreciationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_date', models.DateField(help_text='Period end date (month end)')),
+                ('assets_processed', models.IntegerField(default=0)),
+                ('total_depreciation', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('run_at', models.DateTimeField(auto_now=True)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='depreciation_runs', to='fixed_assets.depreciationbook')),
+                ('journal_entry', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='depreciation_run', to='finance_gl.journalentry')),
+                ('run_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='depreciation_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-period_date', 'book'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_number', models.CharField(db_index=True, max_length=50, unique=True)),
+                ('transaction_type', models.CharField(choices=[('ACQUISITION', 'Acquisition'), ('DEPRECIATION', 'Depreciation'), ('TRANSFER', 'Transfer'), ('RECATEGORIZE', 'Recategorization'), ('COST_ADJUSTMENT', 'Cost Adjustment'), ('DEPRECIATION_ADJUSTMENT', 'Depreciation Adjustment'), ('RETIREMENT', 'Retirement'), ('PHYSICAL_INVENTORY', 'Physical Inventory')], max_length=30)),
+                ('transaction_date', models.DateField()),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('quantity', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('transaction_details', models.JSONField(blank=True, default=dict)),
+                ('description', models.TextField(blank=True)),
+                ('reference', models.CharField(blank=True, max_length=200)),
+                ('approval_status', models.CharField(choices=[('DRAFT', 'Draft'), ('PENDING', 'Pending Approval'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], default='DRAFT', max_length=20)),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('is_posted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('approved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='approved_transactions', to=settings.AUTH_USER_MODEL)),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='transactions', to='fixed_assets.asset')),
+                ('asset_book', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transactions', to='fixed_assets.assetbook')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='created_transactions', to=settings.AUTH_USER_MODEL)),
+                ('from_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transactions_from', to='fixed_assets.assetcategory')),
+                ('journal_entry', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='asset_transactions', to='finance_gl.journalentry')),
+                ('to_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transactions_to', to='fixed_assets.assetcategory')),
+                ('depreciation_run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transactions', to='fixed_assets.depreciationrun')),
+                ('from_location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transactions_from', to='fixed_assets.location')),
+                ('to_location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transactions_to', to='fixed_assets.location')),
+            ],
+            options={
+                'ordering': ['-transaction_date', '-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='assetbook',
+            index=models.Index(fields=['book', 'is_fully_depreciated', 'last_depreciation_date'], name='fixed_asset_book_id_4bfb39_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='assetbook',
+            unique_together={('asset', 'book')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='depreciationrun',
+            unique_together={('book', 'period_date')},
+        ),
+        migrations.AddIndex(
+            model_name='assettransaction',
+            index=models.Index(fields=['asset', 'transaction_type'], name='fixed_asset_asset_i_558c40_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assettransaction',
+            index=models.Index(fields=['asset_book', 'transaction_type', 'transaction_date'], name='fixed_asset_asset_b_d6cf03_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assettransaction',
+            index=models.Index(fields=['transaction_date'], name='fixed_asset_transac_11a91f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['status', 'category'], name='fixed_asset_status_4c1820_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['location'], name='fixed_asset_locatio_18d77c_idx'),
+        ),
+    ]
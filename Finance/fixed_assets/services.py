@@ -0,0 +1,229 @@
+"""
+Fixed Assets Service Layer
+
+Period-end depreciation run.
+
+A run handles every eligible asset book of one depreciation book for one
+period in set-based batches:
+1. Eligible books are streamed once and their straight-line amounts computed
+2. Depreciation transactions are bulk inserted per batch
+3. All asset books are updated with one UPDATE joined to the run's transactions
+4. One summarized journal entry is written for the book and period
+
+Runs are safe to repeat: re-running a period whose journal is not posted
+first reverses the earlier run, then depreciates again.
+"""
+import calendar
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Q, Case, When, Value, Max, OuterRef, Subquery
+from django.db.models.functions import Least
+from django.utils.dateparse import parse_date
+
+from Finance.GL.models import JournalEntry, JournalLine
+from Finance.fixed_assets.models import (
+    Asset,
+    AssetBook,
+    AssetCategory,
+    AssetTransaction,
+    DepreciationRun,
+)
+
+
+class DepreciationService:
+    """Period-end depreciation for a depreciation book"""
+
+    BATCH_SIZE = 2000
+
+    @staticmethod
+    def period_end(period_date):
+        """Month end for any date in the period (accepts date or 'YYYY-MM-DD')"""
+        if isinstance(period_date, str):
+            period_date = parse_date(period_date)
+        last_day = calendar.monthrange(period_date.year, period_date.month)[1]
+        return period_date.replace(day=last_day)
+
+    @staticmethod
+    @transaction.atomic
+    def run_depreciation(book, period_date, user=None, batch_size=None):
+        """
+        Depreciate all eligible asset books of `book` for the period.
+
+        Args:
+            book: DepreciationBook
+            period_date: Any date in the period (normalized to month end)
+            user: User running depreciation (for audit)
+            batch_size: Rows per bulk insert (default BATCH_SIZE)
+
+        Returns:
+            DepreciationRun: The run with totals and its journal entry
+
+        Raises:
+            ValidationError: If the period is posted or a later period was already run
+        """
+        batch_size = batch_size or DepreciationService.BATCH_SIZE
+        period_date = DepreciationService.period_end(period_date)
+
+        if DepreciationRun.objects.filter(book=book, period_date__gt=period_date).exists():
+            raise ValidationError(
+                f"Depreciation for book {book.code} has already been run for a period after {period_date}."
+            )
+
+        run, created = DepreciationRun.objects.select_for_update().select_related(
+            'journal_entry'
+        ).get_or_create(book=book, period_date=period_date)
+        if not created:
+            DepreciationService._reverse_run(run)
+
+        journal_entry = JournalEntry.objects.create(
+            date=period_date,
+            currency_id=book.currency_id,
+            memo=f"Depreciation {book.code} {period_date:%Y-%m}"
+        )
+
+        eligible = AssetBook.objects.filter(
+            book=book,
+            asset__status=Asset.ACTIVE,
+            is_fully_depreciated=False,
+            depreciation_start_date__lte=period_date,
+        ).filter(
+            Q(last_depreciation_date__isnull=True) | Q(last_depreciation_date__lt=period_date)
+        )
+
+        # 1-2. Compute amounts and bulk insert transactions batch by batch
+        totals_by_category = {}
+        assets_processed = 0
+        pending = []
+        rows = eligible.order_by().values_list(
+            'id', 'asset_id', 'asset__category_id',
+            'cost', 'salvage_value', 'net_book_value', 'useful_life_months', 'remaining_life_months'
+        ).iterator(chunk_size=batch_size)
+
+        for book_id, asset_id, category_id, cost, salvage_value, net_book_value, life, remaining_life in rows:
+            amount = AssetBook.straight_line_amount(cost, salvage_value, net_book_value, life, remaining_life)
+            if amount <= 0:
+                continue
+            pending.append(AssetTransaction(
+                transaction_number=f"DEP-{run.pk}-{book_id}",
+                asset_id=asset_id,
+                asset_book_id=book_id,
+                transaction_type=AssetTransaction.DEPRECIATION,
+                transaction_date=period_date,
+                amount=amount,
+                approval_status='APPROVED',
+                depreciation_run=run,
+                journal_entry=journal_entry,
+                created_by=user,
+            ))
+            totals_by_category[category_id] = totals_by_category.get(category_id, Decimal('0.00')) + amount
+            assets_processed += 1
+            if len(pending) >= batch_size:
+                AssetTransaction.objects.bulk_create(pending)
+                pending = []
+        if pending:
+            AssetTransaction.objects.bulk_create(pending)
+
+        # Books with nothing left to depreciate
+        eligible.filter(
+            Q(net_book_value__lte=F('salvage_value')) | Q(remaining_life_months=0)
+        ).update(is_fully_depreciated=True)
+
+        # 3. Apply the run to every asset book in one UPDATE
+        amount = Subquery(
+            AssetTransaction.objects.filter(
+                depreciation_run=run, asset_book=OuterRef('pk')
+            ).order_by().values('amount')[:1]
+        )
+        AssetBook.objects.filter(transactions__depreciation_run=run).update(
+            accumulated_depreciation=F('accumulated_depreciation') + amount,
+            net_book_value=F('net_book_value') - amount,
+            remaining_life_months=Case(
+                When(remaining_life_months__gt=0, then=F('remaining_life_months') - 1),
+                default=Value(0)
+            ),
+            # The last month of useful life takes the remainder down to salvage
+            is_fully_depreciated=Case(
+                When(remaining_life_months__lte=1, then=Value(True)),
+                When(net_book_value__lte=F('salvage_value') + amount, then=Value(True)),
+                default=Value(False)
+            ),
+            last_depreciation_date=period_date,
+            next_depreciation_date=DepreciationService.period_end(period_date + timedelta(days=1)),
+        )
+
+        # 4. One summarized journal for the book and period
+        total = sum(totals_by_category.values(), Decimal('0.00'))
+        if total:
+            DepreciationService._write_journal_lines(journal_entry, totals_by_category)
+        else:
+            journal_entry.delete()
+            journal_entry = None
+
+        run.assets_processed = assets_processed
+        run.total_depreciation = total
+        run.journal_entry = journal_entry
+        run.run_by = user
+        run.save()
+        return run
+
+    @staticmethod
+    def _write_journal_lines(journal_entry, totals_by_category):
+        """Debit expense / credit accumulated depreciation, summarized by account"""
+        accounts = AssetCategory.objects.filter(pk__in=totals_by_category).values_list(
+            'id', 'depreciation_expense_account_id', 'accumulated_depreciation_account_id'
+        )
+        debits = {}
+        credits = {}
+        for category_id, expense_account_id, accumulated_account_id in accounts:
+            amount = totals_by_category[category_id]
+            debits[expense_account_id] = debits.get(expense_account_id, Decimal('0.00')) + amount
+            credits[accumulated_account_id] = credits.get(accumulated_account_id, Decimal('0.00')) + amount
+
+        JournalLine.objects.bulk_create(
+            [
+                JournalLine(entry=journal_entry, amount=amount, type='DEBIT', segment_combination_id=combination_id)
+                for combination_id, amount in debits.items()
+            ] + [
+                JournalLine(entry=journal_entry, amount=amount, type='CREDIT', segment_combination_id=combination_id)
+                for combination_id, amount in credits.items()
+            ]
+        )
+
+    @staticmethod
+    def _reverse_run(run):
+        """Undo an unposted run so the period can be depreciated again"""
+        if run.journal_entry_id and run.journal_entry.posted:
+            raise ValidationError(
+                f"Depreciation for book {run.book.code} {run.period_date} is posted and cannot be re-run."
+            )
+
+        amount = Subquery(
+            AssetTransaction.objects.filter(
+                depreciation_run=run, asset_book=OuterRef('pk')
+            ).order_by().values('amount')[:1]
+        )
+        previous_date = Subquery(
+            AssetTransaction.objects.filter(
+                asset_book=OuterRef('pk'),
+                transaction_type=AssetTransaction.DEPRECIATION,
+                transaction_date__lt=run.period_date,
+            ).order_by().values('asset_book').annotate(last=Max('transaction_date')).values('last')
+        )
+        AssetBook.objects.filter(transactions__depreciation_run=run).update(
+            accumulated_depreciation=F('accumulated_depreciation') - amount,
+            net_book_value=F('net_book_value') + amount,
+            remaining_life_months=Least(F('remaining_life_months') + 1, F('useful_life_months')),
+            is_fully_depreciated=False,
+            last_depreciation_date=previous_date,
+            next_depreciation_date=run.period_date,
+        )
+
+        run.transactions.all().delete()
+        if run.journal_entry_id:
+            journal_entry = run.journal_entry
+            run.journal_entry = None
+            run.save(update_fields=['journal_entry'])
+            journal_entry.delete()
@@ -0,0 +1 @@
+# Tests for Finance fixed assets module
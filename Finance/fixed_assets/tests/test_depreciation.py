@@ -0,0 +1,217 @@
+"""
+Depreciation Tests
+
+Covers:
+- AssetBook monthly depreciation (straight line, salvage value floor)
+- DepreciationService.run_depreciation(): journal entry, re-runs, period order,
+  independent books, constant query count
+- Depreciation run and history endpoints
+"""
+
+from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from decimal import Decimal
+from datetime import date
+
+from core.base.test_utils import create_test_currency, next_test_number
+from Finance.fixed_assets.models import (
+    AssetCategory, Location, DepreciationBook,
+    Asset, AssetBook, AssetTransaction, DepreciationRun
+)
+from Finance.fixed_assets.services import DepreciationService
+from Finance.GL.models import XX_Segment_combination, JournalEntry
+
+
+class DepreciationTestCase(TestCase):
+    """Base test case with a depreciation book, category and asset builder."""
+
+    def setUp(self):
+        self.currency = create_test_currency()
+        self.expense_account = XX_Segment_combination.objects.create(description='Depreciation expense')
+        self.accumulated_account = XX_Segment_combination.objects.create(description='Accumulated depreciation')
+        self.category = AssetCategory.objects.create(
+            code='VEHICLE',
+            name='Vehicles',
+            depreciation_expense_account=self.expense_account,
+            accumulated_depreciation_account=self.accumulated_account,
+        )
+        self.location = Location.objects.create(location_code='HQ', location_name='Head Office')
+        self.book = DepreciationBook.objects.create(
+            code='FIN', name='Financial', book_type='FINANCIAL', is_primary=True, currency=self.currency
+        )
+
+    def create_asset_book(self, cost='12000.00', salvage='0.00', life=60, status=Asset.ACTIVE,
+                          start=date(2026, 1, 1), book=None):
+        number = next_test_number()
+        asset = Asset.objects.create(
+            asset_number=f'FA-{number}',
+            description=f'Asset {number}',
+            category=self.category,
+            location=self.location,
+            acquisition_date=start,
+            in_service_date=start,
+            original_cost=Decimal(cost),
+            status=status,
+        )
+        return AssetBook.objects.create(
+            asset=asset,
+            book=book or self.book,
+            cost=Decimal(cost),
+            salvage_value=Decimal(salvage),
+            net_book_value=Decimal(cost),
+            useful_life_months=life,
+            remaining_life_months=life,
+            depreciation_start_date=start,
+        )
+
+
+class AssetBookTestCase(DepreciationTestCase):
+    """Tests for AssetBook model."""
+
+    def test_straight_line_depreciation(self):
+        # acquisition_cost = 12000, salvage_value = 0, useful_life = 60 months
+        asset_book = self.create_asset_book()
+        self.assertEqual(asset_book.calculate_monthly_depreciation(), Decimal('200.00'))
+
+    def test_depreciation_stops_at_salvage_value(self):
+        asset_book = self.create_asset_book(cost='1000.00', salvage='100.00', life=3)
+        asset_book.net_book_value = Decimal('150.00')
+        self.assertEqual(asset_book.calculate_monthly_depreciation(), Decimal('50.00'))
+
+
+class DepreciationRunTestCase(DepreciationTestCase):
+    """Tests for depreciation run."""
+
+    def test_run_depreciation(self):
+        first = self.create_asset_book()
+        second = self.create_asset_book(cost='1000.00', life=3)
+        self.create_asset_book(status=Asset.DRAFT)
+        self.create_asset_book(start=date(2026, 3, 1))
+
+        run = DepreciationService.run_depreciation(self.book, date(2026, 1, 15))
+
+        self.assertEqual(run.period_date, date(2026, 1, 31))
+        self.assertEqual(run.assets_processed, 2)
+        self.assertEqual(run.total_depreciation, Decimal('533.33'))
+
+        first.refresh_from_db()
+        self.assertEqual(first.accumulated_depreciation, Decimal('200.00'))
+        self.assertEqual(first.net_book_value, Decimal('11800.00'))
+        self.assertEqual(first.remaining_life_months, 59)
+        self.assertEqual(first.last_depreciation_date, date(2026, 1, 31))
+        self.assertEqual(first.next_depreciation_date, date(2026, 2, 28))
+        self.assertEqual(second.transactions.get().amount, Decimal('333.33'))
+
+        journal = JournalEntry.objects.get(pk=run.journal_entry_id)
+        self.assertEqual(journal.date, date(2026, 1, 31))
+        self.assertEqual(journal.line_count, 2)
+        self.assertEqual(journal.total_debit, Decimal('533.33'))
+        self.assertTrue(journal.is_balanced())
+        self.assertEqual(
+            journal.lines.get(type='DEBIT').segment_combination_id, self.expense_account.id
+        )
+        self.assertEqual(
+            journal.lines.get(type='CREDIT').segment_combination_id, self.accumulated_account.id
+        )
+
+    def test_last_period_reaches_salvage_and_stops(self):
+        asset_book = self.create_asset_book(cost='1000.00', life=3)
+
+        for month in (1, 2, 3, 4):
+            DepreciationService.run_depreciation(self.book, date(2026, month, 1))
+
+        asset_book.refresh_from_db()
+        self.assertEqual(asset_book.accumulated_depreciation, Decimal('1000.00'))
+        self.assertEqual(asset_book.net_book_value, Decimal('0.00'))
+        self.assertTrue(asset_book.is_fully_depreciated)
+        self.assertEqual(
+            list(asset_book.transactions.order_by('transaction_date').values_list('amount', flat=True)),
+            [Decimal('333.33'), Decimal('333.33'), Decimal('333.34')]
+        )
+        self.assertEqual(DepreciationRun.objects.get(period_date=date(2026, 4, 30)).assets_processed, 0)
+
+    def test_rerun_same_period_replaces_previous_run(self):
+        asset_book = self.create_asset_book()
+        DepreciationService.run_depreciation(self.book, date(2026, 1, 31))
+        DepreciationService.run_depreciation(self.book, date(2026, 2, 28))
+
+        # Cost corrected before re-running February
+        AssetBook.objects.filter(pk=asset_book.pk).update(cost=Decimal('6000.00'))
+        run = DepreciationService.run_depreciation(self.book, date(2026, 2, 28))
+
+        asset_book.refresh_from_db()
+        self.assertEqual(run.total_depreciation, Decimal('100.00'))
+        self.assertEqual(asset_book.accumulated_depreciation, Decimal('300.00'))
+        self.assertEqual(asset_book.remaining_life_months, 58)
+        self.assertEqual(asset_book.last_depreciation_date, date(2026, 2, 28))
+        self.assertEqual(DepreciationRun.objects.count(), 2)
+        self.assertEqual(AssetTransaction.objects.count(), 2)
+        self.assertEqual(JournalEntry.objects.count(), 2)
+
+    def test_cannot_rerun_posted_period(self):
+        self.create_asset_book()
+        run = DepreciationService.run_depreciation(self.book, date(2026, 1, 31))
+        JournalEntry.objects.filter(pk=run.journal_entry_id).update(posted=True)
+
+        with self.assertRaises(ValidationError):
+            DepreciationService.run_depreciation(self.book, date(2026, 1, 31))
+
+    def test_cannot_run_earlier_period_after_later_one(self):
+        self.create_asset_book()
+        DepreciationService.run_depreciation(self.book, date(2026, 2, 28))
+
+        with self.assertRaises(ValidationError):
+            DepreciationService.run_depreciation(self.book, date(2026, 1, 31))
+
+    def test_books_are_independent(self):
+        tax_book = DepreciationBook.objects.create(
+            code='TAX', name='Tax', book_type='TAX', currency=self.currency
+        )
+        self.create_asset_book()
+        tax_asset_book = self.create_asset_book(book=tax_book)
+
+        DepreciationService.run_depreciation(self.book, date(2026, 1, 31))
+
+        tax_asset_book.refresh_from_db()
+        self.assertEqual(tax_asset_book.accumulated_depreciation, Decimal('0.00'))
+
+    def test_query_count_does_not_grow_with_assets(self):
+        def run_queries(month, count):
+            for _ in range(count):
+                self.create_asset_book(start=date(2026, month, 1))
+            with CaptureQueriesContext(connection) as ctx:
+                DepreciationService.run_depreciation(self.book, date(2026, month, 1), batch_size=1000)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run_queries(1, 2), run_queries(2, 30))
+
+
+class DepreciationEndpointTestCase(DepreciationTestCase):
+    """Tests for the depreciation endpoints."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+
+    def test_run_and_history(self):
+        self.create_asset_book()
+
+        response = self.client.post(
+            reverse('finance:fixed_assets:run_depreciation'),
+            {'book_id': self.book.id, 'period_date': '2026-01-31'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['assets_processed'], 1)
+        self.assertEqual(response.data['total_depreciation'], '200.00')
+        self.assertFalse(response.data['is_posted'])
+
+        response = self.client.get(reverse('finance:fixed_assets:depreciation_history'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['results'][0]['book_code'], 'FIN')
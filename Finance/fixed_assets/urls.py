@@ -18,6 +18,6 @@ urlpatterns = [
     # path('<int:pk>/dispose/', views.asset_dispose, name='asset_dispose'),
     
     # Depreciation URLs
-    # path('depreciation/run/', views.run_depreciation, name='run_depreciation'),
-    # path('depreciation/history/', views.depreciation_history, name='depreciation_history'),
+    path('depreciation/run/', views.run_depreciation, name='run_depreciation'),
+    path('depreciation/history/', views.depreciation_history, name='depreciation_history'),
 ]
@@ -1,47 +1,66 @@
-from django.shortcuts import render
-from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from django.core.exceptions import ValidationError
+from rest_framework import status
+from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-# Views will be implemented here
-# Example structure:
-
-# class AssetCategoryViewSet(viewsets.ModelViewSet):
-#     """ViewSet for AssetCategory CRUD operations."""
-#     queryset = AssetCategory.objects.all()
-#     serializer_class = AssetCategorySerializer
-
-
-# class FixedAssetViewSet(viewsets.ModelViewSet):
-#     """ViewSet for FixedAsset operations with lifecycle actions."""
-#     queryset = FixedAsset.objects.all()
-#     serializer_class = FixedAssetSerializer
-    
-#     @action(detail=True, methods=['post'])
-#     def activate(self, request, pk=None):
-#         asset = self.get_object()
-#         asset.activate()
-#         return Response({'status': 'activated'})
-    
-#     @action(detail=True, methods=['post'])
-#     def dispose(self, request, pk=None):
-#         asset = self.get_object()
-#         disposal_date = request.data.get('disposal_date')
-#         disposal_amount = request.data.get('disposal_amount')
-#         reason = request.data.get('reason', '')
-#         asset.dispose(disposal_date, disposal_amount, reason)
-#         return Response({'status': 'disposed'})
-
-
-# class DepreciationViewSet(viewsets.ViewSet):
-#     """ViewSet for depreciation operations."""
-    
-#     @action(detail=False, methods=['post'])
-#     def run(self, request):
-#         period_date = request.data.get('period_date')
-#         run = DepreciationRun.run_depreciation(period_date)
-#         return Response({
-#             'period': str(run.period_date),
-#             'assets_processed': run.assets_processed,
-#             'total_depreciation': str(run.total_depreciation)
-#         })
+from erp_project.pagination import auto_paginate
+
+from .models import DepreciationRun
+from .serializers import DepreciationRunSerializer, RunDepreciationSerializer
+from .services import DepreciationService
+
+
+@api_view(['POST'])
+def run_depreciation(request):
+    """
+    Run period-end depreciation for a depreciation book.
+
+    POST /fixed-assets/depreciation/run/
+    {
+        "book_id": 1,
+        "period_date": "2026-01-31"
+    }
+
+    Re-running a period that is not posted replaces the earlier run.
+
+    Returns:
+        200: The depreciation run
+        400: Validation errors (posted period, later period already run)
+    """
+    serializer = RunDepreciationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+        run = DepreciationService.run_depreciation(
+            serializer.validated_data['book'],
+            serializer.validated_data['period_date'],
+            user=request.user if request.user.is_authenticated else None
+        )
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(DepreciationRunSerializer(run).data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@auto_paginate
+def depreciation_history(request):
+    """
+    List depreciation runs.
+
+    GET /fixed-assets/depreciation/history/
+
+    Query Parameters:
+    - book_id: Filter by depreciation book
+    - date_from / date_to: Filter by period date (YYYY-MM-DD)
+    """
+    runs = DepreciationRun.objects.select_related('book', 'journal_entry')
+
+    if request.query_params.get('book_id'):
+        runs = runs.filter(book_id=request.query_params['book_id'])
+    if request.query_params.get('date_from'):
+        runs = runs.filter(period_date__gte=request.query_params['date_from'])
+    if request.query_params.get('date_to'):
+        runs = runs.filter(period_date__lte=request.query_params['date_to'])
+
+    return Response(DepreciationRunSerializer(runs, many=True).data)
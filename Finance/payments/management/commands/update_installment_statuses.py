@@ -0,0 +1,64 @@
+"""
+Django management command to refresh payment plan and installment statuses.
+
+Meant to run nightly: installments only become overdue with the passing of
+time, so nothing else marks them. Statuses are recomputed for all plans with
+two set-based UPDATEs (installments, then plans); cancelled plans are left
+unchanged.
+
+This command will:
+1. Mark installments paid / overdue / partial / pending from their amounts
+   and due dates
+2. Rederive every payment plan status from its installments
+3. Report how many rows changed
+
+Usage:
+    python manage.py update_installment_statuses
+    python manage.py update_installment_statuses --as-of 2026-01-31
+    python manage.py update_installment_statuses --plan-id 12 --plan-id 15
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from Finance.payments.models import InvoicePaymentPlan
+
+
+class Command(BaseCommand):
+    help = 'Recompute installment and payment plan statuses (overdue, partial, paid) for all plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--as-of',
+            help='Date overdue is measured against, YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument(
+            '--plan-id',
+            type=int,
+            action='append',
+            dest='plan_ids',
+            help='Refresh only this payment plan (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        as_of = None
+        if options.get('as_of'):
+            try:
+                as_of = date.fromisoformat(options['as_of'])
+            except ValueError:
+                raise CommandError(f"Invalid --as-of date '{options['as_of']}' (expected YYYY-MM-DD)")
+
+        self.stdout.write('=' * 60)
+        self.stdout.write('PAYMENT PLAN STATUS REFRESH')
+        self.stdout.write('=' * 60)
+
+        with transaction.atomic():
+            installments_updated, plans_updated = InvoicePaymentPlan.refresh_statuses(
+                plan_ids=options.get('plan_ids'), as_of=as_of
+            )
+
+        self.stdout.write(f'Installments updated: {installments_updated}')
+        self.stdout.write(f'Payment plans updated: {plans_updated}')
+        self.stdout.write('=' * 60)
+        self.stdout.write(self.style.SUCCESS('✓ Payment plan statuses are up to date'))
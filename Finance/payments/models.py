@@ -1,17 +1,79 @@
 from django.db import models, transaction
+from django.db.models import F, Q, Case, When, Value, Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from dateutil.relativedelta import relativedelta
 from decimal import Decimal
 from Finance.core.models import Currency
 from Finance.BusinessPartner.models import BusinessPartner
-from Finance.Invoice.models import Invoice
+from Finance.Invoice.models import Invoice, InvoiceOpenItem
 from Finance.GL.models import JournalEntry
 from core.approval.mixins import ApprovableMixin, ApprovableInterface
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Rows per INSERT / UPDATE statement for bulk allocation writes
+BULK_BATCH_SIZE = 500
+
+
+def apply_invoice_paid_changes(invoices, changes):
+    """
+    Apply paid_amount changes to many invoices with set-based UPDATEs.
+    
+    New paid amounts and payment statuses are computed in memory from the
+    given invoice rows, which the caller must already have locked with
+    select_for_update(). One UPDATE is issued per BULK_BATCH_SIZE invoices
+    instead of one Invoice.save() per invoice, and the invoices' open items
+    (aging snapshot) are refreshed in one set-based sync.
+    
+    Args:
+        invoices (dict): {invoice_id: Invoice} - locked rows
+        changes (dict): {invoice_id: Decimal} - amount to add (negative to remove)
+        
+    Raises:
+        ValidationError: If a change would overpay an invoice or make
+            paid_amount negative
+    """
+    changes = {pk: amount for pk, amount in changes.items() if amount}
+    
+    for pk, amount in changes.items():
+        invoice = invoices[pk]
+        new_paid = invoice.paid_amount + amount
+        if new_paid < 0:
+            raise ValidationError(
+                f"Refund amount {abs(amount)} exceeds paid amount {invoice.paid_amount} on invoice {pk}"
+            )
+        if invoice.total is None or new_paid > invoice.total:
+            raise ValidationError(
+                f"Payment amount exceeds remaining balance of {invoice.remaining_amount()} on invoice {pk}"
+            )
+        invoice.paid_amount = new_paid
+        invoice.update_payment_status()
+    
+    invoice_ids = sorted(changes)
+    for start in range(0, len(invoice_ids), BULK_BATCH_SIZE):
+        batch = invoice_ids[start:start + BULK_BATCH_SIZE]
+        by_status = {}
+        for pk in batch:
+            by_status.setdefault(invoices[pk].payment_status, []).append(pk)
+        
+        Invoice.objects.filter(pk__in=batch).update(
+            paid_amount=F('paid_amount') + Case(
+                *[When(pk=pk, then=Value(changes[pk])) for pk in batch],
+                output_field=models.DecimalField(max_digits=14, decimal_places=2)
+            ),
+            payment_status=Case(
+                *[When(pk__in=pks, then=Value(payment_status)) for payment_status, pks in by_status.items()],
+                output_field=models.CharField()
+            )
+        )
+    
+    # Queryset updates send no signals - refresh the aging snapshot here
+    InvoiceOpenItem.objects.sync(invoice_ids)
+
+
 class Payment(ApprovableMixin, ApprovableInterface, models.Model):
     
     # Payment Type Choices
@@ -42,6 +104,16 @@ class Payment(ApprovableMixin, ApprovableInterface, models.Model):
         (REJECTED, 'Rejected'),
     ]
     
+    # Bulk allocation strategies (see auto_allocate)
+    OLDEST_FIRST = 'OLDEST_FIRST'
+    DUE_DATE = 'DUE_DATE'
+    EXACT_MATCH = 'EXACT_MATCH'
+    ALLOCATION_STRATEGY_CHOICES = [
+        (OLDEST_FIRST, 'Oldest invoice first'),
+        (DUE_DATE, 'Earliest due installment first'),
+        (EXACT_MATCH, 'Invoice with exactly matching open balance'),
+    ]
+    
     # Payment Direction
     payment_type = models.CharField(
         max_length=10,
@@ -278,20 +350,239 @@ class Payment(ApprovableMixin, ApprovableInterface, models.Model):
         Remove all payment allocations.
         This will decrease paid_amount on all related invoices.
         
-        NOTE: We must delete allocations individually to trigger the custom
-        delete() method which updates invoice.paid_amount. Bulk delete bypasses this.
+        Returns:
+            int: Number of allocations deleted
+        """
+        return self.remove_allocations_bulk()
+    
+    # ==================== BULK ALLOCATION METHODS ====================
+    
+    def get_open_invoices(self, invoice_ids=None):
+        """
+        Get invoices this payment can be allocated to.
+        
+        Args:
+            invoice_ids (list): Optional restriction to these invoice IDs
+            
+        Returns:
+            QuerySet: Invoices of the same business partner and currency
+                      that are not fully paid
+        """
+        invoices = Invoice.objects.filter(
+            business_partner_id=self.business_partner_id,
+            currency_id=self.currency_id,
+            total__isnull=False,
+            paid_amount__lt=F('total')
+        )
+        if invoice_ids is not None:
+            invoices = invoices.filter(pk__in=invoice_ids)
+        return invoices
+    
+    @transaction.atomic
+    def auto_allocate(self, amount, strategy=OLDEST_FIRST, invoice_ids=None):
+        """
+        Spread an amount over the open invoices of this payment's partner.
+        
+        Strategies:
+        - OLDEST_FIRST: invoices by invoice date, oldest first
+        - DUE_DATE: invoices by the due date of their earliest unpaid
+          installment (invoice date when there is no payment plan)
+        - EXACT_MATCH: the oldest invoice whose open balance equals amount
+        
+        The candidate invoices are locked once, allocations are computed in
+        memory and written with bulk statements (see allocate_bulk).
+        
+        Args:
+            amount (Decimal): Amount to allocate
+            strategy (str): One of ALLOCATION_STRATEGY_CHOICES
+            invoice_ids (list): Optional restriction to these invoice IDs
+            
+        Returns:
+            dict: See allocate_bulk(); also includes 'unallocated'
+            
+        Raises:
+            ValidationError: If amount/strategy is invalid or nothing matches
+        """
+        amount = Decimal(str(amount))
+        if amount <= 0:
+            raise ValidationError("Allocation amount must be greater than zero")
+        if strategy not in dict(self.ALLOCATION_STRATEGY_CHOICES):
+            raise ValidationError(
+                f"Invalid allocation strategy '{strategy}'. "
+                f"Use one of: {', '.join(dict(self.ALLOCATION_STRATEGY_CHOICES))}"
+            )
+        
+        invoices = self.get_open_invoices(invoice_ids)
+        if strategy == self.DUE_DATE:
+            next_due_date = PaymentPlanInstallment.objects.filter(
+                payment_plan__invoice=OuterRef('pk'),
+                paid_amount__lt=F('amount')
+            ).exclude(
+                payment_plan__status='cancelled'
+            ).order_by('due_date').values('due_date')[:1]
+            invoices = invoices.annotate(
+                sort_date=Coalesce(Subquery(next_due_date), F('date'))
+            ).order_by('sort_date', 'id')
+        else:
+            invoices = invoices.order_by('date', 'id')
+        
+        invoices = list(invoices.select_for_update())
+        
+        amounts = {}
+        if strategy == self.EXACT_MATCH:
+            match = next(
+                (invoice for invoice in invoices if invoice.remaining_amount() == amount),
+                None
+            )
+            if match is None:
+                raise ValidationError(f"No open invoice has an open balance of exactly {amount}")
+            amounts[match.pk] = amount
+        else:
+            left = amount
+            for invoice in invoices:
+                if left <= 0:
+                    break
+                applied = min(left, invoice.remaining_amount())
+                amounts[invoice.pk] = applied
+                left -= applied
+        
+        if not amounts:
+            raise ValidationError("No open invoices available for allocation")
+        
+        result = self._write_allocations({invoice.pk: invoice for invoice in invoices}, amounts)
+        result['unallocated'] = amount - result['allocated_total']
+        return result
+    
+    @transaction.atomic
+    def allocate_bulk(self, amounts):
+        """
+        Allocate explicit amounts to many invoices at once.
+        
+        Set-based counterpart of allocate_to_invoice(): the invoices are
+        locked with one query and validated in memory, new allocations are
+        inserted with bulk_create, allocations this payment already had are
+        increased with one UPDATE, and invoice paid_amount / payment_status
+        are applied with one UPDATE (per BULK_BATCH_SIZE invoices).
+        
+        Args:
+            amounts (dict): {invoice_id: amount}
+            
+        Returns:
+            dict with:
+                - allocated_total: Sum of the amounts allocated
+                - allocations: List of {invoice_id, amount_allocated,
+                  invoice_paid_amount, payment_status}
+                  
+        Raises:
+            ValidationError: With one message per invalid invoice (nothing is saved)
+        """
+        amounts = {int(invoice_id): Decimal(str(amount)) for invoice_id, amount in amounts.items()}
+        if not amounts:
+            raise ValidationError("At least one allocation is required")
+        
+        invoices = {
+            invoice.pk: invoice
+            for invoice in Invoice.objects.filter(pk__in=amounts).order_by('pk').select_for_update()
+        }
+        
+        errors = {}
+        for invoice_id, amount in sorted(amounts.items()):
+            invoice = invoices.get(invoice_id)
+            if invoice is None:
+                errors[str(invoice_id)] = f"Invoice with ID {invoice_id} does not exist"
+                continue
+            can_allocate, error_msg = self.can_allocate_to_invoice(invoice, amount)
+            if not can_allocate:
+                errors[str(invoice_id)] = error_msg
+        if errors:
+            raise ValidationError(errors)
+        
+        return self._write_allocations(invoices, amounts)
+    
+    @transaction.atomic
+    def remove_allocations_bulk(self, invoice_ids=None):
+        """
+        Remove allocations with one DELETE and one invoice UPDATE.
         
+        Args:
+            invoice_ids (list): Optional restriction to these invoice IDs
+                                (default: all allocations of this payment)
+            
         Returns:
             int: Number of allocations deleted
         """
-        allocations = list(self.allocations.all())  # Convert to list to avoid query issues
-        count = len(allocations)
+        allocations = self.allocations.all()
+        if invoice_ids is not None:
+            allocations = allocations.filter(invoice_id__in=invoice_ids)
         
-        # Delete each allocation individually to trigger custom delete() logic
-        for allocation in allocations:
-            allocation.delete()
+        removed = dict(allocations.values_list('invoice_id', 'amount_allocated'))
+        if not removed:
+            return 0
+        
+        invoices = {
+            invoice.pk: invoice
+            for invoice in Invoice.objects.filter(pk__in=removed).order_by('pk').select_for_update()
+        }
+        
+        # Queryset delete skips PaymentAllocation.delete() - invoices are updated below
+        allocations.delete()
+        apply_invoice_paid_changes(
+            invoices,
+            {invoice_id: -amount for invoice_id, amount in removed.items()}
+        )
         
-        return count
+        return len(removed)
+    
+    def _write_allocations(self, invoices, amounts):
+        """
+        Persist computed allocations (invoices must already be locked).
+        
+        Args:
+            invoices (dict): {invoice_id: Invoice}
+            amounts (dict): {invoice_id: Decimal}
+            
+        Returns:
+            dict: See allocate_bulk()
+        """
+        amounts = {invoice_id: amount for invoice_id, amount in amounts.items() if amount > 0}
+        
+        existing = dict(
+            self.allocations.filter(invoice_id__in=amounts).values_list('invoice_id', 'id')
+        )
+        
+        PaymentAllocation.objects.bulk_create(
+            [
+                PaymentAllocation(payment=self, invoice_id=invoice_id, amount_allocated=amount)
+                for invoice_id, amount in amounts.items()
+                if invoice_id not in existing
+            ],
+            batch_size=BULK_BATCH_SIZE
+        )
+        
+        if existing:
+            PaymentAllocation.objects.filter(pk__in=existing.values()).update(
+                amount_allocated=F('amount_allocated') + Case(
+                    *[When(pk=allocation_id, then=Value(amounts[invoice_id]))
+                      for invoice_id, allocation_id in existing.items()],
+                    output_field=models.DecimalField(max_digits=15, decimal_places=2)
+                ),
+                updated_at=timezone.now()
+            )
+        
+        apply_invoice_paid_changes(invoices, amounts)
+        
+        return {
+            'allocated_total': sum(amounts.values(), Decimal('0')),
+            'allocations': [
+                {
+                    'invoice_id': invoice_id,
+                    'amount_allocated': amount,
+                    'invoice_paid_amount': invoices[invoice_id].paid_amount,
+                    'payment_status': invoices[invoice_id].payment_status,
+                }
+                for invoice_id, amount in amounts.items()
+            ],
+        }
     
     # ==================== APPROVAL WORKFLOW INTERFACE IMPLEMENTATION ====================
     
@@ -867,6 +1158,10 @@ class InvoicePaymentPlan(models.Model):
         Payments are applied to future installments if older ones are paid,
         allowing customers to "pay ahead" on their plan.
         
+        The waterfall runs in memory over one locked read of the plan's
+        installments; the touched installments are written with a single
+        UPDATE and the plan status is derived from the same rows.
+        
         Args:
             payment_amount (Decimal or float): Amount of money being paid
             
@@ -889,53 +1184,69 @@ class InvoicePaymentPlan(models.Model):
         # Lock this payment plan row to prevent concurrent payment processing
         payment_plan = InvoicePaymentPlan.objects.select_for_update().get(pk=self.pk)
         
-        # Get unpaid/partial installments, oldest first
-        # select_for_update() locks these rows so no other transaction can modify them
-        installments = payment_plan.installments.filter(
-            paid_amount__lt=models.F('amount')
-        ).order_by('due_date').select_for_update()
+        # All installments, oldest first - locked so no other transaction can modify them
+        installments = list(
+            payment_plan.installments.select_for_update().order_by('due_date', 'installment_number').values(
+                'pk', 'installment_number', 'due_date', 'amount', 'paid_amount'
+            )
+        )
         
         remaining_payment = payment_amount
         updated_installments = []
+        new_values = {}  # {pk: (paid_amount, status)}
         
-        # Apply payment to each installment in order
+        # Apply payment to each unpaid installment in order
         for installment in installments:
             if remaining_payment <= 0:
                 break  # Payment exhausted
             
             # Calculate how much is still owed on this installment
-            remaining_balance = installment.amount - installment.paid_amount
+            remaining_balance = installment['amount'] - installment['paid_amount']
+            if remaining_balance <= 0:
+                continue  # Already paid
             
             if remaining_payment >= remaining_balance:
                 # We can fully pay this installment
-                installment.paid_amount = installment.amount
-                installment.status = 'paid'
-                remaining_payment -= remaining_balance
-                
-                updated_installments.append({
-                    'installment_number': installment.installment_number,
-                    'paid': float(remaining_balance),
-                    'new_paid_amount': float(installment.paid_amount),
-                    'status': 'paid'
-                })
+                paid, installment_status = remaining_balance, 'paid'
             else:
                 # Partial payment - apply what we have and stop
-                installment.paid_amount += remaining_payment
-                installment.status = 'partial'
-                
-                updated_installments.append({
-                    'installment_number': installment.installment_number,
-                    'paid': float(remaining_payment),
-                    'new_paid_amount': float(installment.paid_amount),
-                    'status': 'partial'
-                })
-                
-                remaining_payment = Decimal('0.00')
+                paid, installment_status = remaining_payment, 'partial'
+            
+            installment['paid_amount'] += paid
+            remaining_payment -= paid
+            new_values[installment['pk']] = (installment['paid_amount'], installment_status)
             
-            installment.save()
+            updated_installments.append({
+                'installment_number': installment['installment_number'],
+                'paid': float(paid),
+                'new_paid_amount': float(installment['paid_amount']),
+                'status': installment_status
+            })
         
-        # Update payment plan status based on installment states
-        self.update_status()
+        if new_values:
+            payment_plan.installments.filter(pk__in=new_values).update(
+                paid_amount=Case(
+                    *[When(pk=pk, then=Value(paid_amount)) for pk, (paid_amount, _) in new_values.items()],
+                    output_field=models.DecimalField(max_digits=10, decimal_places=2)
+                ),
+                status=Case(
+                    *[When(pk=pk, then=Value(status)) for pk, (_, status) in new_values.items()],
+                    output_field=models.CharField()
+                ),
+                updated_at=timezone.now()
+            )
+        
+        # Update payment plan status from the installment rows already in memory
+        if payment_plan.status != 'cancelled':
+            today = timezone.now().date()
+            unpaid = [i for i in installments if i['paid_amount'] < i['amount']]
+            self._save_status(self._derive_status(
+                has_unpaid=bool(unpaid),
+                has_overdue=any(i['due_date'] < today for i in unpaid),
+                has_payments=any(i['paid_amount'] > 0 for i in installments),
+            ))
+        else:
+            self.status = payment_plan.status
         
         return {
             'payment_applied': float(payment_amount - remaining_payment),
@@ -958,24 +1269,79 @@ class InvoicePaymentPlan(models.Model):
         if self.status == 'cancelled':
             return  # Don't change cancelled status
         
-        if not self.installments.filter(
-            paid_amount__lt=models.F('amount')
-        ).exists():
-            # All installments fully paid
-            self.status = 'paid'
-        elif self.has_overdue_installments():
-            # Has overdue installments
-            self.status = 'overdue'
-        elif self.installments.filter(
-            paid_amount__gt=0
-        ).exists():
-            # At least one installment has a payment
-            self.status = 'partial'
-        else:
-            # No payments made
-            self.status = 'pending'
+        # One conditional aggregate instead of one EXISTS query per state
+        unpaid = Q(paid_amount__lt=F('amount'))
+        flags = self.installments.aggregate(
+            unpaid=Count('pk', filter=unpaid),
+            overdue=Count('pk', filter=unpaid & Q(due_date__lt=timezone.now().date())),
+            paid=Count('pk', filter=Q(paid_amount__gt=0)),
+        )
+        self._save_status(self._derive_status(
+            has_unpaid=bool(flags['unpaid']),
+            has_overdue=bool(flags['overdue']),
+            has_payments=bool(flags['paid']),
+        ))
+    
+    @staticmethod
+    def _derive_status(has_unpaid, has_overdue, has_payments):
+        """Plan status from installment states (see update_status)"""
+        if not has_unpaid:
+            return 'paid'
+        if has_overdue:
+            return 'overdue'
+        if has_payments:
+            return 'partial'
+        return 'pending'
+    
+    def _save_status(self, new_status):
+        self.status = new_status
+        self.updated_at = timezone.now()
+        InvoicePaymentPlan.objects.filter(pk=self.pk).update(status=new_status, updated_at=self.updated_at)
+    
+    @classmethod
+    def refresh_statuses(cls, plan_ids=None, as_of=None):
+        """
+        Recompute installment and plan statuses with set-based UPDATEs.
         
-        self.save(update_fields=['status', 'updated_at'])
+        Installments that fell due are marked 'overdue' and every plan
+        status is rederived from its installments, using one UPDATE for
+        installments and one for plans. Only rows whose status changes
+        are written; cancelled plans are left alone.
+        
+        Args:
+            plan_ids: Optional iterable of plan ids (default: all plans)
+            as_of (date): Date overdue is measured against (default: today)
+            
+        Returns:
+            tuple: (installments updated, plans updated)
+        """
+        as_of = as_of or timezone.now().date()
+        now = timezone.now()
+        
+        installments = PaymentPlanInstallment.objects.all()
+        plans = cls.objects.exclude(status='cancelled')
+        if plan_ids is not None:
+            plan_ids = list(plan_ids)
+            installments = installments.filter(payment_plan_id__in=plan_ids)
+            plans = plans.filter(pk__in=plan_ids)
+        
+        installment_status = PaymentPlanInstallment.status_expression(as_of)
+        installments_updated = installments.exclude(status=installment_status).update(
+            status=installment_status, updated_at=now
+        )
+        
+        plan_installments = PaymentPlanInstallment.objects.filter(payment_plan_id=OuterRef('pk'))
+        unpaid = plan_installments.filter(paid_amount__lt=F('amount'))
+        plan_status = Case(
+            When(~Exists(unpaid), then=Value('paid')),
+            When(Exists(unpaid.filter(due_date__lt=as_of)), then=Value('overdue')),
+            When(Exists(plan_installments.filter(paid_amount__gt=0)), then=Value('partial')),
+            default=Value('pending'),
+            output_field=models.CharField()
+        )
+        plans_updated = plans.exclude(status=plan_status).update(status=plan_status, updated_at=now)
+        
+        return installments_updated, plans_updated
     
     @staticmethod
     def suggest_schedule(invoice_total, start_date, num_installments=3, frequency='monthly'):
@@ -1196,6 +1562,22 @@ class PaymentPlanInstallment(models.Model):
             not self.is_fully_paid()
         )
     
+    @staticmethod
+    def status_expression(as_of):
+        """
+        SQL expression of the status update_status() would set on a given date.
+        
+        Args:
+            as_of (date): Date overdue is measured against
+        """
+        return Case(
+            When(paid_amount__gte=F('amount'), then=Value('paid')),
+            When(due_date__lt=as_of, then=Value('overdue')),
+            When(paid_amount__gt=0, then=Value('partial')),
+            default=Value('pending'),
+            output_field=models.CharField()
+        )
+    
     def update_status(self):
         """
         Update the installment status based on current state.
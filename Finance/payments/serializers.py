@@ -689,6 +689,62 @@ class AllocationUpdateSerializer(serializers.Serializer):
     )
 
 
+class BulkAllocationLineSerializer(serializers.Serializer):
+    """One explicit allocation in a bulk allocation request"""
+
+    invoice_id = serializers.IntegerField(min_value=Decimal("1"))
+    amount_allocated = serializers.DecimalField(
+        max_digits=15, decimal_places=2, min_value=Decimal("0.01")
+    )
+
+
+class BulkAllocationSerializer(serializers.Serializer):
+    """
+    Serializer for allocating a payment to many invoices at once.
+
+    Either explicit allocations:
+        {"allocations": [{"invoice_id": 1, "amount_allocated": "100.00"}, ...]}
+
+    Or an amount spread by a strategy:
+        {"amount": "5000.00", "strategy": "OLDEST_FIRST", "invoice_ids": [1, 2, 3]}
+    """
+
+    allocations = BulkAllocationLineSerializer(many=True, required=False)
+    amount = serializers.DecimalField(
+        max_digits=15, decimal_places=2, min_value=Decimal("0.01"), required=False
+    )
+    strategy = serializers.ChoiceField(
+        choices=Payment.ALLOCATION_STRATEGY_CHOICES, default=Payment.OLDEST_FIRST
+    )
+    invoice_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False
+    )
+
+    def validate(self, attrs):
+        """Ensure exactly one of 'allocations' or 'amount' is provided"""
+        has_allocations = bool(attrs.get("allocations"))
+        has_amount = attrs.get("amount") is not None
+        if has_allocations == has_amount:
+            raise serializers.ValidationError(
+                "Provide either 'allocations' or 'amount' (with an optional 'strategy')"
+            )
+        if has_allocations:
+            invoice_ids = [line["invoice_id"] for line in attrs["allocations"]]
+            if len(invoice_ids) != len(set(invoice_ids)):
+                raise serializers.ValidationError(
+                    {"allocations": "Each invoice can only appear once"}
+                )
+        return attrs
+
+
+class BulkAllocationRemoveSerializer(serializers.Serializer):
+    """Serializer for removing many allocations at once (all when invoice_ids is omitted)"""
+
+    invoice_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False
+    )
+
+
 # ==================== INVOICE PAYMENT INFO SERIALIZER ====================
 
 
@@ -0,0 +1,242 @@
+"""
+Tests for bulk payment allocation.
+
+Covers:
+- Payment.allocate_bulk() (explicit amounts)
+- Payment.auto_allocate() strategies: OLDEST_FIRST, DUE_DATE, EXACT_MATCH
+- Payment.remove_allocations_bulk() / clear_all_allocations()
+- POST /payments/{id}/allocations/bulk/ and bulk-remove/ endpoints
+- Query count independent of the number of invoices
+"""
+
+from decimal import Decimal
+from datetime import date, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.base.test_utils import create_test_currency, create_test_invoice, create_test_payment
+from Finance.payments.models import Payment, PaymentAllocation, InvoicePaymentPlan, PaymentPlanInstallment
+from Finance.Invoice.models import Invoice
+from Finance.BusinessPartner.models import Supplier
+
+
+class BulkAllocationTestCase(TestCase):
+    """Base test case with a supplier payment and an invoice builder"""
+
+    def setUp(self):
+        self.currency = create_test_currency()
+        self.supplier = Supplier.objects.create(name="Bulk Supplier")
+        self.other_supplier = Supplier.objects.create(name="Other Supplier")
+        self.payment = create_test_payment(self.supplier, date.today(), self.currency)
+
+    def create_invoice(self, total, invoice_date=date(2026, 1, 1), supplier=None):
+        return create_test_invoice(supplier or self.supplier, total, invoice_date, self.currency)
+
+    def assertInvoice(self, invoice, paid_amount, payment_status):
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.paid_amount, Decimal(paid_amount))
+        self.assertEqual(invoice.payment_status, payment_status)
+
+
+class BulkAllocationServiceTests(BulkAllocationTestCase):
+    """Test bulk allocation model methods"""
+
+    # ==================== EXPLICIT AMOUNTS ====================
+
+    def test_allocate_bulk_creates_allocations_and_updates_invoices(self):
+        inv1 = self.create_invoice(1000)
+        inv2 = self.create_invoice(500)
+
+        result = self.payment.allocate_bulk({inv1.pk: Decimal('400.00'), inv2.pk: Decimal('500.00')})
+
+        self.assertEqual(result['allocated_total'], Decimal('900.00'))
+        self.assertEqual(self.payment.allocations.count(), 2)
+        self.assertInvoice(inv1, '400.00', Invoice.PARTIALLY_PAID)
+        self.assertInvoice(inv2, '500.00', Invoice.PAID)
+        self.assertEqual(self.payment.get_total_allocated(), Decimal('900.00'))
+
+    def test_allocate_bulk_adds_to_existing_allocation(self):
+        inv1 = self.create_invoice(1000)
+        self.payment.allocate_to_invoice(inv1, Decimal('100.00'))
+
+        self.payment.allocate_bulk({inv1.pk: Decimal('250.00')})
+
+        allocation = PaymentAllocation.objects.get(payment=self.payment, invoice=inv1)
+        self.assertEqual(allocation.amount_allocated, Decimal('350.00'))
+        self.assertInvoice(inv1, '350.00', Invoice.PARTIALLY_PAID)
+
+    def test_allocate_bulk_is_all_or_nothing(self):
+        inv1 = self.create_invoice(1000)
+        inv2 = self.create_invoice(100)
+        foreign = self.create_invoice(100, supplier=self.other_supplier)
+
+        with self.assertRaises(ValidationError) as ctx:
+            self.payment.allocate_bulk({
+                inv1.pk: Decimal('100.00'),
+                inv2.pk: Decimal('200.00'),
+                foreign.pk: Decimal('50.00'),
+                999999: Decimal('1.00'),
+            })
+
+        errors = ctx.exception.message_dict
+        self.assertEqual(set(errors), {str(inv2.pk), str(foreign.pk), '999999'})
+        self.assertFalse(PaymentAllocation.objects.exists())
+        self.assertInvoice(inv1, '0', Invoice.UNPAID)
+
+    # ==================== STRATEGIES ====================
+
+    def test_oldest_first_strategy(self):
+        newest = self.create_invoice(300, invoice_date=date(2026, 3, 1))
+        oldest = self.create_invoice(300, invoice_date=date(2026, 1, 1))
+        middle = self.create_invoice(300, invoice_date=date(2026, 2, 1))
+
+        result = self.payment.auto_allocate(Decimal('500.00'), strategy=Payment.OLDEST_FIRST)
+
+        self.assertEqual(result['unallocated'], Decimal('0.00'))
+        self.assertInvoice(oldest, '300.00', Invoice.PAID)
+        self.assertInvoice(middle, '200.00', Invoice.PARTIALLY_PAID)
+        self.assertInvoice(newest, '0', Invoice.UNPAID)
+
+    def test_oldest_first_reports_unallocated_remainder(self):
+        inv1 = self.create_invoice(100)
+        self.create_invoice(50, supplier=self.other_supplier)
+
+        result = self.payment.auto_allocate(Decimal('180.00'))
+
+        self.assertEqual(result['allocated_total'], Decimal('100.00'))
+        self.assertEqual(result['unallocated'], Decimal('80.00'))
+        self.assertInvoice(inv1, '100.00', Invoice.PAID)
+
+    def test_due_date_strategy_uses_earliest_unpaid_installment(self):
+        old_invoice = self.create_invoice(400, invoice_date=date(2026, 1, 1))
+        new_invoice = self.create_invoice(400, invoice_date=date(2026, 2, 1))
+
+        # The newer invoice has an installment due before the older invoice's date
+        plan = InvoicePaymentPlan.objects.create(invoice=new_invoice, total_amount=Decimal('400.00'))
+        PaymentPlanInstallment.objects.create(
+            payment_plan=plan, installment_number=1,
+            due_date=date(2025, 12, 15), amount=Decimal('400.00')
+        )
+
+        self.payment.auto_allocate(Decimal('400.00'), strategy=Payment.DUE_DATE)
+
+        self.assertInvoice(new_invoice, '400.00', Invoice.PAID)
+        self.assertInvoice(old_invoice, '0', Invoice.UNPAID)
+
+    def test_exact_match_strategy(self):
+        self.create_invoice(100)
+        match = self.create_invoice(250)
+
+        self.payment.auto_allocate(Decimal('250.00'), strategy=Payment.EXACT_MATCH)
+
+        self.assertEqual(self.payment.allocations.get().invoice_id, match.pk)
+        self.assertInvoice(match, '250.00', Invoice.PAID)
+
+    def test_exact_match_without_match_raises(self):
+        self.create_invoice(100)
+
+        with self.assertRaises(ValidationError):
+            self.payment.auto_allocate(Decimal('99.00'), strategy=Payment.EXACT_MATCH)
+
+    def test_invalid_strategy_raises(self):
+        with self.assertRaises(ValidationError):
+            self.payment.auto_allocate(Decimal('10.00'), strategy='RANDOM')
+
+    # ==================== REMOVAL ====================
+
+    def test_remove_allocations_bulk(self):
+        inv1 = self.create_invoice(1000)
+        inv2 = self.create_invoice(800)
+        self.payment.allocate_bulk({inv1.pk: Decimal('500.00'), inv2.pk: Decimal('800.00')})
+
+        removed = self.payment.remove_allocations_bulk([inv2.pk])
+
+        self.assertEqual(removed, 1)
+        self.assertInvoice(inv2, '0.00', Invoice.UNPAID)
+        self.assertInvoice(inv1, '500.00', Invoice.PARTIALLY_PAID)
+
+        self.assertEqual(self.payment.clear_all_allocations(), 1)
+        self.assertInvoice(inv1, '0.00', Invoice.UNPAID)
+        self.assertFalse(self.payment.allocations.exists())
+
+    def test_query_count_is_independent_of_invoice_count(self):
+        def allocate(count):
+            invoices = [self.create_invoice(100) for _ in range(count)]
+            with CaptureQueriesContext(connection) as ctx:
+                self.payment.allocate_bulk({invoice.pk: Decimal('60.00') for invoice in invoices})
+            return len(ctx.captured_queries)
+
+        self.assertEqual(allocate(2), allocate(20))
+
+
+class BulkAllocationEndpointTests(BulkAllocationTestCase):
+    """Test the bulk allocation API endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.bulk_url = reverse('finance:payments:payment-allocations-bulk', args=[self.payment.pk])
+        self.remove_url = reverse('finance:payments:payment-allocations-bulk-remove', args=[self.payment.pk])
+
+    def test_bulk_allocate_with_strategy(self):
+        inv1 = self.create_invoice(100)
+        inv2 = self.create_invoice(100)
+
+        response = self.client.post(self.bulk_url, {'amount': '150.00', 'strategy': 'OLDEST_FIRST'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['allocation_count'], 2)
+        self.assertEqual(response.data['unallocated'], '0.00')
+        self.assertInvoice(inv1, '100.00', Invoice.PAID)
+        self.assertInvoice(inv2, '50.00', Invoice.PARTIALLY_PAID)
+
+    def test_bulk_allocate_explicit(self):
+        inv1 = self.create_invoice(100)
+
+        response = self.client.post(
+            self.bulk_url,
+            {'allocations': [{'invoice_id': inv1.pk, 'amount_allocated': '40.00'}]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['allocated_total'], '40.00')
+
+    def test_bulk_allocate_requires_one_mode(self):
+        inv1 = self.create_invoice(100)
+
+        response = self.client.post(
+            self.bulk_url,
+            {'amount': '10.00', 'allocations': [{'invoice_id': inv1.pk, 'amount_allocated': '40.00'}]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_allocate_invalid_returns_400(self):
+        inv1 = self.create_invoice(100)
+
+        response = self.client.post(
+            self.bulk_url,
+            {'allocations': [{'invoice_id': inv1.pk, 'amount_allocated': '400.00'}]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(inv1.pk), response.data['error'])
+
+    def test_bulk_remove(self):
+        inv1 = self.create_invoice(100)
+        self.payment.allocate_bulk({inv1.pk: Decimal('100.00')})
+
+        response = self.client.post(self.remove_url, {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['removed_count'], 1)
+        self.assertInvoice(inv1, '0.00', Invoice.UNPAID)
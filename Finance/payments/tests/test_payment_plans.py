@@ -8,6 +8,9 @@ This test suite validates:
 4. Status transitions and calculations
 """
 
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -687,6 +690,118 @@ class InstallmentTests(PaymentPlanTestCase):
             )
 
 
+class BulkStatusTests(PaymentPlanTestCase):
+    """Tests for the single-pass waterfall and set-based status refresh"""
+    
+    def setUp(self):
+        super().setUp()
+        self.invoice = self.create_ap_invoice(total=50000.00)
+    
+    def create_plan(self, installments=3, start=None):
+        plan = InvoicePaymentPlan.objects.create(
+            invoice=self.invoice.invoice,
+            total_amount=Decimal('1000.00') * installments
+        )
+        start = start or date.today()
+        for i in range(1, installments + 1):
+            PaymentPlanInstallment.objects.create(
+                payment_plan=plan,
+                installment_number=i,
+                due_date=start + relativedelta(months=i-1),
+                amount=Decimal('1000.00')
+            )
+        return plan
+    
+    def test_process_payment_query_count_is_constant(self):
+        """Savepoint, lock plan, read installments, one installment UPDATE, one plan UPDATE, release"""
+        small = self.create_plan(installments=2)
+        large = self.create_plan(installments=12)
+        
+        with self.assertNumQueries(6):
+            small.process_payment(Decimal('2000.00'))
+        with self.assertNumQueries(6):
+            large.process_payment(Decimal('11500.00'))
+        
+        large.refresh_from_db()
+        self.assertEqual(large.status, 'partial')
+        self.assertEqual(
+            list(large.installments.values_list('status', flat=True)),
+            ['paid'] * 11 + ['partial']
+        )
+        self.assertEqual(large.installments.get(installment_number=12).paid_amount, Decimal('500.00'))
+    
+    def test_process_payment_skips_paid_installments(self):
+        plan = self.create_plan()
+        plan.process_payment(Decimal('1000.00'))
+        
+        result = plan.process_payment(Decimal('300.00'))
+        
+        self.assertEqual(result['updated_installments'], [
+            {'installment_number': 2, 'paid': 300.0, 'new_paid_amount': 300.0, 'status': 'partial'}
+        ])
+    
+    def test_process_payment_keeps_cancelled_status(self):
+        plan = self.create_plan()
+        InvoicePaymentPlan.objects.filter(pk=plan.pk).update(status='cancelled')
+        
+        result = plan.process_payment(Decimal('500.00'))
+        
+        self.assertEqual(result['payment_plan_status'], 'cancelled')
+        plan.refresh_from_db()
+        self.assertEqual(plan.status, 'cancelled')
+    
+    def test_refresh_statuses(self):
+        overdue = self.create_plan(start=date.today() - relativedelta(months=2))
+        partial = self.create_plan(start=date.today() + timedelta(days=5))
+        PaymentPlanInstallment.objects.filter(payment_plan=partial, installment_number=1).update(
+            paid_amount=Decimal('250.00')
+        )
+        cancelled = self.create_plan(start=date.today() - relativedelta(months=2))
+        InvoicePaymentPlan.objects.filter(pk=cancelled.pk).update(status='cancelled')
+        
+        with self.assertNumQueries(2):
+            installments_updated, plans_updated = InvoicePaymentPlan.refresh_statuses()
+        
+        # Two past-due installments on each back-dated plan, one partial
+        self.assertEqual(installments_updated, 5)
+        self.assertEqual(plans_updated, 2)
+        self.assertEqual(
+            list(overdue.installments.values_list('status', flat=True)),
+            ['overdue', 'overdue', 'pending']
+        )
+        self.assertEqual(partial.installments.get(installment_number=1).status, 'partial')
+        self.assertEqual(
+            dict(InvoicePaymentPlan.objects.values_list('pk', 'status')),
+            {overdue.pk: 'overdue', partial.pk: 'partial', cancelled.pk: 'cancelled'}
+        )
+        
+        # Nothing left to change
+        self.assertEqual(InvoicePaymentPlan.refresh_statuses(), (0, 0))
+    
+    def test_refresh_statuses_as_of_and_plan_filter(self):
+        first = self.create_plan()
+        second = self.create_plan()
+        
+        InvoicePaymentPlan.refresh_statuses(plan_ids=[first.pk], as_of=date.today() + relativedelta(months=1, days=1))
+        
+        self.assertEqual(
+            list(first.installments.values_list('status', flat=True)),
+            ['overdue', 'overdue', 'pending']
+        )
+        self.assertFalse(second.installments.exclude(status='pending').exists())
+    
+    def test_update_installment_statuses_command(self):
+        plan = self.create_plan(start=date.today() - timedelta(days=1))
+        out = StringIO()
+        
+        call_command('update_installment_statuses', stdout=out)
+        
+        plan.refresh_from_db()
+        self.assertEqual(plan.status, 'overdue')
+        self.assertIn('Installments updated: 1', out.getvalue())
+        self.assertIn('Payment plans updated: 1', out.getvalue())
+
+
 class PaymentPlanIntegrationTests(PaymentPlanTestCase):
     """Integration tests for complete payment plan workflows"""
     
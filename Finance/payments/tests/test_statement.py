@@ -0,0 +1,213 @@
+"""
+Tests for the partner statement of account.
+
+Covers:
+- Opening balance, invoices, allocations, unapplied payments and closing balance
+- Partners with payments but no invoices up to date_to
+- AR / AP separation and partner filters
+- GET /finance/bp/customers/statement/ (paginated and CSV download)
+- GET /finance/bp/customers/{bp_id}/statement/ and suppliers/{bp_id}/statement/
+- Query count independent of the number of partners
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.base.test_utils import create_test_currency, create_test_invoice, create_test_payment
+from Finance.BusinessPartner.models import Customer, Supplier
+from Finance.GL.models import JournalEntry
+from Finance.Invoice.models import Invoice, InvoiceOpenItem
+from Finance.Invoice.services import StatementOfAccountService
+
+
+class StatementTestCase(TestCase):
+    """Base test case with a customer, a supplier and invoice / receipt builders"""
+
+    date_from = date(2026, 1, 1)
+    date_to = date(2026, 1, 31)
+
+    def setUp(self):
+        self.currency = create_test_currency()
+        self.customer = Customer.objects.create(name='Statement Customer')
+        self.supplier = Supplier.objects.create(name='Statement Supplier')
+
+    def create_ar_invoice(self, total, invoice_date, customer=None, approval_status=Invoice.APPROVED):
+        return create_test_invoice(
+            customer or self.customer, total, invoice_date, self.currency, approval_status=approval_status
+        )
+
+    def create_ap_invoice(self, total, invoice_date):
+        return create_test_invoice(self.supplier, total, invoice_date, self.currency, approval_status=Invoice.APPROVED)
+
+    def create_receipt(self, payment_date, gl_total=None, customer=None):
+        gl_entry = None
+        if gl_total is not None:
+            gl_entry = JournalEntry.objects.create(
+                date=payment_date, currency=self.currency, total_debit=Decimal(gl_total), total_credit=Decimal(gl_total)
+            )
+        return create_test_payment(customer or self.customer, payment_date, self.currency, gl_entry=gl_entry)
+
+
+class StatementOfAccountTests(StatementTestCase):
+    """Test StatementOfAccountService"""
+
+    def statement(self, invoice_type=InvoiceOpenItem.AR, **kwargs):
+        return StatementOfAccountService.format_rows(
+            StatementOfAccountService.statement_queryset(invoice_type, self.date_from, self.date_to, **kwargs)
+        )
+
+    def test_figures(self):
+        december = self.create_ar_invoice('100.00', date(2025, 12, 15))
+        self.create_receipt(date(2025, 12, 20)).allocate_to_invoice(december, Decimal('40.00'))
+        january = self.create_ar_invoice('200.00', date(2026, 1, 10))
+        self.create_receipt(date(2026, 1, 15), gl_total='150.00').allocate_to_invoice(january, Decimal('120.00'))
+        self.create_ar_invoice('300.00', date(2026, 1, 20), approval_status=Invoice.DRAFT)
+        self.create_ar_invoice('500.00', date(2026, 2, 1))
+        self.create_receipt(date(2026, 2, 2), gl_total='75.00')
+
+        [row] = self.statement()
+
+        self.assertEqual(row['business_partner_name'], 'Statement Customer')
+        self.assertEqual(row['currency_code'], 'USD')
+        self.assertEqual(row['opening_balance'], '60.00')
+        self.assertEqual(row['invoice_count'], 1)
+        self.assertEqual(row['invoiced'], '200.00')
+        self.assertEqual(row['allocated'], '120.00')
+        self.assertEqual(row['unapplied'], '30.00')
+        self.assertEqual(row['closing_balance'], '110.00')
+
+    def test_unapplied_payments_before_the_period_reduce_opening_balance(self):
+        self.create_ar_invoice('100.00', date(2025, 11, 1))
+        self.create_receipt(date(2025, 12, 1), gl_total='25.00')
+
+        [row] = self.statement()
+
+        self.assertEqual(row['opening_balance'], '75.00')
+        self.assertEqual(row['closing_balance'], '75.00')
+
+    def test_partners_with_payments_only(self):
+        prepaid = Customer.objects.create(name='Prepaid Customer')
+        self.create_receipt(date(2025, 12, 10), gl_total='30.00', customer=prepaid)
+        self.create_receipt(date(2026, 1, 10), gl_total='50.00', customer=prepaid)
+        self.create_receipt(date(2026, 1, 12), gl_total='20.00', customer=prepaid)
+        later = Customer.objects.create(name='Later Customer')
+        invoice = self.create_ar_invoice('100.00', date(2026, 2, 5), customer=later)
+        self.create_receipt(date(2026, 1, 20), gl_total='100.00', customer=later).allocate_to_invoice(
+            invoice, Decimal('40.00')
+        )
+
+        rows = {row['business_partner_name']: row for row in self.statement()}
+
+        self.assertEqual(set(rows), {'Prepaid Customer', 'Later Customer'})
+        self.assertEqual(rows['Prepaid Customer']['opening_balance'], '-30.00')
+        self.assertEqual(rows['Prepaid Customer']['invoice_count'], 0)
+        self.assertEqual(rows['Prepaid Customer']['unapplied'], '70.00')
+        self.assertEqual(rows['Prepaid Customer']['closing_balance'], '-100.00')
+        self.assertEqual(rows['Later Customer']['allocated'], '40.00')
+        self.assertEqual(rows['Later Customer']['unapplied'], '60.00')
+        self.assertEqual(rows['Later Customer']['closing_balance'], '-100.00')
+        self.assertEqual(len(self.statement(search='prepaid', has_balance=True)), 1)
+
+    def test_ar_and_ap_are_separate(self):
+        self.create_ar_invoice('100.00', date(2026, 1, 5))
+        self.create_ap_invoice('40.00', date(2026, 1, 6))
+
+        [row] = self.statement(InvoiceOpenItem.AP)
+
+        self.assertEqual(row['business_partner_name'], 'Statement Supplier')
+        self.assertEqual(row['closing_balance'], '40.00')
+
+    def test_partner_filters(self):
+        other = Customer.objects.create(name='Other Buyer')
+        self.create_ar_invoice('100.00', date(2026, 1, 5))
+        invoice = self.create_ar_invoice('50.00', date(2026, 1, 5), customer=other)
+        self.create_receipt(date(2026, 1, 6), customer=other).allocate_to_invoice(invoice, Decimal('50.00'))
+
+        self.assertEqual(len(self.statement()), 2)
+        self.assertEqual([row['business_partner_name'] for row in self.statement(search='buyer')], ['Other Buyer'])
+        self.assertEqual(
+            [row['business_partner_name'] for row in self.statement(has_balance=True)], ['Statement Customer']
+        )
+        [row] = self.statement(business_partner_id=other.business_partner_id)
+        self.assertEqual(row['allocated'], '50.00')
+
+    def test_parse_period(self):
+        self.assertEqual(
+            StatementOfAccountService.parse_period(None, '2026-03-20'), (date(2026, 3, 1), date(2026, 3, 20))
+        )
+        with self.assertRaises(ValidationError):
+            StatementOfAccountService.parse_period('2026-03-21', '2026-03-20')
+        with self.assertRaises(ValidationError):
+            StatementOfAccountService.parse_period('march')
+
+
+class StatementEndpointTests(StatementTestCase):
+    """Test the statement endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.period = {'date_from': str(self.date_from), 'date_to': str(self.date_to)}
+
+    def test_customer_statement(self):
+        self.create_ar_invoice('100.00', date(2026, 1, 5))
+
+        response = self.client.get(
+            f'/finance/bp/customers/{self.customer.business_partner_id}/statement/', self.period
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['date_from'], '2026-01-01')
+        [row] = response.data['statements']
+        self.assertEqual(row['closing_balance'], '100.00')
+
+    def test_supplier_statement_list(self):
+        self.create_ap_invoice('40.00', date(2026, 1, 6))
+
+        response = self.client.get('/finance/bp/suppliers/statement/', self.period)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [row] = response.data['data']['results']
+        self.assertEqual(row['business_partner_name'], 'Statement Supplier')
+        self.assertEqual(row['invoiced'], '40.00')
+
+    def test_csv_download(self):
+        self.create_ar_invoice('100.00', date(2026, 1, 5))
+
+        response = self.client.get('/finance/bp/customers/statement/', {**self.period, 'file_format': 'csv'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['Business Partner ID', 'Business Partner', 'Currency'])
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Statement Customer', lines[1])
+
+    def test_invalid_parameters(self):
+        response = self.client.get('/finance/bp/customers/statement/', {'date_from': '2026-02-01', 'date_to': '2026-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/finance/bp/customers/statement/', {'file_format': 'pdf'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/finance/bp/customers/999999/statement/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_query_count_does_not_grow_with_partners(self):
+        def count_queries(partners):
+            for index in range(partners):
+                customer = Customer.objects.create(name=f'Statement Customer {index}')
+                invoice = self.create_ar_invoice('10.00', date(2026, 1, 5), customer=customer)
+                self.create_receipt(date(2026, 1, 6), gl_total='8.00', customer=customer).allocate_to_invoice(
+                    invoice, Decimal('5.00')
+                )
+            with self.assertNumQueries(2):  # count + page
+                response = self.client.get('/finance/bp/customers/statement/', self.period)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        count_queries(2)
+        count_queries(20)
@@ -14,6 +14,8 @@ urlpatterns = [
     
     # Payment allocation management
     path('<int:payment_pk>/allocations/', views.payment_allocations, name='payment-allocations'),
+    path('<int:payment_pk>/allocations/bulk/', views.payment_allocations_bulk, name='payment-allocations-bulk'),
+    path('<int:payment_pk>/allocations/bulk-remove/', views.payment_allocations_bulk_remove, name='payment-allocations-bulk-remove'),
     path('<int:payment_pk>/allocations/<int:allocation_pk>/', views.payment_allocation_detail, name='payment-allocation-detail'),
     
     # Utility endpoints
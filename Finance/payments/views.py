@@ -19,16 +19,20 @@ from django.core.exceptions import ValidationError
 from django.db.models import Q, Sum, F
 from decimal import Decimal
 
-from erp_project.pagination import auto_paginate
+from erp_project.exports import ExportSheet, export_response, iterate_queryset
+from erp_project.pagination import auto_paginate, paginate_queryset_response
+from core.security import get_scoped_queryset, apply_field_security
 
 from Finance.payments.models import Payment, PaymentAllocation, InvoicePaymentPlan, PaymentPlanInstallment
-from Finance.Invoice.models import Invoice
+from Finance.Invoice.models import Invoice, InvoiceOpenItem
+from Finance.Invoice.services import StatementOfAccountService
 from Finance.BusinessPartner.models import BusinessPartner
 from Finance.payments.serializers import (
     PaymentListSerializer, PaymentDetailSerializer,
     PaymentCreateSerializer, PaymentUpdateSerializer,
     AllocationCreateSerializer, AllocationUpdateSerializer,
     PaymentAllocationDetailSerializer,
+    BulkAllocationSerializer, BulkAllocationRemoveSerializer,
     PaymentPlanListSerializer, PaymentPlanDetailSerializer,
     PaymentPlanCreateSerializer, PaymentPlanUpdateSerializer,
     InstallmentListSerializer, InstallmentDetailSerializer,
@@ -75,6 +79,7 @@ def payment_list(request):
             'gl_entry',
             'reconciled_by'
         ).prefetch_related('allocations').all()
+        payments = get_scoped_queryset(request.user, Payment, queryset=payments)
         
         # Apply filters
         business_partner_id = request.query_params.get('business_partner_id')
@@ -120,7 +125,8 @@ def payment_list(request):
             elif has_allocations.lower() == 'false':
                 payments = payments.filter(allocations__isnull=True)
         
-        serializer = PaymentListSerializer(payments, many=True)
+        serializer_class = apply_field_security(request.user, PaymentListSerializer)
+        serializer = serializer_class(payments, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     elif request.method == 'POST':
@@ -285,6 +291,89 @@ def payment_allocation_detail(request, payment_pk, allocation_pk):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+def _format_allocation_result(result):
+    """Convert a bulk allocation result dict to a JSON-friendly response body"""
+    data = {
+        'allocated_total': str(result['allocated_total']),
+        'allocation_count': len(result['allocations']),
+        'allocations': [
+            {
+                'invoice_id': row['invoice_id'],
+                'amount_allocated': str(row['amount_allocated']),
+                'invoice_paid_amount': str(row['invoice_paid_amount']),
+                'payment_status': row['payment_status'],
+            }
+            for row in result['allocations']
+        ],
+    }
+    if 'unallocated' in result:
+        data['unallocated'] = str(result['unallocated'])
+    return data
+
+
+@api_view(['POST'])
+def payment_allocations_bulk(request, payment_pk):
+    """
+    Allocate a payment to many invoices in one request.
+    
+    POST /payments/{payment_id}/allocations/bulk/
+    - Explicit amounts: {allocations: [{invoice_id: int, amount_allocated: decimal}, ...]}
+    - Strategy: {amount: decimal, strategy: OLDEST_FIRST|DUE_DATE|EXACT_MATCH, invoice_ids: [int] (optional)}
+    
+    Invoices are locked once, allocations are computed in memory and written
+    with bulk statements. Nothing is saved if any allocation is invalid.
+    """
+    payment = get_object_or_404(Payment, pk=payment_pk)
+    
+    serializer = BulkAllocationSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
+    try:
+        if data.get('allocations'):
+            result = payment.allocate_bulk({
+                line['invoice_id']: line['amount_allocated']
+                for line in data['allocations']
+            })
+        else:
+            result = payment.auto_allocate(
+                data['amount'],
+                strategy=data['strategy'],
+                invoice_ids=data.get('invoice_ids')
+            )
+    except ValidationError as e:
+        return Response(
+            {'error': e.message_dict if hasattr(e, 'message_dict') else e.messages},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return Response(_format_allocation_result(result), status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+def payment_allocations_bulk_remove(request, payment_pk):
+    """
+    Remove many allocations from a payment in one request.
+    
+    POST /payments/{payment_id}/allocations/bulk-remove/
+    - Request body: {invoice_ids: [int]} (omit to remove all allocations)
+    - Decreases invoice paid_amount with one set-based update
+    """
+    payment = get_object_or_404(Payment, pk=payment_pk)
+    
+    serializer = BulkAllocationRemoveSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        removed = payment.remove_allocations_bulk(serializer.validated_data.get('invoice_ids'))
+    except ValidationError as e:
+        return Response({'error': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({'removed_count': removed}, status=status.HTTP_200_OK)
+
+
 # ============================================================================
 # Invoice Payment Information Views
 # ============================================================================
@@ -378,6 +467,149 @@ def business_partner_payment_summary(request, bp_pk):
     return Response(data)
 
 
+# ============================================================================
+# Statement of Account Views
+# ============================================================================
+
+STATEMENT_EXPORT_HEADERS = [
+    'Business Partner ID', 'Business Partner', 'Currency', 'Opening Balance', 'Invoices',
+    'Invoiced', 'Allocated', 'Unapplied', 'Closing Balance',
+]
+
+
+def _statement_export_rows(rows):
+    for row in iterate_queryset(rows):
+        yield [
+            row['business_partner_id'], row['business_partner_name'], row['currency_code'],
+            row['opening_balance'], row['invoice_count'], row['invoiced'], row['allocated'],
+            row['unapplied'], row['closing_balance'],
+        ]
+
+
+def _statement_list_response(request, invoice_type, filename):
+    """
+    Build the statement of account of a filtered list of partners.
+
+    Query params:
+        - date_from / date_to: Period YYYY-MM-DD (default: this month to today)
+        - business_partner_id: Filter by business partner
+        - currency_id: Filter by currency
+        - search: Partner name contains
+        - is_active: Filter by partner active status (true/false)
+        - has_balance: true to skip rows with a zero closing balance
+        - file_format: xlsx or csv to download every row instead of a page
+    """
+    params = request.query_params
+    try:
+        date_from, date_to = StatementOfAccountService.parse_period(params.get('date_from'), params.get('date_to'))
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+    is_active = params.get('is_active')
+    rows = StatementOfAccountService.statement_queryset(
+        invoice_type, date_from, date_to,
+        business_partner_id=params.get('business_partner_id'),
+        currency_id=params.get('currency_id'),
+        search=params.get('search'),
+        is_active=is_active.lower() == 'true' if is_active is not None else None,
+        has_balance=params.get('has_balance', '').lower() == 'true',
+    )
+
+    file_format = params.get('file_format')
+    if file_format:
+        sheet = ExportSheet(
+            title='Statement of Account',
+            headers=STATEMENT_EXPORT_HEADERS,
+            rows=_statement_export_rows(rows),
+            column_widths={1: 30},
+            number_formats={index: '#,##0.00' for index in (3, 5, 6, 7, 8)},
+        )
+        try:
+            return export_response(f'{filename}_{date_from}_{date_to}', [sheet], file_format=file_format)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return paginate_queryset_response(request, rows, StatementOfAccountService.format_rows)
+
+
+def _statement_detail_response(request, bp_pk, invoice_type):
+    """
+    Build the statement of account of one partner, one row per currency.
+
+    Query params:
+        - date_from / date_to: Period YYYY-MM-DD (default: this month to today)
+        - currency_id: Filter by currency
+    """
+    bp = get_object_or_404(BusinessPartner, pk=bp_pk)
+    try:
+        date_from, date_to = StatementOfAccountService.parse_period(
+            request.query_params.get('date_from'), request.query_params.get('date_to')
+        )
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = StatementOfAccountService.statement_queryset(
+        invoice_type, date_from, date_to,
+        business_partner_id=bp.pk,
+        currency_id=request.query_params.get('currency_id'),
+    )
+    return Response({
+        'business_partner_id': bp.id,
+        'business_partner_name': bp.name,
+        'date_from': str(date_from),
+        'date_to': str(date_to),
+        'statements': StatementOfAccountService.format_rows(rows),
+    })
+
+
+@api_view(['GET'])
+def customer_statement_list(request):
+    """
+    Statement of account of all customers.
+    
+    GET /customers/statement/?date_from=2026-01-01&date_to=2026-06-30
+    - Returns one row per customer and currency: opening balance, invoiced,
+      allocated, unapplied receipts and closing balance
+    - Paginated; file_format=xlsx|csv downloads every row
+    """
+    return _statement_list_response(request, InvoiceOpenItem.AR, 'Customer_Statement')
+
+
+@api_view(['GET'])
+def supplier_statement_list(request):
+    """
+    Statement of account of all suppliers.
+    
+    GET /suppliers/statement/?date_from=2026-01-01&date_to=2026-06-30
+    - Returns one row per supplier and currency: opening balance, invoiced,
+      allocated, unapplied payments and closing balance
+    - Paginated; file_format=xlsx|csv downloads every row
+    """
+    return _statement_list_response(request, InvoiceOpenItem.AP, 'Supplier_Statement')
+
+
+@api_view(['GET'])
+def customer_statement(request, bp_pk):
+    """
+    Statement of account of one customer.
+    
+    GET /customers/{bp_id}/statement/?date_from=2026-01-01&date_to=2026-06-30
+    - Returns the customer's statement rows, one per currency
+    """
+    return _statement_detail_response(request, bp_pk, InvoiceOpenItem.AR)
+
+
+@api_view(['GET'])
+def supplier_statement(request, bp_pk):
+    """
+    Statement of account of one supplier.
+    
+    GET /suppliers/{bp_id}/statement/?date_from=2026-01-01&date_to=2026-06-30
+    - Returns the supplier's statement rows, one per currency
+    """
+    return _statement_detail_response(request, bp_pk, InvoiceOpenItem.AP)
+
+
 # ============================================================================
 # Utility Views
 # ============================================================================
@@ -876,11 +1108,9 @@ def payment_plan_update_status(request, pk):
     payment_plan = get_object_or_404(InvoicePaymentPlan, pk=pk)
     
     try:
-        payment_plan.update_status()
-        
-        # Also update all installment statuses
-        for installment in payment_plan.installments.all():
-            installment.update_status()
+        # Installment and plan statuses in two set-based UPDATEs
+        InvoicePaymentPlan.refresh_statuses(plan_ids=[payment_plan.pk])
+        payment_plan.refresh_from_db(fields=['status', 'updated_at'])
             
         return Response({
             'message': 'Status updated successfully',
@@ -31,6 +31,9 @@ urlpatterns = [
     # Budget Control URLs
     path('budget/', include('Finance.budget_control.urls')),
     
+    # Fixed Assets URLs
+    path('fixed-assets/', include('Finance.fixed_assets.urls')),
+    
     # Default Combinations URLs
     path('', include('Finance.default_combinations.urls')),
 ]
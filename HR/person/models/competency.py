@@ -47,6 +47,8 @@ class Competency(SoftDeleteMixin, AuditMixin, models.Model):
         help_text="Competency category from lookup (e.g., Technical, Behavioral)"
     )
 
+    search_index_fields = ('code', 'name', 'description')
+
     objects = SoftDeleteManager()
 
     class Meta:
@@ -64,6 +64,8 @@ class Employee(DFFMixin, VersionedMixin, ChildModelMixin, AuditMixin, models.Mod
         help_text="First day of employment (this period)"
     )
 
+    search_index_fields = ('employee_number',)
+
     objects = EmployeeManager()
 
     class Meta:
@@ -79,6 +79,11 @@ class Person(ManagedParentModel, AuditMixin, models.Model):
     religion = models.CharField(max_length=50, blank=True)
     blood_type = models.CharField(max_length=5, blank=True)
 
+    search_index_fields = (
+        'first_name', 'middle_name', 'last_name',
+        'first_name_arabic', 'middle_name_arabic', 'last_name_arabic',
+    )
+
     objects = ManagedParentManager()
 
     class Meta:
@@ -1,6 +1,5 @@
 from django.db import transaction
 from django.core.exceptions import ValidationError
-from django.db.models import Q
 from datetime import date
 from typing import List, Optional
 from HR.person.dtos import CompetencyCreateDTO, CompetencyUpdateDTO
@@ -151,7 +150,7 @@ class CompetencyService:
     @staticmethod
     def search_competencies(search_term: str) -> List[Competency]:
         """
-        Search competencies by code, name, or description.
+        Search competencies by code, name, or description (word prefixes, best match first).
 
         Args:
             search_term: Search string (case-insensitive)
@@ -162,11 +161,7 @@ class CompetencyService:
         if not search_term:
             return Competency.objects.active().select_related('category').order_by('name')
 
-        return Competency.objects.active().filter(
-            Q(code__icontains=search_term) |
-            Q(name__icontains=search_term) |
-            Q(description__icontains=search_term)
-        ).select_related('category').order_by('name')
+        return Competency.objects.active().select_related('category').order_by('name').search(search_term)
 
     @staticmethod
     def get_competency_by_code(code: str) -> Optional[Competency]:
@@ -17,6 +17,7 @@ from django.core.exceptions import ValidationError
 from datetime import date, timedelta
 from HR.person.models import Employee, Applicant, Person, PersonType, Assignment
 from HR.work_structures.models import Organization, Position
+from core.base.search import matching_ids
 from core.lookups.models import LookupValue
 from HR.person.dtos import EmployeeUpdateDTO
 
@@ -371,12 +372,13 @@ class EmployeeService:
 
         search = filters.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(person__first_name__icontains=search) |
-                Q(person__last_name__icontains=search) |
-                Q(person__middle_name__icontains=search) |
-                Q(employee_number__icontains=search)
-            )
+            # Indexed word / prefix match on person names or employee number
+            person_ids = matching_ids(Person, search)
+            if person_ids is not None:
+                queryset = queryset.filter(
+                    Q(person__in=person_ids) |
+                    Q(pk__in=matching_ids(Employee, search))
+                )
 
         return queryset
 
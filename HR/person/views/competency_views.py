@@ -4,7 +4,6 @@ from rest_framework import status
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
 from datetime import date
 
 from HR.person.services.competency_service import CompetencyService
@@ -49,11 +48,7 @@ def competency_list(request):
             competencies = competencies.filter(category__code=category_code)
             
         if search_query:
-            competencies = competencies.filter(
-                Q(code__icontains=search_query) |
-                Q(name__icontains=search_query) |
-                Q(description__icontains=search_query)
-            )
+            competencies = competencies.search(search_query)
             
         serializer = CompetencySerializer(competencies, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -4,6 +4,7 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404
 from erp_project.pagination import auto_paginate
 from core.job_roles.decorators import require_page_action
+from core.security import get_scoped_queryset, apply_field_security
 
 from HR.person.models import Employee, Person, PersonType
 from HR.person.services.employee_service import EmployeeService
@@ -33,8 +34,10 @@ def employee_list(request):
         }
         
         employees = EmployeeService.list_employees(filters)
-            
-        serializer = EmployeeSerializer(employees, many=True)
+        employees = get_scoped_queryset(request.user, Employee, queryset=employees)
+
+        serializer_class = apply_field_security(request.user, EmployeeSerializer)
+        serializer = serializer_class(employees, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     elif request.method == 'POST':
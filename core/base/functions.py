@@ -0,0 +1,26 @@
+"""
+Core Database Functions
+
+Expressions shared by querysets across apps.
+
+Usage:
+    from core.base.functions import DecimalDivide
+
+    queryset.annotate(pct=DecimalDivide(F('part') * Value(Decimal('100')), F('whole'),
+                                        output_field=models.DecimalField(max_digits=9, decimal_places=2)))
+"""
+from django.db import models
+
+
+class DecimalDivide(models.Func):
+    """
+    Decimal division that is not truncated on SQLite.
+
+    SQLite stores whole-number decimals (10.000) as integers and divides two
+    integers as integers, so 10 × 105 / 100 would give 10 instead of 10.5.
+    """
+    arg_joiner = ' / '
+    template = '(%(expressions)s)'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='(1.0 * %(expressions)s)', **extra_context)
@@ -4,15 +4,16 @@ Core Base Managers Module
 Provides custom managers and querysets for base models.
 
 **Architecture:**
-- BaseQuerySet: Generic filtering (code/name/search)
+- BaseQuerySet: Generic filtering (code/name/search), indexed search
 - SoftDeleteQuerySet: For models with status field
 - VersionedQuerySet: For models with effective_start_date/end_date
 
 Exports:
     QuerySets:
-        - BaseQuerySet: filter_by_search_params
+        - BaseQuerySet: filter_by_search_params, search
         - SoftDeleteQuerySet: active(), inactive()
-        - VersionedQuerySet: active_on(), active_between(), all_versions(), latest_version()
+        - VersionedQuerySet: active_on(), active_between(), all_versions(), latest_version(),
+          overlapping(), bulk_update_version()
 
     Managers:
         - SoftDeleteManager: For SoftDeleteMixin models
@@ -34,9 +35,19 @@ Usage:
         objects = VersionedManager()
 """
 
-from django.db import models
-from django.db.models import Q
+from datetime import date, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from core.base.models import StatusChoices
+from core.base.search import get_search_index_fields, index_objects, reindex, search as search_queryset
+
+
+# Rows per UPDATE / INSERT statement in bulk versioning
+BULK_VERSION_BATCH_SIZE = 500
 
 
 class BaseQuerySet(models.QuerySet):
@@ -45,22 +56,31 @@ class BaseQuerySet(models.QuerySet):
 
     Methods:
         - filter_by_search_params: Filter by code/name/search
+        - search: Indexed token/prefix search, ranked (see core.base.search)
+
+    Models with search_index_fields keep their search index in sync through
+    bulk_create(), bulk_update() and update() as well as save()/delete().
     """
 
     def filter_by_search_params(self, query_params):
         """
         Apply standard code/name/search filters from query parameters.
 
+        Models with search_index_fields use the search index: name and search
+        match words by prefix ('lap' matches 'Dell Laptop'), and search results
+        come best match first. Other models use contains matches.
+
         Args:
             query_params: QueryDict or dict with optional keys:
                 - code: Exact match (case-insensitive)
-                - name: Contains match (case-insensitive)
-                - search: Contains match across code and name
+                - name: Match on name
+                - search: Match across code and name (or all indexed fields)
 
         Returns:
             Filtered QuerySet
         """
         queryset = self
+        indexed_fields = get_search_index_fields(self.model)
 
         code = query_params.get('code')
         if code:
@@ -68,17 +88,58 @@ class BaseQuerySet(models.QuerySet):
 
         name = query_params.get('name')
         if name:
-            queryset = queryset.filter(name__icontains=name)
+            if 'name' in indexed_fields:
+                queryset = queryset.search(name, fields=['name'], rank=False)
+            else:
+                queryset = queryset.filter(name__icontains=name)
 
         search = query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(code__icontains=search) |
-                Q(name__icontains=search)
-            )
+            if indexed_fields:
+                queryset = queryset.search(search)
+            else:
+                queryset = queryset.filter(
+                    Q(code__icontains=search) |
+                    Q(name__icontains=search)
+                )
 
         return queryset
 
+    def search(self, text, fields=None, rank=True):
+        """
+        Records matching every word of text, by whole word or prefix.
+
+        Args:
+            text: Search text
+            fields: Restrict matching to these indexed fields (default: all)
+            rank: Annotate search_rank and order best match first
+
+        Returns:
+            QuerySet
+        """
+        return search_queryset(self, text, fields, rank)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if get_search_index_fields(self.model):
+            index_objects(self.model, objs, self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if set(fields) & set(get_search_index_fields(self.model)):
+            index_objects(self.model, objs, self.db)
+        return rows
+
+    def update(self, **kwargs):
+        if not set(kwargs) & set(get_search_index_fields(self.model)):
+            return super().update(**kwargs)
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        reindex(self.model, pks, self.db)
+        return rows
+
 
 class SoftDeleteQuerySet(BaseQuerySet):
     """
@@ -123,6 +184,8 @@ class VersionedQuerySet(BaseQuerySet):
         - active_between(start, end): Records active in date range
         - all_versions(): All versions including inactive
         - latest_version(group_field, group_value): Most recent version
+        - overlapping(group_field, scope_fields): Records overlapping another version
+        - bulk_update_version(field_updates, new_start_date): Dated change for many records
 
     Usage:
         class Department(VersionedMixin, models.Model):
@@ -142,6 +205,11 @@ class VersionedQuerySet(BaseQuerySet):
 
         # Get latest version
         Department.objects.latest_version('code', 'IT')
+
+        # Move every active department of a location to another one from July 1st
+        Department.objects.active_on(date(2026, 7, 1)).filter(location=old).bulk_update_version(
+            {'location': new}, new_start_date=date(2026, 7, 1)
+        )
     """
 
     def active_on(self, reference_date):
@@ -208,6 +276,170 @@ class VersionedQuerySet(BaseQuerySet):
         ).order_by('-effective_start_date').first()
 
 
+    def overlapping(self, group_field, scope_fields=()):
+        """
+        Return records whose date range overlaps another version of their group.
+
+        Same rule as VersionedMixin.clean(), evaluated in SQL for the whole
+        queryset at once.
+
+        Args:
+            group_field: Field that groups versions (e.g., 'code')
+            scope_fields: Extra fields versions must share (e.g., ['business_group'])
+
+        Returns:
+            QuerySet: Records with at least one overlapping version
+        """
+        same_group = {
+            field: OuterRef(field) for field in (group_field, *scope_fields)
+        }
+        others = self.model._base_manager.filter(
+            **same_group,
+            effective_start_date__lt=Coalesce(
+                OuterRef('effective_end_date'), Value(date.max, output_field=models.DateField())
+            ),
+        ).filter(
+            Q(effective_end_date__isnull=True) |
+            Q(effective_end_date__gt=OuterRef('effective_start_date'))
+        ).exclude(pk=OuterRef('pk'))
+        return self.filter(Exists(others))
+
+    def bulk_update_version(self, field_updates, new_start_date, new_end_date=None,
+                            batch_size=BULK_VERSION_BATCH_SIZE):
+        """
+        Apply one dated change to every record in the queryset.
+
+        Bulk counterpart of VersionedMixin.update_version():
+        - Records starting on new_start_date are corrected in place
+        - Other records are end-dated the day before new_start_date and get a
+          new version carrying field_updates, with their M2M rows copied
+
+        Writes are set-based (UPDATE / bulk_create per batch), so the query
+        count depends on the number of batches, not records. All or nothing:
+        any validation error rolls the whole change back.
+
+        Validation:
+        - Every record must be active on new_start_date
+        - field_updates are validated once with clean_fields(); model clean()
+          is not run per record
+        - Overlaps with other versions are checked in SQL after the writes
+
+        Args:
+            field_updates: Dict of concrete field name -> new value
+            new_start_date: Date the change takes effect
+            new_end_date: End date of the changed versions (None = keep each record's)
+            batch_size: Rows per UPDATE / INSERT
+
+        Returns:
+            list: Corrected and newly created versions
+
+        Raises:
+            ValidationError: If any record fails validation (nothing is written)
+        """
+        model = self.model
+        fields = {name: model._meta.get_field(name) for name in field_updates}
+        invalid = sorted(
+            name for name, field in fields.items()
+            if not field.concrete or field.many_to_many or field.primary_key
+            or field.name in ('effective_start_date', 'effective_end_date')
+        )
+        if invalid:
+            raise ValidationError(f"Cannot bulk update field(s): {', '.join(invalid)}")
+        if new_end_date is not None and new_end_date < new_start_date:
+            raise ValidationError({'effective_end_date': 'Start date must be before end date'})
+
+        with transaction.atomic(using=self.db):
+            records = list(self.select_for_update())
+            if not records:
+                return []
+
+            inactive = [
+                record.pk for record in records
+                if record.effective_start_date > new_start_date
+                or (record.effective_end_date is not None and record.effective_end_date < new_start_date)
+            ]
+            if inactive:
+                raise ValidationError({
+                    'effective_start_date': f"Records not active on {new_start_date}: {inactive}"
+                })
+
+            # Updated values are the same for every record: validate them once
+            sample = model(**{
+                field.attname: getattr(records[0], field.attname) for field in model._meta.concrete_fields
+            })
+            for name, value in field_updates.items():
+                setattr(sample, name, value)
+            updated_names = {field.name for field in fields.values()}
+            sample.clean_fields(exclude=[
+                field.name for field in model._meta.fields if field.name not in updated_names
+            ])
+
+            # queryset.update() skips auto_now fields
+            now = timezone.now()
+            touched = {
+                field.attname: now if isinstance(field, models.DateTimeField) else now.date()
+                for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)
+            }
+            base = self.__class__(model=model, using=self.db)
+
+            def update_in_batches(pks, **values):
+                for index in range(0, len(pks), batch_size):
+                    base.filter(pk__in=pks[index:index + batch_size]).update(**values, **touched)
+
+            corrected = [record for record in records if record.effective_start_date == new_start_date]
+            superseded = [record for record in records if record.effective_start_date < new_start_date]
+
+            correction_values = dict(field_updates)
+            if new_end_date is not None:
+                correction_values['effective_end_date'] = new_end_date
+            update_in_batches([record.pk for record in corrected], **correction_values)
+            for record in corrected:
+                for name, value in correction_values.items():
+                    setattr(record, name, value)
+
+            update_in_batches(
+                [record.pk for record in superseded],
+                effective_end_date=new_start_date - timedelta(days=1)
+            )
+            new_versions = []
+            for record in superseded:
+                version = model(**{
+                    field.attname: getattr(record, field.attname)
+                    for field in model._meta.concrete_fields if not field.primary_key
+                })
+                for name, value in field_updates.items():
+                    setattr(version, name, value)
+                version.effective_start_date = new_start_date
+                if new_end_date is not None:
+                    version.effective_end_date = new_end_date
+                new_versions.append(version)
+            base.bulk_create(new_versions, batch_size=batch_size)
+            model.copy_many_to_many(
+                {record.pk: version.pk for record, version in zip(superseded, new_versions)},
+                exclude=updated_names,
+                batch_size=batch_size
+            )
+
+            changed = corrected + new_versions
+            try:
+                group_field = records[0].get_version_group_field()
+            except NotImplementedError:
+                return changed
+            scope_fields = list(records[0].get_version_scope_filters())
+            changed_pks = [version.pk for version in changed]
+            for index in range(0, len(changed_pks), batch_size):
+                conflicts = list(
+                    base.filter(pk__in=changed_pks[index:index + batch_size])
+                    .overlapping(group_field, scope_fields)
+                    .values_list(group_field, flat=True)[:10]
+                )
+                if conflicts:
+                    raise ValidationError({
+                        'effective_start_date': f"Date range overlaps with existing {group_field}={conflicts}"
+                    })
+            return changed
+
+
 class VersionedManager(models.Manager.from_queryset(VersionedQuerySet)):
     """
     Manager for VersionedMixin models.
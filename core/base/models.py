@@ -279,6 +279,7 @@ class VersionedMixin(models.Model):
         - active_on(reference_date): Check if active on a specific date
         - deactivate(end_date): End-date the record
         - update_version(field_updates, new_start_date, new_end_date): Generic correction/versioning
+        - copy_many_to_many(version_map): Bulk-copy M2M rows from old to new versions
         - get_version_group_field(): Override to enable overlap validation
         - get_version_scope_filters(): Override for scoped uniqueness
 
@@ -295,6 +296,9 @@ class VersionedMixin(models.Model):
         # Update versioned record (correction or new version):
         dept.update_version({'name': 'New Name'})  # Correction
         dept.update_version({'name': 'New Name'}, new_start_date=date(2026, 2, 1))  # New version
+
+        # Same change for many records at once (see VersionedQuerySet.bulk_update_version):
+        Department.objects.filter(location=old).bulk_update_version({'location': new}, date(2026, 2, 1))
     """
     effective_start_date = models.DateField(
         help_text="Date this version becomes active"
@@ -429,30 +433,40 @@ class VersionedMixin(models.Model):
             new_version.save()
 
             # Copy Many-to-Many relationships
-            for field in self._meta.many_to_many:
-                if field.name in field_updates:
-                    continue
-
-                if field.remote_field.through._meta.auto_created:
-                    # Simple M2M: use set() to copy relations
-                    getattr(new_version, field.name).set(getattr(self, field.name).all())
-                else:
-                    # M2M with custom through model: manually copy rows
-                    through_model = field.remote_field.through
-                    fk_name = field.m2m_field_name()
-                    
-                    # Filter for rows related to the current (old) instance
-                    filter_kwargs = {fk_name: self.pk}
-                    old_rows = through_model.objects.filter(**filter_kwargs)
-                    
-                    for row in old_rows:
-                        # Clone the row
-                        row.pk = None
-                        setattr(row, fk_name, new_version)
-                        row.save()
+            self.copy_many_to_many({self.pk: new_version.pk}, exclude=field_updates)
 
             return new_version
 
+    @classmethod
+    def copy_many_to_many(cls, version_map, exclude=(), batch_size=None):
+        """
+        Copy the M2M rows of old versions onto their new versions in bulk.
+
+        Works for auto-created and custom through models alike: through rows
+        are read per batch of old versions and re-inserted with bulk_create.
+
+        Args:
+            version_map: Dict of old version pk -> new version pk
+            exclude: M2M field names not to copy (e.g. the ones being updated)
+            batch_size: Old versions read per query / rows per INSERT
+        """
+        old_pks = list(version_map)
+        for field in cls._meta.many_to_many:
+            if field.name in exclude:
+                continue
+
+            through_model = field.remote_field.through
+            source = through_model._meta.get_field(field.m2m_field_name()).attname
+            step = batch_size or len(old_pks) or 1
+            rows = []
+            for index in range(0, len(old_pks), step):
+                batch = old_pks[index:index + step]
+                for row in through_model._base_manager.filter(**{f'{source}__in': batch}):
+                    row.pk = None
+                    setattr(row, source, version_map[getattr(row, source)])
+                    rows.append(row)
+            through_model._base_manager.bulk_create(rows, batch_size=batch_size)
+
     def get_version_group_field(self):
         """
         Override to specify which field groups versions together.
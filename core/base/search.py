@@ -0,0 +1,253 @@
+"""
+Core Search Index
+
+Indexed token/prefix search for list endpoints, portable across SQLite and
+server databases (plain B-tree lookups, no vendor full-text extension).
+
+Models opt in by naming the text fields to index:
+
+    class catalogItem(models.Model):
+        search_index_fields = ('code', 'name', 'description')
+        objects = BaseQuerySet.as_manager()
+
+Each field value is split into lower-cased words stored in core.SearchToken.
+A search term matches a word equal to it or starting with it, looked up as a
+range on the (content_type, token) index: `token >= 'lap' AND token < 'laq'`.
+Unlike LIKE 'lap%' (ESCAPE defeats SQLite's LIKE optimisation, and server
+collations need special operator classes), a range scan is served from a
+plain B-tree index on every database.
+
+Matching and ranking:
+- Every term of the search text must match a word of the record (AND)
+- Whole-word matches rank above prefix matches; records matching in more
+  fields or words rank higher
+- Terms shorter than MIN_PREFIX_LENGTH only match whole words
+
+Keeping the index in sync:
+- save() / delete(): post_save / post_delete handlers (connect_search_index)
+- BaseQuerySet.bulk_create(), bulk_update() and update() reindex the rows
+  they write
+- Other writes that skip both (raw SQL, update() on a plain manager) must
+  call index_objects() / reindex() themselves; `manage.py rebuild_search_index`
+  rebuilds everything
+
+Usage:
+    catalogItem.objects.search('dell lap')  # ranked, attribute search_rank
+    catalogItem.objects.filter_by_search_params(request.query_params)
+    Employee.objects.filter(person__in=matching_ids(Person, 'smith'))
+"""
+import re
+
+from django.apps import apps
+from django.db.models import Case, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+
+
+# Whole words longer than this are indexed (and searched) truncated
+MAX_TOKEN_LENGTH = 32
+
+# Shortest search term matched as a prefix
+MIN_PREFIX_LENGTH = 2
+
+# Search text beyond this many terms is ignored
+MAX_SEARCH_TERMS = 8
+
+# Records reindexed / token rows written per query
+INDEX_BATCH_SIZE = 500
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def get_search_index_fields(model):
+    """Indexed fields of a model (empty tuple when the model does not opt in)"""
+    return tuple(getattr(model, 'search_index_fields', ()))
+
+
+def tokenize(text):
+    """
+    Lower-cased words of a text, in order, without duplicates.
+
+    Example:
+        tokenize('HP-ProBook 450, HP')  # ['hp', 'probook', '450']
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(str(text or '').lower()):
+        token = token[:MAX_TOKEN_LENGTH]
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def term_filter(term):
+    """
+    Q matching the tokens equal to a search term or starting with it.
+
+    Example:
+        term_filter('lap')  # token >= 'lap' AND token < 'laq'
+    """
+    if len(term) < MIN_PREFIX_LENGTH:
+        return Q(token=term)
+    return Q(token__gte=term, token__lt=term[:-1] + chr(ord(term[-1]) + 1))
+
+
+def _content_type(model):
+    from django.contrib.contenttypes.models import ContentType
+
+    return ContentType.objects.get_for_model(model, for_concrete_model=False)
+
+
+def _tokens(model, using=None):
+    from core.models import SearchToken
+
+    return SearchToken.objects.db_manager(using).filter(content_type=_content_type(model))
+
+
+def index_rows(model, rows, using=None):
+    """
+    Replace the index entries of records with the given field values.
+
+    Args:
+        model: Model with search_index_fields
+        rows: Iterable of {'pk': ..., field: value, ...}
+        using: Database alias
+    """
+    from core.models import SearchToken
+
+    fields = get_search_index_fields(model)
+    rows = list(rows)
+    if not fields or not rows:
+        return
+    content_type = _content_type(model)
+    tokens = _tokens(model, using)
+    for index in range(0, len(rows), INDEX_BATCH_SIZE):
+        batch = rows[index:index + INDEX_BATCH_SIZE]
+        tokens.filter(object_id__in=[row['pk'] for row in batch]).delete()
+        SearchToken.objects.db_manager(using).bulk_create([
+            SearchToken(content_type=content_type, object_id=row['pk'], field=field, token=token)
+            for row in batch
+            for field in fields
+            for token in tokenize(row[field])
+        ], batch_size=INDEX_BATCH_SIZE)
+
+
+def index_objects(model, objects, using=None):
+    """Index saved instances from their current attribute values"""
+    fields = get_search_index_fields(model)
+    index_rows(model, (
+        {'pk': obj.pk, **{field: getattr(obj, field) for field in fields}}
+        for obj in objects if obj.pk is not None
+    ), using)
+
+
+def reindex(model, pks=None, using=None):
+    """
+    Rebuild the index entries of records from the database.
+
+    Args:
+        model: Model with search_index_fields
+        pks: Primary keys to reindex (None = the whole table)
+        using: Database alias
+    """
+    fields = get_search_index_fields(model)
+    if not fields:
+        return
+    records = model._base_manager.db_manager(using).order_by('pk')
+    if pks is None:
+        _tokens(model, using).delete()
+        index_rows(model, records.values('pk', *fields).iterator(chunk_size=INDEX_BATCH_SIZE), using)
+        return
+    pks = list(pks)
+    for index in range(0, len(pks), INDEX_BATCH_SIZE):
+        index_rows(model, records.filter(pk__in=pks[index:index + INDEX_BATCH_SIZE]).values('pk', *fields), using)
+
+
+def unindex(model, pks, using=None):
+    """Remove the index entries of deleted records"""
+    _tokens(model, using).filter(object_id__in=list(pks)).delete()
+
+
+def matching_ids(model, text, fields=None, using=None):
+    """
+    Subquery of the ids of records matching every term of a search text.
+
+    Args:
+        model: Model with search_index_fields
+        text: Search text
+        fields: Restrict matching to these indexed fields (default: all)
+        using: Database alias
+
+    Returns:
+        QuerySet of object_id values, usable as `pk__in=`; None when the
+        text has no searchable terms
+    """
+    terms = tokenize(text)[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    tokens = _tokens(model, using)
+    if fields:
+        tokens = tokens.filter(field__in=fields)
+    ids = tokens.filter(term_filter(terms[0])).values('object_id')
+    for term in terms[1:]:
+        ids = ids.filter(object_id__in=tokens.filter(term_filter(term)).values('object_id'))
+    return ids
+
+
+def search(queryset, text, fields=None, rank=True):
+    """
+    Filter a queryset to records matching a search text, best matches first.
+
+    Args:
+        queryset: QuerySet of a model with search_index_fields
+        text: Search text
+        fields: Restrict matching to these indexed fields (default: all)
+        rank: Annotate search_rank and order by it (then the current ordering)
+
+    Returns:
+        QuerySet: unchanged when the text has no searchable terms
+    """
+    model = queryset.model
+    ids = matching_ids(model, text, fields, queryset.db)
+    if ids is None:
+        return queryset
+    queryset = queryset.filter(pk__in=ids)
+    if not rank:
+        return queryset
+
+    terms = tokenize(text)[:MAX_SEARCH_TERMS]
+    matches = Q()
+    for term in terms:
+        matches |= term_filter(term)
+    tokens = _tokens(model, queryset.db).filter(matches, object_id=OuterRef('pk'))
+    if fields:
+        tokens = tokens.filter(field__in=fields)
+    score = tokens.order_by().values('object_id').annotate(
+        score=Sum(Case(When(token__in=terms, then=Value(2)), default=Value(1), output_field=IntegerField()))
+    ).values('score')
+    ordering = queryset.query.order_by or model._meta.ordering
+    return queryset.annotate(
+        search_rank=Coalesce(Subquery(score), 0)
+    ).order_by('-search_rank', *ordering, 'pk')
+
+
+def _index_saved(sender, instance, update_fields=None, using=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(get_search_index_fields(sender)):
+        return
+    index_objects(sender, [instance], using)
+
+
+def _unindex_deleted(sender, instance, using=None, **kwargs):
+    unindex(sender, [instance.pk], using)
+
+
+def searchable_models():
+    """Installed models with search_index_fields"""
+    return [model for model in apps.get_models() if get_search_index_fields(model)]
+
+
+def connect_search_index():
+    """Keep the index of every searchable model in sync on save() / delete()"""
+    for model in searchable_models():
+        label = model._meta.label
+        post_save.connect(_index_saved, sender=model, dispatch_uid=f'search_index_{label}_saved')
+        post_delete.connect(_unindex_deleted, sender=model, dispatch_uid=f'search_index_{label}_deleted')
@@ -0,0 +1,38 @@
+"""
+Signal Muting
+
+Bulk operations that delete rows through the ORM, so cascades still run,
+can mute the per-row cache invalidation receivers of the models they
+delete and invalidate the affected caches once for the whole batch:
+
+    with mute_cache_signals(UserJobRole):
+        UserJobRole.objects.filter(pk__in=pks).delete()
+    invalidate_permission_matrices(user_ids)
+
+Receivers opt in by returning early while their sender is muted:
+
+    def invalidate_assignment_matrix(sender, instance, **kwargs):
+        if cache_signals_muted(sender):
+            return
+        ...
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_muted_senders = ContextVar('muted_cache_signal_senders', default=frozenset())
+
+
+@contextmanager
+def mute_cache_signals(*models):
+    """Mute the opted-in cache receivers of some models for the block"""
+    token = _muted_senders.set(_muted_senders.get() | frozenset(models))
+    try:
+        yield
+    finally:
+        _muted_senders.reset(token)
+
+
+def cache_signals_muted(sender):
+    """True inside mute_cache_signals() for this sender"""
+    return sender in _muted_senders.get()
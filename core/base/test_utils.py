@@ -1,7 +1,11 @@
 from django.core.management import call_command
 from django.utils import timezone
 from core.job_roles.models import JobRole, UserJobRole
+from decimal import Decimal
 import io
+import itertools
+
+_test_numbers = itertools.count(1)
 
 def setup_core_data():
     """Initialize core system data for tests once and suppressing print output"""
@@ -26,3 +30,130 @@ def setup_admin_permissions(user):
         defaults={'effective_start_date': timezone.now().date()}
     )
 
+def next_test_number():
+    """Unique number for the codes and document numbers of test records"""
+    return next(_test_numbers)
+
+def create_test_user(email=None, name='Test User', password='testpass123'):
+    """Create a user account (a unique email is generated when none is given)"""
+    from core.user_accounts.models import UserAccount
+
+    return UserAccount.objects.create_user(
+        email=email or f'user{next_test_number()}@example.com',
+        name=name,
+        phone_number='1234567890',
+        password=password
+    )
+
+def assign_job_role(user, job_role, start=None):
+    """Assign a job role to a user, effective from start (default: today)"""
+    return UserJobRole.objects.create(
+        user=user, job_role=job_role, effective_start_date=start or timezone.now().date()
+    )
+
+def reset_permission_caches():
+    """
+    Invalidate cached principals, permission matrices and security policies.
+
+    The cache outlives the test transaction: call from tearDown() of tests
+    that build any of them.
+    """
+    from core.job_roles.permission_matrix import bump_permission_matrix_version
+    from core.security.services import bump_policy_version
+    from core.user_accounts.principal import bump_principal_version
+
+    bump_principal_version()
+    bump_permission_matrix_version()
+    bump_policy_version()
+
+def create_test_currency(code='USD', name='US Dollar', symbol='$', is_base_currency=True, **kwargs):
+    """Create a currency (the base currency unless is_base_currency=False)"""
+    from Finance.core.models import Currency
+
+    return Currency.objects.create(code=code, name=name, symbol=symbol, is_base_currency=is_base_currency, **kwargs)
+
+def create_test_invoice(partner, total, invoice_date, currency, journal_entry=None, **kwargs):
+    """
+    Create an AR invoice for a Customer or an AP invoice for a Supplier.
+
+    The invoice number is unique and, unless given, the invoice gets its own
+    journal entry. kwargs override the other invoice fields
+    (e.g. approval_status).
+
+    Returns:
+        Invoice: The parent invoice record
+    """
+    from Finance.BusinessPartner.models import Customer
+    from Finance.GL.models import JournalEntry
+    from Finance.Invoice.models import AP_Invoice, AR_Invoice
+
+    if journal_entry is None:
+        journal_entry = JournalEntry.objects.create(date=invoice_date, currency=currency, memo='Test invoice')
+    if isinstance(partner, Customer):
+        model, partner_field, prefix = AR_Invoice, 'customer', 'AR'
+    else:
+        model, partner_field, prefix = AP_Invoice, 'supplier', 'AP'
+    return model.objects.create(**{
+        'invoice_number': f'TEST-{prefix}-{next_test_number()}',
+        partner_field: partner,
+        'date': invoice_date,
+        'currency': currency,
+        'subtotal': Decimal(str(total)),
+        'total': Decimal(str(total)),
+        'gl_distributions': journal_entry,
+        **kwargs,
+    }).invoice
+
+def create_test_payment(partner, payment_date, currency, **kwargs):
+    """Create a payment (a receipt for a Customer) at exchange rate 1"""
+    from Finance.BusinessPartner.models import Customer
+    from Finance.payments.models import Payment
+
+    if isinstance(partner, Customer):
+        kwargs.setdefault('payment_type', Payment.RECEIPT)
+    return Payment.objects.create(
+        date=payment_date,
+        business_partner=partner.business_partner,
+        currency=currency,
+        exchange_rate=1,
+        **kwargs
+    )
+
+
+
+class QueryProfileTestMixin:
+    """
+    Profile every request made by self.client (see erp_project.profiling).
+
+    Responses carry a query_profile; assert it against the URL's budget:
+
+        response = self.client.get('/finance/payments/')
+        self.assertWithinQueryBudget(response)
+        self.assertNoDuplicateQueries(response)
+    """
+
+    def setUp(self):
+        from django.test.utils import override_settings
+        from erp_project.profiling import get_profiling_config
+
+        profiling_settings = override_settings(QUERY_PROFILING={**get_profiling_config(), 'ENABLED': True})
+        profiling_settings.enable()
+        self.addCleanup(profiling_settings.disable)
+        super().setUp()
+
+    def assertWithinQueryBudget(self, response, budget=None):
+        """Fail if the request ran more queries than budget (default: its URL budget)"""
+        profile = response.query_profile
+        budget = profile.budget if budget is None else budget
+        if budget is None:
+            self.fail(f"No query budget configured for {profile.path}")
+        self.assertLessEqual(
+            profile.query_count, budget,
+            f"{profile.method} {profile.path} ran {profile.query_count} queries (budget {budget}); "
+            f"duplicates: {profile.duplicates}"
+        )
+
+    def assertNoDuplicateQueries(self, response):
+        """Fail if the request ran the same query (up to parameters) more than once"""
+        profile = response.query_profile
+        self.assertEqual(profile.duplicates, [], f"Duplicate queries in {profile.method} {profile.path}")
@@ -0,0 +1,135 @@
+"""
+Query Profiling Tests
+
+Covers:
+- fingerprint() and get_query_budget()
+- profile_queries(): counts, duplicates
+- QueryProfilingMiddleware: opt-in, headers, budgets, JSON-lines report
+- QueryProfileTestMixin and the query_profile_report command
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core.base.test_utils import QueryProfileTestMixin
+from erp_project.profiling import (
+    QueryBudgetExceeded,
+    fingerprint,
+    get_query_budget,
+    profile_queries,
+)
+from Finance.core.models import Currency
+
+
+class ProfilingHelperTests(TestCase):
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint('SELECT *  FROM "po" WHERE "id" IN (%s, %s, %s) AND "code" = \'USD\' LIMIT 21'),
+            'SELECT * FROM "po" WHERE "id" IN (...) AND "code" = ? LIMIT ?'
+        )
+        self.assertEqual(fingerprint('SELECT 1 WHERE "a" = %s'), fingerprint('SELECT 2 WHERE "a" = %s'))
+
+    def test_get_query_budget(self):
+        budgets = {r'^/finance/payments/$': 8, r'^/finance/': 20}
+
+        self.assertEqual(get_query_budget('/finance/payments/', budgets), 8)
+        self.assertEqual(get_query_budget('/finance/payments/3/', budgets), 20)
+        self.assertIsNone(get_query_budget('/accounts/profile/', budgets))
+
+    def test_profile_queries(self):
+        currencies = [
+            Currency.objects.create(code=code, name=code, symbol=code) for code in ('USD', 'EUR', 'GBP')
+        ]
+
+        with profile_queries() as profile:
+            for currency in currencies:
+                Currency.objects.get(pk=currency.pk)
+            Currency.objects.count()
+
+        self.assertEqual(profile.query_count, 4)
+        self.assertEqual(profile.duplicate_count, 2)
+        self.assertEqual(len(profile.duplicates), 1)
+        self.assertEqual(profile.duplicates[0][1], 3)
+        self.assertGreater(profile.sql_time, 0)
+
+
+class QueryProfilingMiddlewareTests(APITestCase):
+
+    url = '/finance/core/currencies/'
+
+    def setUp(self):
+        for code in ('USD', 'EUR'):
+            Currency.objects.create(code=code, name=code, symbol=code)
+
+    def profiling(self, **config):
+        return override_settings(QUERY_PROFILING={'ENABLED': True, 'BUDGETS': {}, **config})
+
+    def test_disabled_by_default(self):
+        response = self.client.get(self.url)
+
+        self.assertNotIn('X-Query-Count', response)
+        self.assertFalse(hasattr(response, 'query_profile'))
+
+    def test_headers(self):
+        with self.profiling(BUDGETS={r'^/finance/core/currencies/$': 10}):
+            response = self.client.get(self.url)
+
+        self.assertEqual(int(response['X-Query-Count']), response.query_profile.query_count)
+        self.assertGreaterEqual(response.query_profile.query_count, 1)
+        self.assertEqual(response['X-Query-Duplicates'], '0')
+        self.assertEqual(response['X-Query-Budget'], '10')
+        self.assertIn('X-Query-Time-Ms', response)
+        self.assertGreater(float(response['X-Serializer-Time-Ms']), 0)
+
+    def test_budget_overrun_raises_when_configured(self):
+        with self.profiling(BUDGETS={r'^/finance/core/currencies/$': 0}, RAISE_ON_BUDGET=True):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(self.url)
+
+    def test_budget_overrun_is_logged(self):
+        with self.profiling(BUDGETS={r'^/finance/core/currencies/$': 0}):
+            with self.assertLogs('erp_project.profiling', 'WARNING') as logs:
+                response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/finance/core/currencies/ ran', logs.output[0])
+
+    def test_report_and_summary(self):
+        handle, path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        currency = Currency.objects.get(code='EUR')
+
+        with self.profiling(REPORT_PATH=path, BUDGETS={r'^/finance/core/currencies/\d+/$': 0}):
+            self.client.get(self.url)
+            with self.assertLogs('erp_project.profiling', 'WARNING'):
+                self.client.get(f'{self.url}{currency.pk}/')
+
+        with open(path) as report:
+            entries = [json.loads(line) for line in report]
+        self.assertEqual([entry['path'] for entry in entries], [self.url, f'{self.url}{currency.pk}/'])
+        self.assertEqual(entries[0]['status'], 200)
+
+        out = StringIO()
+        call_command('query_profile_report', '--path', path, stdout=out)
+        self.assertIn('/finance/core/currencies/<id>/', out.getvalue())
+        self.assertIn('1 request(s) exceeded their query budget', out.getvalue())
+
+
+class QueryProfileTestMixinTests(QueryProfileTestMixin, APITestCase):
+
+    def test_assertions(self):
+        Currency.objects.create(code='USD', name='US Dollar', symbol='$', is_base_currency=True)
+
+        response = self.client.get('/finance/core/currencies/')
+
+        self.assertWithinQueryBudget(response, budget=5)
+        self.assertNoDuplicateQueries(response)
+        with self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget(response, budget=0)
@@ -0,0 +1,151 @@
+"""
+Search Index Tests
+
+Covers:
+- tokenize() / term_filter()
+- BaseQuerySet.search(): word and prefix matching, all terms required, ranking
+- Index kept in sync on save, delete, bulk_create, bulk_update and update
+- filter_by_search_params() on indexed and non-indexed models
+- rebuild_search_index command and the migration backfill
+"""
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from core.base.managers import BaseQuerySet
+from core.base.search import matching_ids, term_filter, tokenize
+from core.models import SearchToken
+from procurement.catalog.models import UnitOfMeasure, catalogItem
+
+
+class SearchTestCase(TestCase):
+    """Base test case with three indexed catalog items"""
+
+    def setUp(self):
+        self.laptop = catalogItem.objects.create(code='LAPTOP01', name='Dell Laptop', description='Business laptop')
+        self.bag = catalogItem.objects.create(code='BAG01', name='Laptop Bag', description='Fits 15-inch laptops')
+        self.mouse = catalogItem.objects.create(code='MOUSE01', name='Wireless Mouse', description='Ergonomic')
+
+    def codes(self, queryset):
+        return [item.code for item in queryset]
+
+
+class TokenizeTests(TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('HP-ProBook 450, HP'), ['hp', 'probook', '450'])
+        self.assertEqual(tokenize('  '), [])
+        self.assertEqual(tokenize(None), [])
+        self.assertEqual(tokenize('Café  محمد'), ['café', 'محمد'])
+
+    def test_term_filter(self):
+        self.assertEqual(term_filter('lap'), Q(token__gte='lap', token__lt='laq'))
+        self.assertEqual(term_filter('a'), Q(token='a'))
+
+
+class SearchTests(SearchTestCase):
+
+    def test_word_and_prefix_matching(self):
+        self.assertEqual(set(self.codes(catalogItem.objects.search('laptop'))), {'LAPTOP01', 'BAG01'})
+        self.assertEqual(self.codes(catalogItem.objects.search('WIRE')), ['MOUSE01'])
+        self.assertEqual(self.codes(catalogItem.objects.search('mouse01')), ['MOUSE01'])
+        self.assertEqual(self.codes(catalogItem.objects.search('ouse')), [])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.codes(catalogItem.objects.search('laptop ba')), ['BAG01'])
+        self.assertEqual(self.codes(catalogItem.objects.search('dell mouse')), [])
+
+    def test_ranking(self):
+        # Whole word 'laptop' in name and description beats the bag's name word + 'laptops' prefix
+        results = list(catalogItem.objects.search('laptop'))
+
+        self.assertEqual(self.codes(results), ['LAPTOP01', 'BAG01'])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def test_field_restriction(self):
+        self.assertEqual(self.codes(catalogItem.objects.search('business', fields=['name'])), [])
+        self.assertEqual(self.codes(catalogItem.objects.search('business', fields=['description'])), ['LAPTOP01'])
+
+    def test_text_without_words_does_not_filter(self):
+        self.assertEqual(catalogItem.objects.search(' - ').count(), 3)
+        self.assertIsNone(matching_ids(catalogItem, '...'))
+
+    def test_search_is_one_query(self):
+        with self.assertNumQueries(1):
+            list(catalogItem.objects.search('lap bag')[:20])
+
+
+class SearchIndexSyncTests(SearchTestCase):
+
+    def test_save_and_delete(self):
+        self.mouse.name = 'Optical Mouse'
+        self.mouse.save()
+        self.assertEqual(self.codes(catalogItem.objects.search('optical')), ['MOUSE01'])
+        self.assertEqual(self.codes(catalogItem.objects.search('wireless')), [])
+
+        self.mouse.delete()
+        self.assertFalse(SearchToken.objects.filter(object_id=self.mouse.pk, token='optical').exists())
+
+    def test_bulk_create_and_bulk_update(self):
+        items = catalogItem.objects.bulk_create([
+            catalogItem(code=f'CABLE{index}', name=f'USB Cable {index}m', description='Cable') for index in range(3)
+        ])
+        self.assertEqual(catalogItem.objects.search('usb cab').count(), 3)
+
+        items[0].name = 'HDMI Cable'
+        catalogItem.objects.bulk_update(items, ['name'])
+        self.assertEqual(self.codes(catalogItem.objects.search('hdmi')), ['CABLE0'])
+
+    def test_queryset_update(self):
+        catalogItem.objects.filter(code__in=['BAG01', 'MOUSE01']).update(description='Accessory')
+
+        self.assertEqual(set(self.codes(catalogItem.objects.search('accessory'))), {'BAG01', 'MOUSE01'})
+        self.assertEqual(self.codes(catalogItem.objects.search('ergonomic')), [])
+
+    def test_rebuild_command(self):
+        SearchToken.objects.all().delete()
+        out = StringIO()
+
+        call_command('rebuild_search_index', 'catalog.catalogItem', stdout=out)
+
+        self.assertIn('catalog.catalogItem: 3 records indexed', out.getvalue())
+        self.assertEqual(self.codes(catalogItem.objects.search('dell')), ['LAPTOP01'])
+
+    def test_migration_backfill(self):
+        migration = import_module('core.migrations.0002_backfill_search_tokens')
+        schema_editor = SimpleNamespace(connection=connection)
+        SearchToken.objects.all().delete()
+        catalogItem.objects.filter(pk=self.laptop.pk).update(name='Dell Latitude')
+
+        migration.backfill_search_tokens(apps, schema_editor)
+        tokens = SearchToken.objects.count()
+        migration.backfill_search_tokens(apps, schema_editor)
+
+        self.assertEqual(SearchToken.objects.count(), tokens)
+        self.assertEqual(self.codes(catalogItem.objects.search('latitude')), ['LAPTOP01'])
+        self.assertEqual(set(self.codes(catalogItem.objects.search('laptop'))), {'LAPTOP01', 'BAG01'})
+        self.assertEqual(catalogItem.objects.search('wireless').count(), 1)
+
+
+class FilterBySearchParamsTests(SearchTestCase):
+
+    def test_indexed_model(self):
+        items = catalogItem.objects.all()
+
+        self.assertEqual(self.codes(items.filter_by_search_params({'search': 'laptop'})), ['LAPTOP01', 'BAG01'])
+        self.assertEqual(set(self.codes(items.filter_by_search_params({'name': 'laptop'}))), {'LAPTOP01', 'BAG01'})
+        self.assertEqual(self.codes(items.filter_by_search_params({'name': 'business'})), [])
+        self.assertEqual(self.codes(items.filter_by_search_params({'code': 'bag01', 'search': 'lap'})), ['BAG01'])
+
+    def test_model_without_index_uses_contains(self):
+        UnitOfMeasure.objects.create(code='KG', name='Kilograms', uom_type='WEIGHT')
+        units = BaseQuerySet(model=UnitOfMeasure)
+
+        self.assertEqual(units.filter_by_search_params({'search': 'ogram'}).count(), 1)
+        self.assertEqual(units.filter_by_search_params({'name': 'kilo'}).count(), 1)
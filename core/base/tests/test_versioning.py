@@ -0,0 +1,198 @@
+"""
+Bulk Versioning Tests
+
+Covers:
+- VersionedQuerySet.bulk_update_version(): new versions, corrections,
+  M2M copy (auto-created and custom through), validation, rollback
+- Constant query count regardless of the number of records
+- VersionedQuerySet.overlapping()
+- VersionedMixin.update_version() M2M copy
+"""
+from datetime import date, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from HR.work_structures.models import Grade, Job, JobQualificationRequirement, Organization
+from core.lookups.models import LookupType, LookupValue
+
+
+class BulkVersioningTestCase(TestCase):
+    """Base test case with a business group, lookups, a grade and a job builder"""
+
+    def setUp(self):
+        lookup_types = {
+            name: LookupType.objects.create(name=name) for name in (
+                'Organization Type', 'Grade Name', 'Job Category', 'Job Title',
+                'Qualification Type', 'Qualification Title',
+            )
+        }
+
+        def lookup(type_name, name):
+            return LookupValue.objects.create(lookup_type=lookup_types[type_name], name=name, is_active=True)
+
+        self.business_group = Organization.objects.create(
+            organization_name='BG001',
+            organization_type=lookup('Organization Type', 'Business Group'),
+            effective_start_date=date(2025, 1, 1),
+        )
+        self.technical = lookup('Job Category', 'Technical')
+        self.management = lookup('Job Category', 'Management')
+        self.title = lookup('Job Title', 'Developer')
+        self.bachelor = lookup('Qualification Type', 'Bachelor')
+        self.computer_science = lookup('Qualification Title', 'Computer Science')
+        self.grade = Grade.objects.create(
+            organization=self.business_group, sequence=1, grade_name=lookup('Grade Name', 'Grade 1')
+        )
+        self.start = date(2026, 1, 1)
+        self.change_date = date(2026, 7, 1)
+
+    def create_jobs(self, count, prefix='JOB', start=None):
+        jobs = Job.objects.bulk_create([
+            Job(
+                code=f'{prefix}{index:03d}',
+                business_group=self.business_group,
+                job_category=self.technical,
+                job_title=self.title,
+                job_description='Builds things',
+                effective_start_date=start or self.start,
+            )
+            for index in range(count)
+        ])
+        Job.grades.through.objects.bulk_create([
+            Job.grades.through(job_id=job.pk, grade_id=self.grade.pk) for job in jobs
+        ])
+        JobQualificationRequirement.objects.bulk_create([
+            JobQualificationRequirement(
+                job=job, qualification_type=self.bachelor, qualification_title=self.computer_science
+            )
+            for job in jobs
+        ])
+        return jobs
+
+
+class BulkUpdateVersionTests(BulkVersioningTestCase):
+
+    def test_new_versions(self):
+        self.create_jobs(3)
+
+        versions = Job.objects.filter(code__startswith='JOB').bulk_update_version(
+            {'job_category': self.management}, new_start_date=self.change_date
+        )
+
+        self.assertEqual(len(versions), 3)
+        self.assertEqual(Job.objects.count(), 6)
+        old = Job.objects.get(code='JOB000', effective_start_date=self.start)
+        self.assertEqual(old.effective_end_date, self.change_date - timedelta(days=1))
+        self.assertEqual(old.job_category, self.technical)
+
+        new = Job.objects.get(code='JOB000', effective_start_date=self.change_date)
+        self.assertIsNone(new.effective_end_date)
+        self.assertEqual(new.job_category, self.management)
+        self.assertEqual(new.job_description, 'Builds things')
+        self.assertEqual(list(new.grades.all()), [self.grade])
+        self.assertEqual(list(new.qualifications.all()), [self.bachelor])
+        self.assertEqual(list(old.qualifications.all()), [self.bachelor])
+        self.assertEqual(Job.objects.active_on(self.change_date).filter(job_category=self.management).count(), 3)
+
+    def test_corrections_and_end_date(self):
+        self.create_jobs(1, prefix='OLD')
+        self.create_jobs(1, prefix='NEW', start=self.change_date)
+        end = date(2026, 12, 31)
+
+        versions = Job.objects.all().bulk_update_version(
+            {'job_description': 'Reorganised'}, new_start_date=self.change_date, new_end_date=end
+        )
+
+        self.assertEqual(len(versions), 2)
+        self.assertEqual(Job.objects.count(), 3)
+        corrected = Job.objects.get(code='NEW000')
+        self.assertEqual((corrected.job_description, corrected.effective_end_date), ('Reorganised', end))
+        self.assertEqual(corrected.grades.count(), 1)
+        new = Job.objects.get(code='OLD000', effective_start_date=self.change_date)
+        self.assertEqual((new.job_description, new.effective_end_date), ('Reorganised', end))
+
+    def test_query_count_does_not_grow_with_records(self):
+        self.create_jobs(3, prefix='FEW')
+        self.create_jobs(60, prefix='MANY')
+
+        with CaptureQueriesContext(connection) as few:
+            Job.objects.filter(code__startswith='FEW').bulk_update_version(
+                {'job_category': self.management}, new_start_date=self.change_date
+            )
+        with CaptureQueriesContext(connection) as many:
+            Job.objects.filter(code__startswith='MANY').bulk_update_version(
+                {'job_category': self.management}, new_start_date=self.change_date
+            )
+
+        self.assertEqual(Job.objects.filter(effective_start_date=self.change_date).count(), 63)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+    def test_records_not_active_on_the_date_are_rejected(self):
+        self.create_jobs(1, prefix='LATE', start=date(2026, 8, 1))
+        self.create_jobs(1)
+
+        with self.assertRaises(ValidationError) as ctx:
+            Job.objects.all().bulk_update_version({'job_category': self.management}, new_start_date=self.change_date)
+
+        self.assertIn('not active on 2026-07-01', str(ctx.exception))
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_invalid_updates_are_rejected(self):
+        self.create_jobs(1)
+
+        for field_updates in (
+            {'job_category': self.title},
+            {'effective_start_date': self.change_date},
+            {'grades': [self.grade]},
+        ):
+            with self.assertRaises(ValidationError, msg=field_updates):
+                Job.objects.all().bulk_update_version(field_updates, new_start_date=self.change_date)
+        with self.assertRaises(ValidationError):
+            Job.objects.all().bulk_update_version(
+                {'job_description': 'X'}, new_start_date=self.change_date, new_end_date=self.start
+            )
+        self.assertEqual(Job.objects.get().job_category, self.technical)
+
+    def test_overlap_rolls_back_everything(self):
+        jobs = self.create_jobs(2)
+        # A future version of JOB001 already starts inside the new range
+        Job.objects.filter(pk=jobs[1].pk).update(effective_end_date=date(2026, 9, 30))
+        self.create_jobs(2, start=date(2026, 10, 1))[0].delete()
+
+        with self.assertRaises(ValidationError) as ctx:
+            Job.objects.filter(effective_start_date=self.start).bulk_update_version(
+                {'job_description': 'Changed'}, new_start_date=self.change_date, new_end_date=date(2026, 12, 31)
+            )
+
+        self.assertIn("code=['JOB001']", str(ctx.exception))
+        self.assertEqual(Job.objects.count(), 3)
+        self.assertFalse(Job.objects.filter(job_description='Changed').exists())
+        self.assertIsNone(Job.objects.get(pk=jobs[0].pk).effective_end_date)
+
+    def test_overlapping(self):
+        jobs = self.create_jobs(2)
+        self.create_jobs(1, start=date(2026, 3, 1))
+
+        overlapping = Job.objects.overlapping('code', ['business_group'])
+
+        self.assertEqual(
+            set(overlapping.values_list('code', 'effective_start_date')),
+            {('JOB000', self.start), ('JOB000', date(2026, 3, 1))}
+        )
+        Job.objects.filter(pk=jobs[0].pk).update(effective_end_date=date(2026, 2, 28))
+        self.assertFalse(Job.objects.overlapping('code', ['business_group']).exists())
+
+
+class UpdateVersionTests(BulkVersioningTestCase):
+
+    def test_update_version_copies_m2m_rows(self):
+        job = self.create_jobs(1)[0]
+
+        new = job.update_version({'job_description': 'Changed'}, new_start_date=self.change_date)
+
+        self.assertEqual(list(new.grades.all()), [self.grade])
+        self.assertEqual(new.qualification_requirements.get().qualification_title, self.computer_science)
+        self.assertEqual(job.qualification_requirements.count(), 1)
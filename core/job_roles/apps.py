@@ -5,3 +5,6 @@ class JobRolesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.job_roles'
     verbose_name = 'Job Roles and Permissions'
+
+    def ready(self):
+        import core.job_roles.signals  # noqa: F401
@@ -0,0 +1,214 @@
+"""
+Effective Permission Matrix
+
+The page/action matrix of a user: for every page the user reaches through
+their roles or explicit grants, the actions allowed, denied and granted
+after role inheritance, page inheritance and permission overrides. It is
+what permission checks read:
+
+- user_can_perform_action() and the permission decorators
+- get_user_all_permissions() (GET /users/{pk}/permissions/, frontend menu)
+
+The matrix is materialized per user in the cache and built in a fixed
+number of queries on top of the user's principal
+(core.user_accounts.principal), which already holds the role pages:
+active overrides, reachable pages, their page actions.
+
+Entries are valid for one day (role assignments and overrides are
+effective-dated), one principal version and one matrix version.
+Invalidation (core.job_roles.signals):
+- user, role assignment or permission override changed → that user's entry
+- role or role page changed → entries of the users assigned to the role
+  or to one of its descendant roles
+- page or page action changed → the version is bumped
+
+Invalidation is incremental: only the affected users' entries are dropped,
+and each is rebuilt on that user's next check. Entries live in the default
+cache, which is shared by every worker process (required outside DEBUG by
+core.user_accounts.principal.require_shared_cache()), so a new denial or a
+removed role page takes effect on all workers at once.
+
+Queryset-level bulk writes (update(), bulk_create()) do not send signals;
+callers doing them must call invalidate_permission_matrices() /
+bump_permission_matrix_version(). Bulk deletes of role assignments and role
+pages run inside core.base.signals.mute_cache_signals() and invalidate the
+affected users once.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from core.user_accounts.principal import get_principal
+
+
+PERMISSION_MATRIX_VERSION_CACHE_KEY = 'job_roles:permission_matrix_version'
+PERMISSION_MATRIX_CACHE_PREFIX = 'job_roles:permission_matrix'
+PERMISSION_MATRIX_CACHE_TIMEOUT = 60 * 60
+
+class PermissionMatrix:
+    """
+    Effective actions of one user, by page code.
+
+    Attributes:
+        pages: {page_code: (name, module_code)} of the pages
+            the user reaches, in menu order (sort_order, name)
+        allowed / denied / granted: {page_code: tuple of action codes};
+            granted is the subset of allowed coming from explicit grants
+        role_pages: Codes of the pages reached through roles
+    """
+
+    def __init__(self, pages, allowed, denied, granted, role_pages, version, principal_version, as_of):
+        self.pages = pages
+        self.allowed = allowed
+        self.denied = denied
+        self.granted = granted
+        self.role_pages = frozenset(role_pages)
+        self.version = version
+        self.principal_version = principal_version
+        self.as_of = as_of
+
+    def __repr__(self):
+        return f"<PermissionMatrix pages={len(self.pages)}>"
+
+    def can(self, page_code, action_code):
+        """Whether the action is allowed on the page"""
+        return action_code in self.allowed.get(page_code, ())
+
+    def is_denied(self, page_code, action_code):
+        """Whether an explicit denial removes the action from the page"""
+        return action_code in self.denied.get(page_code, ())
+
+    def is_granted(self, page_code, action_code):
+        """Whether the action is allowed through an explicit grant"""
+        return action_code in self.granted.get(page_code, ())
+
+    def as_list(self):
+        """The matrix in the get_user_all_permissions() format"""
+        return [
+            {
+                'page': code,
+                'page_display_name': name,
+                'module_code': module_code,
+                'allowed_actions': list(self.allowed.get(code, ())),
+                'denied_actions': list(self.denied.get(code, ())),
+                'granted_actions': list(self.granted.get(code, ())),
+                'access_source': 'role' if code in self.role_pages else 'grant',
+            }
+            for code, (name, module_code) in self.pages.items()
+        ]
+
+
+def get_permission_matrix_version():
+    """Current matrix version (created on first use)"""
+    version = cache.get(PERMISSION_MATRIX_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(PERMISSION_MATRIX_VERSION_CACHE_KEY, version, None)
+        version = cache.get(PERMISSION_MATRIX_VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_permission_matrix_version():
+    """Invalidate every cached matrix"""
+    cache.set(PERMISSION_MATRIX_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_permission_matrices(user_ids):
+    """Drop the cached matrices of some users"""
+    cache.delete_many([f"{PERMISSION_MATRIX_CACHE_PREFIX}:{user_id}" for user_id in set(user_ids)])
+
+
+def get_role_user_ids(role_ids):
+    """
+    Ids of the users assigned (on any date) to some roles or to one of
+    their descendant roles, i.e. the users whose permissions the roles feed.
+    """
+    from .models import JobRole, UserJobRole
+
+    children = {}
+    for role_id, parent_id in JobRole.objects.exclude(parent_role=None).values_list('pk', 'parent_role_id'):
+        children.setdefault(parent_id, []).append(role_id)
+
+    affected = set()
+    pending = list(role_ids)
+    while pending:
+        role_id = pending.pop()
+        if role_id not in affected:
+            affected.add(role_id)
+            pending.extend(children.get(role_id, ()))
+
+    return set(
+        UserJobRole.objects.filter(job_role_id__in=affected).order_by().values_list('user_id', flat=True).distinct()
+    )
+
+
+def _build_permission_matrix(principal, version, as_of):
+    from .models import Page, PageAction, UserPermissionOverride
+
+    grants = {}
+    denials = {}
+    overrides = UserPermissionOverride.objects.active_on(as_of).filter(user_id=principal.user.pk).values_list(
+        'page_action_id', 'page_action__page_id', 'permission_type'
+    )
+    for page_action_id, page_id, permission_type in overrides:
+        (grants if permission_type == 'grant' else denials)[page_action_id] = page_id
+
+    pages = {}
+    role_pages = set()
+    page_codes = {}
+    for page_id, code, name, module_code in Page.objects.filter(
+        pk__in=principal.page_ids | set(grants.values())
+    ).order_by('sort_order', 'name').values_list('pk', 'code', 'name', 'module_code'):
+        pages[code] = (name, module_code)
+        page_codes[page_id] = code
+        if page_id in principal.page_ids:
+            role_pages.add(code)
+
+    allowed = {}
+    denied = {}
+    granted = {}
+    page_actions = PageAction.objects.filter(
+        Q(page_id__in=page_codes) | Q(pk__in=denials)
+    ).order_by('action__code').values_list('pk', 'page_id', 'page__code', 'action__code')
+    for page_action_id, page_id, page_code, action_code in page_actions:
+        if page_action_id in denials:
+            denied.setdefault(page_code, []).append(action_code)
+        elif page_action_id in grants:
+            granted.setdefault(page_code, []).append(action_code)
+            allowed.setdefault(page_code, []).append(action_code)
+        elif page_id in principal.page_ids:
+            allowed.setdefault(page_code, []).append(action_code)
+
+    def freeze(actions):
+        return {page_code: tuple(codes) for page_code, codes in actions.items()}
+
+    return PermissionMatrix(
+        pages, freeze(allowed), freeze(denied), freeze(granted), role_pages, version, principal.version, as_of
+    )
+
+
+def get_permission_matrix(user):
+    """
+    Cached permission matrix of a user, built on a cache miss.
+
+    Unsaved and anonymous users get an empty, uncached matrix.
+    """
+    principal = get_principal(user)
+    if principal.version is None:
+        return PermissionMatrix({}, {}, {}, {}, (), None, None, None)
+
+    key = f"{PERMISSION_MATRIX_CACHE_PREFIX}:{user.pk}"
+    version = get_permission_matrix_version()
+    as_of = timezone.now().date()
+    matrix = cache.get(key)
+    if (
+        matrix is not None and matrix.version == version
+        and matrix.principal_version == principal.version and matrix.as_of == as_of
+    ):
+        return matrix
+
+    matrix = _build_permission_matrix(principal, version, as_of)
+    cache.set(key, matrix, PERMISSION_MATRIX_CACHE_TIMEOUT)
+    return matrix
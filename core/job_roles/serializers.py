@@ -277,4 +277,40 @@ class UserRolePermissionsSerializer(serializers.Serializer):
             'direct_permissions': instance['direct_permissions'],
             'effective_permissions': instance['effective_permissions'],
             'permission_overrides': instance['permission_overrides']
-        }
\ No newline at end of file
+        }
+
+# ============================================================================
+# BULK ASSIGNMENT SERIALIZERS
+# ============================================================================
+
+class BulkUserJobRoleSerializer(serializers.Serializer):
+    """
+    Input of the bulk user-role endpoints: every role is assigned to (or
+    revoked from) every user.
+    """
+    user_emails = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    job_role_codes = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    effective_start_date = serializers.DateField(required=False)
+    effective_end_date = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, data):
+        """Default the start date to today and check the date range"""
+        if not data.get('effective_start_date'):
+            data['effective_start_date'] = timezone.now().date()
+
+        end_date = data.get('effective_end_date')
+        if end_date and end_date < data['effective_start_date']:
+            raise serializers.ValidationError(
+                {'effective_end_date': 'End date must be after start date'}
+            )
+        return data
+
+
+class BulkJobRolePageSerializer(serializers.Serializer):
+    """
+    Input of the bulk role-page endpoints: every page is assigned to (or
+    removed from) every role.
+    """
+    job_role_codes = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    page_codes = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    inherit_to_children = serializers.BooleanField(required=False, default=False)
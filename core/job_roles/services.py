@@ -3,10 +3,19 @@ Service layer for Job Roles permission checking.
 Contains business logic for role-based access control.
 """
 from typing import Tuple, List, Dict, Set
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from .models import (
     JobRole, Page, Action, PageAction, JobRolePage,
 )
+from core.user_accounts.principal import get_principal
+from core.base.signals import mute_cache_signals
+from .permission_matrix import get_permission_matrix, get_role_user_ids, invalidate_permission_matrices
+
+
+# Rows looked up / inserted per query by the bulk assignment services
+BULK_ASSIGNMENT_BATCH_SIZE = 500
 
 
 def get_effective_pages_for_job_role_page(job_role_page) -> list:
@@ -161,49 +170,38 @@ def user_can_perform_action(user, page_code: str, action_code: str) -> Tuple[boo
     if hasattr(user, 'is_admin') and user.is_admin():
         return True, "Permission granted (Admin)"
 
-    # Check if page exists
+    # 2-4. Overrides and role pages, resolved in the cached matrix
+    matrix = get_permission_matrix(user)
+
+    if matrix.is_denied(page_code, action_code):
+        return False, f"Access explicitly denied for action '{action_code}' on page '{page_code}'"
+
+    if matrix.is_granted(page_code, action_code):
+        return True, "Permission granted (explicit grant)"
+
+    if matrix.can(page_code, action_code):
+        return True, "Permission granted"
+
+    # 5. Default: denied, explaining why
     try:
         page = Page.objects.get(code=page_code)
     except Page.DoesNotExist:
         return False, f"Page '{page_code}' does not exist"
 
-    # Check if action exists
     try:
         action = Action.objects.get(code=action_code)
     except Action.DoesNotExist:
         return False, f"Action '{action_code}' does not exist"
 
-    # Check if this page-action combination exists
-    try:
-        page_action = PageAction.objects.get(page=page, action=action)
-    except PageAction.DoesNotExist:
+    if not PageAction.objects.filter(page=page, action=action).exists():
         return False, f"Action '{action_code}' is not available for page '{page_code}'"
 
-    # Get permission overrides for this specific page_action
-    overrides = get_user_permission_overrides(user, [page_action.pk])
-
-    # 2. Check for explicit denial (highest priority block)
-    if page_action.pk in overrides['denials']:
-        return False, f"Access explicitly denied for action '{action_code}' on page '{page_code}'"
-
-    # 3. Check for explicit grant (overrides role-based access)
-    if page_action.pk in overrides['grants']:
-        return True, "Permission granted (explicit grant)"
-
-    # 4. Check role-based access
-    effective_roles = get_user_active_roles(user)
+    principal = get_principal(user)
 
-    if not effective_roles:
+    if not principal.role_ids:
         return False, "User has no active job roles assigned"
 
-    # Get all pages accessible by user's roles
-    accessible_page_ids = get_all_effective_pages_for_roles(effective_roles)
-
-    if page.pk in accessible_page_ids:
-        return True, "Permission granted"
-    
-    # 5. Default: denied
-    role_names = ', '.join([r.name for r in effective_roles])
+    role_names = ', '.join(principal.role_names)
     return False, f"Your roles ({role_names}) do not have access to page '{page_code}'"
 
 
@@ -306,6 +304,7 @@ def get_user_all_permissions(user) -> list:
             {
                 'page': 'hr_department',
                 'page_display_name': 'HR - Departments',
+                'module_code': 'hr',
                 'allowed_actions': ['view', 'create', 'edit'],
                 'denied_actions': ['delete'],
                 'granted_actions': [],
@@ -313,55 +312,15 @@ def get_user_all_permissions(user) -> list:
             },
             ...
         ]
+
+    Non-admin users are served from their cached permission matrix
+    (core.job_roles.permission_matrix).
     """
     # Admin gets all pages
     if hasattr(user, 'is_admin') and user.is_admin():
         return _get_all_pages_permissions()
 
-    effective_roles = get_user_active_roles(user)
-
-    if not effective_roles:
-        # Check for explicit grants even without roles
-        return _get_granted_only_permissions(user)
-
-    # Get all pages user has access to through their roles
-    accessible_page_ids = get_all_effective_pages_for_roles(effective_roles)
-
-    # Get explicit grants that might give access to additional pages
-    all_overrides = get_user_permission_overrides(user)
-    granted_page_action_ids = all_overrides['grants']
-
-    # Find pages from explicit grants that aren't in role-based access
-    if granted_page_action_ids:
-        granted_page_actions = PageAction.objects.filter(
-            pk__in=granted_page_action_ids
-        ).select_related('page')
-        for pa in granted_page_actions:
-            accessible_page_ids.add(pa.page.pk)
-
-    # Build permissions for each accessible page
-    pages = Page.objects.filter(pk__in=accessible_page_ids).order_by('sort_order', 'name')
-
-    permissions = []
-    for page in pages:
-        page_permissions = get_user_page_permissions(user, page.code)
-
-        # Determine access source
-        access_source = 'role'
-        if page_permissions['granted_actions'] and not page.pk in get_all_effective_pages_for_roles(effective_roles):
-            access_source = 'grant'
-
-        permissions.append({
-            'page': page.name,
-            'page_display_name': page.display_name,
-            'module_code': page.module_code,
-            'allowed_actions': page_permissions['allowed_actions'],
-            'denied_actions': page_permissions['denied_actions'],
-            'granted_actions': page_permissions['granted_actions'],
-            'access_source': access_source
-        })
-
-    return permissions
+    return get_permission_matrix(user).as_list()
 
 
 def _get_all_pages_permissions():
@@ -384,34 +343,230 @@ def _get_all_pages_permissions():
     return permissions
 
 
-def _get_granted_only_permissions(user):
-    """Get permissions only from explicit grants (for users without roles)"""
-    overrides = get_user_permission_overrides(user)
-    granted_page_action_ids = overrides['grants'] - overrides['denials']
+# ============================================================================
+# Bulk assignments
+# ============================================================================
 
-    if not granted_page_action_ids:
-        return []
+def _unique(values):
+    return list(dict.fromkeys(values))
 
-    # Group by page
-    page_actions = PageAction.objects.filter(
-        pk__in=granted_page_action_ids
-    ).select_related('page', 'action')
-
-    page_permissions = {}
-    for pa in page_actions:
-        if pa.page.pk not in page_permissions:
-            page_permissions[pa.page.pk] = {
-                'page': pa.page.name,
-                'page_display_name': pa.page.display_name,
-                'module_code': pa.page.module_code,
-                'allowed_actions': [],
-                'denied_actions': [],
-                'granted_actions': [],
-                'access_source': 'grant'
-            }
-        page_permissions[pa.page.pk]['allowed_actions'].append(pa.action.name)
-        page_permissions[pa.page.pk]['granted_actions'].append(pa.action.name)
 
-    return list(page_permissions.values())
+def _pair_results(left_key, left_values, left_ids, left_error, right_key, right_values, right_ids, right_error):
+    """
+    Result skeleton for every (left, right) pair, with unknown codes reported
+    as errors. Yields (result, left_id, right_id); ids are None on error.
+    """
+    for left in left_values:
+        for right in right_values:
+            result = {left_key: left, right_key: right}
+            if left not in left_ids:
+                result.update(status='error', error=left_error.format(left))
+            elif right not in right_ids:
+                result.update(status='error', error=right_error.format(right))
+            yield result, left_ids.get(left), right_ids.get(right)
+
+
+def _invalidate_users(user_ids):
+    """Drop cached principals and matrices after writes that skip signals"""
+    from core.user_accounts.principal import invalidate_principals
+
+    invalidate_principals(user_ids)
+    invalidate_permission_matrices(user_ids)
+
+
+def bulk_assign_user_roles(user_emails, job_role_codes, effective_start_date,
+                           effective_end_date=None, created_by=None) -> List[Dict]:
+    """
+    Assign every job role to every user in one transaction.
 
+    Users and roles are resolved in one query each, existing assignments
+    overlapping the new date range (same rule as VersionedMixin.clean()) are
+    read per batch of users and new assignments are bulk inserted, so the
+    query count does not grow with the number of pairs.
 
+    Returns:
+        One result per (user, role) pair:
+        {'user_email', 'job_role_code', 'status': 'created' | 'already_assigned' | 'error', 'error'}
+    """
+    from .models import UserJobRole
+    from core.user_accounts.models import UserAccount
+
+    user_emails = _unique(user_emails)
+    job_role_codes = _unique(job_role_codes)
+
+    with transaction.atomic():
+        users = dict(UserAccount.objects.filter(email__in=user_emails).values_list('email', 'pk'))
+        roles = dict(JobRole.objects.filter(code__in=job_role_codes).values_list('code', 'pk'))
+
+        overlapping = Q(effective_end_date__isnull=True) | Q(effective_end_date__gt=effective_start_date)
+        if effective_end_date:
+            overlapping &= Q(effective_start_date__lt=effective_end_date)
+        user_ids = list(users.values())
+        existing = set()
+        for index in range(0, len(user_ids), BULK_ASSIGNMENT_BATCH_SIZE):
+            existing.update(UserJobRole.objects.filter(
+                overlapping,
+                user_id__in=user_ids[index:index + BULK_ASSIGNMENT_BATCH_SIZE],
+                job_role_id__in=roles.values(),
+            ).values_list('user_id', 'job_role_id'))
+
+        results = []
+        assignments = []
+        for result, user_id, role_id in _pair_results(
+            'user_email', user_emails, users, "User with email '{}' not found",
+            'job_role_code', job_role_codes, roles, "JobRole with code '{}' not found",
+        ):
+            if 'status' not in result:
+                if (user_id, role_id) in existing:
+                    result['status'] = 'already_assigned'
+                else:
+                    result['status'] = 'created'
+                    assignments.append(UserJobRole(
+                        user_id=user_id,
+                        job_role_id=role_id,
+                        effective_start_date=effective_start_date,
+                        effective_end_date=effective_end_date,
+                        created_by=created_by,
+                    ))
+            results.append(result)
+
+        UserJobRole.objects.bulk_create(assignments, batch_size=BULK_ASSIGNMENT_BATCH_SIZE)
+
+    if assignments:
+        from core.security.services import bump_policy_version
+
+        _invalidate_users({assignment.user_id for assignment in assignments})
+        bump_policy_version()
+    return results
+
+
+def bulk_revoke_user_roles(user_emails, job_role_codes) -> List[Dict]:
+    """
+    Remove every job role from every user in one transaction.
+
+    All assignments of a pair are deleted, whatever their dates (like
+    POST /users/{pk}/remove-roles/).
+
+    Returns:
+        One result per (user, role) pair:
+        {'user_email', 'job_role_code', 'status': 'removed' | 'not_assigned' | 'error', 'error', 'removed_count'}
+    """
+    from .models import UserJobRole
+    from core.user_accounts.models import UserAccount
+
+    user_emails = _unique(user_emails)
+    job_role_codes = _unique(job_role_codes)
+
+    with transaction.atomic():
+        users = dict(UserAccount.objects.filter(email__in=user_emails).values_list('email', 'pk'))
+        roles = dict(JobRole.objects.filter(code__in=job_role_codes).values_list('code', 'pk'))
+
+        user_ids = list(users.values())
+        assignment_ids = {}
+        for index in range(0, len(user_ids), BULK_ASSIGNMENT_BATCH_SIZE):
+            for pk, user_id, role_id in UserJobRole.objects.filter(
+                user_id__in=user_ids[index:index + BULK_ASSIGNMENT_BATCH_SIZE],
+                job_role_id__in=roles.values(),
+            ).values_list('pk', 'user_id', 'job_role_id'):
+                assignment_ids.setdefault((user_id, role_id), []).append(pk)
+
+        results = []
+        for result, user_id, role_id in _pair_results(
+            'user_email', user_emails, users, "User with email '{}' not found",
+            'job_role_code', job_role_codes, roles, "JobRole with code '{}' not found",
+        ):
+            if 'status' not in result:
+                removed = len(assignment_ids.get((user_id, role_id), ()))
+                result.update(status='removed' if removed else 'not_assigned', removed_count=removed)
+            results.append(result)
+
+        # Per-row signal invalidation would write the cache for every deleted
+        # assignment; caches are invalidated once below instead
+        pks = [pk for ids in assignment_ids.values() for pk in ids]
+        with mute_cache_signals(UserJobRole):
+            for index in range(0, len(pks), BULK_ASSIGNMENT_BATCH_SIZE):
+                UserJobRole.objects.filter(pk__in=pks[index:index + BULK_ASSIGNMENT_BATCH_SIZE]).delete()
+
+    if pks:
+        from core.security.services import bump_policy_version
+
+        _invalidate_users({user_id for user_id, _ in assignment_ids})
+        bump_policy_version()
+    return results
+
+
+def bulk_assign_role_pages(job_role_codes, page_codes, inherit_to_children=False) -> List[Dict]:
+    """
+    Assign every page to every job role in one transaction.
+
+    Returns:
+        One result per (role, page) pair:
+        {'job_role_code', 'page_code', 'status': 'created' | 'already_assigned' | 'error', 'error'}
+    """
+    job_role_codes = _unique(job_role_codes)
+    page_codes = _unique(page_codes)
+
+    with transaction.atomic():
+        roles = dict(JobRole.objects.filter(code__in=job_role_codes).values_list('code', 'pk'))
+        pages = dict(Page.objects.filter(code__in=page_codes).values_list('code', 'pk'))
+        existing = set(JobRolePage.objects.filter(
+            job_role_id__in=roles.values(), page_id__in=pages.values()
+        ).values_list('job_role_id', 'page_id'))
+
+        results = []
+        role_pages = []
+        for result, role_id, page_id in _pair_results(
+            'job_role_code', job_role_codes, roles, "JobRole with code '{}' not found",
+            'page_code', page_codes, pages, "Page with code '{}' not found",
+        ):
+            if 'status' not in result:
+                if (role_id, page_id) in existing:
+                    result['status'] = 'already_assigned'
+                else:
+                    result['status'] = 'created'
+                    role_pages.append(JobRolePage(
+                        job_role_id=role_id, page_id=page_id, inherit_to_children=inherit_to_children
+                    ))
+            results.append(result)
+
+        JobRolePage.objects.bulk_create(role_pages, batch_size=BULK_ASSIGNMENT_BATCH_SIZE)
+
+    if role_pages:
+        _invalidate_users(get_role_user_ids({role_page.job_role_id for role_page in role_pages}))
+    return results
+
+
+def bulk_remove_role_pages(job_role_codes, page_codes) -> List[Dict]:
+    """
+    Remove every page from every job role in one transaction.
+
+    Returns:
+        One result per (role, page) pair:
+        {'job_role_code', 'page_code', 'status': 'removed' | 'not_assigned' | 'error', 'error'}
+    """
+    job_role_codes = _unique(job_role_codes)
+    page_codes = _unique(page_codes)
+
+    with transaction.atomic():
+        roles = dict(JobRole.objects.filter(code__in=job_role_codes).values_list('code', 'pk'))
+        pages = dict(Page.objects.filter(code__in=page_codes).values_list('code', 'pk'))
+        role_pages = JobRolePage.objects.filter(job_role_id__in=roles.values(), page_id__in=pages.values())
+        existing = set(role_pages.values_list('job_role_id', 'page_id'))
+
+        results = []
+        for result, role_id, page_id in _pair_results(
+            'job_role_code', job_role_codes, roles, "JobRole with code '{}' not found",
+            'page_code', page_codes, pages, "Page with code '{}' not found",
+        ):
+            if 'status' not in result:
+                result['status'] = 'removed' if (role_id, page_id) in existing else 'not_assigned'
+            results.append(result)
+
+        # Per-row signal invalidation would re-resolve the role's users for
+        # every deleted row; caches are invalidated once below instead
+        with mute_cache_signals(JobRolePage):
+            role_pages.delete()
+
+    if existing:
+        _invalidate_users(get_role_user_ids({role_id for role_id, _ in existing}))
+    return results
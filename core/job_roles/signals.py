@@ -0,0 +1,58 @@
+"""
+Job Role Signals
+
+Keep cached permission matrices (core.job_roles.permission_matrix) current:
+- a user, role assignment or permission override changes → drop that user's matrix
+- a role or role page changes → drop the matrices of the users it feeds
+- a page or page action changes → bump the matrix version
+"""
+from django.db.models.signals import post_save, post_delete, pre_delete
+
+from core.job_roles.models import JobRole, JobRolePage, Page, PageAction, UserJobRole, UserPermissionOverride
+from core.base.signals import cache_signals_muted
+from core.job_roles.permission_matrix import (
+    bump_permission_matrix_version, get_role_user_ids, invalidate_permission_matrices,
+)
+from core.user_accounts.models import UserAccount
+
+
+def invalidate_user_matrix(sender, instance, **kwargs):
+    invalidate_permission_matrices([instance.pk])
+
+
+def invalidate_assignment_matrix(sender, instance, **kwargs):
+    if cache_signals_muted(sender):
+        return
+    invalidate_permission_matrices([instance.user_id])
+
+
+def invalidate_role_matrices(sender, instance, **kwargs):
+    invalidate_permission_matrices(get_role_user_ids([instance.pk]))
+
+
+def invalidate_role_page_matrices(sender, instance, **kwargs):
+    if cache_signals_muted(sender):
+        return
+    invalidate_permission_matrices(get_role_user_ids([instance.job_role_id]))
+
+
+def invalidate_all_matrices(sender, **kwargs):
+    bump_permission_matrix_version()
+
+
+post_save.connect(invalidate_user_matrix, sender=UserAccount, dispatch_uid='matrix_user_saved')
+post_delete.connect(invalidate_user_matrix, sender=UserAccount, dispatch_uid='matrix_user_deleted')
+
+for model in (UserJobRole, UserPermissionOverride):
+    post_save.connect(invalidate_assignment_matrix, sender=model, dispatch_uid=f'matrix_{model.__name__}_saved')
+    post_delete.connect(invalidate_assignment_matrix, sender=model, dispatch_uid=f'matrix_{model.__name__}_deleted')
+
+# Before the delete, while child roles still point to the role
+post_save.connect(invalidate_role_matrices, sender=JobRole, dispatch_uid='matrix_JobRole_saved')
+pre_delete.connect(invalidate_role_matrices, sender=JobRole, dispatch_uid='matrix_JobRole_deleted')
+post_save.connect(invalidate_role_page_matrices, sender=JobRolePage, dispatch_uid='matrix_JobRolePage_saved')
+post_delete.connect(invalidate_role_page_matrices, sender=JobRolePage, dispatch_uid='matrix_JobRolePage_deleted')
+
+for model in (Page, PageAction):
+    post_save.connect(invalidate_all_matrices, sender=model, dispatch_uid=f'matrix_{model.__name__}_saved')
+    post_delete.connect(invalidate_all_matrices, sender=model, dispatch_uid=f'matrix_{model.__name__}_deleted')
@@ -0,0 +1,203 @@
+"""
+Tests for the bulk role and page assignment endpoints.
+
+Covers:
+- POST /user-job-roles/bulk-assign/ and /user-job-roles/bulk-revoke/
+- POST /job-roles/bulk-assign-pages/ and /job-roles/bulk-remove-pages/
+- Per-item results for created, existing, unknown and removed pairs
+- Cached permissions picked up after bulk writes
+- Query count independent of the number of pairs
+"""
+from datetime import date
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.base.test_utils import (
+    assign_job_role, create_test_user, reset_permission_caches, setup_admin_permissions, setup_core_data,
+)
+from core.job_roles.models import Action, JobRole, JobRolePage, Page, PageAction, UserJobRole
+from core.job_roles.services import user_can_perform_action
+
+
+def setUpModule():
+    """Run once for the entire module at the beginning"""
+    setup_core_data()
+
+
+class BulkAssignmentTestCase(APITestCase):
+    """Base test case with an admin client, two roles, two pages and three users"""
+
+    base_url = '/core/job_roles'
+
+    def setUp(self):
+        self.admin = create_test_user('admin_bulk@example.com', name='Admin User')
+        setup_admin_permissions(self.admin)
+        self.client.force_authenticate(user=self.admin)
+
+        self.clerk = JobRole.objects.create(code='bulk_clerk', name='Bulk Clerk')
+        self.auditor = JobRole.objects.create(code='bulk_auditor', name='Bulk Auditor')
+        self.ledger = Page.objects.create(code='bulk_ledger', name='Bulk Ledger')
+        self.journal = Page.objects.create(code='bulk_journal', name='Bulk Journal')
+        view = Action.objects.create(code='bulk_view', name='Bulk View')
+        PageAction.objects.create(page=self.ledger, action=view)
+        self.users = [create_test_user(f'bulk{index}@example.com') for index in range(3)]
+
+    def tearDown(self):
+        reset_permission_caches()
+
+    def post(self, path, data):
+        return self.client.post(f'{self.base_url}/{path}', data, format='json')
+
+    def statuses(self, response, *keys):
+        return {tuple(result[key] for key in keys): result['status'] for result in response.data['results']}
+
+
+class UserJobRoleBulkTests(BulkAssignmentTestCase):
+
+    def test_bulk_assign(self):
+        assign_job_role(self.users[0], self.clerk, start=date(2024, 1, 1))
+
+        response = self.post('user-job-roles/bulk-assign/', {
+            'user_emails': [user.email for user in self.users] + ['nobody@example.com'],
+            'job_role_codes': ['bulk_clerk', 'bulk_auditor'],
+            'effective_start_date': '2024-06-01',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['summary'], {'already_assigned': 1, 'created': 5, 'error': 2})
+        results = self.statuses(response, 'user_email', 'job_role_code')
+        self.assertEqual(results[('bulk0@example.com', 'bulk_clerk')], 'already_assigned')
+        self.assertEqual(results[('bulk2@example.com', 'bulk_auditor')], 'created')
+        self.assertEqual(results[('nobody@example.com', 'bulk_clerk')], 'error')
+        self.assertEqual(UserJobRole.objects.filter(job_role__code__startswith='bulk_').count(), 6)
+        assignment = UserJobRole.objects.get(user=self.users[1], job_role=self.auditor)
+        self.assertEqual((assignment.effective_start_date, assignment.created_by), (date(2024, 6, 1), self.admin))
+
+    def test_bulk_assign_refreshes_cached_permissions(self):
+        JobRolePage.objects.create(job_role=self.clerk, page=self.ledger)
+        user = self.users[0]
+        self.assertFalse(user_can_perform_action(user, 'bulk_ledger', 'bulk_view')[0])
+
+        self.post('user-job-roles/bulk-assign/', {'user_emails': [user.email], 'job_role_codes': ['bulk_clerk']})
+
+        self.assertTrue(user_can_perform_action(user, 'bulk_ledger', 'bulk_view')[0])
+
+    def test_bulk_revoke(self):
+        for user in self.users[:2]:
+            assign_job_role(user, self.clerk, start=date(2024, 1, 1))
+
+        response = self.post('user-job-roles/bulk-revoke/', {
+            'user_emails': [user.email for user in self.users],
+            'job_role_codes': ['bulk_clerk', 'bulk_missing'],
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['summary'], {'removed': 2, 'not_assigned': 1, 'error': 3})
+        self.assertFalse(UserJobRole.objects.filter(job_role=self.clerk).exists())
+
+    def test_bulk_revoke_invalidates_caches_once(self):
+        JobRolePage.objects.create(job_role=self.clerk, page=self.ledger)
+        for user in self.users:
+            assign_job_role(user, self.clerk, start=date(2024, 1, 1))
+            assign_job_role(user, self.auditor, start=date(2024, 1, 1))
+        self.assertTrue(user_can_perform_action(self.users[0], 'bulk_ledger', 'bulk_view')[0])
+
+        with patch('core.security.services.bump_policy_version') as bump_policy_version, \
+                patch('core.security.signals.bump_policy_version') as bump_per_row, \
+                patch('core.job_roles.signals.invalidate_permission_matrices') as invalidate_per_row:
+            response = self.post('user-job-roles/bulk-revoke/', {
+                'user_emails': [user.email for user in self.users], 'job_role_codes': ['bulk_clerk', 'bulk_auditor'],
+            })
+
+        self.assertEqual(response.data['summary'], {'removed': 6})
+        bump_policy_version.assert_called_once_with()
+        bump_per_row.assert_not_called()
+        invalidate_per_row.assert_not_called()
+        self.assertFalse(user_can_perform_action(self.users[0], 'bulk_ledger', 'bulk_view')[0])
+
+    def test_invalid_requests(self):
+        response = self.post('user-job-roles/bulk-assign/', {
+            'user_emails': ['bulk0@example.com'], 'job_role_codes': ['bulk_clerk'],
+            'effective_start_date': '2024-06-01', 'effective_end_date': '2024-01-01',
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post(
+            'user-job-roles/bulk-assign/', {'user_emails': ['nobody@example.com'], 'job_role_codes': ['bulk_clerk']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['results'][0]['error'], "User with email 'nobody@example.com' not found")
+
+    def test_query_count_does_not_grow_with_pairs(self):
+        many = [create_test_user() for _ in range(20)]
+        # Warm the requesting admin's cached principal
+        self.post('user-job-roles/bulk-assign/', {'user_emails': ['nobody@example.com'], 'job_role_codes': ['x']})
+
+        with CaptureQueriesContext(connection) as few_queries:
+            self.post('user-job-roles/bulk-assign/', {
+                'user_emails': [user.email for user in self.users], 'job_role_codes': ['bulk_clerk'],
+            })
+        with CaptureQueriesContext(connection) as many_queries:
+            response = self.post('user-job-roles/bulk-assign/', {
+                'user_emails': [user.email for user in many], 'job_role_codes': ['bulk_clerk', 'bulk_auditor'],
+            })
+
+        self.assertEqual(response.data['summary'], {'created': 40})
+        self.assertEqual(len(few_queries.captured_queries), len(many_queries.captured_queries))
+
+
+class JobRolePageBulkTests(BulkAssignmentTestCase):
+
+    def test_bulk_assign_and_remove_pages(self):
+        JobRolePage.objects.create(job_role=self.clerk, page=self.ledger)
+        assign_job_role(self.users[0], self.auditor, start=date(2024, 1, 1))
+        self.assertFalse(user_can_perform_action(self.users[0], 'bulk_ledger', 'bulk_view')[0])
+
+        response = self.post('job-roles/bulk-assign-pages/', {
+            'job_role_codes': ['bulk_clerk', 'bulk_auditor'],
+            'page_codes': ['bulk_ledger', 'bulk_journal', 'bulk_missing'],
+            'inherit_to_children': True,
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['summary'], {'already_assigned': 1, 'created': 3, 'error': 2})
+        self.assertEqual(
+            self.statuses(response, 'job_role_code', 'page_code')[('bulk_auditor', 'bulk_ledger')], 'created'
+        )
+        self.assertTrue(JobRolePage.objects.get(job_role=self.auditor, page=self.journal).inherit_to_children)
+        self.assertTrue(user_can_perform_action(self.users[0], 'bulk_ledger', 'bulk_view')[0])
+
+        response = self.post('job-roles/bulk-remove-pages/', {
+            'job_role_codes': ['bulk_auditor'], 'page_codes': ['bulk_ledger', 'bulk_journal'],
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['summary'], {'removed': 2})
+        self.assertFalse(JobRolePage.objects.filter(job_role=self.auditor).exists())
+        self.assertTrue(JobRolePage.objects.filter(job_role=self.clerk).exists())
+        self.assertFalse(user_can_perform_action(self.users[0], 'bulk_ledger', 'bulk_view')[0])
+
+    def test_remove_pages_query_count_does_not_grow_with_pairs(self):
+        pages = [Page.objects.create(code=f'bulk_page{index}', name=f'Bulk Page {index}') for index in range(10)]
+        for role in (self.clerk, self.auditor):
+            assign_job_role(self.users[0], role, start=date(2024, 1, 1))
+            JobRolePage.objects.bulk_create([JobRolePage(job_role=role, page=page) for page in pages])
+        # Warm the requesting admin's cached principal
+        self.post('job-roles/bulk-remove-pages/', {'job_role_codes': ['x'], 'page_codes': ['x']})
+
+        with CaptureQueriesContext(connection) as few_queries:
+            self.post('job-roles/bulk-remove-pages/', {
+                'job_role_codes': ['bulk_clerk'], 'page_codes': [pages[0].code],
+            })
+        with CaptureQueriesContext(connection) as many_queries:
+            response = self.post('job-roles/bulk-remove-pages/', {
+                'job_role_codes': ['bulk_clerk', 'bulk_auditor'], 'page_codes': [page.code for page in pages[1:]],
+            })
+
+        self.assertEqual(response.data['summary'], {'removed': 18})
+        self.assertEqual(len(few_queries.captured_queries), len(many_queries.captured_queries))
+        self.assertEqual(JobRolePage.objects.filter(page__in=pages).count(), 1)
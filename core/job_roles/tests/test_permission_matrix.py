@@ -0,0 +1,188 @@
+"""
+Tests for the cached effective permission matrix.
+
+Covers:
+- Role hierarchy, page hierarchy, grants and denials in the matrix
+- Effective-dated assignments and overrides
+- get_user_all_permissions() and user_can_perform_action() reading it
+- Incremental invalidation: only the users a role feeds are rebuilt
+- Fixed build cost regardless of the number of pages
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.base.test_utils import assign_job_role, create_test_user, reset_permission_caches
+from core.job_roles.models import (
+    Action, JobRole, JobRolePage, Page, PageAction, UserJobRole, UserPermissionOverride,
+)
+from core.job_roles.permission_matrix import PERMISSION_MATRIX_CACHE_PREFIX, get_permission_matrix
+from core.job_roles.services import get_user_all_permissions, user_can_perform_action
+from core.user_accounts.principal import get_principal
+
+
+class PermissionMatrixTestCase(TestCase):
+    """Base test case with a page tree, an inheriting role pair and an assigned user"""
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.view = Action.objects.create(code='pm_view', name='PM View')
+        self.edit = Action.objects.create(code='pm_edit', name='PM Edit')
+
+        self.finance = self.page('pm_finance', 'PM Finance', sort_order=1)
+        self.invoices = self.page('pm_invoices', 'PM Invoices', parent=self.finance, sort_order=2)
+        self.reports = self.page('pm_reports', 'PM Reports', sort_order=3)
+
+        self.employee = JobRole.objects.create(code='pm_employee', name='PM Employee')
+        self.accountant = JobRole.objects.create(code='pm_accountant', name='PM Accountant', parent_role=self.employee)
+        JobRolePage.objects.create(job_role=self.employee, page=self.reports)
+        JobRolePage.objects.create(job_role=self.accountant, page=self.finance, inherit_to_children=True)
+
+        self.user = create_test_user('pm_user@example.com')
+        assign_job_role(self.user, self.accountant)
+
+    def tearDown(self):
+        reset_permission_caches()
+
+    def page(self, code, name, parent=None, sort_order=0):
+        page = Page.objects.create(code=code, name=name, parent_page=parent, sort_order=sort_order)
+        for action in (self.view, self.edit):
+            PageAction.objects.create(page=page, action=action)
+        return page
+
+    def override(self, page, action, permission_type, start=None):
+        return UserPermissionOverride.objects.create(
+            user=self.user,
+            page_action=PageAction.objects.get(page=page, action=action),
+            permission_type=permission_type,
+            effective_start_date=start or self.today,
+        )
+
+    def is_cached(self, user):
+        return cache.get(f"{PERMISSION_MATRIX_CACHE_PREFIX}:{user.pk}") is not None
+
+
+class PermissionMatrixTests(PermissionMatrixTestCase):
+
+    def test_role_and_page_inheritance(self):
+        matrix = get_permission_matrix(self.user)
+
+        self.assertEqual(list(matrix.pages), ['pm_finance', 'pm_invoices', 'pm_reports'])
+        self.assertEqual(matrix.allowed['pm_invoices'], ('pm_edit', 'pm_view'))
+        self.assertTrue(matrix.can('pm_reports', 'pm_view'))
+        self.assertFalse(matrix.can('pm_reports', 'pm_approve'))
+
+    def test_grants_and_denials(self):
+        other = self.page('pm_other', 'PM Other', sort_order=4)
+        self.override(self.invoices, self.edit, 'deny')
+        self.override(other, self.view, 'grant')
+
+        permissions = {entry['page']: entry for entry in get_user_all_permissions(self.user)}
+
+        self.assertEqual(permissions['pm_invoices']['allowed_actions'], ['pm_view'])
+        self.assertEqual(permissions['pm_invoices']['denied_actions'], ['pm_edit'])
+        self.assertEqual(permissions['pm_invoices']['access_source'], 'role')
+        self.assertEqual(permissions['pm_other']['allowed_actions'], ['pm_view'])
+        self.assertEqual(permissions['pm_other']['granted_actions'], ['pm_view'])
+        self.assertEqual(permissions['pm_other']['access_source'], 'grant')
+        self.assertEqual(
+            user_can_perform_action(self.user, 'pm_invoices', 'pm_edit'),
+            (False, "Access explicitly denied for action 'pm_edit' on page 'pm_invoices'")
+        )
+        self.assertEqual(
+            user_can_perform_action(self.user, 'pm_other', 'pm_view'), (True, "Permission granted (explicit grant)")
+        )
+        self.assertFalse(user_can_perform_action(self.user, 'pm_other', 'pm_edit')[0])
+
+    def test_future_assignments_and_overrides_are_not_effective(self):
+        tomorrow = self.today + timedelta(days=1)
+        user = create_test_user('pm_future@example.com')
+        assign_job_role(user, self.employee, start=tomorrow)
+
+        self.assertEqual(
+            user_can_perform_action(user, 'pm_reports', 'pm_view'), (False, "User has no active job roles assigned")
+        )
+        self.override(self.reports, self.view, 'deny', start=tomorrow)
+        self.assertTrue(user_can_perform_action(self.user, 'pm_reports', 'pm_view')[0])
+
+    def test_denial_reasons(self):
+        self.assertEqual(
+            user_can_perform_action(self.user, 'pm_missing', 'pm_view'), (False, "Page 'pm_missing' does not exist")
+        )
+        self.assertEqual(
+            user_can_perform_action(self.user, 'pm_reports', 'pm_approve'),
+            (False, "Action 'pm_approve' does not exist")
+        )
+        hidden = Page.objects.create(code='pm_hidden', name='PM Hidden')
+        PageAction.objects.create(page=hidden, action=self.view)
+        self.assertEqual(
+            user_can_perform_action(self.user, 'pm_hidden', 'pm_view'),
+            (False, "Your roles (PM Accountant) do not have access to page 'pm_hidden'")
+        )
+
+    def test_allowed_check_runs_no_queries_when_warm(self):
+        user_can_perform_action(self.user, 'pm_invoices', 'pm_view')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user_can_perform_action(self.user, 'pm_invoices', 'pm_view'), (True, "Permission granted"))
+            get_user_all_permissions(self.user)
+
+    def test_build_cost_does_not_grow_with_pages(self):
+        get_principal(self.user)
+        with CaptureQueriesContext(connection) as few:
+            get_permission_matrix(self.user)
+
+        for index in range(10):
+            self.page(f'pm_extra{index}', f'PM Extra {index}', parent=self.invoices)
+        get_principal(self.user)
+        with CaptureQueriesContext(connection) as many:
+            matrix = get_permission_matrix(self.user)
+
+        self.assertEqual(len(matrix.pages), 13)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+
+class PermissionMatrixInvalidationTests(PermissionMatrixTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.outsider = create_test_user('pm_outsider@example.com')
+        assign_job_role(self.outsider, JobRole.objects.create(code='pm_outsider', name='PM Outsider'))
+        get_permission_matrix(self.user)
+        get_permission_matrix(self.outsider)
+
+    def test_parent_role_page_change_rebuilds_only_its_users(self):
+        extra = self.page('pm_extra', 'PM Extra')
+        get_permission_matrix(self.user)
+        get_permission_matrix(self.outsider)
+
+        JobRolePage.objects.create(job_role=self.employee, page=extra)
+
+        self.assertFalse(self.is_cached(self.user))
+        self.assertTrue(self.is_cached(self.outsider))
+        self.assertTrue(get_permission_matrix(self.user).can('pm_extra', 'pm_edit'))
+
+    def test_override_change(self):
+        override = self.override(self.reports, self.view, 'deny')
+        self.assertFalse(get_permission_matrix(self.user).can('pm_reports', 'pm_view'))
+
+        override.delete()
+
+        self.assertTrue(get_permission_matrix(self.user).can('pm_reports', 'pm_view'))
+        self.assertTrue(self.is_cached(self.outsider))
+
+    def test_role_hierarchy_change(self):
+        self.accountant.parent_role = None
+        self.accountant.save()
+
+        self.assertTrue(self.is_cached(self.outsider))
+        self.assertNotIn('pm_reports', get_permission_matrix(self.user).pages)
+
+    def test_assignment_change(self):
+        UserJobRole.objects.filter(user=self.user).delete()
+
+        self.assertEqual(get_permission_matrix(self.user).pages, {})
@@ -14,6 +14,8 @@ urlpatterns = [
     path('job-roles/<int:pk>/assign-page/', views.job_role_assign_page, name='job-role-assign-page'),
     path('job-roles/<int:pk>/remove-page/', views.job_role_remove_page, name='job-role-remove-page'),
     path('job-roles/with-pages/', views.job_role_create_with_pages, name='job-role-create-with-pages'),
+    path('job-roles/bulk-assign-pages/', views.job_role_bulk_assign_pages, name='job-role-bulk-assign-pages'),
+    path('job-roles/bulk-remove-pages/', views.job_role_bulk_remove_pages, name='job-role-bulk-remove-pages'),
 
     # Page endpoints
     path('pages/', views.page_list, name='page-list'),
@@ -23,6 +25,8 @@ urlpatterns = [
     # ============================================================================
     path('user-job-roles/', views.user_job_role_list, name='user-job-role-list'),
     path('user-job-roles/<int:pk>/', views.user_job_role_detail, name='user-job-role-detail'),
+    path('user-job-roles/bulk-assign/', views.user_job_role_bulk_assign, name='user-job-role-bulk-assign'),
+    path('user-job-roles/bulk-revoke/', views.user_job_role_bulk_revoke, name='user-job-role-bulk-revoke'),
 
     # ============================================================================
     # UserPermissionOverride endpoints (Grants AND Denials)
@@ -2,6 +2,8 @@
 API Views for Job Roles and Permissions models.
 Provides REST API endpoints for managing role-based access control.
 """
+from collections import Counter
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
@@ -22,6 +24,8 @@ from .models import (
     UserPermissionOverride,
 )
 from .serializers import (
+    BulkJobRolePageSerializer,
+    BulkUserJobRoleSerializer,
     JobRoleSerializer,
     PageSerializer,
     UserJobRoleSerializer,
@@ -302,6 +306,77 @@ def job_role_create_with_pages(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _bulk_report(results, done_status, message, created=False):
+    """
+    Response of a bulk endpoint: per-item results plus a count per status.
+    400 when every item failed validation.
+    """
+    summary = Counter(result['status'] for result in results)
+    if summary['error'] == len(results):
+        http_status = status.HTTP_400_BAD_REQUEST
+    elif created and summary[done_status]:
+        http_status = status.HTTP_201_CREATED
+    else:
+        http_status = status.HTTP_200_OK
+
+    return Response({
+        'message': message.format(summary[done_status]),
+        'summary': dict(summary),
+        'results': results,
+    }, status=http_status)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@require_page_action(CorePages.JOB_ROLE_MANAGEMENT, 'edit')
+def job_role_bulk_assign_pages(request):
+    """
+    Assign many pages to many job roles in one transaction.
+
+    POST /job-roles/bulk-assign-pages/
+    - Request body: {
+        "job_role_codes": ["accountant", "ap_clerk"],
+        "page_codes": ["ap_invoice", "ap_payment"],
+        "inherit_to_children": false  // optional
+      }
+    - Every page is assigned to every role; existing assignments are kept
+    - Returns: one result per (role, page) pair with status
+      created / already_assigned / error
+    """
+    from .services import bulk_assign_role_pages
+
+    serializer = BulkJobRolePageSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    results = bulk_assign_role_pages(**serializer.validated_data)
+    return _bulk_report(results, 'created', '{} page assignment(s) created', created=True)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@require_page_action(CorePages.JOB_ROLE_MANAGEMENT, 'edit')
+def job_role_bulk_remove_pages(request):
+    """
+    Remove many pages from many job roles in one transaction.
+
+    POST /job-roles/bulk-remove-pages/
+    - Request body: { "job_role_codes": [...], "page_codes": [...] }
+    - Returns: one result per (role, page) pair with status
+      removed / not_assigned / error
+    """
+    from .services import bulk_remove_role_pages
+
+    serializer = BulkJobRolePageSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    results = bulk_remove_role_pages(
+        serializer.validated_data['job_role_codes'], serializer.validated_data['page_codes']
+    )
+    return _bulk_report(results, 'removed', '{} page assignment(s) removed')
+
+
 # ============================================================================
 # Page API Views (READ-ONLY)
 # ============================================================================
@@ -631,6 +706,60 @@ def user_remove_roles(request, pk):
     }, status=status.HTTP_200_OK)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@require_page_action(CorePages.JOB_ROLE_MANAGEMENT)
+def user_job_role_bulk_assign(request):
+    """
+    Assign many roles to many users in one transaction.
+
+    POST /user-job-roles/bulk-assign/
+    - Request body: {
+        "user_emails": ["a@example.com", "b@example.com"],
+        "job_role_codes": ["employee", "ap_clerk"],
+        "effective_start_date": "2024-01-01",  // optional, defaults to today
+        "effective_end_date": "2024-12-31"     // optional
+      }
+    - Every role is assigned to every user; pairs already assigned over
+      an overlapping date range are skipped
+    - Returns: one result per (user, role) pair with status
+      created / already_assigned / error
+    """
+    from .services import bulk_assign_user_roles
+
+    serializer = BulkUserJobRoleSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    results = bulk_assign_user_roles(**serializer.validated_data, created_by=request.user)
+    return _bulk_report(results, 'created', '{} assignment(s) created', created=True)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@require_page_action(CorePages.JOB_ROLE_MANAGEMENT)
+def user_job_role_bulk_revoke(request):
+    """
+    Revoke many roles from many users in one transaction.
+
+    POST /user-job-roles/bulk-revoke/
+    - Request body: { "user_emails": [...], "job_role_codes": [...] }
+    - All assignments of a pair are removed, whatever their dates
+    - Returns: one result per (user, role) pair with status
+      removed / not_assigned / error
+    """
+    from .services import bulk_revoke_user_roles
+
+    serializer = BulkUserJobRoleSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    results = bulk_revoke_user_roles(
+        serializer.validated_data['user_emails'], serializer.validated_data['job_role_codes']
+    )
+    return _bulk_report(results, 'removed', '{} role assignment(s) removed')
+
+
 # ============================================================================
 # UserPermissionOverride API Views (Grants AND Denials)
 # ============================================================================
@@ -0,0 +1,109 @@
+"""
+Django management command to summarise the query profiling report.
+
+Reads the JSON-lines report written by QueryProfilingMiddleware
+(settings.QUERY_PROFILING['REPORT_PATH']) and prints one line per endpoint,
+worst first. Numeric path segments are grouped, so /po/12/ and /po/13/ are
+reported together as /po/<id>/.
+
+Usage:
+    python manage.py query_profile_report
+    python manage.py query_profile_report --path /tmp/query_profile.jsonl --top 20
+    python manage.py query_profile_report --sort sql_ms
+"""
+import json
+import re
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from erp_project.profiling import get_profiling_config
+
+
+ID_SEGMENT_RE = re.compile(r'/\d+(?=/|$)')
+
+SORT_KEYS = {
+    'queries': lambda row: row['max_queries'],
+    'duplicates': lambda row: row['max_duplicates'],
+    'sql_ms': lambda row: row['avg_sql_ms'],
+    'total_ms': lambda row: row['avg_total_ms'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Summarise the per-request query profiling report by endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            help="Report file (default: QUERY_PROFILING['REPORT_PATH'])",
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=30,
+            help='Endpoints to show (default: 30)',
+        )
+        parser.add_argument(
+            '--sort',
+            choices=sorted(SORT_KEYS),
+            default='queries',
+            help='Order endpoints by (default: queries)',
+        )
+
+    def handle(self, *args, **options):
+        path = options.get('path') or get_profiling_config()['REPORT_PATH']
+        if not path:
+            raise CommandError("No report file: pass --path or set QUERY_PROFILING['REPORT_PATH']")
+
+        endpoints = defaultdict(list)
+        try:
+            with open(path, encoding='utf-8') as report:
+                for line in report:
+                    if line.strip():
+                        entry = json.loads(line)
+                        endpoints[(entry['method'], ID_SEGMENT_RE.sub('/<id>', entry['path']))].append(entry)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+        rows = [self._summarise(method, endpoint, entries) for (method, endpoint), entries in endpoints.items()]
+        rows.sort(key=SORT_KEYS[options['sort']], reverse=True)
+
+        self.stdout.write('=' * 60)
+        self.stdout.write('QUERY PROFILE REPORT')
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'Requests: {sum(row["requests"] for row in rows)}  Endpoints: {len(rows)}')
+        for row in rows[:options['top']]:
+            line = (
+                f'{row["method"]:<6} {row["endpoint"]:<45} n={row["requests"]:<5} '
+                f'queries avg={row["avg_queries"]:.1f} max={row["max_queries"]:<4} '
+                f'dup max={row["max_duplicates"]:<4} sql={row["avg_sql_ms"]:.1f} ms '
+                f'ser={row["avg_serializer_ms"]:.1f} ms total={row["avg_total_ms"]:.1f} ms'
+            )
+            if row['over_budget']:
+                self.stdout.write(self.style.ERROR(f'{line}  over budget x{row["over_budget"]}'))
+            else:
+                self.stdout.write(line)
+
+        over_budget = sum(row['over_budget'] for row in rows)
+        self.stdout.write('=' * 60)
+        if over_budget:
+            self.stdout.write(self.style.ERROR(f'✗ {over_budget} request(s) exceeded their query budget'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ No request exceeded its query budget'))
+
+    @staticmethod
+    def _summarise(method, endpoint, entries):
+        count = len(entries)
+        return {
+            'method': method,
+            'endpoint': endpoint,
+            'requests': count,
+            'avg_queries': sum(e['queries'] for e in entries) / count,
+            'max_queries': max(e['queries'] for e in entries),
+            'max_duplicates': max(e['duplicate_queries'] for e in entries),
+            'avg_sql_ms': sum(e['sql_ms'] for e in entries) / count,
+            'avg_serializer_ms': sum(e['serializer_ms'] for e in entries) / count,
+            'avg_total_ms': sum(e['total_ms'] for e in entries) / count,
+            'over_budget': sum(1 for e in entries if e['budget'] is not None and e['queries'] > e['budget']),
+        }
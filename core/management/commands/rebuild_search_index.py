@@ -0,0 +1,42 @@
+"""
+Django management command to rebuild the search index (core.base.search).
+
+Needed once after a model opts in with search_index_fields, and after any
+write that bypassed save() and the BaseQuerySet bulk methods.
+
+Usage:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index catalog.catalogItem person.Person
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.base.search import get_search_index_fields, reindex, searchable_models
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index of searchable models'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help='Model labels (app_label.ModelName); default: every searchable model',
+        )
+
+    def handle(self, *args, **options):
+        models = searchable_models()
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc))
+            not_searchable = [model._meta.label for model in models if not get_search_index_fields(model)]
+            if not_searchable:
+                raise CommandError(f"Not searchable (no search_index_fields): {', '.join(not_searchable)}")
+
+        for model in models:
+            with transaction.atomic():
+                reindex(model)
+            self.stdout.write(f"{model._meta.label}: {model._base_manager.count()} records indexed")
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt for {len(models)} model(s)"))
@@ -1,6 +1,7 @@
 """
 Custom management command to run all project tests.
 Usage: python manage.py test_all
+       python manage.py test_all --query-budgets   (fail on QUERY_PROFILING budget overruns)
 """
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
@@ -12,8 +13,11 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         # Django BaseCommand already provides --verbosity, --keepdb, etc.
-        # We just need to add custom arguments if any
-        pass
+        parser.add_argument(
+            '--query-budgets',
+            action='store_true',
+            help='Profile every request and fail tests that exceed their query budget',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('='*80))
@@ -24,6 +28,9 @@ class Command(BaseCommand):
         verbosity = options.get('verbosity', 1)
         keepdb = options.get('keepdb', False)
         failfast = options.get('failfast', False)
+        extra = {}
+        if options.get('query_budgets'):
+            extra['testrunner'] = 'erp_project.profiling.QueryBudgetTestRunner'
         
         try:
             # Run ALL tests in the project using pattern matching
@@ -33,7 +40,8 @@ class Command(BaseCommand):
                 '--pattern=test_*.py',
                 verbosity=verbosity,
                 keepdb=keepdb,
-                failfast=failfast
+                failfast=failfast,
+                **extra
             )
             
             self.stdout.write('')
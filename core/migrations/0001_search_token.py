@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field', models.CharField(max_length=64)),
+                ('token', models.CharField(max_length=32)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'db_table': 'core_search_token',
+                'indexes': [models.Index(fields=['content_type', 'token'], name='core_search_token_lookup'), models.Index(fields=['content_type', 'object_id', 'token'], name='core_search_token_object')],
+            },
+        ),
+    ]
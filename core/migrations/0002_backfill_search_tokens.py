@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:02
+
+from django.db import migrations
+
+from core.base.search import INDEX_BATCH_SIZE, tokenize
+
+
+# search_index_fields of the models indexed when the search index was added
+# (historical models do not carry the class attribute). Models that opt in
+# later are indexed with `manage.py rebuild_search_index`.
+SEARCH_INDEX_FIELDS = {
+    ('catalog', 'catalogItem'): ('code', 'name', 'description'),
+    ('person', 'Competency'): ('code', 'name', 'description'),
+    ('person', 'Person'): (
+        'first_name', 'middle_name', 'last_name',
+        'first_name_arabic', 'middle_name_arabic', 'last_name_arabic',
+    ),
+    ('person', 'Employee'): ('employee_number',),
+}
+
+
+def backfill_search_tokens(apps, schema_editor):
+    """
+    Index the existing records of the searchable models.
+    """
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    SearchToken = apps.get_model('core', 'SearchToken')
+    db = schema_editor.connection.alias
+
+    for (app_label, model_name), fields in SEARCH_INDEX_FIELDS.items():
+        model = apps.get_model(app_label, model_name)
+        content_type, _ = ContentType.objects.db_manager(db).get_or_create(
+            app_label=app_label, model=model._meta.model_name
+        )
+        tokens = SearchToken.objects.using(db)
+        tokens.filter(content_type=content_type).delete()
+        records = model._base_manager.using(db).order_by('pk').values_list('pk', *fields)
+
+        last_pk = None
+        while True:
+            batch = records if last_pk is None else records.filter(pk__gt=last_pk)
+            batch = list(batch[:INDEX_BATCH_SIZE])
+            if not batch:
+                break
+            tokens.bulk_create([
+                SearchToken(content_type=content_type, object_id=pk, field=field, token=token)
+                for pk, *values in batch
+                for field, value in zip(fields, values)
+                for token in tokenize(value)
+            ], batch_size=INDEX_BATCH_SIZE)
+            last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_search_token'),
+        ('catalog', '0001_initial'),
+        ('person', '0005_alter_competencyproficiency_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_tokens, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,25 @@
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
-# Create your models here.
+
+class SearchToken(models.Model):
+    """
+    One indexed word of a searchable record's field.
+
+    Written and queried by core.base.search; see that module for how models
+    opt in and how the index is kept in sync.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.PositiveBigIntegerField()
+    field = models.CharField(max_length=64)
+    token = models.CharField(max_length=32)
+
+    class Meta:
+        db_table = 'core_search_token'
+        indexes = [
+            models.Index(fields=['content_type', 'token'], name='core_search_token_lookup'),
+            models.Index(fields=['content_type', 'object_id', 'token'], name='core_search_token_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} {self.field}={self.token}"
@@ -1,43 +1,41 @@
 """
-Core Security Module - Task 2 Placeholder
+Core Security Module
 
-This module will implement the complete three-layer security system:
+Implements layers 2 and 3 of the three-layer security system:
 - Layer 2: Data Security (which records can user see)
 - Layer 3: Field Security (which fields can user access)
 
-Layer 1 (Function Security) is already implemented in core/job_roles.
+Layer 1 (Function Security) is implemented in core/job_roles.
 
-Current Status: PLACEHOLDER
-Target: Task 2 Implementation
-"""
+Usage:
+    from core.security import get_scoped_queryset, apply_field_security
+
+    queryset = get_scoped_queryset(request.user, POHeader, queryset=queryset)
+    serializer_class = apply_field_security(request.user, POHeaderListSerializer)
 
-from .placeholder import (
-    # Classes (stubs)
-    DataSecurityPolicy,
-    FieldSecurityPolicy,
-    JobRoleDataPolicy,
-    JobRoleFieldAccess,
+Models live in core.security.models and are not imported here to avoid
+AppRegistryNotReady errors:
+    DataSecurityPolicy, JobRoleDataPolicy, FieldSecurityPolicy, JobRoleFieldAccess
+"""
 
-    # Functions (working fallbacks)
+from .services import (
+    AccessLevel,
+    get_security_context,
+    get_policy_version,
+    bump_policy_version,
     get_scoped_queryset,
     get_field_access,
     apply_field_security,
     mask_field_value,
-    is_own_record,
 )
 
 __all__ = [
-    # Classes
-    'DataSecurityPolicy',
-    'FieldSecurityPolicy',
-    'JobRoleDataPolicy',
-    'JobRoleFieldAccess',
-
-    # Functions
+    'AccessLevel',
+    'get_security_context',
+    'get_policy_version',
+    'bump_policy_version',
     'get_scoped_queryset',
     'get_field_access',
     'apply_field_security',
     'mask_field_value',
-    'is_own_record',
 ]
-
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SecurityConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core.security'
+    verbose_name = 'Data & Field Security'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import core.security.signals  # noqa: F401
@@ -0,0 +1,174 @@
+"""
+Django management command to benchmark the data & field security engine.
+
+Times the secured list endpoints against the current database with the
+engine disabled and enabled, using a throwaway user whose role is granted a
+match-all data policy and one masked field per endpoint (so both runs return
+the same rows). Everything the benchmark creates is rolled back.
+
+This command will:
+1. Create the benchmark user, role and policies inside a transaction
+2. Call each list endpoint with DATA_SECURITY_ENABLED off and on
+3. Report median latency, slowdown factor and query counts
+4. Roll the transaction back
+
+Usage:
+    python manage.py benchmark_data_security
+    python manage.py benchmark_data_security --iterations 50 --page-size 100
+    python manage.py benchmark_data_security --max-ratio 1.5
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.job_roles.models import JobRole, JobRolePage, Page, UserJobRole
+from core.security import AccessLevel, bump_policy_version
+from core.security.models import DataSecurityPolicy, JobRoleDataPolicy, FieldSecurityPolicy
+from core.user_accounts.models import UserAccount
+
+
+# (label, view, model, masked serializer field, page required by the view)
+ENDPOINTS = [
+    ('Purchase orders', 'procurement.po.views.po_list', 'procurement.po.models.POHeader', 'total_amount', None),
+    ('AP invoices', 'Finance.Invoice.views.ap_invoice_list', 'Finance.Invoice.models.AP_Invoice', 'total', None),
+    ('AR invoices', 'Finance.Invoice.views.ar_invoice_list', 'Finance.Invoice.models.AR_Invoice', 'total', None),
+    ('Payments', 'Finance.payments.views.payment_list', 'Finance.payments.models.Payment', 'exchange_rate', None),
+    ('Employees', 'HR.person.views.employee_views.employee_list', 'HR.person.models.Employee',
+     'employee_number', 'hr_person_employee'),
+]
+
+
+class Rollback(Exception):
+    """Raised to discard everything the benchmark created"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark list endpoint latency with data & field security disabled and enabled'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed requests per endpoint and mode (default: 20)',
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Rows requested per list call (default: 100)',
+        )
+        parser.add_argument(
+            '--max-ratio',
+            type=float,
+            help='Fail if any endpoint is slower than this factor with security enabled',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        params = {'page_size': options['page_size']}
+        max_ratio = options.get('max_ratio')
+
+        self.stdout.write('=' * 60)
+        self.stdout.write('DATA SECURITY BENCHMARK')
+        self.stdout.write('=' * 60)
+
+        results = []
+        try:
+            with transaction.atomic():
+                user = self._create_benchmark_user()
+                for label, view_path, model_path, field_name, page_code in ENDPOINTS:
+                    view = import_string(view_path)
+                    model_class = import_string(model_path)
+                    self._grant_policies(user, model_class, field_name, page_code)
+                    results.append(self._benchmark(label, view, user, params, iterations))
+                raise Rollback()
+        except Rollback:
+            pass
+        bump_policy_version()
+
+        worst = 0
+        for label, rows, baseline, secured, queries_off, queries_on in results:
+            if rows is None:
+                self.stdout.write(self.style.WARNING(f'{label:<16} skipped (request was not successful)'))
+                continue
+            ratio = secured / baseline if baseline else 0
+            worst = max(worst, ratio)
+            self.stdout.write(
+                f'{label:<16} rows={rows:<5} off={baseline:8.2f} ms  on={secured:8.2f} ms  '
+                f'x{ratio:.2f}  queries {queries_off} → {queries_on}'
+            )
+
+        self.stdout.write('=' * 60)
+        if max_ratio and worst > max_ratio:
+            raise CommandError(f'Security overhead x{worst:.2f} exceeds --max-ratio {max_ratio}')
+        self.stdout.write(self.style.SUCCESS(f'✓ Worst slowdown with security enabled: x{worst:.2f}'))
+
+    def _create_benchmark_user(self):
+        user = UserAccount.objects.create_user(
+            email='security-benchmark@example.invalid',
+            name='Security Benchmark',
+            phone_number='0000000000',
+        )
+        role = JobRole.objects.create(name='Security Benchmark', code='security_benchmark')
+        UserJobRole.objects.create(user=user, job_role=role, effective_start_date=timezone.now().date())
+        user.benchmark_role = role
+        return user
+
+    def _grant_policies(self, user, model_class, field_name, page_code):
+        """Match-all data policy plus one masked field, so both modes return the same rows"""
+        target_model = model_class._meta.label
+        policy = DataSecurityPolicy.objects.create(
+            code=f'benchmark_{target_model}',
+            name=f'Benchmark {target_model}',
+            target_model=target_model,
+            condition_type=DataSecurityPolicy.CUSTOM,
+            custom_filter={'pk__isnull': False},
+        )
+        JobRoleDataPolicy.objects.create(job_role=user.benchmark_role, data_policy=policy)
+        FieldSecurityPolicy.objects.create(
+            code=f'benchmark_{target_model}.{field_name}',
+            name=f'Benchmark {field_name}',
+            target_model=target_model,
+            field_name=field_name,
+            default_access=AccessLevel.MASKED,
+        )
+        if page_code:
+            for page in Page.objects.filter(code=page_code):
+                JobRolePage.objects.get_or_create(job_role=user.benchmark_role, page=page)
+
+    def _benchmark(self, label, view, user, params, iterations):
+        factory = APIRequestFactory()
+
+        def call():
+            # A fresh request: the user's compiled policies are looked up again
+            user.__dict__.pop('_security_context', None)
+            request = factory.get('/', params)
+            force_authenticate(request, user=user)
+            return view(request)
+
+        measured = {}
+        for enabled in (False, True):
+            with override_settings(DATA_SECURITY_ENABLED=enabled):
+                response = call()  # warm up
+                if response.status_code != 200:
+                    return label, None, 0, 0, 0, 0
+                with CaptureQueriesContext(connection) as ctx:
+                    call()
+                timings = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    call()
+                    timings.append((time.perf_counter() - start) * 1000)
+                measured[enabled] = (statistics.median(timings), len(ctx.captured_queries))
+
+        data = response.data.get('data', response.data) if isinstance(response.data, dict) else response.data
+        rows = data.get('count', 0) if isinstance(data, dict) else len(data)
+        return label, rows, measured[False][0], measured[True][0], measured[False][1], measured[True][1]
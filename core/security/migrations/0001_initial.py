@@ -0,0 +1,121 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('job_roles', '0005_remove_jobrole_job_roles_status_c2901e_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataSecurityPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when record was last modified')),
+                ('code', models.CharField(db_index=True, max_length=100, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('target_model', models.CharField(db_index=True, help_text="Django model path, e.g. 'po.POHeader'", max_length=100)),
+                ('condition_type', models.CharField(choices=[('global', 'All records'), ('self', 'Own records'), ('custom', 'Custom filter')], default='self', max_length=20)),
+                ('owner_field', models.CharField(blank=True, default='created_by', help_text="Lookup path to the owning user (condition_type='self')", max_length=100)),
+                ('custom_filter', models.JSONField(blank=True, default=dict, help_text="Queryset filter kwargs (condition_type='custom')")),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who created this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(blank=True, help_text='User who last updated this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Data Security Policy',
+                'verbose_name_plural': 'Data Security Policies',
+                'db_table': 'data_security_policies',
+                'ordering': ['target_model', 'code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FieldSecurityPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when record was last modified')),
+                ('code', models.CharField(db_index=True, max_length=100, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('target_model', models.CharField(db_index=True, help_text="Django model path, e.g. 'person.Employee'", max_length=100)),
+                ('field_name', models.CharField(max_length=100)),
+                ('default_access', models.CharField(choices=[('hidden', 'Hidden'), ('masked', 'Masked'), ('readonly', 'Read Only'), ('editable', 'Editable')], default='hidden', max_length=20)),
+                ('mask_pattern', models.CharField(blank=True, default='****', help_text="Mask for masked fields; {firstN} / {lastN} keep N characters, e.g. '***-**-{last4}'", max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who created this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(blank=True, help_text='User who last updated this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Field Security Policy',
+                'verbose_name_plural': 'Field Security Policies',
+                'db_table': 'field_security_policies',
+                'ordering': ['target_model', 'field_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRoleDataPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when record was last modified')),
+                ('can_read', models.BooleanField(default=True)),
+                ('can_create', models.BooleanField(default=False)),
+                ('can_update', models.BooleanField(default=False)),
+                ('can_delete', models.BooleanField(default=False)),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who created this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('data_policy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='role_grants', to='security.datasecuritypolicy')),
+                ('job_role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_policies', to='job_roles.jobrole')),
+                ('updated_by', models.ForeignKey(blank=True, help_text='User who last updated this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Job Role Data Policy',
+                'verbose_name_plural': 'Job Role Data Policies',
+                'db_table': 'job_role_data_policies',
+                'ordering': ['job_role__name', 'data_policy__code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRoleFieldAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when record was last modified')),
+                ('access_level', models.CharField(choices=[('hidden', 'Hidden'), ('masked', 'Masked'), ('readonly', 'Read Only'), ('editable', 'Editable')], default='readonly', max_length=20)),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who created this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('field_policy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='role_access', to='security.fieldsecuritypolicy')),
+                ('job_role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='field_access', to='job_roles.jobrole')),
+                ('updated_by', models.ForeignKey(blank=True, help_text='User who last updated this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(app_label)s_%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Job Role Field Access',
+                'verbose_name_plural': 'Job Role Field Access',
+                'db_table': 'job_role_field_access',
+                'ordering': ['job_role__name', 'field_policy__target_model', 'field_policy__field_name'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='datasecuritypolicy',
+            index=models.Index(fields=['target_model', 'is_active'], name='data_securi_target__de704f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='fieldsecuritypolicy',
+            unique_together={('target_model', 'field_name')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobroledatapolicy',
+            unique_together={('job_role', 'data_policy')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobrolefieldaccess',
+            unique_together={('job_role', 'field_policy')},
+        ),
+    ]
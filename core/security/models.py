@@ -0,0 +1,187 @@
+"""
+Security Policy Models
+
+Layer 2 (Data Security) and Layer 3 (Field Security) of the three-layer
+security model. Layer 1 (Function Security) lives in core.job_roles.
+
+- DataSecurityPolicy: WHICH records of a model a policy exposes
+- JobRoleDataPolicy: Grants a data policy to a job role per action
+- FieldSecurityPolicy: Default access to one field of a model
+- JobRoleFieldAccess: Raises a job role's access to a secured field
+
+Policies are compiled per role set and cached (see core.security.services),
+so every change here bumps the policy version via core.security.signals.
+"""
+from django.apps import apps
+from django.core.exceptions import ValidationError, FieldDoesNotExist, FieldError
+from django.db import models
+
+from core.base.models import AuditMixin
+from core.job_roles.models import JobRole
+from core.security.services import AccessLevel, compile_condition
+
+
+def _validate_target_model(target_model):
+    """Resolve an 'app_label.ModelName' path or raise ValidationError"""
+    try:
+        return apps.get_model(target_model)
+    except (LookupError, ValueError):
+        raise ValidationError(
+            {'target_model': f"'{target_model}' is not an installed model (expected 'app_label.ModelName')"}
+        )
+
+
+class DataSecurityPolicy(AuditMixin, models.Model):
+    """
+    Record-level access rule for one model.
+
+    Condition types:
+        - global: Every record
+        - self: Records whose owner_field points at the user (e.g. 'created_by')
+        - custom: custom_filter lookups, e.g. {"invoice__approval_status": "APPROVED"}.
+          The values '$user_id' and '$user_email' are replaced with the
+          requesting user's id / email when the policy is compiled.
+
+    Once a model has an active policy, users only see the records granted to
+    their roles; models without policies are unrestricted.
+    """
+    GLOBAL = 'global'
+    SELF = 'self'
+    CUSTOM = 'custom'
+
+    CONDITION_TYPES = [
+        (GLOBAL, 'All records'),
+        (SELF, 'Own records'),
+        (CUSTOM, 'Custom filter'),
+    ]
+
+    code = models.CharField(max_length=100, unique=True, db_index=True)
+    name = models.CharField(max_length=255)
+    target_model = models.CharField(
+        max_length=100,
+        db_index=True,
+        help_text="Django model path, e.g. 'po.POHeader'"
+    )
+    condition_type = models.CharField(max_length=20, choices=CONDITION_TYPES, default=SELF)
+    owner_field = models.CharField(
+        max_length=100,
+        blank=True,
+        default='created_by',
+        help_text="Lookup path to the owning user (condition_type='self')"
+    )
+    custom_filter = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Queryset filter kwargs (condition_type='custom')"
+    )
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'data_security_policies'
+        verbose_name = 'Data Security Policy'
+        verbose_name_plural = 'Data Security Policies'
+        ordering = ['target_model', 'code']
+        indexes = [
+            models.Index(fields=['target_model', 'is_active']),
+        ]
+
+    def __str__(self):
+        return f"{self.code} ({self.target_model})"
+
+    def clean(self):
+        """Validate that the policy compiles against its target model"""
+        model_class = _validate_target_model(self.target_model)
+        if self.condition_type == self.SELF and not self.owner_field:
+            raise ValidationError({'owner_field': "Required for 'self' policies"})
+        if self.condition_type == self.CUSTOM and not self.custom_filter:
+            raise ValidationError({'custom_filter': "Required for 'custom' policies"})
+
+        try:
+            condition = compile_condition(self.condition_type, self.owner_field, self.custom_filter, user_id=0)
+            if condition is not None:
+                # Builds the SQL without running it
+                str(model_class._default_manager.filter(condition).query)
+        except (FieldError, FieldDoesNotExist, ValueError, TypeError) as e:
+            raise ValidationError(f"Policy does not apply to {self.target_model}: {e}")
+
+
+class JobRoleDataPolicy(AuditMixin, models.Model):
+    """Grants a data policy to a job role, per action"""
+    job_role = models.ForeignKey(JobRole, on_delete=models.CASCADE, related_name='data_policies')
+    data_policy = models.ForeignKey(DataSecurityPolicy, on_delete=models.CASCADE, related_name='role_grants')
+
+    can_read = models.BooleanField(default=True)
+    can_create = models.BooleanField(default=False)
+    can_update = models.BooleanField(default=False)
+    can_delete = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'job_role_data_policies'
+        verbose_name = 'Job Role Data Policy'
+        verbose_name_plural = 'Job Role Data Policies'
+        unique_together = ('job_role', 'data_policy')
+        ordering = ['job_role__name', 'data_policy__code']
+
+    def __str__(self):
+        return f"{self.job_role.name} - {self.data_policy.code}"
+
+
+class FieldSecurityPolicy(AuditMixin, models.Model):
+    """
+    Default access to one field of a model.
+
+    Roles can be granted a less restrictive level through JobRoleFieldAccess;
+    the most permissive level among a user's roles wins.
+    """
+    code = models.CharField(max_length=100, unique=True, db_index=True)
+    name = models.CharField(max_length=255)
+    target_model = models.CharField(
+        max_length=100,
+        db_index=True,
+        help_text="Django model path, e.g. 'person.Employee'"
+    )
+    field_name = models.CharField(max_length=100)
+    default_access = models.CharField(max_length=20, choices=AccessLevel.choices, default=AccessLevel.HIDDEN)
+    mask_pattern = models.CharField(
+        max_length=100,
+        blank=True,
+        default='****',
+        help_text="Mask for masked fields; {firstN} / {lastN} keep N characters, e.g. '***-**-{last4}'"
+    )
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'field_security_policies'
+        verbose_name = 'Field Security Policy'
+        verbose_name_plural = 'Field Security Policies'
+        unique_together = ('target_model', 'field_name')
+        ordering = ['target_model', 'field_name']
+
+    def __str__(self):
+        return f"{self.target_model}.{self.field_name} ({self.default_access})"
+
+    def clean(self):
+        model_class = _validate_target_model(self.target_model)
+        try:
+            model_class._meta.get_field(self.field_name)
+        except FieldDoesNotExist:
+            raise ValidationError(
+                {'field_name': f"'{self.field_name}' is not a field of {self.target_model}"}
+            )
+
+
+class JobRoleFieldAccess(AuditMixin, models.Model):
+    """Grants a job role an access level on a secured field"""
+    job_role = models.ForeignKey(JobRole, on_delete=models.CASCADE, related_name='field_access')
+    field_policy = models.ForeignKey(FieldSecurityPolicy, on_delete=models.CASCADE, related_name='role_access')
+    access_level = models.CharField(max_length=20, choices=AccessLevel.choices, default=AccessLevel.READONLY)
+
+    class Meta:
+        db_table = 'job_role_field_access'
+        verbose_name = 'Job Role Field Access'
+        verbose_name_plural = 'Job Role Field Access'
+        unique_together = ('job_role', 'field_policy')
+        ordering = ['job_role__name', 'field_policy__target_model', 'field_policy__field_name']
+
+    def __str__(self):
+        return f"{self.job_role.name} - {self.field_policy} → {self.access_level}"
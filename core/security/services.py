@@ -0,0 +1,439 @@
+"""
+Security Services - Data & Field Security Engine
+
+Compiles a user's security policies into:
+- one queryset condition per (model, action)  → get_scoped_queryset()
+- one field mask per model                     → apply_field_security()
+
+Compilation works on the user's role set (active roles + ancestors) and is
+cached under the current policy version, so users sharing roles share the
+compiled result. Any change to roles, assignments or policies bumps the
+version (core.security.signals). The user's active role ids come from the
+cached principal (core.user_accounts.principal), so a warm request costs
+no extra queries; filtering and masking never query per row.
+
+The version and the compiled policies live in the default cache, which must
+be shared by every worker process for a policy change to reach them all
+(enforced at startup by core.user_accounts.principal.require_shared_cache()).
+
+Models are imported lazily: this module is imported by core.security at app
+loading time.
+"""
+import re
+import uuid
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Q
+
+
+POLICY_VERSION_CACHE_KEY = 'core_security:policy_version'
+COMPILED_CACHE_PREFIX = 'core_security:compiled'
+COMPILED_CACHE_TIMEOUT = 60 * 60
+
+ACTION_FLAGS = {
+    'read': 'can_read',
+    'create': 'can_create',
+    'update': 'can_update',
+    'delete': 'can_delete',
+}
+
+ADMIN_ROLE_CODE = 'admin'
+
+USER_PLACEHOLDERS = ('$user_id', '$user_email')
+
+_MASK_TOKEN = re.compile(r'\{(first|last)(\d+)\}')
+
+
+class AccessLevel(models.TextChoices):
+    """Field access levels, from most to least restrictive"""
+    HIDDEN = 'hidden', 'Hidden'
+    MASKED = 'masked', 'Masked'
+    READONLY = 'readonly', 'Read Only'
+    EDITABLE = 'editable', 'Editable'
+
+    @classmethod
+    def rank(cls, level):
+        """Position of level in the restrictive → permissive order"""
+        return cls.values.index(level)
+
+
+# =============================================================================
+# POLICY VERSION
+# =============================================================================
+
+def get_policy_version() -> str:
+    """Current policy version, shared by all processes; compiled policies are cached under it"""
+    version = cache.get(POLICY_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(POLICY_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        version = cache.get(POLICY_VERSION_CACHE_KEY)
+    return version
+
+
+def bump_policy_version():
+    """Invalidate every compiled policy set"""
+    cache.set(POLICY_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+# =============================================================================
+# COMPILATION
+# =============================================================================
+
+def compile_condition(condition_type, owner_field, custom_filter, user_id, user_email=''):
+    """
+    Build the Q for one data policy and one user.
+
+    Returns:
+        Q, or None for condition_type='global' (no restriction)
+    """
+    if condition_type == 'global':
+        return None
+    if condition_type == 'self':
+        return Q(**{owner_field: user_id})
+
+    substitutions = {'$user_id': user_id, '$user_email': user_email}
+
+    def substitute(value):
+        if isinstance(value, list):
+            return [substitute(item) for item in value]
+        if isinstance(value, str) and value in USER_PLACEHOLDERS:
+            return substitutions[value]
+        return value
+
+    return Q(**{lookup: substitute(value) for lookup, value in custom_filter.items()})
+
+
+def _resolve_label(target_model):
+    """Normalize 'app_label.ModelName' to the model's label, or None if unknown"""
+    try:
+        return apps.get_model(target_model)._meta.label
+    except (LookupError, ValueError):
+        return None
+
+
+def _compile_policy_index():
+    """
+    Labels of the models that have any active policy (one query).
+
+    Returns:
+        {'data': set of model labels, 'fields': set of model labels}
+    """
+    from core.security.models import DataSecurityPolicy, FieldSecurityPolicy
+
+    targets = DataSecurityPolicy.objects.filter(is_active=True).order_by().annotate(
+        kind=models.Value('data')
+    ).values_list('target_model', 'kind').union(
+        FieldSecurityPolicy.objects.filter(is_active=True).order_by().annotate(
+            kind=models.Value('fields')
+        ).values_list('target_model', 'kind')
+    )
+    index = {'data': set(), 'fields': set()}
+    for target_model, kind in targets:
+        label = _resolve_label(target_model)
+        if label:
+            index[kind].add(label)
+    return index
+
+
+def _get_cached(key, build):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, COMPILED_CACHE_TIMEOUT)
+    return value
+
+
+def _compile_role_set(role_ids):
+    """
+    Compile the policies granted to a set of roles (and their ancestors).
+
+    Returns a plain dict so it can be cached:
+        {
+            'is_admin': bool,
+            'data': {model_label: {action: [(condition_type, owner_field, custom_filter), ...]}},
+            'fields': {model_label: {field_name: (access_level, mask_pattern)}},
+        }
+    Models with policies (see _compile_policy_index) but no rules for an
+    action are denied that action.
+    """
+    from core.job_roles.models import JobRole
+    from core.security.models import JobRoleDataPolicy, FieldSecurityPolicy, JobRoleFieldAccess
+
+    roles = {pk: (parent_id, code) for pk, parent_id, code in JobRole.objects.values_list('id', 'parent_role_id', 'code')}
+    if any(roles.get(role_id, (None, None))[1] == ADMIN_ROLE_CODE for role_id in role_ids):
+        return {'is_admin': True, 'data': {}, 'fields': {}}
+
+    # Child roles inherit their ancestors' grants
+    expanded = set()
+    for role_id in role_ids:
+        current = role_id
+        while current and current not in expanded:
+            expanded.add(current)
+            current = roles.get(current, (None, None))[0]
+
+    # Data security: rules granted per model and action
+    data = {}
+    grants = JobRoleDataPolicy.objects.filter(
+        job_role_id__in=expanded, data_policy__is_active=True
+    ).values_list(
+        'data_policy__target_model', 'data_policy__condition_type', 'data_policy__owner_field',
+        'data_policy__custom_filter', *ACTION_FLAGS.values()
+    )
+    for target_model, condition_type, owner_field, custom_filter, *flags in grants:
+        label = _resolve_label(target_model)
+        if not label:
+            continue
+        rule = (condition_type, owner_field, custom_filter)
+        rules_by_action = data.setdefault(label, {action: [] for action in ACTION_FLAGS})
+        for action, allowed in zip(ACTION_FLAGS, flags):
+            if allowed and rule not in rules_by_action[action]:
+                rules_by_action[action].append(rule)
+
+    # Field security: most permissive level among the roles wins
+    policies = {
+        pk: [target_model, field_name, default_access, mask_pattern]
+        for pk, target_model, field_name, default_access, mask_pattern in FieldSecurityPolicy.objects.filter(
+            is_active=True
+        ).values_list('id', 'target_model', 'field_name', 'default_access', 'mask_pattern')
+    }
+    access = JobRoleFieldAccess.objects.filter(
+        job_role_id__in=expanded, field_policy_id__in=policies
+    ).values_list('field_policy_id', 'access_level')
+    for policy_id, level in access:
+        if AccessLevel.rank(level) > AccessLevel.rank(policies[policy_id][2]):
+            policies[policy_id][2] = level
+
+    fields = {}
+    for target_model, field_name, level, mask_pattern in policies.values():
+        label = _resolve_label(target_model)
+        if label and level != AccessLevel.EDITABLE:
+            fields.setdefault(label, {})[field_name] = (level, mask_pattern)
+
+    return {'is_admin': False, 'data': data, 'fields': fields}
+
+
+def _get_active_role_ids(user):
+    """Ids of the user's currently effective job roles (from the cached principal)"""
+    from core.user_accounts.principal import get_principal
+
+    if not user or not user.is_authenticated:
+        return []
+    return sorted(get_principal(user).role_ids)
+
+
+class SecurityContext:
+    """
+    A user's compiled policies.
+
+    Built once per user object (see get_security_context) and reused for
+    every queryset and serializer in the request. The user's roles are only
+    looked up once a model that has policies is asked for.
+    """
+
+    def __init__(self, user, version):
+        self.user = user
+        self.version = version
+        self._index = _get_cached(f"{COMPILED_CACHE_PREFIX}:{version}:index", _compile_policy_index)
+        self._compiled = None
+        self._conditions = {}
+
+    @property
+    def compiled(self):
+        """The user's role set compiled (shared through the cache)"""
+        if self._compiled is None:
+            role_ids = _get_active_role_ids(self.user)
+            self._compiled = _get_cached(
+                f"{COMPILED_CACHE_PREFIX}:{self.version}:{','.join(map(str, role_ids))}",
+                lambda: _compile_role_set(role_ids)
+            )
+        return self._compiled
+
+    @property
+    def is_admin(self):
+        return self.compiled['is_admin']
+
+    def data_condition(self, model_class, action='read'):
+        """
+        Condition for the records the user may access.
+
+        Returns:
+            None if unrestricted, False if nothing is accessible, otherwise a Q
+        """
+        label = model_class._meta.label
+        if label not in self._index['data'] or self.is_admin:
+            return None
+
+        key = (label, action)
+        if key not in self._conditions:
+            rules_by_action = self.compiled['data'].get(label, {})
+            self._conditions[key] = self._combine(rules_by_action.get(action, []))
+        return self._conditions[key]
+
+    def _combine(self, rules):
+        """OR the rules together; any global rule lifts the restriction"""
+        if not rules:
+            return False
+        combined = Q()
+        for condition_type, owner_field, custom_filter in rules:
+            condition = compile_condition(
+                condition_type, owner_field, custom_filter,
+                user_id=self.user.pk, user_email=getattr(self.user, 'email', '')
+            )
+            if condition is None:
+                return None
+            combined |= condition
+        return combined
+
+    def field_levels(self, model_class):
+        """{field_name: (access_level, mask_pattern)} for restricted fields of model_class"""
+        label = model_class._meta.label
+        if label not in self._index['fields'] or self.is_admin:
+            return {}
+        return self.compiled['fields'].get(label, {})
+
+
+def get_security_context(user) -> SecurityContext:
+    """
+    Compiled policies for user.
+
+    The context is kept on the user object until the policy version changes;
+    the policy index and compiled role sets are shared through the cache.
+    """
+    version = get_policy_version()
+    context = getattr(user, '_security_context', None)
+    if context is not None and context.version == version:
+        return context
+
+    context = SecurityContext(user, version)
+    if user is not None:
+        user._security_context = context
+    return context
+
+
+def _security_enabled():
+    return getattr(settings, 'DATA_SECURITY_ENABLED', True)
+
+
+# =============================================================================
+# DATA SECURITY
+# =============================================================================
+
+def get_scoped_queryset(user, model_class, action='read', queryset=None):
+    """
+    Apply data security policies to a queryset.
+
+    Args:
+        user: UserAccount instance
+        model_class: Django model class
+        action: 'read', 'create', 'update', 'delete'
+        queryset: Queryset to scope (default: all records of model_class)
+
+    Returns:
+        QuerySet filtered to the records the user's roles grant
+    """
+    if queryset is None:
+        queryset = model_class._default_manager.all()
+    if not _security_enabled():
+        return queryset
+
+    condition = get_security_context(user).data_condition(model_class, action)
+    if condition is None:
+        return queryset
+    if condition is False:
+        return queryset.none()
+    return queryset.filter(condition)
+
+
+# =============================================================================
+# FIELD SECURITY
+# =============================================================================
+
+def get_field_access(user, model_class, field_name) -> str:
+    """
+    Determine user's access level for a specific field.
+
+    Returns:
+        str: 'hidden', 'masked', 'readonly', or 'editable'
+    """
+    if not _security_enabled():
+        return AccessLevel.EDITABLE
+    level = get_security_context(user).field_levels(model_class).get(field_name)
+    return level[0] if level else AccessLevel.EDITABLE
+
+
+def apply_field_security(user, serializer_class):
+    """
+    Serializer class with the user's field security applied.
+
+    Hidden fields are removed, readonly and masked fields become read only and
+    masked values are rewritten with their mask pattern. Serializer fields are
+    matched to policies by field name or source. Returns serializer_class
+    itself when no field of its model is restricted for the user.
+    """
+    model_class = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    if model_class is None or not _security_enabled():
+        return serializer_class
+
+    levels = get_security_context(user).field_levels(model_class)
+    if not levels:
+        return serializer_class
+    return _secured_serializer(serializer_class, tuple(sorted(levels.items())))
+
+
+@lru_cache(maxsize=256)
+def _secured_serializer(serializer_class, levels):
+    """Build (once per serializer and mask) the secured serializer subclass"""
+    levels = dict(levels)
+
+    class SecuredSerializer(serializer_class):
+
+        def get_fields(self):
+            fields = super().get_fields()
+            self._masked_fields = {}
+            for name, field in list(fields.items()):
+                level = levels.get(name) or levels.get(field.source)
+                if level is None:
+                    continue
+                access_level, mask_pattern = level
+                if access_level == AccessLevel.HIDDEN:
+                    del fields[name]
+                    continue
+                field.read_only = True
+                if access_level == AccessLevel.MASKED:
+                    self._masked_fields[name] = mask_pattern
+            return fields
+
+        def to_representation(self, instance):
+            data = super().to_representation(instance)
+            for name, mask_pattern in self._masked_fields.items():
+                if data.get(name) is not None:
+                    data[name] = mask_field_value(data[name], mask_pattern)
+            return data
+
+    SecuredSerializer.__name__ = serializer_class.__name__
+    SecuredSerializer.__qualname__ = serializer_class.__qualname__
+    return SecuredSerializer
+
+
+def mask_field_value(value, mask_pattern):
+    """
+    Apply masking pattern to sensitive field value.
+
+    {firstN} / {lastN} in the pattern keep the first / last N characters:
+        mask_field_value('123-45-6789', '***-**-{last4}') → '***-**-6789'
+    """
+    if value is None:
+        return None
+    text = str(value)
+
+    def keep(match):
+        count = int(match.group(2))
+        if match.group(1) == 'first':
+            return text[:count]
+        return text[-count:] if count else ''
+
+    return _MASK_TOKEN.sub(keep, mask_pattern or '****')
@@ -0,0 +1,38 @@
+"""
+Security Signals
+
+Bump the policy version whenever something that feeds compiled policies
+changes: role hierarchy, role assignments or the policies themselves.
+Queryset-level bulk writes (update(), bulk_create()) do not send these
+signals, and bulk deletes may mute them (core.base.signals); callers doing
+either must call bump_policy_version() themselves.
+"""
+from django.db.models.signals import post_save, post_delete
+
+from core.base.signals import cache_signals_muted
+from core.job_roles.models import JobRole, UserJobRole
+from core.security.models import (
+    DataSecurityPolicy, JobRoleDataPolicy, FieldSecurityPolicy, JobRoleFieldAccess,
+)
+from core.security.services import bump_policy_version
+
+
+POLICY_SOURCES = (
+    JobRole,
+    UserJobRole,
+    DataSecurityPolicy,
+    JobRoleDataPolicy,
+    FieldSecurityPolicy,
+    JobRoleFieldAccess,
+)
+
+
+def invalidate_compiled_policies(sender, **kwargs):
+    if cache_signals_muted(sender):
+        return
+    bump_policy_version()
+
+
+for model in POLICY_SOURCES:
+    post_save.connect(invalidate_compiled_policies, sender=model, dispatch_uid=f'security_{model.__name__}_saved')
+    post_delete.connect(invalidate_compiled_policies, sender=model, dispatch_uid=f'security_{model.__name__}_deleted')
@@ -0,0 +1,264 @@
+"""
+Data & Field Security Tests
+
+Covers:
+- get_scoped_queryset(): global / self / custom policies, deny by default,
+  role inheritance, admin bypass
+- apply_field_security(): hidden, masked and readonly fields
+- Policy version invalidation
+- Payment list endpoint with policies (no per-row queries)
+"""
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.base.test_utils import assign_job_role, create_test_currency, create_test_user, reset_permission_caches
+from core.job_roles.models import JobRole
+from core.security import (
+    AccessLevel,
+    apply_field_security,
+    get_field_access,
+    get_scoped_queryset,
+    mask_field_value,
+)
+from core.security.models import (
+    DataSecurityPolicy, JobRoleDataPolicy, FieldSecurityPolicy, JobRoleFieldAccess,
+)
+from Finance.BusinessPartner.models import Supplier
+from Finance.payments.models import Payment
+from Finance.payments.serializers import PaymentListSerializer
+
+
+class SecurityTestCase(APITestCase):
+    """Base test case with a clerk role, two users and policy helpers"""
+
+    def setUp(self):
+        self.user = create_test_user('clerk@example.com')
+        self.other_user = create_test_user('other@example.com')
+        self.role = JobRole.objects.create(name='Clerk', code='clerk')
+        assign_job_role(self.user, self.role)
+
+    def tearDown(self):
+        reset_permission_caches()
+
+    def grant_data(self, role, code, target_model, condition_type, **kwargs):
+        policy, _ = DataSecurityPolicy.objects.get_or_create(
+            code=code,
+            defaults={
+                'name': code, 'target_model': target_model, 'condition_type': condition_type,
+                'owner_field': kwargs.pop('owner_field', 'created_by'),
+                'custom_filter': kwargs.pop('custom_filter', {}),
+            }
+        )
+        JobRoleDataPolicy.objects.create(job_role=role, data_policy=policy, **kwargs)
+        return policy
+
+    def secure_field(self, target_model, field_name, default_access, **kwargs):
+        return FieldSecurityPolicy.objects.create(
+            code=f'{target_model}.{field_name}', name=field_name,
+            target_model=target_model, field_name=field_name,
+            default_access=default_access, **kwargs
+        )
+
+
+class DataSecurityTests(SecurityTestCase):
+    """Test get_scoped_queryset() against JobRole records (AuditMixin owner)"""
+
+    def setUp(self):
+        super().setUp()
+        self.own_role = JobRole.objects.create(name='Own', code='own', created_by=self.user)
+        self.foreign_role = JobRole.objects.create(name='Foreign', code='foreign', created_by=self.other_user)
+
+    def scoped_codes(self, user, action='read'):
+        return set(get_scoped_queryset(user, JobRole, action).values_list('code', flat=True))
+
+    def test_model_without_policies_is_unrestricted(self):
+        self.assertEqual(self.scoped_codes(self.user), set(JobRole.objects.values_list('code', flat=True)))
+
+    def test_model_with_policies_denies_roles_without_grant(self):
+        DataSecurityPolicy.objects.create(
+            code='roles_global', name='All roles', target_model='job_roles.JobRole', condition_type='global'
+        )
+        self.assertEqual(self.scoped_codes(self.user), set())
+
+    def test_self_policy(self):
+        self.grant_data(self.role, 'own_roles', 'job_roles.JobRole', 'self')
+
+        self.assertEqual(self.scoped_codes(self.user), {'own'})
+        # Only read is granted
+        self.assertEqual(self.scoped_codes(self.user, 'delete'), set())
+
+    def test_policies_are_or_combined(self):
+        self.grant_data(self.role, 'own_roles', 'job_roles.JobRole', 'self')
+        self.grant_data(
+            self.role, 'clerk_role', 'job_roles.JobRole', 'custom', custom_filter={'code__in': ['clerk']}
+        )
+
+        self.assertEqual(self.scoped_codes(self.user), {'own', 'clerk'})
+
+    def test_custom_policy_user_placeholders(self):
+        self.grant_data(
+            self.role, 'by_email', 'job_roles.JobRole', 'custom',
+            custom_filter={'created_by__email': '$user_email'}
+        )
+        self.assertEqual(self.scoped_codes(self.user), {'own'})
+
+    def test_child_role_inherits_parent_grants(self):
+        child = JobRole.objects.create(name='Senior Clerk', code='senior_clerk', parent_role=self.role)
+        other = create_test_user('senior@example.com')
+        assign_job_role(other, child)
+        self.grant_data(self.role, 'global_roles', 'job_roles.JobRole', 'global')
+
+        self.assertEqual(self.scoped_codes(other), set(JobRole.objects.values_list('code', flat=True)))
+
+    def test_admin_bypasses_policies(self):
+        self.grant_data(self.role, 'own_roles', 'job_roles.JobRole', 'self')
+        admin = create_test_user('admin@example.com')
+        assign_job_role(admin, JobRole.objects.get_or_create(code='admin', defaults={'name': 'Admin'})[0])
+
+        self.assertEqual(len(self.scoped_codes(admin)), JobRole.objects.count())
+
+    def test_grant_changes_are_picked_up(self):
+        self.grant_data(self.role, 'own_roles', 'job_roles.JobRole', 'self')
+        self.assertEqual(self.scoped_codes(self.user), {'own'})
+
+        self.grant_data(self.role, 'global_roles', 'job_roles.JobRole', 'global')
+        self.assertEqual(len(self.scoped_codes(self.user)), JobRole.objects.count())
+
+        JobRoleDataPolicy.objects.filter(data_policy__code='global_roles').delete()
+        DataSecurityPolicy.objects.filter(code='global_roles').delete()
+        self.assertEqual(self.scoped_codes(self.user), {'own'})
+
+    def test_compiled_once_per_request(self):
+        self.grant_data(self.role, 'own_roles', 'job_roles.JobRole', 'self')
+        list(get_scoped_queryset(self.user, JobRole))
+
+        # Context is reused: only the scoped query itself runs
+        with self.assertNumQueries(1):
+            list(get_scoped_queryset(self.user, JobRole))
+
+    @override_settings(DATA_SECURITY_ENABLED=False)
+    def test_disabled_engine_is_unrestricted(self):
+        self.grant_data(self.role, 'own_roles', 'job_roles.JobRole', 'self')
+        self.assertEqual(len(self.scoped_codes(self.user)), JobRole.objects.count())
+
+    def test_policy_validation(self):
+        with self.assertRaises(ValidationError):
+            DataSecurityPolicy(code='bad', name='bad', target_model='nope.Model', condition_type='global').full_clean()
+        with self.assertRaises(ValidationError):
+            DataSecurityPolicy(
+                code='bad', name='bad', target_model='job_roles.JobRole',
+                condition_type='custom', custom_filter={'no_such_field': 1}
+            ).full_clean()
+        with self.assertRaises(ValidationError):
+            FieldSecurityPolicy(
+                code='bad', name='bad', target_model='job_roles.JobRole', field_name='no_such_field'
+            ).full_clean()
+
+
+class FieldSecurityTests(SecurityTestCase):
+    """Test get_field_access() and apply_field_security()"""
+
+    def test_most_permissive_role_level_wins(self):
+        policy = self.secure_field('payments.Payment', 'exchange_rate', AccessLevel.HIDDEN)
+        self.assertEqual(get_field_access(self.user, Payment, 'exchange_rate'), 'hidden')
+
+        JobRoleFieldAccess.objects.create(job_role=self.role, field_policy=policy, access_level=AccessLevel.MASKED)
+        other_role = JobRole.objects.create(name='Viewer', code='viewer')
+        assign_job_role(self.user, other_role)
+        JobRoleFieldAccess.objects.create(job_role=other_role, field_policy=policy, access_level=AccessLevel.READONLY)
+
+        self.assertEqual(get_field_access(self.user, Payment, 'exchange_rate'), 'readonly')
+        self.assertEqual(get_field_access(self.user, Payment, 'date'), 'editable')
+
+    def test_unrestricted_serializer_is_returned_unchanged(self):
+        self.assertIs(apply_field_security(self.user, PaymentListSerializer), PaymentListSerializer)
+
+    def test_secured_serializer(self):
+        self.secure_field('payments.Payment', 'reconciliation_status', AccessLevel.HIDDEN)
+        self.secure_field('payments.Payment', 'exchange_rate', AccessLevel.MASKED, mask_pattern='**{last2}')
+
+        serializer_class = apply_field_security(self.user, PaymentListSerializer)
+
+        self.assertIsNot(serializer_class, PaymentListSerializer)
+        self.assertIs(apply_field_security(self.user, PaymentListSerializer), serializer_class)
+        fields = serializer_class().fields
+        self.assertNotIn('reconciliation_status', fields)
+        self.assertTrue(fields['exchange_rate'].read_only)
+
+    def test_mask_field_value(self):
+        self.assertEqual(mask_field_value('123-45-6789', '***-**-{last4}'), '***-**-6789')
+        self.assertEqual(mask_field_value('SECRET', '{first1}****'), 'S****')
+        self.assertEqual(mask_field_value('SECRET', ''), '****')
+        self.assertIsNone(mask_field_value(None, '****'))
+
+
+class SecuredListEndpointTests(SecurityTestCase):
+    """Test policies on GET /finance/payments/"""
+
+    url = '/finance/payments/'
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+        self.currency = create_test_currency()
+        self.supplier = Supplier.objects.create(name='Visible Supplier')
+        self.hidden_supplier = Supplier.objects.create(name='Hidden Supplier')
+
+    def create_payments(self, count, supplier=None):
+        for _ in range(count):
+            Payment.objects.create(
+                date=date(2026, 1, 1),
+                business_partner=(supplier or self.supplier).business_partner,
+                currency=self.currency,
+                exchange_rate='1.2345'
+            )
+
+    def list_payments(self):
+        response = self.client.get(self.url, {'page_size': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['data']['results']
+
+    def test_rows_and_fields_are_secured(self):
+        self.create_payments(2)
+        self.create_payments(1, supplier=self.hidden_supplier)
+        self.grant_data(
+            self.role, 'visible_partner', 'payments.Payment', 'custom',
+            custom_filter={'business_partner_id': self.supplier.business_partner_id}
+        )
+        self.secure_field('payments.Payment', 'reconciliation_status', AccessLevel.HIDDEN)
+        self.secure_field('payments.Payment', 'exchange_rate', AccessLevel.MASKED, mask_pattern='*.**{last2}')
+
+        results = self.list_payments()
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual({row['business_partner_name'] for row in results}, {'Visible Supplier'})
+        self.assertNotIn('reconciliation_status', results[0])
+        self.assertEqual(results[0]['exchange_rate'], '*.**45')
+
+    def test_policies_add_no_per_row_queries(self):
+        self.grant_data(
+            self.role, 'visible_partner', 'payments.Payment', 'custom',
+            custom_filter={'business_partner_id': self.supplier.business_partner_id}
+        )
+        self.secure_field('payments.Payment', 'exchange_rate', AccessLevel.MASKED)
+
+        def count_queries(rows, enabled):
+            Payment.objects.all().delete()
+            self.create_payments(rows)
+            self.list_payments()  # warm the compiled policy cache
+            with self.settings(DATA_SECURITY_ENABLED=enabled):
+                with CaptureQueriesContext(connection) as ctx:
+                    self.list_payments()
+            return len(ctx.captured_queries)
+
+        overhead_small = count_queries(2, True) - count_queries(2, False)
+        overhead_large = count_queries(20, True) - count_queries(20, False)
+
+        self.assertEqual(overhead_small, overhead_large)
+        self.assertLessEqual(overhead_small, 1)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UserAccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.user_accounts'
+
+    def ready(self):
+        import core.user_accounts.signals  # noqa: F401
+        from core.user_accounts.principal import require_shared_cache
+
+        require_shared_cache()
@@ -116,11 +116,10 @@ class UserAccount(SoftDeleteMixin, AuditMixin, AbstractBaseUser):
     def is_admin(self):
         """
         Check if user has the admin job role.
-        Checks the currently effective roles via the job_roles service.
+        Reads the currently effective roles from the cached principal.
         """
-        from core.job_roles.services import get_user_active_roles
-        effective_roles = get_user_active_roles(self)
-        return any(role.code == 'admin' for role in effective_roles)
+        from core.user_accounts.principal import get_principal
+        return get_principal(self).is_admin
 
     def deactivate(self):
         """
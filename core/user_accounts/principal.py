@@ -0,0 +1,163 @@
+"""
+Authenticated Principal Cache
+
+A principal is everything permission checks need to know about a user:
+the user row, the currently effective job roles, the admin flag and the
+pages those roles grant. Building it costs several queries (user, role
+assignments, role and page hierarchies), so it is cached per user and
+reused by:
+
+- CachedJWTAuthentication (core.user_accounts.authentication): the user
+  of a JWT request comes from the principal, not from the database
+- UserAccount.is_admin() and user_can_perform_action()
+- the data security engine (core.security) for the user's role ids
+
+Entries are valid for one day (role assignments are effective-dated) and
+one principal version. Invalidation (core.user_accounts.signals):
+- user saved/deleted, role assignment changed  → that user's entry is dropped
+- role or role page changed → entries of the users assigned to the role or
+  to one of its descendant roles are dropped
+- page hierarchy changed → the version is bumped
+
+Queryset-level bulk writes (update(), bulk_create()) do not send signals;
+callers doing them must call invalidate_principal() / invalidate_principals() /
+bump_principal_version().
+
+Invalidation only reaches other worker processes through a shared cache
+(Redis, Memcached, database): require_shared_cache() refuses a per-process
+backend unless DEBUG is on.
+"""
+import copy
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+
+PRINCIPAL_VERSION_CACHE_KEY = 'user_accounts:principal_version'
+PRINCIPAL_CACHE_PREFIX = 'user_accounts:principal'
+PRINCIPAL_CACHE_TIMEOUT = 60 * 60
+
+ADMIN_ROLE_CODE = 'admin'
+
+# Backends whose entries live in one process only
+PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+class Principal:
+    """A user with the effective role data permission checks need"""
+
+    def __init__(self, user, roles, page_ids, version, as_of):
+        self.user = user
+        self.role_ids = tuple(role.pk for role in roles)
+        self.role_codes = frozenset(role.code for role in roles)
+        self.role_names = tuple(role.name for role in roles)
+        self.is_admin = ADMIN_ROLE_CODE in self.role_codes
+        self.page_ids = frozenset(page_ids)
+        self.version = version
+        self.as_of = as_of
+
+    def __repr__(self):
+        return f"<Principal user={self.user.pk} roles={sorted(self.role_codes)}>"
+
+
+def require_shared_cache():
+    """
+    Refuse to start with a per-process default cache unless DEBUG is on.
+
+    Raises:
+        ImproperlyConfigured: If the default cache is a LocMemCache and DEBUG is off
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if not settings.DEBUG and backend in PER_PROCESS_CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"The default cache ({backend}) is local to each process: cached principals, permissions "
+            "and security policies would not be invalidated across workers. Configure a shared cache "
+            "in CACHES (Redis, Memcached or the database cache)."
+        )
+
+
+def get_principal_version():
+    """Current principal version (created on first use)"""
+    version = cache.get(PRINCIPAL_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(PRINCIPAL_VERSION_CACHE_KEY, version, None)
+        version = cache.get(PRINCIPAL_VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_principal_version():
+    """Invalidate every cached principal"""
+    cache.set(PRINCIPAL_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_principal(user_id):
+    """Drop one user's cached principal"""
+    cache.delete(f"{PRINCIPAL_CACHE_PREFIX}:{user_id}")
+
+
+def invalidate_principals(user_ids):
+    """Drop the cached principals of some users"""
+    cache.delete_many([f"{PRINCIPAL_CACHE_PREFIX}:{user_id}" for user_id in set(user_ids)])
+
+
+def _build_principal(user, version, as_of):
+    from core.job_roles.models import JobRole, UserJobRole
+    from core.job_roles.services import get_all_effective_pages_for_roles
+
+    roles = list(JobRole.objects.filter(
+        id__in=UserJobRole.objects.active_on(as_of).filter(user_id=user.pk).values('job_role_id')
+    ).order_by('name'))
+    page_ids = get_all_effective_pages_for_roles(roles) if roles else set()
+    return Principal(user, roles, page_ids, version, as_of)
+
+
+def _get_cached_principal(user_id, version, as_of):
+    principal = cache.get(f"{PRINCIPAL_CACHE_PREFIX}:{user_id}")
+    if principal is not None and principal.version == version and principal.as_of == as_of:
+        return principal
+    return None
+
+
+def _cache_principal(user, version, as_of):
+    # Cache a plain copy of the user, without per-request state
+    user = copy.copy(user)
+    user.__dict__.pop('_security_context', None)
+    principal = _build_principal(user, version, as_of)
+    cache.set(f"{PRINCIPAL_CACHE_PREFIX}:{user.pk}", principal, PRINCIPAL_CACHE_TIMEOUT)
+    return principal
+
+
+def load_principal(user_id, load_user):
+    """
+    Principal for a user id, loading the user row only on a cache miss.
+
+    Args:
+        user_id: Primary key of the user
+        load_user: Callable returning the UserAccount for user_id (may raise)
+
+    Returns:
+        Principal
+    """
+    version = get_principal_version()
+    as_of = timezone.now().date()
+    principal = _get_cached_principal(user_id, version, as_of)
+    if principal is None:
+        principal = _cache_principal(load_user(), version, as_of)
+    return principal
+
+
+def get_principal(user):
+    """
+    Cached principal of a user instance.
+
+    Unsaved and anonymous users get an uncached principal without roles.
+    """
+    if not user or not getattr(user, 'is_authenticated', False) or user.pk is None:
+        return Principal(user, [], (), None, None)
+    return load_principal(user.pk, lambda: user)
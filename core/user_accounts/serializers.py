@@ -201,9 +201,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     def get_roles(self, obj):
         """Get list of all active role names"""
-        from core.job_roles.services import get_user_active_roles
-        roles = get_user_active_roles(obj)
-        return [role.name for role in roles]
+        from core.user_accounts.principal import get_principal
+        return list(get_principal(obj).role_names)
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -0,0 +1,55 @@
+"""
+User Account Signals
+
+Keep cached principals (core.user_accounts.principal) current:
+- a user or one of their role assignments changes → drop that user's principal
+- a role or role page changes → drop the principals of the users it feeds
+- the page hierarchy changes → bump the principal version
+"""
+from django.db.models.signals import post_save, post_delete, pre_delete
+
+from core.job_roles.models import JobRole, JobRolePage, Page, UserJobRole
+from core.base.signals import cache_signals_muted
+from core.job_roles.permission_matrix import get_role_user_ids
+from core.user_accounts.models import UserAccount
+from core.user_accounts.principal import bump_principal_version, invalidate_principal
+
+
+def invalidate_user_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+def invalidate_assignment_principal(sender, instance, **kwargs):
+    if cache_signals_muted(sender):
+        return
+    invalidate_principal(instance.user_id)
+
+
+def invalidate_role_principals(sender, instance, **kwargs):
+    for user_id in get_role_user_ids([instance.pk]):
+        invalidate_principal(user_id)
+
+
+def invalidate_role_page_principals(sender, instance, **kwargs):
+    if cache_signals_muted(sender):
+        return
+    for user_id in get_role_user_ids([instance.job_role_id]):
+        invalidate_principal(user_id)
+
+
+def invalidate_all_principals(sender, **kwargs):
+    bump_principal_version()
+
+
+post_save.connect(invalidate_user_principal, sender=UserAccount, dispatch_uid='principal_user_saved')
+post_delete.connect(invalidate_user_principal, sender=UserAccount, dispatch_uid='principal_user_deleted')
+post_save.connect(invalidate_assignment_principal, sender=UserJobRole, dispatch_uid='principal_assignment_saved')
+post_delete.connect(invalidate_assignment_principal, sender=UserJobRole, dispatch_uid='principal_assignment_deleted')
+
+# Before the delete, while child roles still point to the role
+post_save.connect(invalidate_role_principals, sender=JobRole, dispatch_uid='principal_JobRole_saved')
+pre_delete.connect(invalidate_role_principals, sender=JobRole, dispatch_uid='principal_JobRole_deleted')
+post_save.connect(invalidate_role_page_principals, sender=JobRolePage, dispatch_uid='principal_JobRolePage_saved')
+post_delete.connect(invalidate_role_page_principals, sender=JobRolePage, dispatch_uid='principal_JobRolePage_deleted')
+post_save.connect(invalidate_all_principals, sender=Page, dispatch_uid='principal_Page_saved')
+post_delete.connect(invalidate_all_principals, sender=Page, dispatch_uid='principal_Page_deleted')
@@ -0,0 +1,118 @@
+"""
+Tests for the cached authenticated principal.
+
+Covers:
+- JWT requests served from the principal cache (no identity queries when warm)
+- Invalidation on user, role assignment and role page changes
+- is_admin() and user_can_perform_action() reading the principal
+- Per-process caches refused outside DEBUG
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.job_roles.models import JobRole, JobRolePage, Page, UserJobRole
+from core.job_roles.services import user_can_perform_action
+from core.user_accounts.models import UserAccount
+from core.user_accounts.principal import bump_principal_version, get_principal, require_shared_cache
+
+
+class PrincipalCacheTests(APITestCase):
+    """Test GET /accounts/profile/ with the principal cache"""
+
+    url = '/accounts/profile/'
+
+    def setUp(self):
+        self.user = UserAccount.objects.create_user(
+            email='principal@example.com', name='Principal', phone_number='1234567890', password='TestPass123'
+        )
+        self.role = JobRole.objects.create(name='Clerk', code='clerk')
+        self.assign(self.role)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def tearDown(self):
+        # Cached principals outlive the test transaction
+        bump_principal_version()
+
+    def assign(self, role):
+        return UserJobRole.objects.create(user=self.user, job_role=role, effective_start_date=timezone.now().date())
+
+    def get_profile(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_warm_request_runs_no_queries(self):
+        self.get_profile()
+
+        with self.assertNumQueries(0):
+            data = self.get_profile()
+        self.assertEqual(data['roles'], ['Clerk'])
+
+    def test_cold_request_loads_user_once(self):
+        with self.assertNumQueries(3) as ctx:  # user + active roles + role pages
+            self.get_profile()
+        identity = [q['sql'] for q in ctx.captured_queries if '"user_account"' in q['sql']]
+        self.assertEqual(len(identity), 1)
+
+    def test_user_changes_are_picked_up(self):
+        self.get_profile()
+        self.user.name = 'Renamed'
+        self.user.save()
+
+        self.assertEqual(self.get_profile()['name'], 'Renamed')
+
+    def test_assignment_changes_are_picked_up(self):
+        self.assertFalse(self.user.is_admin())
+        admin_role, _ = JobRole.objects.get_or_create(code='admin', defaults={'name': 'Admin'})
+        self.assign(admin_role)
+
+        self.assertTrue(self.user.is_admin())
+        self.assertEqual(sorted(self.get_profile()['roles']), sorted([admin_role.name, 'Clerk']))
+
+    def test_role_page_changes_are_picked_up(self):
+        page = Page.objects.create(name='Ledger', code='ledger')
+        self.assertNotIn(page.pk, get_principal(self.user).page_ids)
+
+        JobRolePage.objects.create(job_role=self.role, page=page)
+
+        self.assertIn(page.pk, get_principal(self.user).page_ids)
+
+    def test_permission_check_uses_principal(self):
+        allowed, reason = user_can_perform_action(self.user, 'no_such_page', 'view')
+        self.assertFalse(allowed)
+
+        get_principal(self.user)
+        # Page, action and page-action lookups only; roles come from the cache
+        with self.assertNumQueries(1):
+            user_can_perform_action(self.user, 'no_such_page', 'view')
+
+    def test_deleted_user_is_rejected(self):
+        self.get_profile()
+        UserAccount.objects.filter(pk=self.user.pk).delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class SharedCacheTests(SimpleTestCase):
+    """Test require_shared_cache()"""
+
+    locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    database = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'}}
+
+    @override_settings(DEBUG=False, CACHES=locmem)
+    def test_per_process_cache_is_refused_without_debug(self):
+        with self.assertRaises(ImproperlyConfigured):
+            require_shared_cache()
+
+    @override_settings(DEBUG=True, CACHES=locmem)
+    def test_per_process_cache_is_allowed_with_debug(self):
+        require_shared_cache()
+
+    @override_settings(DEBUG=False, CACHES=database)
+    def test_shared_cache_is_allowed(self):
+        require_shared_cache()
@@ -0,0 +1,201 @@
+"""
+Streaming Export Engine for Large Downloads
+
+Builds Excel (.xlsx) and CSV downloads without holding the whole dataset in memory:
+- Rows are produced lazily (typically from queryset.iterator(chunk_size=...))
+- Excel files use openpyxl write-only mode, which spools rows to disk instead of
+  keeping a cell object per value
+- The finished file is streamed to the client through a StreamingHttpResponse
+- CSV is a true row-by-row stream and is the fastest option for very large exports
+
+Views should read the format from a `file_format` query parameter - DRF reserves
+`format` for renderer selection.
+
+Usage:
+    from erp_project.exports import ExportSheet, export_response, iterate_queryset
+
+    def rows():
+        for line in iterate_queryset(JournalLine.objects.select_related('entry')):
+            yield [line.entry.date, line.type, line.amount]
+
+    sheet = ExportSheet(
+        title='Journal Lines',
+        headers=['Date', 'Type', 'Amount'],
+        rows=rows(),
+        number_formats={2: '#,##0.00'},
+    )
+    return export_response('Journal_Lines', [sheet], file_format=request.query_params.get('file_format'))
+"""
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CSV_CONTENT_TYPE = 'text/csv'
+
+# Rows fetched per database round trip when iterating querysets
+DEFAULT_CHUNK_SIZE = 2000
+
+SUPPORTED_FORMATS = ('xlsx', 'csv')
+
+
+def iterate_queryset(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Iterate a queryset in chunks without populating the result cache.
+
+    Args:
+        queryset: QuerySet to iterate
+        chunk_size: Rows fetched per round trip
+
+    Returns:
+        Iterator over model instances (or values rows)
+    """
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+class ExportSheet:
+    """
+    One worksheet (or the CSV body) of an export.
+
+    Attributes:
+        title: Worksheet title (ignored for CSV)
+        headers: Column header labels
+        rows: Iterable of row lists - may be a generator, consumed once
+        column_widths: Optional {column_index: width}; default_width otherwise
+        number_formats: Optional {column_index: excel number format} (0-based)
+        default_width: Width applied to columns without an explicit width
+    """
+
+    def __init__(self, title, headers, rows, column_widths=None, number_formats=None, default_width=15):
+        self.title = title
+        self.headers = list(headers)
+        self.rows = rows
+        self.column_widths = column_widths or {}
+        self.number_formats = number_formats or {}
+        self.default_width = default_width
+
+
+def _write_xlsx_sheet(workbook, sheet):
+    """Append one ExportSheet to a write-only workbook."""
+    ws = workbook.create_sheet(sheet.title)
+
+    # Column dimensions must be set before any row is written in write-only mode
+    for col_idx in range(len(sheet.headers)):
+        width = sheet.column_widths.get(col_idx, sheet.default_width)
+        ws.column_dimensions[get_column_letter(col_idx + 1)].width = width
+
+    header_cells = []
+    for header in sheet.headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = Font(bold=True)
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    if not sheet.number_formats:
+        for row in sheet.rows:
+            ws.append(row)
+        return
+
+    for row in sheet.rows:
+        cells = []
+        for col_idx, value in enumerate(row):
+            number_format = sheet.number_formats.get(col_idx)
+            if number_format and value is not None:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.number_format = number_format
+                cells.append(cell)
+            else:
+                cells.append(value)
+        ws.append(cells)
+
+
+def build_xlsx_response(filename, sheets):
+    """
+    Build a streamed .xlsx download from one or more sheets.
+
+    The workbook is written in write-only mode to a temporary file, which is
+    then streamed to the client in blocks and closed when the response ends.
+
+    Args:
+        filename: Download file name without extension
+        sheets: List of ExportSheet
+
+    Returns:
+        FileResponse (a StreamingHttpResponse)
+    """
+    workbook = Workbook(write_only=True)
+    for sheet in sheets:
+        _write_xlsx_sheet(workbook, sheet)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+
+    response = FileResponse(output, content_type=XLSX_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
+    return response
+
+
+class _Echo:
+    """Pseudo-buffer for csv.writer: write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def build_csv_response(filename, sheet):
+    """
+    Build a row-by-row streamed CSV download.
+
+    Args:
+        filename: Download file name without extension
+        sheet: ExportSheet providing headers and rows
+
+    Returns:
+        StreamingHttpResponse
+    """
+    writer = csv.writer(_Echo())
+
+    def stream():
+        yield writer.writerow(sheet.headers)
+        for row in sheet.rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(stream(), content_type=CSV_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def export_response(filename, sheets, file_format=None):
+    """
+    Build a streamed export in the requested format.
+
+    CSV holds a single table, so only the last sheet (the data sheet by
+    convention - e.g. 'Budget Amounts' after 'Budget Header') is written.
+
+    Args:
+        filename: Download file name without extension
+        sheets: List of ExportSheet
+        file_format: 'xlsx' (default) or 'csv'
+
+    Returns:
+        StreamingHttpResponse
+
+    Raises:
+        ValueError: If file_format is not supported
+    """
+    file_format = (file_format or 'xlsx').lower()
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Unsupported export format '{file_format}'. Use one of: {', '.join(SUPPORTED_FORMATS)}"
+        )
+
+    if file_format == 'csv':
+        return build_csv_response(filename, sheets[-1])
+    return build_xlsx_response(filename, sheets)
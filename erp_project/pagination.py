@@ -106,3 +106,32 @@ def auto_paginate(view_func):
         return response
     
     return wrapper
+
+
+def paginate_queryset_response(request, queryset, serialize):
+    """
+    Paginate a QuerySet in the database and return the standard paginated response.
+    
+    Unlike @auto_paginate (which slices an already-serialized list), only the
+    requested page is fetched and serialized - use it for large reports.
+    
+    Usage:
+        from erp_project.pagination import paginate_queryset_response
+        
+        queryset = MyModel.objects.filter(...).order_by('-id')
+        return paginate_queryset_response(
+            request, queryset,
+            lambda page: MySerializer(page, many=True).data
+        )
+    
+    Args:
+        request: DRF request (reads page / page_size query params)
+        queryset: Ordered QuerySet
+        serialize: Callable turning the list of page objects into response data
+    
+    Returns:
+        Response: Paginated response in standard format
+    """
+    paginator = StandardResultsSetPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(serialize(page))
@@ -0,0 +1,284 @@
+"""
+Query Profiling
+
+Opt-in, per-request profile of the database work behind an endpoint:
+- query count and total SQL time
+- duplicate queries, grouped by fingerprint (the SQL with its literals
+  replaced), which is how N+1 patterns show up
+- time spent building serializer .data
+- total request time
+
+Enable it with settings.QUERY_PROFILING['ENABLED'] (the middleware removes
+itself otherwise). Each profiled response then carries X-Query-* headers,
+is appended to the JSON-lines report at REPORT_PATH (summarised by
+`manage.py query_profile_report`) and is checked against the per-URL query
+budgets in BUDGETS.
+
+Budgets fail tests when run with
+`manage.py test --testrunner erp_project.profiling.QueryBudgetTestRunner`
+(or `manage.py test_all --query-budgets`); QueryProfileTestMixin
+(core.base.test_utils) asserts budgets in individual tests.
+"""
+import contextvars
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'ENABLED': False,
+    'HEADERS': True,
+    'REPORT_PATH': None,
+    'BUDGETS': {},
+    'RAISE_ON_BUDGET': False,
+}
+
+# Duplicate fingerprints listed per request in headers / the report
+MAX_REPORTED_DUPLICATES = 5
+
+_current_profile = contextvars.ContextVar('query_profile', default=None)
+_report_lock = threading.Lock()
+_serializer_timing_installed = False
+
+_IN_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACE_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """An endpoint ran more queries than its budget allows"""
+
+
+def get_profiling_config():
+    """settings.QUERY_PROFILING merged over the defaults"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'QUERY_PROFILING', {})}
+
+
+def fingerprint(sql):
+    """
+    Normalised SQL: IN lists collapsed, literals replaced with '?'.
+
+    Two queries with the same fingerprint differ only in their parameters.
+    """
+    sql = _IN_LIST_RE.sub('(...)', sql)
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    return _SPACE_RE.sub(' ', sql).strip().replace('%s', '?')
+
+
+def get_query_budget(path, budgets=None):
+    """
+    Query budget of a URL path.
+
+    Args:
+        path: Request path, e.g. '/finance/payments/'
+        budgets: {regex: max queries} (default: QUERY_PROFILING['BUDGETS'])
+
+    Returns:
+        int or None: Budget of the first matching pattern
+    """
+    if budgets is None:
+        budgets = get_profiling_config()['BUDGETS']
+    for pattern, budget in budgets.items():
+        if re.search(pattern, path):
+            return budget
+    return None
+
+
+class RequestProfile:
+    """Database and serializer work of one request (or profiled block)"""
+
+    def __init__(self, method='', path=''):
+        self.method = method
+        self.path = path
+        self.status_code = None
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.total_time = 0.0
+        self.budget = None
+        self.fingerprints = Counter()
+        self._serializer_depth = 0
+
+    def record_query(self, sql, duration):
+        self.query_count += 1
+        self.sql_time += duration
+        self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """[(fingerprint, count)] of queries run more than once, most repeated first"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+    @property
+    def duplicate_count(self):
+        """Queries that repeat an earlier query's fingerprint"""
+        return sum(count - 1 for _, count in self.duplicates)
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.query_count > self.budget
+
+    def as_dict(self):
+        return {
+            'method': self.method,
+            'path': self.path,
+            'status': self.status_code,
+            'queries': self.query_count,
+            'duplicate_queries': self.duplicate_count,
+            'sql_ms': round(self.sql_time * 1000, 2),
+            'serializer_ms': round(self.serializer_time * 1000, 2),
+            'total_ms': round(self.total_time * 1000, 2),
+            'budget': self.budget,
+            'duplicates': [
+                {'sql': sql, 'count': count} for sql, count in self.duplicates[:MAX_REPORTED_DUPLICATES]
+            ],
+        }
+
+    def __repr__(self):
+        return f"<RequestProfile {self.method} {self.path} queries={self.query_count}>"
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if profile is not None:
+            profile.record_query(sql, time.perf_counter() - start)
+
+
+@contextmanager
+def profile_queries(method='', path=''):
+    """
+    Profile every query run on any database connection inside the block.
+
+    Usage:
+        with profile_queries() as profile:
+            list(POHeader.objects.all())
+        profile.query_count, profile.duplicates
+    """
+    profile = RequestProfile(method, path)
+    token = _current_profile.set(profile)
+    start = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield profile
+    finally:
+        profile.total_time = time.perf_counter() - start
+        _current_profile.reset(token)
+
+
+def _timed_data(fget):
+    def data(serializer):
+        profile = _current_profile.get()
+        if profile is None or profile._serializer_depth:
+            return fget(serializer)
+        profile._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(serializer)
+        finally:
+            profile.serializer_time += time.perf_counter() - start
+            profile._serializer_depth -= 1
+    return data
+
+
+def install_serializer_timing():
+    """Time Serializer.data / ListSerializer.data of profiled requests (idempotent)"""
+    global _serializer_timing_installed
+    if _serializer_timing_installed:
+        return
+    from rest_framework.serializers import ListSerializer, Serializer
+
+    for serializer_class in (Serializer, ListSerializer):
+        serializer_class.data = property(_timed_data(serializer_class.data.fget))
+    _serializer_timing_installed = True
+
+
+def write_report(profile, path):
+    """Append one profile to the JSON-lines report"""
+    line = json.dumps(profile.as_dict())
+    with _report_lock:
+        with open(path, 'a', encoding='utf-8') as report:
+            report.write(line + '\n')
+
+
+class QueryProfilingMiddleware:
+    """
+    Profile each request (see module docstring).
+
+    Headers:
+        X-Query-Count, X-Query-Time-Ms, X-Query-Duplicates,
+        X-Serializer-Time-Ms, X-Query-Budget (when the URL has one)
+    """
+
+    def __init__(self, get_response):
+        if not get_profiling_config()['ENABLED']:
+            raise MiddlewareNotUsed()
+        install_serializer_timing()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_profiling_config()
+        with profile_queries(request.method, request.path) as profile:
+            response = self.get_response(request)
+        profile.status_code = response.status_code
+        profile.budget = get_query_budget(request.path, config['BUDGETS'])
+        response.query_profile = profile
+
+        if config['HEADERS']:
+            response['X-Query-Count'] = str(profile.query_count)
+            response['X-Query-Time-Ms'] = f'{profile.sql_time * 1000:.2f}'
+            response['X-Query-Duplicates'] = str(profile.duplicate_count)
+            response['X-Serializer-Time-Ms'] = f'{profile.serializer_time * 1000:.2f}'
+            if profile.budget is not None:
+                response['X-Query-Budget'] = str(profile.budget)
+        if config['REPORT_PATH']:
+            write_report(profile, config['REPORT_PATH'])
+
+        if profile.over_budget:
+            message = (
+                f"{request.method} {request.path} ran {profile.query_count} queries "
+                f"(budget {profile.budget}, {profile.duplicate_count} duplicate)"
+            )
+            if config['RAISE_ON_BUDGET']:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """
+    Test runner that profiles every request and fails on budget overruns.
+
+    Usage:
+        python manage.py test --testrunner erp_project.profiling.QueryBudgetTestRunner
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._profiling_settings = override_settings(QUERY_PROFILING={
+            **get_profiling_config(), 'ENABLED': True, 'RAISE_ON_BUDGET': True,
+        })
+        self._profiling_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._profiling_settings.disable()
+        super().teardown_test_environment(**kwargs)
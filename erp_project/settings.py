@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -59,6 +60,7 @@ INSTALLED_APPS = [
     'Finance.period',    # Period management
     'Finance.cash_management',  # Cash Management
     'Finance.budget_control',
+    'Finance.fixed_assets',     # Fixed Assets
     
     # Core Module
     'core',              # Main Core App
@@ -66,6 +68,7 @@ INSTALLED_APPS = [
     'core.user_accounts',     # Accounts management
     'core.approval',     # Approval workflows
     'core.lookups',     # Lookup tables
+    'core.security',    # Data & field security policies
     
     # Procurement Module
     'procurement',              # Main Procurement App  
@@ -81,6 +84,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'erp_project.profiling.QueryProfilingMiddleware',  # no-op unless QUERY_PROFILING['ENABLED']
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -124,6 +128,40 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# Cached principals, permission matrices, compiled security policies and the
+# exchange rate version are invalidated through this cache, so every worker
+# process must share it: a per-process LocMemCache is only allowed with DEBUG
+# on (checked at startup by core.user_accounts). Set CACHE_URL
+# (redis://host:6379/0) to use Redis; otherwise non-debug deployments use the
+# database cache (run `python manage.py createcachetable` once).
+
+CACHE_URL = os.environ.get('CACHE_URL')
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+elif DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -168,7 +206,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.user_accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,  # Default items per page
@@ -195,3 +233,21 @@ SIMPLE_JWT = {
 
 # Use custom user model
 AUTH_USER_MODEL = 'user_accounts.UserAccount'
+
+# Data & field security (core.security): set False to bypass policies
+DATA_SECURITY_ENABLED = True
+
+# Query profiling (erp_project.profiling): opt-in per-request query count,
+# SQL / serializer time and duplicate queries, exposed as X-Query-* headers.
+# BUDGETS maps URL path regexes to the most queries a request may run.
+QUERY_PROFILING = {
+    'ENABLED': False,
+    'HEADERS': True,
+    'REPORT_PATH': None,  # e.g. BASE_DIR / 'query_profile.jsonl'
+    'RAISE_ON_BUDGET': False,
+    'BUDGETS': {
+        r'^/finance/invoice/(ar|ap)/aging/$': 5,
+        r'^/finance/core/deletable/$': 5,
+        r'^/accounts/profile/$': 5,
+    },
+}
@@ -525,6 +525,7 @@ All operations should be performed through child classes.
 """
 
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from decimal import Decimal
@@ -536,6 +537,57 @@ from procurement.catalog.models import catalogItem, UnitOfMeasure
 
 # ==================== PARENT MODEL ====================
 
+REMAINING_VALUE_OUTPUT = models.DecimalField(max_digits=18, decimal_places=2)
+
+
+class PRQuerySet(models.QuerySet):
+    """
+    QuerySet for PR with SQL-side conversion statistics.
+
+    Methods:
+        - with_conversion_stats(): Annotate item counts and remaining value
+    """
+
+    def with_conversion_stats(self):
+        """
+        Annotate each PR with its PO conversion progress (one aggregate query).
+
+        Annotations:
+            - total_item_count: Number of items
+            - unconverted_item_count: Items not yet fully converted to a PO
+            - partially_converted_item_count: Unconverted items with some quantity converted
+            - remaining_value: Sum of unconverted quantity × estimated unit price
+
+        The counts aggregate over the items join, so do not combine them with
+        other filters across multi-valued relations.
+        """
+        unconverted = models.Q(items__converted_to_po=False)
+        return self.annotate(
+            total_item_count=models.Count('items'),
+            unconverted_item_count=models.Count('items', filter=unconverted),
+            partially_converted_item_count=models.Count(
+                'items', filter=unconverted & models.Q(items__quantity_converted__gt=0)
+            ),
+            remaining_value=Coalesce(
+                models.Sum(
+                    models.ExpressionWrapper(
+                        (models.F('items__quantity') - models.F('items__quantity_converted'))
+                        * models.F('items__estimated_unit_price'),
+                        output_field=REMAINING_VALUE_OUTPUT
+                    ),
+                    filter=unconverted
+                ),
+                models.Value(Decimal('0.00')),
+                output_field=REMAINING_VALUE_OUTPUT
+            ),
+        )
+
+
+class PRManager(ManagedParentManager.from_queryset(PRQuerySet)):
+    """ManagedParentManager exposing with_conversion_stats()"""
+    pass
+
+
 class PR(ApprovableMixin, ApprovableInterface, ManagedParentModel, models.Model):
     """
     Purchase Requisition - MANAGED BASE CLASS
@@ -666,7 +718,7 @@ class PR(ApprovableMixin, ApprovableInterface, ManagedParentModel, models.Model)
     )
     
     # Custom manager
-    objects = ManagedParentManager()
+    objects = PRManager()
     
     class Meta:
         db_table = 'pr'
@@ -0,0 +1,125 @@
+"""
+Tests for the PR conversion queue.
+
+Tests the endpoint:
+- GET /procurement/pr/approved-for-conversion/ - Approved PRs with unconverted items
+
+Covers scenarios:
+- Item counts and remaining value per PR
+- Query count independent of the number of PRs
+- Department, required date and remaining value filters
+- Validation errors
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from datetime import date, timedelta
+
+from procurement.PR.models import Catalog_PR, PRItem
+from procurement.PR.tests.fixtures import (
+    create_unit_of_measure,
+    create_catalog_item,
+    get_or_create_test_user
+)
+
+
+class ConversionQueueTests(TestCase):
+    """Test the approved-for-conversion queue"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = get_or_create_test_user()
+        self.client.force_authenticate(user=self.user)
+
+        self.uom = create_unit_of_measure(code='PCS', name='Pieces')
+        self.catalog_item = create_catalog_item(name='Monitor', code='MON01')
+        self.url = reverse('pr:approved-prs-for-conversion')
+
+    def create_approved_pr(self, department='IT', required_in_days=10, items=()):
+        """Approved Catalog PR with (quantity, unit price, quantity converted) items"""
+        catalog_pr = Catalog_PR.objects.create(
+            date=date.today(),
+            required_date=date.today() + timedelta(days=required_in_days),
+            requester_name='Jane Roe',
+            requester_department=department
+        )
+        catalog_pr.pr.status = 'APPROVED'
+        catalog_pr.pr._allow_direct_save = True
+        catalog_pr.pr.save()
+        for line_number, (quantity, price, converted) in enumerate(items, start=1):
+            PRItem.objects.create(
+                pr=catalog_pr.pr,
+                line_number=line_number,
+                item_name='Monitor',
+                catalog_item=self.catalog_item,
+                quantity=quantity,
+                unit_of_measure=self.uom,
+                estimated_unit_price=price,
+                quantity_converted=converted,
+                converted_to_po=converted >= quantity
+            )
+        return catalog_pr.pr
+
+    def test_conversion_counts(self):
+        """Item counts and remaining value come from one aggregate query"""
+        pr = self.create_approved_pr(items=[(4, 100, 1), (2, 50, 2), (3, 10, 0)])
+        self.create_approved_pr(items=[(10, 1200, 0)])
+
+        response = self.client.get(self.url, {'pr_type': 'Catalog', 'department': 'it', 'page_size': 50})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = {row['pr_id']: row for row in response.data['data']['results']}
+        self.assertEqual(response.data['data']['count'], 2)
+        self.assertEqual(rows[pr.id]['total_items'], 3)
+        self.assertEqual(rows[pr.id]['unconverted_items'], 2)
+        self.assertEqual(rows[pr.id]['partially_converted_items'], 1)
+        # (4 - 1) × 100 + 3 × 10
+        self.assertEqual(rows[pr.id]['remaining_value'], 330.0)
+
+    def test_query_count_is_constant(self):
+        """The page costs the same number of queries for 2 or 12 PRs"""
+        self.create_approved_pr(items=[(1, 10, 0)])
+        self.create_approved_pr(items=[(1, 10, 0)])
+        self.client.get(self.url, {'pr_type': 'Catalog'})
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {'pr_type': 'Catalog'})
+        for _ in range(10):
+            self.create_approved_pr(items=[(1, 10, 0), (2, 10, 1)])
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url, {'pr_type': 'Catalog'})
+
+        self.assertEqual(response.data['data']['count'], 12)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_filters(self):
+        """Department, required-date window and minimum remaining value filters"""
+        it_pr = self.create_approved_pr(items=[(10, 1200, 0)])
+        hr_pr = self.create_approved_pr(department='HR', required_in_days=30, items=[(100, 1000, 0)])
+        converted_pr = self.create_approved_pr(items=[(1, 10, 1)])
+
+        def pr_ids(**params):
+            response = self.client.get(self.url, {'pr_type': 'Catalog', **params})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return {row['pr_id'] for row in response.data['data']['results']}
+
+        self.assertEqual(pr_ids(department='HR'), {hr_pr.id})
+        self.assertEqual(pr_ids(required_date_from=str(date.today() + timedelta(days=20))), {hr_pr.id})
+        self.assertEqual(pr_ids(required_date_to=str(date.today() + timedelta(days=20))), {it_pr.id})
+        self.assertEqual(pr_ids(min_remaining_value='50000'), {hr_pr.id})
+        self.assertIn(converted_pr.id, pr_ids(has_unconverted_items='false'))
+        self.assertNotIn(converted_pr.id, pr_ids())
+
+    def test_invalid_filters(self):
+        """Malformed dates and amounts are rejected"""
+        for params in ({'required_date_from': '2026-13-01'}, {'min_remaining_value': 'lots'}):
+            response = self.client.get(self.url, {'pr_type': 'Catalog', **params})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {'pr_type': 'Unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
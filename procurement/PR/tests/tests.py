@@ -358,8 +358,8 @@ class PRConversionTests(PRTestBase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['status'], 'success')
-        self.assertGreaterEqual(len(response.data['data']), 1)
-        self.assertEqual(response.data['data'][0]['pr_type'], 'Catalog')
+        self.assertGreaterEqual(len(response.data['data']['results']), 1)
+        self.assertEqual(response.data['data']['results'][0]['pr_type'], 'Catalog')
     
     def test_get_approved_prs_invalid_type_fails(self):
         """Test getting approved PRs with invalid type fails"""
@@ -17,9 +17,11 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, F
 from django.db import models
+from django.utils.dateparse import parse_date
+from decimal import Decimal, InvalidOperation
 
 from erp_project.response_formatter import success_response, error_response
-from erp_project.pagination import auto_paginate
+from erp_project.pagination import auto_paginate, paginate_queryset_response
 from core.approval.managers import ApprovalManager
 
 from procurement.PR.models import Catalog_PR, NonCatalog_PR, Service_PR, PR, PRItem, PRAttachment
@@ -669,15 +671,19 @@ def service_pr_cancel(request, pk):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@auto_paginate
 def approved_prs_for_conversion(request):
     """
     GET: Get all approved PRs available for PO conversion, filtered by type
     Query params:
         - pr_type: 'Catalog', 'Non-Catalog', or 'Service' (required)
         - has_unconverted_items: true/false (optional, default: true)
+        - department: Requester department (optional, case-insensitive)
+        - required_date_from / required_date_to: YYYY-MM-DD (optional)
+        - min_remaining_value: Minimum unconverted value (optional)
+        - page / page_size: Pagination
     
-    Returns PRs with their available items for PO creation
+    Returns PRs with their item conversion counts. The counts are computed
+    in one aggregate query and only the requested page is fetched.
     """
     pr_type = request.query_params.get('pr_type')
     
@@ -695,44 +701,66 @@ def approved_prs_for_conversion(request):
         type_of_pr=pr_type
     )
     
+    department = request.query_params.get('department')
+    if department:
+        queryset = queryset.filter(requester_department__iexact=department)
+    
+    for param, lookup in (('required_date_from', 'required_date__gte'), ('required_date_to', 'required_date__lte')):
+        value = request.query_params.get(param)
+        if value:
+            try:
+                parsed = parse_date(value)
+            except ValueError:
+                parsed = None
+            if parsed is None:
+                return error_response(
+                    data={'detail': f'Invalid {param}. Use YYYY-MM-DD'},
+                    message="Invalid date",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(**{lookup: parsed})
+    
+    queryset = queryset.with_conversion_stats()
+    
     # Optional: Filter only PRs with unconverted items
     has_unconverted = request.query_params.get('has_unconverted_items', 'true').lower() == 'true'
     if has_unconverted:
-        queryset = queryset.filter(
-            items__converted_to_po=False
-        ).distinct()
-    
-    queryset = queryset.order_by('-approved_at')
-    
-    # Build response with PR details and item counts
-    response_data = []
-    for pr in queryset:
-        unconverted_items = pr.items.filter(converted_to_po=False).count()
-        partially_converted = pr.items.filter(
-            converted_to_po=False,
-            quantity_converted__gt=0
-        ).count()
-        
-        response_data.append({
-            'pr_id': pr.id,
-            'pr_number': pr.pr_number,
-            'pr_type': pr.type_of_pr,
-            'date': pr.date,
-            'required_date': pr.required_date,
-            'requester_name': pr.requester_name,
-            'requester_department': pr.requester_department,
-            'total': float(pr.total),
-            'approved_at': pr.approved_at,
-            'total_items': pr.items.count(),
-            'unconverted_items': unconverted_items,
-            'partially_converted_items': partially_converted
-        })
+        queryset = queryset.filter(unconverted_item_count__gt=0)
     
-    return success_response(
-        data=response_data,
-        message="Approved PRs retrieved successfully",
-        status_code=status.HTTP_200_OK
-    )
+    min_remaining_value = request.query_params.get('min_remaining_value')
+    if min_remaining_value:
+        try:
+            queryset = queryset.filter(remaining_value__gte=Decimal(min_remaining_value))
+        except InvalidOperation:
+            return error_response(
+                data={'detail': 'Invalid min_remaining_value. Must be a number'},
+                message="Invalid amount",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+    
+    queryset = queryset.order_by(F('approved_at').desc(nulls_last=True), '-id')
+    
+    def serialize(page):
+        return [
+            {
+                'pr_id': pr.id,
+                'pr_number': pr.pr_number,
+                'pr_type': pr.type_of_pr,
+                'date': pr.date,
+                'required_date': pr.required_date,
+                'requester_name': pr.requester_name,
+                'requester_department': pr.requester_department,
+                'total': float(pr.total),
+                'approved_at': pr.approved_at,
+                'total_items': pr.total_item_count,
+                'unconverted_items': pr.unconverted_item_count,
+                'partially_converted_items': pr.partially_converted_item_count,
+                'remaining_value': float(pr.remaining_value),
+            }
+            for pr in page
+        ]
+    
+    return paginate_queryset_response(request, queryset, serialize)
 
 
 @api_view(['GET'])
@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from core.base.managers import BaseQuerySet
 
 # Create your models here.
 class UnitOfMeasure(models.Model):
@@ -46,6 +47,10 @@ class catalogItem(models.Model):
     description = models.TextField()
     code = models.CharField(max_length=50, unique=True)
 
+    search_index_fields = ('code', 'name', 'description')
+
+    objects = BaseQuerySet.as_manager()
+
     def __str__(self):
         return self.name
     
@@ -70,8 +75,8 @@ class catalogItem(models.Model):
     
     @classmethod
     def search_by_name(cls, search_term):
-        """Search catalog items by name (case-insensitive)"""
-        return cls.objects.filter(name__icontains=search_term)
+        """Search catalog items by name words / word prefixes (case-insensitive), best match first"""
+        return cls.objects.search(search_term, fields=['name'])
     
     class Meta:
         verbose_name = 'Catalog Item'
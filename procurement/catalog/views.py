@@ -160,8 +160,8 @@ def catalog_item_list(request):
     GET /catalog/items/
     - Returns list of all catalog items
     - Query params:
-        - search: Search by name or code
-        - name: Filter by name (case-insensitive partial match)
+        - search: Search by code, name or description (word prefixes, ranked)
+        - name: Filter by name (word prefixes)
         - code: Filter by code (exact match)
     
     POST /catalog/items/
@@ -169,24 +169,8 @@ def catalog_item_list(request):
     - Request body: CatalogItemSerializer fields
     """
     if request.method == 'GET':
-        items = catalogItem.objects.all()
-        
-        # Apply filters
-        search = request.query_params.get('search')
-        if search:
-            items = items.filter(
-                Q(code__icontains=search) |
-                Q(name__icontains=search) |
-                Q(description__icontains=search)
-            )
-        
-        name = request.query_params.get('name')
-        if name:
-            items = items.filter(name__icontains=name)
-        
-        code = request.query_params.get('code')
-        if code:
-            items = items.filter(code__iexact=code)
+        # Indexed search, best match first
+        items = catalogItem.objects.filter_by_search_params(request.query_params)
         
         serializer = CatalogItemListSerializer(items, many=True)
         return success_response(
@@ -303,7 +287,8 @@ def catalog_item_search(request):
     GET /catalog/items/search/
     - Query params:
         - q: Search term (required)
-    - Returns items with names matching the search term (case-insensitive)
+    - Returns items whose name words start with the search terms (case-insensitive),
+      best match first
     """
     search_term = request.query_params.get('q')
     
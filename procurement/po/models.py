@@ -1,4 +1,10 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import (
+    Count, Sum, Max, Q, F, Value, OuterRef, Subquery, Exists, Case, When, ExpressionWrapper
+)
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from decimal import Decimal
 from datetime import date
@@ -9,6 +15,186 @@ from Finance.core.models import Currency, TaxRate
 from Finance.BusinessPartner.models import BusinessPartner
 from procurement.PR.models import PR
 from core.approval.mixins import ApprovableMixin
+from core.base.functions import DecimalDivide
+
+QUANTITY_OUTPUT = models.DecimalField(max_digits=18, decimal_places=3)
+AMOUNT_OUTPUT = models.DecimalField(max_digits=18, decimal_places=2)
+PERCENTAGE_OUTPUT = models.DecimalField(max_digits=9, decimal_places=2)
+
+
+def max_receivable_quantity():
+    """SQL mirror of POLineItem.get_max_receivable_quantity()"""
+    return DecimalDivide(
+        F('quantity') * (Value(Decimal('100')) + F('tolerance_percentage')),
+        Value(Decimal('100')),
+        output_field=QUANTITY_OUTPUT
+    )
+
+
+def min_acceptable_quantity():
+    """SQL mirror of POLineItem.get_min_acceptable_quantity()"""
+    return DecimalDivide(
+        F('quantity') * (Value(Decimal('100')) - F('tolerance_percentage')),
+        Value(Decimal('100')),
+        output_field=QUANTITY_OUTPUT
+    )
+
+
+def receipt_percentage(received, ordered):
+    """
+    SQL mirror of POLineItem.get_receiving_percentage() for any pair of
+    received / ordered quantity expressions (0 when nothing was ordered).
+    """
+    return Case(
+        When(**{ordered: 0}, then=Value(Decimal('0'))),
+        default=DecimalDivide(F(received) * Value(Decimal('100')), F(ordered), output_field=PERCENTAGE_OUTPUT),
+        output_field=PERCENTAGE_OUTPUT
+    )
+
+
+def fully_received_line_q():
+    """
+    Q object matching PO lines received up to their minimum acceptable quantity.
+
+    SQL mirror of POLineItem.is_fully_received():
+        quantity_received >= quantity × (100 - tolerance) / 100
+    """
+    return Q(quantity_received__gte=min_acceptable_quantity())
+
+
+class POHeaderQuerySet(models.QuerySet):
+    """
+    QuerySet for POHeader with SQL-side line statistics.
+
+    Methods:
+        - with_line_stats(): Annotate line count, ordered/received totals and
+          the fully-received flag so list/detail serializers need no per-row queries.
+        - with_receiving_status(): with_line_stats() plus receipt percentage,
+          completion flags and goods receipt totals.
+    """
+
+    def with_line_stats(self):
+        """
+        Annotate each PO with line item statistics computed in the database.
+
+        Annotations:
+            - line_count: Number of line items
+            - total_ordered_qty: Sum of ordered quantities
+            - total_received_qty: Sum of received quantities
+            - fully_received_line_count: Lines received within tolerance
+            - is_fully_received_flag: True when every line is fully received
+
+        Each annotation is a correlated subquery, so the result stays correct
+        when combined with filters across multi-valued relations (e.g. source PRs).
+        """
+        lines = POLineItem.objects.filter(po_header=OuterRef('pk')).order_by().values('po_header')
+
+        return self.annotate(
+            line_count=Coalesce(
+                Subquery(lines.annotate(c=Count('id')).values('c')),
+                Value(0)
+            ),
+            total_ordered_qty=Coalesce(
+                Subquery(lines.annotate(s=Sum('quantity')).values('s'), output_field=QUANTITY_OUTPUT),
+                Value(Decimal('0.000')),
+                output_field=QUANTITY_OUTPUT
+            ),
+            total_received_qty=Coalesce(
+                Subquery(lines.annotate(s=Sum('quantity_received')).values('s'), output_field=QUANTITY_OUTPUT),
+                Value(Decimal('0.000')),
+                output_field=QUANTITY_OUTPUT
+            ),
+            fully_received_line_count=Coalesce(
+                Subquery(
+                    POLineItem.objects.filter(fully_received_line_q(), po_header=OuterRef('pk'))
+                    .order_by().values('po_header')
+                    .annotate(c=Count('id')).values('c')
+                ),
+                Value(0)
+            ),
+        ).annotate(
+            is_fully_received_flag=Case(
+                When(line_count__gt=0, fully_received_line_count=F('line_count'), then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField()
+            )
+        )
+
+    def with_receiving_status(self):
+        """
+        Annotate each PO with its receiving status, on top of with_line_stats().
+
+        Annotations:
+            - receipt_percentage: Received / ordered quantity × 100
+            - is_partially_received_flag: Something received, not every line fully
+            - grn_count: Number of goods receipts
+            - total_received_amount: Sum of goods receipt totals
+            - last_receipt_date: Date of the latest goods receipt
+        """
+        from procurement.receiving.models import GoodsReceipt
+
+        grns = GoodsReceipt.objects.filter(po_header=OuterRef('pk')).order_by().values('po_header')
+
+        return self.with_line_stats().annotate(
+            receipt_percentage=receipt_percentage('total_received_qty', 'total_ordered_qty'),
+            is_partially_received_flag=Case(
+                When(total_received_qty__gt=0, is_fully_received_flag=False, then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField()
+            ),
+            grn_count=Coalesce(
+                Subquery(grns.annotate(c=Count('id')).values('c')),
+                Value(0)
+            ),
+            total_received_amount=Coalesce(
+                Subquery(grns.annotate(s=Sum('total_amount')).values('s'), output_field=AMOUNT_OUTPUT),
+                Value(Decimal('0.00')),
+                output_field=AMOUNT_OUTPUT
+            ),
+            last_receipt_date=Subquery(grns.annotate(d=Max('receipt_date')).values('d')),
+        )
+
+
+class POHeaderManager(models.Manager.from_queryset(POHeaderQuerySet)):
+    """
+    Manager for POHeader.
+
+    Usage:
+        POHeader.objects.with_line_stats().filter(status='CONFIRMED')
+    """
+
+    def refresh_receiving_status(self, po_ids):
+        """
+        Set the receiving status of many POs from their lines (one UPDATE).
+
+        Set-based version of the status update in POHeader.save():
+        RECEIVED when every line is fully received, PARTIALLY_RECEIVED when
+        anything is received, and back to CONFIRMED when receipts were reversed
+        to nothing. Draft, submitted and cancelled POs are left alone.
+
+        Args:
+            po_ids: Iterable of POHeader ids
+
+        Returns:
+            int: Number of POs whose status changed
+        """
+        lines = POLineItem.objects.filter(po_header=OuterRef('pk'))
+        new_status = Case(
+            When(
+                Exists(lines) & ~Exists(lines.exclude(fully_received_line_q())),
+                then=Value('RECEIVED')
+            ),
+            When(Exists(lines.filter(quantity_received__gt=0)), then=Value('PARTIALLY_RECEIVED')),
+            When(status__in=['RECEIVED', 'PARTIALLY_RECEIVED'], then=Value('CONFIRMED')),
+            default=F('status'),
+            output_field=models.CharField()
+        )
+        return self.filter(pk__in=po_ids).exclude(
+            status__in=['DRAFT', 'SUBMITTED', 'CANCELLED']
+        ).alias(new_status=new_status).exclude(status=F('new_status')).update(
+            status=new_status, updated_at=timezone.now()
+        )
+
 
 """Purchase Order Header Model."""
 class POHeader(ApprovableMixin, models.Model):    
@@ -113,8 +299,8 @@ class POHeader(ApprovableMixin, models.Model):
         help_text="Tracks if source PR commitment was released during PO approval"
     )
     
-    # Manager - Standard manager (child classes will use ChildModelManagerMixin)
-    objects = models.Manager()
+    # Manager - adds with_line_stats() for SQL-side receiving figures
+    objects = POHeaderManager()
     
     class Meta:
         db_table = 'po_header'
@@ -154,10 +340,9 @@ class POHeader(ApprovableMixin, models.Model):
         Returns:
             dict: Dictionary containing calculated values
         """
-        line_items = self.line_items.all()
-        
-        # Calculate subtotal from line items
-        self.subtotal = sum(item.line_total for item in line_items)
+        # Calculate subtotal from line items (one aggregate query)
+        subtotal = self.line_items.aggregate(total=Sum('line_total'))['total']
+        self.subtotal = Decimal(subtotal or 0).quantize(Decimal('0.01'))
         
         # Calculate tax amount based on tax_rate percentage
         if self.tax_rate:
@@ -191,12 +376,41 @@ class POHeader(ApprovableMixin, models.Model):
     
     # ==================== RECEIVING/STATUS FUNCTIONS ====================
     
+    def get_line_stats(self, use_annotations=True):
+        """
+        Get line count and ordered/received totals.
+
+        Uses with_line_stats() annotations when the instance was loaded through
+        them, otherwise runs a single aggregate query over the line items.
+        
+        Args:
+            use_annotations: Pass False to ignore (possibly stale) annotations
+
+        Returns:
+            dict: line_count, total_ordered, total_received, fully_received_lines
+        """
+        if use_annotations and hasattr(self, 'fully_received_line_count'):
+            return {
+                'line_count': self.line_count,
+                'total_ordered': self.total_ordered_qty,
+                'total_received': self.total_received_qty,
+                'fully_received_lines': self.fully_received_line_count,
+            }
+        
+        stats = POLineItem.objects.filter(po_header=self).aggregate(
+            line_count=Count('id'),
+            total_ordered=Sum('quantity'),
+            total_received=Sum('quantity_received'),
+            fully_received_lines=Count('id', filter=fully_received_line_q()),
+        )
+        stats['total_ordered'] = stats['total_ordered'] or Decimal('0.000')
+        stats['total_received'] = stats['total_received'] or Decimal('0.000')
+        return stats
+    
     def is_fully_received(self):
         """Check if all line items are fully received."""
-        line_items = self.line_items.all()
-        if not line_items.exists():
-            return False
-        return all(item.is_fully_received() for item in line_items)
+        stats = self.get_line_stats()
+        return stats['line_count'] > 0 and stats['fully_received_lines'] == stats['line_count']
     
     def is_partially_received(self):
         """Check if any line items have been received."""
@@ -204,9 +418,9 @@ class POHeader(ApprovableMixin, models.Model):
     
     def get_receiving_summary(self):
         """Get summary of received vs ordered quantities."""
-        line_items = self.line_items.all()
-        total_ordered = sum(item.quantity for item in line_items)
-        total_received = sum(item.quantity_received for item in line_items)
+        stats = self.get_line_stats()
+        total_ordered = stats['total_ordered']
+        total_received = stats['total_received']
         
         return {
             'total_ordered': total_ordered,
@@ -422,11 +636,13 @@ class POHeader(ApprovableMixin, models.Model):
             next_number = 1 if not last_po else last_po.id + 1
             self.po_number = f"PO-{self.po_date.year}-{next_number:05d}"
         
-        # Update receiving status based on line items (only for existing POs)
+        # Update receiving status based on line items (only for existing POs).
+        # One aggregate query instead of iterating every line.
         if self.pk and self.status not in ['DRAFT', 'SUBMITTED', 'CANCELLED']:
-            if self.is_fully_received():
+            stats = self.get_line_stats(use_annotations=False)
+            if stats['line_count'] > 0 and stats['fully_received_lines'] == stats['line_count']:
                 self.status = 'RECEIVED'
-            elif self.is_partially_received():
+            elif stats['total_received'] > 0:
                 self.status = 'PARTIALLY_RECEIVED'
         
         super().save(*args, **kwargs)
@@ -518,6 +734,231 @@ class POHeader(ApprovableMixin, models.Model):
             self.cancel_po(reason=reason, cancelled_by=None)
 
 
+class POLineItemQuerySet(models.QuerySet):
+    """
+    QuerySet for POLineItem with SQL-side receiving flags.
+
+    Methods:
+        - with_received_flags(): Annotate is_fully_received_flag
+        - with_receiving_progress(): Also annotate remaining quantity and receipt percentage
+    """
+
+    def with_received_flags(self):
+        """Annotate is_fully_received_flag, mirroring POLineItem.is_fully_received()."""
+        return self.annotate(
+            is_fully_received_flag=Case(
+                When(fully_received_line_q(), then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField()
+            )
+        )
+
+    def with_receiving_progress(self):
+        """
+        Annotate the receiving progress of each line, mirroring
+        get_remaining_quantity(), get_receiving_percentage() and is_fully_received().
+
+        Annotations:
+            - remaining_quantity: Maximum receivable (with tolerance) minus received
+            - receipt_percentage: Received / ordered quantity × 100
+            - is_fully_received_flag: see with_received_flags()
+        """
+        return self.with_received_flags().annotate(
+            remaining_quantity=ExpressionWrapper(
+                max_receivable_quantity() - F('quantity_received'),
+                output_field=QUANTITY_OUTPUT
+            ),
+            receipt_percentage=receipt_percentage('quantity_received', 'quantity'),
+        )
+
+
+class POLineItemManager(models.Manager.from_queryset(POLineItemQuerySet)):
+    """
+    Manager for POLineItem.
+
+    Methods:
+        - with_received_flags() / with_receiving_progress(): see POLineItemQuerySet
+        - save_lines(): batch save of many lines of one PO
+        - validate_pr_quantities(): PR quantity check of many lines in one query
+        - receive_quantities() / reverse_quantities(): atomic receipt updates
+    """
+
+    BATCH_SIZE = 500
+
+    # Maintained by receiving with in-SQL increments (receive_quantities(),
+    # reverse_quantities(), POLineItem.record_receipt()); never written back
+    # from line instances, which may be stale
+    RECEIVING_FIELDS = ('quantity_received',)
+
+    def save_lines(self, po_header, lines):
+        """
+        Save many lines of one PO in batch mode.
+
+        POLineItem.save() validates its PR item and recalculates the PO header
+        for every line. Here every line is validated up front (PR quantities in
+        one query), new lines are written with one bulk insert, existing lines
+        with one bulk update, and the header is recalculated once, so the query
+        count does not grow with the number of lines. The bulk update leaves
+        the receiving fields (RECEIVING_FIELDS) alone.
+
+        Args:
+            po_header: POHeader the lines belong to
+            lines: POLineItem instances, new (no pk) or existing
+
+        Returns:
+            list: The saved lines
+
+        Raises:
+            ValidationError: If a line type or PR quantity is invalid (nothing is saved)
+        """
+        lines = list(lines)
+        for line in lines:
+            line.po_header = po_header
+            line.validate_line_type()
+            line.calculate_line_total()
+        self.validate_pr_quantities(lines)
+
+        new_lines = [line for line in lines if line.pk is None]
+        existing_lines = [line for line in lines if line.pk is not None]
+
+        with transaction.atomic():
+            if new_lines:
+                self.bulk_create(new_lines, batch_size=self.BATCH_SIZE)
+            if existing_lines:
+                now = timezone.now()
+                for line in existing_lines:
+                    line.updated_at = now
+                update_fields = [
+                    field.name for field in self.model._meta.concrete_fields
+                    if not field.primary_key and field.name != 'created_at'
+                    and field.name not in self.RECEIVING_FIELDS
+                ]
+                self.bulk_update(existing_lines, update_fields, batch_size=self.BATCH_SIZE)
+
+            po_header.calculate_totals()
+            po_header.save()
+
+        return lines
+
+    def validate_pr_quantities(self, lines):
+        """
+        Ensure no PR item is ordered beyond its quantity (one query).
+
+        Batch version of POLineItem.validate_quantity_from_pr(): the lines
+        converting the same PR item are added up and checked against the PR
+        item quantity less the quantity already on other PO lines.
+
+        Raises:
+            ValidationError: One message per over-ordered PR item
+        """
+        from procurement.PR.models import PRItem
+
+        requested = defaultdict(Decimal)
+        for line in lines:
+            if line.source_pr_item_id:
+                requested[line.source_pr_item_id] += line.quantity
+        if not requested:
+            return
+
+        saved_pks = [line.pk for line in lines if line.pk is not None]
+        other_lines = ~Q(converted_po_lines__pk__in=saved_pks) if saved_pks else None
+        pr_items = PRItem.objects.filter(pk__in=requested).annotate(
+            other_po_qty=Coalesce(
+                Sum('converted_po_lines__quantity', filter=other_lines),
+                Value(Decimal('0.000')),
+                output_field=QUANTITY_OUTPUT
+            )
+        ).values_list('pk', 'quantity', 'other_po_qty')
+
+        errors = []
+        found = set()
+        for pr_item_id, pr_quantity, other_po_qty in pr_items:
+            found.add(pr_item_id)
+            available_qty = pr_quantity - other_po_qty
+            if requested[pr_item_id] > available_qty:
+                errors.append(
+                    f"Quantity {requested[pr_item_id]} exceeds available quantity {available_qty} "
+                    f"from PR item {pr_item_id} (Total: {pr_quantity}, Already converted: {other_po_qty})"
+                )
+        errors.extend(f"PR item {pr_item_id} not found" for pr_item_id in requested if pr_item_id not in found)
+        if errors:
+            raise ValidationError(errors)
+
+    def receive_quantities(self, receipts):
+        """
+        Add received quantities to many PO lines with one UPDATE.
+
+        The increment happens in SQL (quantity_received = quantity_received + n)
+        so concurrent receipts cannot overwrite each other, and the tolerance
+        checks are part of the UPDATE's WHERE clause:
+            - every line: received <= quantity × (100 + tolerance) / 100
+            - 'PARTIAL' lines: received <= quantity
+            - 'FULLY' lines: received >= quantity × (100 - tolerance) / 100
+        If any line fails its check, nothing is updated. The PO header status
+        is not touched (see POHeader.objects.refresh_receiving_status()).
+
+        Args:
+            receipts: {line_id: (quantity, receiving_type or None)}
+
+        Raises:
+            ValidationError: One message per line that failed its check
+        """
+        condition = Q(new_received__lte=max_receivable_quantity())
+        partial_ids = [pk for pk, (_, receiving_type) in receipts.items() if receiving_type == 'PARTIAL']
+        fully_ids = [pk for pk, (_, receiving_type) in receipts.items() if receiving_type == 'FULLY']
+        if partial_ids:
+            condition &= ~Q(pk__in=partial_ids) | Q(new_received__lte=F('quantity'))
+        if fully_ids:
+            condition &= ~Q(pk__in=fully_ids) | Q(new_received__gte=min_acceptable_quantity())
+        self._apply_received_deltas(
+            {pk: quantity for pk, (quantity, _) in receipts.items()}, condition, 'receive'
+        )
+
+    def reverse_quantities(self, quantities):
+        """
+        Subtract received quantities from many PO lines with one UPDATE.
+
+        Args:
+            quantities: {line_id: quantity to take back}
+
+        Raises:
+            ValidationError: If a line would drop below zero received (nothing is updated)
+        """
+        self._apply_received_deltas(
+            {pk: -quantity for pk, quantity in quantities.items()}, Q(new_received__gte=0), 'reverse'
+        )
+
+    def _apply_received_deltas(self, deltas, condition, action):
+        if not deltas:
+            return
+        delta = Case(
+            *[When(pk=pk, then=Value(quantity)) for pk, quantity in deltas.items()],
+            default=Value(Decimal('0.000')),
+            output_field=QUANTITY_OUTPUT
+        )
+        lines = self.filter(pk__in=deltas).alias(new_received=F('quantity_received') + delta)
+
+        with transaction.atomic():
+            updated = lines.filter(condition).update(
+                quantity_received=F('quantity_received') + delta,
+                updated_at=timezone.now()
+            )
+            if updated == len(deltas):
+                return
+            # Raising inside the atomic block rolls the partial update back
+            failed = lines.exclude(condition).values_list(
+                'pk', 'quantity', 'quantity_received', 'tolerance_percentage'
+            )
+            errors = [
+                f"PO line {pk}: cannot {action} {abs(deltas[pk])} "
+                f"(Ordered: {quantity}, Received: {received}, Tolerance: {tolerance}%)"
+                for pk, quantity, received, tolerance in failed
+            ]
+            found = set(lines.values_list('pk', flat=True))
+            errors.extend(f"PO line {pk} not found" for pk in deltas if pk not in found)
+            raise ValidationError(errors)
+
+
 """PO Line Item - Unified model for all PO types."""
 class POLineItem(models.Model):
     po_header = models.ForeignKey(
@@ -611,6 +1052,8 @@ class POLineItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = POLineItemManager()
+    
     class Meta:
         db_table = 'po_line_item'
         ordering = ['po_header', 'line_number']
@@ -708,16 +1151,20 @@ class POLineItem(models.Model):
         if quantity_received_now <= 0:
             raise ValidationError("Receipt quantity must be positive.")
         
-        remaining = self.get_remaining_quantity()
-        if quantity_received_now > remaining:
+        # Atomic increment with the tolerance check in SQL (no lost updates)
+        try:
+            POLineItem.objects.receive_quantities({self.pk: (quantity_received_now, None)})
+        except ValidationError:
+            self.refresh_from_db(fields=['quantity_received'])
+            remaining = self.get_remaining_quantity()
             max_receivable = self.get_max_receivable_quantity()
             raise ValidationError(
                 f"Cannot receive {quantity_received_now}. Only {remaining} remaining. "
                 f"(Ordered: {self.quantity}, Max allowed with tolerance: {max_receivable})"
             )
         
-        self.quantity_received += quantity_received_now
-        self.save()
+        self.refresh_from_db(fields=['quantity_received', 'updated_at'])
+        POHeader.objects.refresh_receiving_status([self.po_header_id])
     
     # ==================== PR-TO-PO CONVERSION FUNCTIONS ====================
     
@@ -750,8 +1197,14 @@ class POLineItem(models.Model):
     
     # ==================== SAVE OVERRIDE ====================
     
-    def save(self, *args, **kwargs):
-        """Override save to auto-calculate line_total and validate."""
+    def save(self, *args, recalculate_header=True, **kwargs):
+        """
+        Override save to auto-calculate line_total and validate.
+
+        Pass recalculate_header=False when saving several lines in a row and
+        recalculate the header once afterwards (or use
+        POLineItem.objects.save_lines()).
+        """
         # Validate line type matches PO type
         self.validate_line_type()
         
@@ -765,8 +1218,9 @@ class POLineItem(models.Model):
         super().save(*args, **kwargs)
         
         # After saving, recalculate PO header totals
-        self.po_header.calculate_totals()
-        self.po_header.save()
+        if recalculate_header:
+            self.po_header.calculate_totals()
+            self.po_header.save()
 
 
 """PO Attachment Model - Store file attachments as BLOBs for Purchase Orders."""
@@ -241,9 +241,13 @@ class POLineItemFromPRSerializer(serializers.Serializer):
         """Validate PR item exists and has remaining quantity"""
         pr_item_id = attrs['pr_item_id']
         
-        try:
-            pr_item = PRItem.objects.get(id=pr_item_id)
-        except PRItem.DoesNotExist:
+        # PR items prefetched by POHeaderCreateSerializer (one query for all lines)
+        prefetched = getattr(self.root, '_pr_items', None)
+        if prefetched is not None:
+            pr_item = prefetched.get(pr_item_id)
+        else:
+            pr_item = PRItem.objects.select_related('pr').filter(id=pr_item_id).first()
+        if pr_item is None:
             raise serializers.ValidationError({"pr_item_id": f"PR item with ID {pr_item_id} not found"})
         
         # Check if PR is approved
@@ -375,6 +379,19 @@ class POHeaderCreateSerializer(serializers.Serializer):
     items = POLineItemCreateSerializer(many=True, required=False)
     items_from_pr = POLineItemFromPRSerializer(many=True, required=False)
     
+    def to_internal_value(self, data):
+        """Fetch every PR item referenced by items_from_pr in one query"""
+        pr_item_ids = set()
+        items_from_pr = data.get('items_from_pr') if hasattr(data, 'get') else None
+        if isinstance(items_from_pr, list):
+            for item in items_from_pr:
+                try:
+                    pr_item_ids.add(int(item['pr_item_id']))
+                except (KeyError, TypeError, ValueError):
+                    continue
+        self._pr_items = PRItem.objects.select_related('pr').in_bulk(pr_item_ids) if pr_item_ids else {}
+        return super().to_internal_value(data)
+    
     def validate(self, attrs):
         """Validate that either items or items_from_pr is provided, not both"""
         has_items = bool(attrs.get('items'))
@@ -482,11 +499,10 @@ class POHeaderCreateSerializer(serializers.Serializer):
             segment_combination=segment_combination
         )
         
-        # Create items from manual input
+        # Create items from manual input (batch save: one insert, one header recalculation)
         if items_data:
-            for item_data in items_data:
-                POLineItem.objects.create(
-                    po_header=po_header,
+            POLineItem.objects.save_lines(po_header, [
+                POLineItem(
                     line_number=item_data['line_number'],
                     line_type=item_data['line_type'],
                     item_name=item_data['item_name'],
@@ -498,10 +514,15 @@ class POHeaderCreateSerializer(serializers.Serializer):
                     line_notes=item_data.get('line_notes', ''),
                     source_pr_item_id=item_data.get('source_pr_item_id')
                 )
+                for item_data in items_data
+            ])
         
         # Create items from PR
         if items_from_pr_data:
             pr_headers = set()
+            po_lines = []
+            pr_items = {}
+            now = timezone.now()
             
             for idx, item_data in enumerate(items_from_pr_data, start=1):
                 pr_item = item_data['_pr_item']
@@ -518,23 +539,26 @@ class POHeaderCreateSerializer(serializers.Serializer):
                 po_line.unit_price = item_data['unit_price']
                 po_line.tolerance_percentage = item_data.get('tolerance_percentage', Decimal('0.00'))
                 po_line.line_notes = item_data.get('line_notes', '')
-                po_line.calculate_line_total()
-                po_line.save()
+                po_lines.append(po_line)
                 
                 # Update PR item conversion tracking
                 pr_item.quantity_converted += item_data['quantity_to_convert']
                 if pr_item.quantity_converted >= pr_item.quantity:
                     pr_item.converted_to_po = True
-                    pr_item.conversion_date = timezone.now()
-                pr_item.save()
+                    pr_item.conversion_date = now
+                pr_item.updated_at = now
+                pr_items[pr_item.pk] = pr_item
+            
+            POLineItem.objects.save_lines(po_header, po_lines)
+            PRItem.objects.bulk_update(
+                pr_items.values(),
+                ['quantity_converted', 'converted_to_po', 'conversion_date', 'updated_at'],
+                batch_size=POLineItem.objects.BATCH_SIZE
+            )
             
             # Link all source PR headers to PO
             po_header.source_pr_headers.set(pr_headers)
         
-        # Recalculate totals
-        po_header.calculate_totals()
-        po_header.save()
-        
         return po_header
 
 
@@ -557,8 +581,8 @@ class POHeaderListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
     
     def get_item_count(self, obj):
-        """Get number of line items"""
-        return obj.line_items.count()
+        """Get number of line items (annotated by with_line_stats() when available)"""
+        return obj.get_line_stats()['line_count']
     
     def get_receiving_summary(self, obj):
         """Get receiving status summary"""
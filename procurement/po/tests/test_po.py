@@ -26,7 +26,10 @@ Covers scenarios:
 - PR-to-PO conversion
 """
 
+from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -538,6 +541,117 @@ class POCreateFromPRTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+class POLineBatchSaveTests(TestCase):
+    """Test batch saving of PO lines (POLineItem.objects.save_lines)"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = get_or_create_test_user()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('po:po-list')
+        
+        self.uom = create_unit_of_measure()
+        self.supplier = create_supplier()
+        self.currency = create_currency()
+        self.tax_rate = create_tax_rate()  # 5% tax rate
+    
+    def po_data(self, line_count):
+        data = create_valid_po_data(self.supplier, self.currency, self.uom, self.tax_rate)
+        line = data['items'][0]
+        data['items'] = [
+            {**line, 'line_number': number, 'quantity': '2', 'unit_price': '10.00'}
+            for number in range(1, line_count + 1)
+        ]
+        return data
+    
+    def count_create_queries(self, line_count):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, self.po_data(line_count), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return len(ctx.captured_queries), POHeader.objects.get(id=response.data['data']['id'])
+    
+    def test_create_query_count_is_constant(self):
+        """Creating a PO costs the same number of queries for 2 or 50 lines"""
+        small_count, _ = self.count_create_queries(2)
+        large_count, po = self.count_create_queries(50)
+        
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(po.line_items.count(), 50)
+        # 50 × 2 × 10.00 = 1,000.00, tax 5% = 50.00, delivery 50.00
+        self.assertEqual(po.subtotal, Decimal('1000.00'))
+        self.assertEqual(po.tax_amount, Decimal('50.00'))
+        self.assertEqual(po.total_amount, Decimal('1100.00'))
+    
+    def test_save_lines_updates_existing_lines(self):
+        """Editing lines in batch recalculates line and header totals once"""
+        _, po = self.count_create_queries(5)
+        lines = list(po.line_items.all())
+        for line in lines:
+            line.quantity = Decimal('4.000')
+        
+        # Savepoint, bulk update, header totals aggregate, tax rate, header update, release
+        with self.assertNumQueries(6):
+            POLineItem.objects.save_lines(po, lines)
+        
+        po.refresh_from_db()
+        self.assertEqual(po.subtotal, Decimal('200.00'))
+        self.assertEqual(po.total_amount, Decimal('260.00'))
+        self.assertEqual(
+            set(po.line_items.values_list('line_total', flat=True)), {Decimal('40.00')}
+        )
+    
+    def test_save_lines_keeps_received_quantities(self):
+        """Saving stale line instances does not undo receipts recorded meanwhile"""
+        _, po = self.count_create_queries(2)
+        lines = list(po.line_items.order_by('line_number'))
+        POLineItem.objects.receive_quantities({lines[0].id: (Decimal('1.500'), None)})
+        for line in lines:
+            line.unit_price = Decimal('12.00')
+        
+        POLineItem.objects.save_lines(po, lines)
+        
+        self.assertEqual(
+            list(po.line_items.order_by('line_number').values_list('quantity_received', 'line_total')),
+            [(Decimal('1.500'), Decimal('24.00')), (Decimal('0.000'), Decimal('24.00'))]
+        )
+    
+    def test_save_lines_validates_pr_quantities_together(self):
+        """Lines converting the same PR item may not exceed its quantity together"""
+        _, pr_items = create_approved_pr_with_items()
+        _, po = self.count_create_queries(1)
+        lines = [
+            POLineItem(line_number=number, line_type='Catalog', item_name='Laptop', item_description='',
+                       quantity=Decimal('6.000'), unit_of_measure=self.uom, unit_price=Decimal('10.00'),
+                       source_pr_item=pr_items[0])
+            for number in (2, 3)
+        ]
+        
+        with self.assertNumQueries(1):
+            with self.assertRaises(ValidationError) as ctx:
+                POLineItem.objects.save_lines(po, lines)
+        
+        self.assertIn('exceeds available quantity 10.00 ', str(ctx.exception))
+        self.assertEqual(po.line_items.count(), 1)
+        
+        lines[1].quantity = Decimal('4.000')
+        POLineItem.objects.save_lines(po, lines)
+        self.assertEqual(po.line_items.filter(source_pr_item=pr_items[0]).count(), 2)
+    
+    def test_save_without_header_recalculation(self):
+        """POLineItem.save(recalculate_header=False) leaves the header untouched"""
+        _, po = self.count_create_queries(1)
+        line = po.line_items.get()
+        line.quantity = Decimal('5.000')
+        line.save(recalculate_header=False)
+        
+        po.refresh_from_db()
+        self.assertEqual(po.subtotal, Decimal('20.00'))
+        
+        po.calculate_totals()
+        self.assertEqual(po.subtotal, Decimal('50.00'))
+
+
 # ============================================================================
 # PO LIST AND DETAIL TESTS
 # ============================================================================
@@ -645,6 +759,65 @@ class POListTests(TestCase):
         self.assertGreater(response.data['data']['count'], 0)
 
 
+    def test_list_pos_query_count_is_constant(self):
+        """Test PO list runs a fixed number of queries regardless of PO/line count"""
+        supplier = create_supplier(name='Volume Supplier')
+        currency = create_currency()
+        uom = create_unit_of_measure()
+        
+        for i in range(10):
+            po = POHeader.objects.create(
+                po_date=date.today(),
+                po_type='Catalog',
+                supplier_name_id=supplier.business_partner_id,
+                currency=currency,
+                status='CONFIRMED',
+                created_by=self.user
+            )
+            for line_number in range(1, 4):
+                POLineItem.objects.create(
+                    po_header=po,
+                    line_number=line_number,
+                    line_type='Catalog',
+                    item_name=f'Item {i}-{line_number}',
+                    item_description='Volume item',
+                    quantity=Decimal('10.000'),
+                    unit_of_measure=uom,
+                    unit_price=Decimal('5.00'),
+                    quantity_received=Decimal('10.000') if line_number == 1 else Decimal('0.000')
+                )
+        
+        # Warm the data security policy cache
+        self.client.get(self.url, {'page_size': 100})
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'page_size': 100})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['count'], 13)
+        # First line received on save -> header moved to PARTIALLY_RECEIVED
+        receiving = [po for po in response.data['data']['results'] if po['status'] == 'PARTIALLY_RECEIVED']
+        self.assertEqual(len(receiving), 10)
+        self.assertEqual(receiving[0]['item_count'], 3)
+        self.assertEqual(receiving[0]['receiving_summary']['total_ordered'], Decimal('30.000'))
+        self.assertEqual(receiving[0]['receiving_summary']['total_received'], Decimal('10.000'))
+    
+    def test_with_line_stats_matches_python_receiving_checks(self):
+        """Test annotated receiving figures agree with the per-line Python methods"""
+        po = POHeader.objects.filter(status='APPROVED').first()
+        line = po.line_items.first()
+        line.tolerance_percentage = Decimal('10.00')
+        line.quantity = Decimal('10.000')
+        line.quantity_received = Decimal('9.000')
+        line.save()
+        
+        annotated = POHeader.objects.with_line_stats().get(pk=po.pk)
+        self.assertEqual(annotated.line_count, 1)
+        self.assertEqual(annotated.total_received_qty, Decimal('9.000'))
+        self.assertTrue(line.is_fully_received())
+        self.assertTrue(annotated.is_fully_received_flag)
+        self.assertEqual(annotated.is_fully_received(), po.is_fully_received())
+
+
 class PODetailTests(TestCase):
     """Test PO detail endpoint"""
     
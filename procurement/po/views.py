@@ -21,6 +21,7 @@ from django.core.exceptions import ValidationError
 from erp_project.response_formatter import success_response, error_response
 from erp_project.pagination import auto_paginate
 from core.approval.managers import ApprovalManager
+from core.security import get_scoped_queryset, apply_field_security
 
 from procurement.po.models import POHeader, POLineItem, POAttachment
 from procurement.po.serializers import (
@@ -40,6 +41,15 @@ from procurement.po.serializers import (
 # PO HEADER VIEWS
 # ============================================================================
 
+def po_detail_queryset():
+    """POs loaded with everything POHeaderDetailSerializer reads (fixed query count)"""
+    return (
+        POHeader.objects.with_line_stats()
+        .select_related('supplier_name', 'currency', 'created_by')
+        .prefetch_related('line_items__unit_of_measure', 'source_pr_headers')
+    )
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 @auto_paginate
@@ -58,9 +68,10 @@ def po_list(request):
     """
     if request.method == 'GET':
         # Get queryset
-        queryset = POHeader.objects.all().select_related(
+        queryset = POHeader.objects.with_line_stats().select_related(
             'supplier_name', 'currency', 'created_by'
         ).order_by('-po_date', '-created_at')
+        queryset = get_scoped_queryset(request.user, POHeader, queryset=queryset)
         
         # Apply filters
         status_filter = request.query_params.get('status')
@@ -95,7 +106,8 @@ def po_list(request):
             )
         
         # Serialize
-        serializer = POHeaderListSerializer(queryset, many=True)
+        serializer_class = apply_field_security(request.user, POHeaderListSerializer)
+        serializer = serializer_class(queryset, many=True)
         return Response(serializer.data)
     
     elif request.method == 'POST':
@@ -103,7 +115,7 @@ def po_list(request):
         if serializer.is_valid():
             try:
                 po_header = serializer.save()
-                response_serializer = POHeaderDetailSerializer(po_header)
+                response_serializer = POHeaderDetailSerializer(po_detail_queryset().get(pk=po_header.pk))
                 return success_response(
                     data=response_serializer.data,
                     message="PO created successfully",
@@ -135,11 +147,7 @@ def po_detail(request, pk):
     GET: Retrieve a specific PO by ID
     DELETE: Delete a PO (only if in DRAFT status)
     """
-    po_header = get_object_or_404(
-        POHeader.objects.select_related('supplier_name', 'currency', 'created_by')
-        .prefetch_related('line_items__unit_of_measure', 'source_pr_headers'),
-        pk=pk
-    )
+    po_header = get_object_or_404(po_detail_queryset(), pk=pk)
     
     if request.method == 'GET':
         serializer = POHeaderDetailSerializer(po_header)
@@ -546,7 +554,7 @@ def po_from_pr(request):
     Query Parameters:
     - pr_number: Filter by source PR number
     """
-    queryset = POHeader.objects.filter(
+    queryset = POHeader.objects.with_line_stats().filter(
         source_pr_headers__isnull=False
     ).distinct().select_related(
         'supplier_name', 'currency'
@@ -1,4 +1,7 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models import Sum, Count, Exists, OuterRef, Q
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from decimal import Decimal
@@ -9,6 +12,253 @@ from procurement.po.models import POHeader, POLineItem
 from procurement.catalog.models import UnitOfMeasure
 
 
+class GoodsReceiptQuerySet(models.QuerySet):
+    """
+    QuerySet for GoodsReceipt.
+
+    Methods:
+        - with_list_stats(): Annotate what GoodsReceiptListSerializer shows per GRN
+    """
+
+    def with_list_stats(self):
+        """
+        Annotate line counts and the invoiced flag so listing GRNs needs no
+        per-row queries.
+
+        Annotations:
+            - total_line_count: Number of lines
+            - gift_line_count: Number of gift lines
+            - has_invoice_flag: True when an AP invoice references the GRN
+        """
+        from Finance.Invoice.models import AP_Invoice
+
+        return self.annotate(
+            total_line_count=Count('lines'),
+            gift_line_count=Count('lines', filter=Q(lines__is_gift=True)),
+            has_invoice_flag=Exists(AP_Invoice.objects.filter(goods_receipt=OuterRef('pk'))),
+        )
+
+
+class GoodsReceiptManager(models.Manager.from_queryset(GoodsReceiptQuerySet)):
+    """
+    Manager for GoodsReceipt.
+
+    Methods:
+        - with_list_stats(): see GoodsReceiptQuerySet
+        - receive_bulk(): Receive many PO lines across many POs in one transaction
+        - reverse_bulk(): Delete many GRNs and reverse their received quantities
+    """
+
+    RECEIVABLE_PO_STATUSES = ['CONFIRMED', 'PARTIALLY_RECEIVED']
+
+    def receive_bulk(self, lines, received_by, receipt_date=None, notes='', created_by=None):
+        """
+        Receive many PO lines, across many POs, in one transaction.
+
+        One GRN is created per PO. Received quantities are added to the PO
+        lines with one atomic UPDATE (tolerance checks in SQL, see
+        POLineItem.objects.receive_quantities()), PO statuses are refreshed
+        with one UPDATE and the budget actual is updated once per PO, so the
+        query count grows with the number of POs, not lines.
+
+        Args:
+            lines: list of dicts with po_line_item_id, quantity and optional
+                receiving_type ('PARTIAL' by default, or 'FULLY') and line_notes
+            received_by: User who received the goods
+            receipt_date (date): Receipt date (default: today)
+            notes: GRN notes
+            created_by: User creating the GRNs
+
+        Returns:
+            list: Created GoodsReceipt instances, in order of first appearance of their PO
+
+        Raises:
+            ValidationError: One message per invalid line (nothing is saved)
+        """
+        receipt_date = receipt_date or timezone.now().date()
+        errors = []
+
+        id_counts = Counter(line['po_line_item_id'] for line in lines)
+        errors.extend(
+            f"PO line {pk} appears more than once" for pk, count in id_counts.items() if count > 1
+        )
+        po_lines = POLineItem.objects.select_related(
+            'po_header__segment_combination', 'unit_of_measure'
+        ).in_bulk(list(id_counts))
+
+        receipts = {}
+        for line in lines:
+            pk = line['po_line_item_id']
+            po_line = po_lines.get(pk)
+            receiving_type = line.get('receiving_type') or 'PARTIAL'
+            if po_line is None:
+                errors.append(f"PO line {pk} not found")
+            elif po_line.po_header.status not in self.RECEIVABLE_PO_STATUSES:
+                errors.append(
+                    f"PO {po_line.po_header.po_number} must be CONFIRMED to receive goods. "
+                    f"Current status: {po_line.po_header.status}"
+                )
+            elif line['quantity'] <= 0:
+                errors.append(f"PO line {pk}: quantity must be greater than 0")
+            elif receiving_type not in dict(GoodsReceiptLine.RECEIVING_TYPE_CHOICES):
+                errors.append(f"PO line {pk}: invalid receiving type '{receiving_type}'")
+            else:
+                receipts[pk] = (line['quantity'], receiving_type)
+
+        po_headers = {po_line.po_header_id: po_line.po_header for po_line in po_lines.values()}
+        suppliers = {
+            supplier.business_partner_id: supplier
+            for supplier in Supplier.objects.filter(
+                business_partner_id__in={po.supplier_name_id for po in po_headers.values()}
+            )
+        }
+        errors.extend(
+            f"PO {po.po_number} supplier has no supplier record"
+            for po in po_headers.values() if po.supplier_name_id not in suppliers
+        )
+        if errors:
+            raise ValidationError(errors)
+
+        lines_by_po = defaultdict(list)
+        for line in lines:
+            lines_by_po[po_lines[line['po_line_item_id']].po_header_id].append(line)
+
+        with transaction.atomic():
+            POLineItem.objects.receive_quantities(receipts)
+
+            last_id = self.order_by('-id').values_list('id', flat=True).first() or 0
+            grns = []
+            grn_lines = []
+            for offset, (po_id, po_receipts) in enumerate(lines_by_po.items(), start=1):
+                po = po_headers[po_id]
+                grn = self.model(
+                    grn_number=f"GRN-{receipt_date.year}-{last_id + offset:05d}",
+                    po_header=po,
+                    receipt_date=receipt_date,
+                    supplier=suppliers[po.supplier_name_id],
+                    grn_type=po.po_type,
+                    received_by=received_by,
+                    notes=notes,
+                    created_by=created_by,
+                )
+                po_grn_lines = []
+                for line_number, line in enumerate(po_receipts, start=1):
+                    po_line = po_lines[line['po_line_item_id']]
+                    grn_line = GoodsReceiptLine(
+                        goods_receipt=grn,
+                        line_number=line_number,
+                        receiving_type=receipts[po_line.pk][1],
+                        line_notes=line.get('line_notes', ''),
+                        item_name=po_line.item_name,
+                        item_description=po_line.item_description,
+                        quantity_ordered=po_line.quantity,
+                        quantity_received=line['quantity'],
+                        unit_of_measure=po_line.unit_of_measure,
+                        unit_price=po_line.unit_price,
+                        po_line_item=po_line,
+                    )
+                    grn_line.calculate_line_total()
+                    po_grn_lines.append(grn_line)
+                grn.total_amount = sum(grn_line.line_total for grn_line in po_grn_lines)
+                grns.append(grn)
+                grn_lines.extend(po_grn_lines)
+
+            self.bulk_create(grns)
+            GoodsReceiptLine.objects.bulk_create(grn_lines)
+            POHeader.objects.refresh_receiving_status(lines_by_po)
+
+            for grn in grns:
+                grn.update_budget_actual()
+            budget_updated = [grn for grn in grns if grn.budget_actual_updated_at]
+            if budget_updated:
+                self.bulk_update(budget_updated, ['budget_actual_updated_at'])
+
+        return grns
+
+    def _group_by_budget(self, grns_by_po):
+        """
+        {(po_id, budget_id): [GRN]} of the GRNs whose budget actual was updated,
+        with the budget reverse_budget_actual() picks for each receipt date
+        (one query for all GRNs).
+        """
+        from Finance.budget_control.models import BudgetHeader
+
+        budgeted = [grn for po_grns in grns_by_po.values() for grn in po_grns if grn.budget_actual_updated_at]
+        if not budgeted:
+            return {}
+        receipt_dates = [grn.receipt_date for grn in budgeted]
+        # Same filter and ordering (latest start first) as reverse_budget_actual()
+        budgets = list(BudgetHeader.objects.filter(
+            status__in=['ACTIVE', 'CLOSED'],
+            start_date__lte=max(receipt_dates),
+            end_date__gte=min(receipt_dates)
+        ).values_list('pk', 'start_date', 'end_date'))
+
+        groups = defaultdict(list)
+        for grn in budgeted:
+            budget_id = next(
+                (pk for pk, start, end in budgets if start <= grn.receipt_date <= end), None
+            )
+            groups[(grn.po_header_id, budget_id)].append(grn)
+        return groups
+
+    def reverse_bulk(self, grn_ids):
+        """
+        Delete many GRNs and reverse what they received, in one transaction.
+
+        The received quantities of all GRNs are summed per PO line in one
+        query and taken back with one atomic UPDATE; the budget actual is
+        reversed once per PO and budget period and PO statuses are refreshed
+        with one UPDATE.
+
+        Args:
+            grn_ids: Iterable of GoodsReceipt ids
+
+        Returns:
+            dict: grn_ids and po_ids affected
+
+        Raises:
+            ValidationError: If a GRN does not exist or has been invoiced (nothing is changed)
+        """
+        grn_ids = set(grn_ids)
+        grns = list(self.filter(pk__in=grn_ids).select_related('po_header__segment_combination'))
+        found = {grn.pk for grn in grns}
+        errors = [f"GRN {pk} not found" for pk in sorted(grn_ids - found)]
+        errors.extend(
+            f"GRN {grn_number} has AP invoices and cannot be reversed"
+            for grn_number in self.filter(pk__in=found, ap_invoices__isnull=False)
+            .values_list('grn_number', flat=True).distinct()
+        )
+        if errors:
+            raise ValidationError(errors)
+
+        quantities = dict(
+            GoodsReceiptLine.objects.filter(
+                goods_receipt_id__in=found, po_line_item__isnull=False, is_gift=False
+            ).order_by().values('po_line_item').annotate(
+                total=Sum('quantity_received')
+            ).values_list('po_line_item', 'total')
+        )
+
+        grns_by_po = defaultdict(list)
+        for grn in grns:
+            grns_by_po[grn.po_header_id].append(grn)
+
+        with transaction.atomic():
+            POLineItem.objects.reverse_quantities(quantities)
+
+            # One budget reversal per PO and budget: GRNs of one PO can fall in
+            # different budget periods, each reversed against its own budget
+            for grns_of_budget in self._group_by_budget(grns_by_po).values():
+                latest = max(grns_of_budget, key=lambda grn: (grn.receipt_date, grn.pk))
+                latest.reverse_budget_actual(amount=sum(grn.total_amount for grn in grns_of_budget))
+
+            self.filter(pk__in=found).delete()
+            POHeader.objects.refresh_receiving_status(grns_by_po)
+
+        return {'grn_ids': sorted(found), 'po_ids': sorted(grns_by_po)}
+
+
 class GoodsReceipt(models.Model):
     """
     Goods Receipt Note (GRN) header.
@@ -119,6 +369,8 @@ class GoodsReceipt(models.Model):
             models.Index(fields=['po_header']),
         ]
     
+    objects = GoodsReceiptManager()
+    
     def __str__(self):
         return f"{self.grn_number} - PO: {self.po_header.po_number}"
     
@@ -241,10 +493,13 @@ class GoodsReceipt(models.Model):
         
         self.budget_actual_updated_at = timezone.now()
     
-    def reverse_budget_actual(self):
+    def reverse_budget_actual(self, amount=None):
         """
         Reverse budget actual consumption when GRN is deleted.
         Restores encumbrance to PO.
+        
+        Args:
+            amount: Amount to reverse (default: this GRN's total_amount)
         """
         from Finance.budget_control.models import BudgetHeader
         from Finance.GL.models import XX_Segment
@@ -280,18 +535,20 @@ class GoodsReceipt(models.Model):
             return
         
         budget_amounts = budget.get_applicable_budget_amounts(segment_objects)
+        if amount is None:
+            amount = self.total_amount
         
         # Reverse actual and restore encumbrance
         for budget_amt in budget_amounts:
             try:
                 # Decrease actual_amount
-                budget_amt.actual_amount -= self.total_amount
+                budget_amt.actual_amount -= amount
                 # Restore encumbrance
-                budget_amt.encumbered_amount += self.total_amount
+                budget_amt.encumbered_amount += amount
                 budget_amt.save(update_fields=['actual_amount', 'encumbered_amount', 'updated_at'])
                 
                 logger.info(
-                    f"Reversed budget actual: {self.total_amount} for deleted GRN {self.grn_number}, "
+                    f"Reversed budget actual: {amount} for deleted GRN {self.grn_number}, "
                     f"restored encumbrance"
                 )
             except Exception as e:
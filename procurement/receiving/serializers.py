@@ -350,6 +350,52 @@ class GoodsReceiptCreateSerializer(serializers.Serializer):
         return grn
 
 
+class BulkReceiptLineSerializer(serializers.Serializer):
+    """One PO line of a bulk receipt."""
+    
+    po_line_item_id = serializers.IntegerField()
+    quantity = serializers.DecimalField(max_digits=14, decimal_places=3, min_value=Decimal('0.001'))
+    receiving_type = serializers.ChoiceField(choices=['PARTIAL', 'FULLY'], default='PARTIAL')
+    line_notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class BulkReceivingSerializer(serializers.Serializer):
+    """
+    Serializer for bulk receiving across many POs.
+    
+    Example Request Body (receive - one GRN is created per PO):
+    {
+        "action": "receive",
+        "receipt_date": "2026-01-15",
+        "notes": "Dock 3 morning deliveries",
+        "lines": [
+            {"po_line_item_id": 12, "quantity": "5.000"},
+            {"po_line_item_id": 40, "quantity": "20.000", "receiving_type": "FULLY"}
+        ]
+    }
+    
+    Example Request Body (reverse - GRNs are deleted):
+    {
+        "action": "reverse",
+        "grn_ids": [7, 8, 9]
+    }
+    """
+    
+    action = serializers.ChoiceField(choices=['receive', 'reverse'])
+    receipt_date = serializers.DateField(required=False)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    lines = BulkReceiptLineSerializer(many=True, required=False)
+    grn_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    
+    def validate(self, attrs):
+        """Validate the payload matches the action."""
+        if attrs['action'] == 'receive' and not attrs.get('lines'):
+            raise serializers.ValidationError({'lines': "Provide the PO lines to receive"})
+        if attrs['action'] == 'reverse' and not attrs.get('grn_ids'):
+            raise serializers.ValidationError({'grn_ids': "Provide the GRNs to reverse"})
+        return attrs
+
+
 class GoodsReceiptListSerializer(serializers.ModelSerializer):
     """Serializer for listing GRNs."""
     
@@ -369,15 +415,21 @@ class GoodsReceiptListSerializer(serializers.ModelSerializer):
         ]
     
     def get_line_count(self, obj):
-        """Get count of line items."""
+        """Get count of line items (from with_list_stats() when annotated)."""
+        if hasattr(obj, 'total_line_count'):
+            return obj.total_line_count
         return obj.lines.count()
     
     def get_gift_count(self, obj):
-        """Get count of gift items."""
+        """Get count of gift items (from with_list_stats() when annotated)."""
+        if hasattr(obj, 'gift_line_count'):
+            return obj.gift_line_count
         return obj.lines.filter(is_gift=True).count()
     
     def get_has_invoice(self, obj):
-        """Check if this receipt has been invoiced."""
+        """Check if this receipt has been invoiced (from with_list_stats() when annotated)."""
+        if hasattr(obj, 'has_invoice_flag'):
+            return obj.has_invoice_flag
         return obj.has_ap_invoice()
 
 
@@ -6,8 +6,10 @@ Tests all endpoints:
 - GET    /procurement/receiving/                  - List GRNs
 - GET    /procurement/receiving/{id}/             - Get GRN detail
 - DELETE /procurement/receiving/{id}/             - Delete GRN
+- POST   /procurement/receiving/bulk/             - Receive / reverse many PO lines at once
 - GET    /procurement/receiving/{id}/summary/     - Get GRN summary
 - GET    /procurement/receiving/po/{po_id}/status/ - Get PO receiving status
+- GET    /procurement/receiving/po/status/        - Receiving status of many POs
 - GET    /procurement/receiving/by-supplier/      - GRN stats by supplier
 - GET    /procurement/receiving/by-type/          - GRN stats by type
 - GET    /procurement/receiving/recent/           - Recent GRNs
@@ -23,14 +25,20 @@ Covers scenarios:
 - PO quantity updates
 """
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from decimal import Decimal
 from datetime import date, timedelta
+from unittest.mock import patch
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from procurement.receiving.models import GoodsReceipt, GoodsReceiptLine
+from Finance.budget_control.models import BudgetHeader
 from procurement.po.models import POHeader, POLineItem
 from Finance.BusinessPartner.models import Supplier
 from procurement.receiving.tests.fixtures import (
@@ -613,6 +621,269 @@ class POReceivingStatusTests(TestCase):
             self.assertIn('quantity_received', line)
             self.assertIn('quantity_remaining', line)
             self.assertIn('receipt_percentage', line)
+    
+    def test_get_po_status_values(self):
+        """Test progress, percentages and flags computed in the database"""
+        create_grn_with_lines(self.po, self.user)
+        
+        with self.assertNumQueries(3):  # PO, lines, GRNs
+            response = self.client.get(self.url)
+        
+        data = response.data['data']
+        self.assertEqual(Decimal(data['total_received']), Decimal('6125.00'))
+        self.assertEqual(round(data['receipt_percentage'], 2), Decimal('33.33'))
+        self.assertTrue(data['is_partially_received'])
+        self.assertFalse(data['is_fully_received'])
+        self.assertEqual(data['grns'][0]['line_count'], 2)
+        self.assertFalse(data['grns'][0]['has_invoice'])
+        
+        laptop = self.po.line_items.get(line_number=1)
+        laptop_status = data['lines_status'][0]
+        self.assertEqual(Decimal(laptop_status['quantity_remaining']), laptop.get_remaining_quantity())
+        self.assertEqual(laptop_status['receipt_percentage'], Decimal('50'))
+        self.assertFalse(laptop_status['is_fully_received'])
+
+
+class POReceivingStatusListTests(TestCase):
+    """Test receiving status of many POs at once"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = get_or_create_test_user()
+        self.client.force_authenticate(user=self.user)
+        
+        self.uom = create_unit_of_measure()
+        self.supplier = create_supplier()
+        self.currency = create_currency()
+        self.received_po = create_confirmed_po(self.supplier, self.currency, self.uom, self.user)
+        self.open_po = create_confirmed_po(self.supplier, self.currency, self.uom, self.user)
+        for line in self.received_po.line_items.all():
+            line.record_receipt(line.quantity)
+        self.url = reverse('receiving:po-receiving-status-list')
+    
+    def test_list_status(self):
+        """Test every PO is returned with its line progress"""
+        response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {row['po_id']: row for row in response.data['data']['results']}
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[self.received_po.id]['status'], 'RECEIVED')
+        self.assertTrue(results[self.received_po.id]['is_fully_received'])
+        self.assertEqual(results[self.received_po.id]['receipt_percentage'], Decimal('100'))
+        self.assertEqual(results[self.open_po.id]['receipt_percentage'], Decimal('0'))
+        self.assertEqual(len(results[self.open_po.id]['lines_status']), 2)
+    
+    def test_list_query_count_is_constant(self):
+        """Test the number of queries does not grow with the number of POs"""
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        for _ in range(3):
+            create_confirmed_po(self.supplier, self.currency, self.uom, self.user)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+        
+        self.assertEqual(response.data['data']['count'], 5)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+    
+    def test_list_filters(self):
+        """Test supplier, status, date and completion filters"""
+        other_supplier = create_supplier(name='Other Supplier')
+        create_confirmed_po(other_supplier, self.currency, self.uom, self.user)
+        
+        response = self.client.get(self.url, {'supplier_id': self.supplier.business_partner_id})
+        self.assertEqual(response.data['data']['count'], 2)
+        
+        response = self.client.get(self.url, {'status': 'received,cancelled'})
+        self.assertEqual([row['po_id'] for row in response.data['data']['results']], [self.received_po.id])
+        
+        response = self.client.get(self.url, {'is_fully_received': 'false'})
+        self.assertEqual(response.data['data']['count'], 2)
+        
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        response = self.client.get(self.url, {'date_from': tomorrow})
+        self.assertEqual(response.data['data']['count'], 0)
+        
+        for params in ({'status': 'SHIPPED'}, {'date_to': '2026-02-30'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GRNBulkReceivingTests(TestCase):
+    """Test bulk receiving / reversal across many POs"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = get_or_create_test_user()
+        self.client.force_authenticate(user=self.user)
+        
+        self.uom = create_unit_of_measure()
+        self.supplier = create_supplier()
+        self.currency = create_currency()
+        self.po1 = create_confirmed_po(self.supplier, self.currency, self.uom, self.user)
+        self.po2 = create_confirmed_po(self.supplier, self.currency, self.uom, self.user)
+        self.url = reverse('receiving:grn-bulk')
+    
+    def receive(self, lines):
+        return self.client.post(self.url, {'action': 'receive', 'notes': 'Dock 1', 'lines': lines}, format='json')
+    
+    def test_bulk_receive_across_pos(self):
+        """One GRN per PO, quantities added and PO statuses refreshed"""
+        laptop1, mouse1 = self.po1.line_items.order_by('line_number')
+        laptop2, _ = self.po2.line_items.order_by('line_number')
+        
+        response = self.receive([
+            {'po_line_item_id': laptop1.id, 'quantity': '10.000', 'receiving_type': 'FULLY'},
+            {'po_line_item_id': mouse1.id, 'quantity': '20.000'},
+            {'po_line_item_id': laptop2.id, 'quantity': '4.000'},
+        ])
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        grns = response.data['data']['grns']
+        self.assertEqual([grn['po_id'] for grn in grns], [self.po1.id, self.po2.id])
+        self.assertEqual(GoodsReceipt.objects.get(id=grns[0]['id']).total_amount, Decimal('12500.00'))
+        self.assertEqual(GoodsReceiptLine.objects.filter(goods_receipt_id=grns[0]['id']).count(), 2)
+        self.assertEqual(response.data['data']['po_statuses'], {
+            self.po1.id: 'RECEIVED', self.po2.id: 'PARTIALLY_RECEIVED'
+        })
+        laptop2.refresh_from_db()
+        self.assertEqual(laptop2.quantity_received, Decimal('4.000'))
+    
+    def test_bulk_receive_query_count_is_constant(self):
+        """Receiving twice as many lines of the same POs costs no extra queries"""
+        po3 = create_confirmed_po(self.supplier, self.currency, self.uom, self.user)
+        po4 = create_confirmed_po(self.supplier, self.currency, self.uom, self.user)
+        
+        first_lines = [po.line_items.order_by('line_number').first() for po in (self.po1, self.po2)]
+        with CaptureQueriesContext(connection) as few:
+            self.receive([{'po_line_item_id': line.id, 'quantity': '1.000'} for line in first_lines])
+        lines = [line for po in (po3, po4) for line in po.line_items.all()]
+        with CaptureQueriesContext(connection) as many:
+            response = self.receive([{'po_line_item_id': line.id, 'quantity': '1.000'} for line in lines])
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+    
+    def test_bulk_receive_is_all_or_nothing(self):
+        """A line over its tolerance rejects the whole batch"""
+        laptop1 = self.po1.line_items.get(line_number=1)
+        laptop2 = self.po2.line_items.get(line_number=1)
+        
+        response = self.receive([
+            {'po_line_item_id': laptop1.id, 'quantity': '5.000'},
+            {'po_line_item_id': laptop2.id, 'quantity': '11.000'},
+            {'po_line_item_id': 99999, 'quantity': '1.000'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['data']['detail'], ['PO line 99999 not found'])
+        
+        response = self.receive([
+            {'po_line_item_id': laptop1.id, 'quantity': '5.000'},
+            {'po_line_item_id': laptop2.id, 'quantity': '11.000'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f'PO line {laptop2.id}: cannot receive 11.000', response.data['data']['detail'][0])
+        
+        laptop1.refresh_from_db()
+        self.assertEqual(laptop1.quantity_received, Decimal('0.000'))
+        self.assertFalse(GoodsReceipt.objects.exists())
+    
+    def test_bulk_receive_within_fractional_tolerance(self):
+        """Tolerance limits are not truncated by the database (10 ordered + 5% = 10.5)"""
+        laptop1 = self.po1.line_items.get(line_number=1)
+        POLineItem.objects.filter(pk=laptop1.pk).update(tolerance_percentage=Decimal('5.00'))
+        
+        response = self.receive([
+            {'po_line_item_id': laptop1.id, 'quantity': '10.500', 'receiving_type': 'FULLY'}
+        ])
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        laptop1.refresh_from_db()
+        self.assertEqual(laptop1.quantity_received, Decimal('10.500'))
+    
+    def test_bulk_receive_fully_below_fractional_tolerance(self):
+        """The minimum acceptable quantity is not truncated either (10 ordered - 5% = 9.5)"""
+        laptop1 = self.po1.line_items.get(line_number=1)
+        POLineItem.objects.filter(pk=laptop1.pk).update(tolerance_percentage=Decimal('5.00'))
+        
+        response = self.receive([
+            {'po_line_item_id': laptop1.id, 'quantity': '9.000', 'receiving_type': 'FULLY'}
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = self.receive([
+            {'po_line_item_id': laptop1.id, 'quantity': '9.500', 'receiving_type': 'FULLY'}
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['po_statuses'][self.po1.id], 'PARTIALLY_RECEIVED')
+    
+    def test_receipts_do_not_lose_updates(self):
+        """Increments are applied in SQL, so a stale line instance cannot overwrite a receipt"""
+        stale_line = self.po1.line_items.get(line_number=1)
+        self.receive([{'po_line_item_id': stale_line.id, 'quantity': '6.000'}])
+        
+        stale_line.record_receipt(Decimal('3.000'))
+        self.assertEqual(stale_line.quantity_received, Decimal('9.000'))
+        
+        with self.assertRaises(ValidationError):
+            stale_line.record_receipt(Decimal('2.000'))
+    
+    def test_bulk_reverse(self):
+        """Reversal deletes the GRNs and takes their quantities back"""
+        laptop1, mouse1 = self.po1.line_items.order_by('line_number')
+        laptop2, _ = self.po2.line_items.order_by('line_number')
+        grns = self.receive([
+            {'po_line_item_id': laptop1.id, 'quantity': '10.000'},
+            {'po_line_item_id': mouse1.id, 'quantity': '20.000'},
+            {'po_line_item_id': laptop2.id, 'quantity': '4.000'},
+        ]).data['data']['grns']
+        self.receive([{'po_line_item_id': laptop2.id, 'quantity': '1.000'}])
+        
+        response = self.client.post(
+            self.url, {'action': 'reverse', 'grn_ids': [grn['id'] for grn in grns]}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['po_statuses'], {
+            self.po1.id: 'CONFIRMED', self.po2.id: 'PARTIALLY_RECEIVED'
+        })
+        self.assertEqual(GoodsReceipt.objects.count(), 1)
+        laptop2.refresh_from_db()
+        self.assertEqual(laptop2.quantity_received, Decimal('1.000'))
+        
+        response = self.client.post(self.url, {'action': 'reverse', 'grn_ids': [99999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_bulk_reverse_budget_per_period(self):
+        """GRNs of one PO in different budget periods are reversed against their own budget"""
+        for year in (2025, 2026):
+            BudgetHeader.objects.create(
+                budget_code=f'FY{year}', budget_name=f'FY {year}', start_date=date(year, 1, 1),
+                end_date=date(year, 12, 31), currency=self.currency, status='ACTIVE',
+                is_active=True, created_by='test'
+            )
+        laptop1 = self.po1.line_items.get(line_number=1)
+        grn_ids = [
+            self.receive([{'po_line_item_id': laptop1.id, 'quantity': '1.000'}]).data['data']['grns'][0]['id']
+            for _ in range(3)
+        ]
+        for grn_id, receipt_date in zip(grn_ids, (date(2025, 12, 1), date(2025, 12, 20), date(2026, 1, 5))):
+            GoodsReceipt.objects.filter(id=grn_id).update(
+                receipt_date=receipt_date, budget_actual_updated_at=timezone.now()
+            )
+        
+        with patch.object(GoodsReceipt, 'reverse_budget_actual', autospec=True) as reverse_budget_actual:
+            response = self.client.post(self.url, {'action': 'reverse', 'grn_ids': grn_ids}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        reversals = sorted(
+            (grn.receipt_date, kwargs['amount']) for (grn,), kwargs in reverse_budget_actual.call_args_list
+        )
+        self.assertEqual(reversals, [
+            (date(2025, 12, 20), Decimal('2400.00')), (date(2026, 1, 5), Decimal('1200.00'))
+        ])
 
 
 # ============================================================================
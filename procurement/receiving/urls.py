@@ -17,6 +17,9 @@ urlpatterns = [
     # List all GRNs / Create new GRN
     path('', views.grn_list, name='grn-list'),
     
+    # Receive / reverse many PO lines across many POs at once
+    path('bulk/', views.grn_bulk, name='grn-bulk'),
+    
     # Get GRN detail / Delete GRN
     path('<int:pk>/', views.grn_detail, name='grn-detail'),
     
@@ -29,6 +32,9 @@ urlpatterns = [
     # Get receiving status for a specific PO
     path('po/<int:po_id>/status/', views.po_receiving_status, name='po-receiving-status'),
     
+    # Receiving status of many POs (filter by supplier, status, PO date)
+    path('po/status/', views.po_receiving_status_list, name='po-receiving-status-list'),
+    
     # ============================================================================
     # Reporting & Analytics
     # ============================================================================
@@ -15,18 +15,20 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Sum, Count
+from django.db.models import Q, Sum, Count, Prefetch
 from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_date
 
 from erp_project.response_formatter import success_response, error_response
-from erp_project.pagination import auto_paginate
+from erp_project.pagination import auto_paginate, paginate_queryset_response
 
 from procurement.receiving.models import GoodsReceipt, GoodsReceiptLine
-from procurement.po.models import POHeader
+from procurement.po.models import POHeader, POLineItem
 from procurement.receiving.serializers import (
     GoodsReceiptCreateSerializer,
     GoodsReceiptListSerializer,
-    GoodsReceiptDetailSerializer
+    GoodsReceiptDetailSerializer,
+    BulkReceivingSerializer
 )
 
 
@@ -142,25 +144,15 @@ def grn_detail(request, pk):
         )
     
     elif request.method == 'DELETE':
-        # Store PO lines to reverse quantities
-        po_lines_to_update = []
-        for line in grn.lines.filter(po_line_item__isnull=False):
-            po_lines_to_update.append({
-                'po_line': line.po_line_item,
-                'quantity': line.quantity_received
-            })
-        
-        # Reverse budget actual before deletion
-        grn.reverse_budget_actual()
-        
-        # Delete GRN
-        grn.delete()
-        
-        # Reverse received quantities on PO lines
-        for item in po_lines_to_update:
-            po_line = item['po_line']
-            po_line.quantity_received -= item['quantity']
-            po_line.save()
+        # Reverse budget actual and PO line quantities (atomic decrements), then delete
+        try:
+            GoodsReceipt.objects.reverse_bulk([grn.pk])
+        except ValidationError as e:
+            return error_response(
+                data={'detail': e.messages},
+                message="Failed to delete GRN",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
         
         return success_response(
             data={},
@@ -169,6 +161,68 @@ def grn_detail(request, pk):
         )
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def grn_bulk(request):
+    """
+    POST: Receive or reverse quantities for many PO lines across many POs
+    in one transaction (see BulkReceivingSerializer for the request body).
+    
+    - receive: one GRN per PO; quantities are added with atomic increments
+      and tolerance checks in SQL, the budget actual is updated once per PO
+    - reverse: deletes the GRNs and takes their quantities back the same way
+    
+    Either every line is applied or none is; errors list every failing line.
+    """
+    serializer = BulkReceivingSerializer(data=request.data)
+    if not serializer.is_valid():
+        return error_response(
+            data=serializer.errors,
+            message="Invalid data provided",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    data = serializer.validated_data
+    
+    try:
+        if data['action'] == 'receive':
+            grns = GoodsReceipt.objects.receive_bulk(
+                data['lines'],
+                received_by=request.user,
+                receipt_date=data.get('receipt_date'),
+                notes=data['notes'],
+                created_by=request.user
+            )
+            po_ids = [grn.po_header_id for grn in grns]
+            result = {
+                'grns': [
+                    {
+                        'id': grn.id,
+                        'grn_number': grn.grn_number,
+                        'po_id': grn.po_header_id,
+                        'po_number': grn.po_header.po_number,
+                        'total_amount': str(grn.total_amount),
+                    }
+                    for grn in grns
+                ]
+            }
+        else:
+            result = GoodsReceipt.objects.reverse_bulk(data['grn_ids'])
+            po_ids = result['po_ids']
+    except ValidationError as e:
+        return error_response(
+            data={'detail': e.messages},
+            message=f"Failed to {data['action']} goods",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    
+    result['po_statuses'] = dict(POHeader.objects.filter(pk__in=po_ids).values_list('id', 'status'))
+    return success_response(
+        data=result,
+        message="Goods received successfully" if data['action'] == 'receive' else "GRNs reversed successfully",
+        status_code=status.HTTP_201_CREATED if data['action'] == 'receive' else status.HTTP_200_OK
+    )
+
+
 # ============================================================================
 # GRN SUMMARY & REPORTING
 # ============================================================================
@@ -195,50 +249,136 @@ def grn_summary(request, pk):
     )
 
 
+def receiving_status_line_prefetch():
+    """Prefetch of PO lines with their receiving progress computed in SQL"""
+    return Prefetch(
+        'line_items',
+        queryset=POLineItem.objects.with_receiving_progress().order_by('line_number')
+    )
+
+
+def serialize_receiving_status(po):
+    """
+    Receiving status of a PO loaded through with_receiving_status() and
+    receiving_status_line_prefetch().
+    """
+    return {
+        'po_id': po.id,
+        'po_number': po.po_number,
+        'status': po.status,
+        'po_total': str(po.total_amount),
+        'total_received': str(po.total_received_amount),
+        'grn_count': po.grn_count,
+        'last_receipt_date': po.last_receipt_date,
+        'receipt_percentage': po.receipt_percentage,
+        'is_fully_received': po.is_fully_received_flag,
+        'is_partially_received': po.is_partially_received_flag,
+        'lines_status': [
+            {
+                'line_number': po_line.line_number,
+                'item_name': po_line.item_name,
+                'quantity_ordered': str(po_line.quantity),
+                'quantity_received': str(po_line.quantity_received),
+                'quantity_remaining': str(po_line.remaining_quantity),
+                'receipt_percentage': po_line.receipt_percentage,
+                'is_fully_received': po_line.is_fully_received_flag
+            }
+            for po_line in po.line_items.all()
+        ]
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def po_receiving_status(request, po_id):
     """
     GET: Get receiving status for a specific PO
+    
+    Totals, percentages and completion flags are computed in the database:
+    one query for the PO, one for its lines and one for its GRNs.
     """
-    po = get_object_or_404(POHeader, pk=po_id)
+    po = get_object_or_404(
+        POHeader.objects.with_receiving_status().prefetch_related(
+            receiving_status_line_prefetch(),
+            Prefetch(
+                'goods_receipts',
+                queryset=GoodsReceipt.objects.with_list_stats().select_related(
+                    'po_header', 'supplier__business_partner'
+                ).order_by('-receipt_date', '-id')
+            )
+        ),
+        pk=po_id
+    )
     
-    # Get all GRNs for this PO
-    grns = GoodsReceipt.objects.filter(po_header=po).order_by('-receipt_date')
+    data = serialize_receiving_status(po)
+    data['grns'] = GoodsReceiptListSerializer(po.goods_receipts.all(), many=True).data
     
-    # Calculate totals
-    total_received = grns.aggregate(total=Sum('total_amount'))['total'] or 0
-    grn_count = grns.count()
+    return success_response(
+        data=data,
+        message="PO receiving status retrieved successfully"
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def po_receiving_status_list(request):
+    """
+    GET: Receiving status of many POs at once (receiving dashboard)
     
-    # Get line-level status
-    lines_status = []
-    for po_line in po.line_items.all():
-        remaining = po_line.get_remaining_quantity()
-        percentage = po_line.get_receiving_percentage()
-        
-        lines_status.append({
-            'line_number': po_line.line_number,
-            'item_name': po_line.item_name,
-            'quantity_ordered': str(po_line.quantity),
-            'quantity_received': str(po_line.quantity_received),
-            'quantity_remaining': str(remaining),
-            'receipt_percentage': percentage,
-            'is_fully_received': po_line.is_fully_received()
-        })
+    Query Parameters:
+    - supplier_id: Filter by supplier (business partner) ID
+    - status: Comma-separated PO statuses (e.g. CONFIRMED,PARTIALLY_RECEIVED)
+    - date_from / date_to: Filter by PO date, YYYY-MM-DD
+    - is_fully_received: true/false
+    - page / page_size: Pagination
+    
+    Each page costs one query for the POs and one for their lines.
+    """
+    queryset = POHeader.objects.all()
     
-    # Serialize GRNs
-    grn_serializer = GoodsReceiptListSerializer(grns, many=True)
+    supplier_filter = request.query_params.get('supplier_id')
+    if supplier_filter:
+        queryset = queryset.filter(supplier_name_id=supplier_filter)
     
-    return success_response(
-        data={
-            'po_number': po.po_number,
-            'po_total': str(po.total_amount),
-            'total_received': str(total_received),
-            'grn_count': grn_count,
-            'grns': grn_serializer.data,
-            'lines_status': lines_status
-        },
-        message="PO receiving status retrieved successfully"
+    status_filter = request.query_params.get('status')
+    if status_filter:
+        statuses = [value.strip().upper() for value in status_filter.split(',') if value.strip()]
+        valid_statuses = {code for code, _ in POHeader.STATUS_CHOICES}
+        invalid = [value for value in statuses if value not in valid_statuses]
+        if invalid:
+            return error_response(
+                data={'detail': f"Invalid status: {', '.join(invalid)}"},
+                message="Invalid status",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = queryset.filter(status__in=statuses)
+    
+    for param, lookup in (('date_from', 'po_date__gte'), ('date_to', 'po_date__lte')):
+        value = request.query_params.get(param)
+        if value:
+            try:
+                parsed = parse_date(value)
+            except ValueError:
+                parsed = None
+            if parsed is None:
+                return error_response(
+                    data={'detail': f'Invalid {param}. Use YYYY-MM-DD'},
+                    message="Invalid date",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(**{lookup: parsed})
+    
+    queryset = queryset.with_receiving_status()
+    
+    fully_received = request.query_params.get('is_fully_received')
+    if fully_received:
+        queryset = queryset.filter(is_fully_received_flag=fully_received.lower() == 'true')
+    
+    queryset = queryset.prefetch_related(receiving_status_line_prefetch()).order_by('-po_date', '-id')
+    
+    return paginate_queryset_response(
+        request, queryset,
+        lambda page: [serialize_receiving_status(po) for po in page]
     )
 
 